@@ -0,0 +1,31 @@
+"""add_sample_updated_at
+
+Revision ID: 20251118_000000
+Revises: 20251117_100000
+Create Date: 2025-11-18 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20251118_000000'
+down_revision: Union[str, Sequence[str], None] = '20251117_100000'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add updated_at to samples for HTTP cache validators."""
+    op.add_column('samples', sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True))
+
+    # Existing rows: last known change is analysis or creation
+    op.execute("UPDATE samples SET updated_at = COALESCE(analyzed_at, created_at)")
+
+
+def downgrade() -> None:
+    """Remove updated_at from samples."""
+    op.drop_column('samples', 'updated_at')
@@ -0,0 +1,65 @@
+"""add_padconf_backup_index
+
+Revision ID: 20251119_000000
+Revises: 20251118_000000
+Create Date: 2025-11-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20251119_000000'
+down_revision: Union[str, Sequence[str], None] = '20251118_000000'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the PADCONF.BIN backup index tables."""
+    op.create_table(
+        'padconf_backups',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('path', sa.String(), nullable=False),
+        sa.Column('size_bytes', sa.Integer(), nullable=False),
+        sa.Column('mtime_ns', sa.BigInteger(), nullable=False),
+        sa.Column('project_name', sa.String(), nullable=True),
+        sa.Column('project_bpm', sa.Float(), nullable=True),
+        sa.Column('tempo_mode', sa.String(), nullable=True),
+        sa.Column('pad_count', sa.Integer(), nullable=True),
+        sa.Column('indexed_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('path')
+    )
+    op.create_index(op.f('ix_padconf_backups_id'), 'padconf_backups', ['id'], unique=False)
+
+    op.create_table(
+        'padconf_backup_pads',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('backup_id', sa.Integer(), nullable=False),
+        sa.Column('pad_index', sa.Integer(), nullable=False),
+        sa.Column('bank', sa.String(length=1), nullable=False),
+        sa.Column('pad_number', sa.Integer(), nullable=False),
+        sa.Column('filename', sa.String(length=24), nullable=False),
+        sa.Column('filename_key', sa.String(length=24), nullable=False),
+        sa.Column('bpm', sa.Float(), nullable=True),
+        sa.Column('loop', sa.Boolean(), nullable=True),
+        sa.Column('sample_start', sa.BigInteger(), nullable=True),
+        sa.Column('sample_end', sa.BigInteger(), nullable=True),
+        sa.ForeignKeyConstraint(['backup_id'], ['padconf_backups.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_padconf_backup_pads_filename_key', 'padconf_backup_pads', ['filename_key'], unique=False)
+    op.create_index('idx_padconf_backup_pads_backup_id', 'padconf_backup_pads', ['backup_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Drop the PADCONF.BIN backup index tables."""
+    op.drop_index('idx_padconf_backup_pads_backup_id', table_name='padconf_backup_pads')
+    op.drop_index('idx_padconf_backup_pads_filename_key', table_name='padconf_backup_pads')
+    op.drop_table('padconf_backup_pads')
+    op.drop_index(op.f('ix_padconf_backups_id'), table_name='padconf_backups')
+    op.drop_table('padconf_backups')
@@ -0,0 +1,32 @@
+"""add_sample_loudness
+
+Revision ID: 20251120_000000
+Revises: 20251119_000000
+Create Date: 2025-11-20 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20251120_000000'
+down_revision: Union[str, Sequence[str], None] = '20251119_000000'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add EBU R128 loudness measurements to samples."""
+    op.add_column('samples', sa.Column('loudness_lufs', sa.Float(), nullable=True, comment='Integrated loudness (LUFS)'))
+    op.add_column('samples', sa.Column('true_peak_dbtp', sa.Float(), nullable=True, comment='True peak (dBTP)'))
+    op.add_column('samples', sa.Column('loudness_range_lu', sa.Float(), nullable=True, comment='Loudness range (LU)'))
+
+
+def downgrade() -> None:
+    """Remove loudness measurements from samples."""
+    op.drop_column('samples', 'loudness_range_lu')
+    op.drop_column('samples', 'true_peak_dbtp')
+    op.drop_column('samples', 'loudness_lufs')
@@ -0,0 +1,29 @@
+"""add_batch_paused_status
+
+Revision ID: 20251122_000000
+Revises: 20251121_000000
+Create Date: 2025-11-22 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20251122_000000'
+down_revision: Union[str, Sequence[str], None] = '20251121_000000'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add PAUSED to the batch status enum (native enum on PostgreSQL only)."""
+    if op.get_bind().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.execute("ALTER TYPE batchstatus ADD VALUE IF NOT EXISTS 'PAUSED'")
+
+
+def downgrade() -> None:
+    """PostgreSQL cannot drop enum values; move paused batches back to pending."""
+    op.execute("UPDATE batches SET status = 'PENDING' WHERE status = 'PAUSED'")
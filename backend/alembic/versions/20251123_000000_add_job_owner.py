@@ -0,0 +1,32 @@
+"""add_job_owner
+
+Revision ID: 20251123_000000
+Revises: 20251122_000000
+Create Date: 2025-11-23 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20251123_000000'
+down_revision: Union[str, Sequence[str], None] = '20251122_000000'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Record which user queued each job."""
+    with op.batch_alter_table('jobs') as batch_op:
+        batch_op.add_column(sa.Column('user_id', sa.Integer(), nullable=True))
+        batch_op.create_foreign_key('fk_jobs_user_id_users', 'users', ['user_id'], ['id'])
+
+
+def downgrade() -> None:
+    """Drop the job owner column."""
+    with op.batch_alter_table('jobs') as batch_op:
+        batch_op.drop_constraint('fk_jobs_user_id_users', type_='foreignkey')
+        batch_op.drop_column('user_id')
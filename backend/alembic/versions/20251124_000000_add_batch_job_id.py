@@ -0,0 +1,29 @@
+"""add_batch_job_id
+
+Revision ID: 20251124_000000
+Revises: 20251123_000000
+Create Date: 2025-11-24 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20251124_000000'
+down_revision: Union[str, Sequence[str], None] = '20251123_000000'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Record the job currently processing each batch."""
+    op.add_column('batches', sa.Column('job_id', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    """Drop the batch job column."""
+    with op.batch_alter_table('batches') as batch_op:
+        batch_op.drop_column('job_id')
@@ -0,0 +1,29 @@
+"""add_padconf_backup_error
+
+Revision ID: 20251125_000000
+Revises: 20251124_000000
+Create Date: 2025-11-25 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '20251125_000000'
+down_revision: Union[str, Sequence[str], None] = '20251124_000000'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Record PADCONF.BIN backups that could not be read."""
+    op.add_column('padconf_backups', sa.Column('error', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    """Drop the backup read error column."""
+    with op.batch_alter_table('padconf_backups') as batch_op:
+        batch_op.drop_column('error')
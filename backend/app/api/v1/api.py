@@ -3,7 +3,7 @@ API v1 router aggregation
 """
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import auth, samples, public, batch, usage, preferences, sp404_export, kits, vibe_search, projects, collections
+from app.api.v1.endpoints import auth, samples, public, batch, usage, preferences, sp404_export, kits, vibe_search, projects, collections, jobs
 
 api_router = APIRouter()
 
@@ -21,4 +21,5 @@ api_router.include_router(sp404_export.router, prefix="/sp404", tags=["sp404-exp
 api_router.include_router(kits.router, prefix="/kits", tags=["kits"])
 api_router.include_router(vibe_search.router, prefix="/search", tags=["vibe-search"])
 api_router.include_router(projects.router, prefix="/projects", tags=["projects"])
-api_router.include_router(collections.router, prefix="/collections", tags=["collections"])
\ No newline at end of file
+api_router.include_router(collections.router, prefix="/collections", tags=["collections"])
+api_router.include_router(jobs.router, prefix="/jobs", tags=["jobs"])
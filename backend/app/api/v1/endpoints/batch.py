@@ -2,8 +2,8 @@
 Batch processing endpoints
 """
 from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks, WebSocket, Form
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Depends, HTTPException, status, WebSocket, WebSocketDisconnect, Form
+from fastapi.responses import FileResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from pathlib import Path
 
@@ -14,6 +14,8 @@ from app.schemas.batch import (
     BatchListResponse
 )
 from app.services.batch_service import BatchService
+from app.services.export_jobs import session_factory_for
+from app.services.progress_broadcast import SlowConsumerError
 
 router = APIRouter()
 public_router = APIRouter()
@@ -22,7 +24,6 @@ public_router = APIRouter()
 @router.post("/", response_model=BatchResponse, status_code=status.HTTP_201_CREATED)
 async def create_batch(
     batch_data: BatchCreate,
-    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
@@ -36,11 +37,8 @@ async def create_batch(
         options=batch_data.options
     )
     
-    # Start processing in background
-    background_tasks.add_task(
-        batch_service.process_batch,
-        batch_id=batch.id
-    )
+    # Queue processing for a job worker
+    await batch_service.enqueue_processing(batch.id)
     
     return batch
 
@@ -112,6 +110,75 @@ async def cancel_batch(
     return {"message": "Batch cancelled successfully"}
 
 
+@router.post("/{batch_id}/pause")
+async def pause_batch(
+    batch_id: str,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Pause a batch job after the sample in progress."""
+    batch_service = BatchService(db)
+    
+    success = await batch_service.pause_batch(
+        batch_id=batch_id,
+        user_id=current_user.id
+    )
+    
+    if not success:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cannot pause batch"
+        )
+    
+    return {"message": "Batch paused successfully"}
+
+
+@router.post("/{batch_id}/resume")
+async def resume_batch(
+    batch_id: str,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Resume a paused batch job; completed samples are not processed again."""
+    batch_service = BatchService(db)
+    
+    success = await batch_service.resume_batch(
+        batch_id=batch_id,
+        user_id=current_user.id
+    )
+    
+    if not success:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cannot resume batch"
+        )
+    
+    return {"message": "Batch resumed successfully"}
+
+
+@router.post("/{batch_id}/retry")
+async def retry_batch(
+    batch_id: str,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Retry a failed or cancelled batch job; completed samples are not processed again."""
+    batch_service = BatchService(db)
+    
+    success = await batch_service.retry_batch(
+        batch_id=batch_id,
+        user_id=current_user.id
+    )
+    
+    if not success:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cannot retry batch"
+        )
+    
+    return {"message": "Batch queued for retry"}
+
+
 @router.websocket("/{batch_id}/progress")
 async def batch_progress_websocket(
     websocket: WebSocket,
@@ -137,20 +204,61 @@ async def batch_progress_websocket(
         async for progress in batch_service.watch_progress(batch_id):
             await websocket.send_json({
                 "type": "progress",
-                "data": progress.dict()
+                "data": progress.model_dump(mode="json")
             })
             
             if progress.status in ["completed", "failed", "cancelled"]:
                 break
-                
+
+    except SlowConsumerError:
+        await websocket.close(code=4008, reason="Too slow to keep up with progress updates")
+    except WebSocketDisconnect:
+        pass
     except Exception as e:
         await websocket.close(code=4000, reason=str(e))
 
 
+@router.get("/{batch_id}/events")
+async def stream_batch_events(
+    batch_id: str,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Stream a batch's progress as server-sent events.
+
+    Emits a `progress` event per update (the first one is the current state)
+    and ends after the completed/failed/cancelled update. A client that falls
+    too far behind gets an `evicted` event and should reconnect.
+    """
+    batch_service = BatchService(db)
+    if not await batch_service.get_batch(batch_id=batch_id, user_id=current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Batch not found"
+        )
+
+    # The stream outlives the request's session, so it uses its own
+    stream_session = session_factory_for(db)
+
+    async def event_stream():
+        async with stream_session() as session:
+            try:
+                async for progress in BatchService(session).watch_progress(batch_id):
+                    yield f"event: progress\ndata: {progress.model_dump_json()}\n\n"
+            except SlowConsumerError:
+                yield "event: evicted\ndata: {}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 # Public endpoints for testing (no auth required)
 @public_router.post("/")
 async def create_batch_public(
-    background_tasks: BackgroundTasks,
     collection_path: str = Form(...),
     batch_size: int = Form(5),
     vibe_analysis: bool = Form(False),
@@ -185,11 +293,8 @@ async def create_batch_public(
             options=batch_data.options
         )
 
-        # Start processing in background
-        background_tasks.add_task(
-            batch_service.process_batch,
-            batch_id=batch.id
-        )
+        # Queue processing for a job worker
+        await batch_service.enqueue_processing(batch.id)
 
         return batch
     except Exception as e:
@@ -324,7 +429,6 @@ async def cancel_batch_public(
 @public_router.post("/{batch_id}/retry")
 async def retry_batch_public(
     batch_id: str,
-    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db)
 ):
     """Retry a failed batch job."""
@@ -350,20 +454,11 @@ async def retry_batch_public(
                 detail=f"Cannot retry batch with status: {batch.status}"
             )
 
-        # Create new batch with same collection_path and options
-        new_batch = await batch_service.create_batch(
-            user_id=1,  # Demo user
-            collection_path=batch.collection_path,
-            options=batch.options
-        )
-
-        # Start processing in background
-        background_tasks.add_task(
-            batch_service.process_batch,
-            batch_id=new_batch.id
-        )
+        # Requeue the same batch so it continues from its checkpoints
+        await batch_service.retry_batch(batch_id=batch_id, user_id=1)
+        await db.refresh(batch)
 
-        return new_batch
+        return batch
 
     except Exception as e:
         raise HTTPException(
@@ -13,6 +13,7 @@ from app.schemas.collection_schemas import (
     CollectionDetailResponse,
     CollectionListResponse,
     CollectionResponse,
+    CollectionSummaryListResponse,
     CollectionUpdate,
     SampleInCollectionResponse,
 )
@@ -47,17 +48,27 @@ async def create_collection(
         )
 
 
-@router.get("", response_model=CollectionListResponse)
+@router.get("", response_model=CollectionListResponse | CollectionSummaryListResponse)
 async def list_collections(
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
-    include_smart: bool = Query(True)
+    include_smart: bool = Query(True),
+    view: str = Query("full", pattern="^(full|summary)$")
 ):
-    """List collections with pagination."""
+    """List collections with pagination. `view=summary` returns column-only rows."""
     service = CollectionService(db)
 
+    if view == "summary":
+        rows, total = await service.list_collection_summaries(
+            user_id=current_user.id,
+            skip=skip,
+            limit=limit,
+            include_smart=include_smart
+        )
+        return CollectionSummaryListResponse(items=rows, total=total)
+
     collections, total = await service.list_collections(
         user_id=current_user.id,
         skip=skip,
@@ -0,0 +1,43 @@
+"""
+Background job endpoints
+"""
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_db, get_current_user
+from app.models.user import User
+from app.schemas.job import JobResponse
+from app.services.job_queue import cancel_job, get_job
+
+router = APIRouter()
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job_status(
+    job_id: str,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get the status (and result, once finished) of one of the user's background jobs."""
+    job = await get_job(db, job_id, user_id=current_user.id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+    return job
+
+
+@router.post("/{job_id}/cancel")
+async def cancel_job_endpoint(
+    job_id: str,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Cancel one of the user's queued or running background jobs."""
+    if not await cancel_job(db, job_id, user_id=current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cannot cancel job"
+        )
+    return {"message": "Job cancelled successfully"}
@@ -16,7 +16,7 @@ from io import BytesIO
 from fastapi import APIRouter, Depends, Request, HTTPException, status, Query, Header
 from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Optional
+from typing import Optional, Union
 
 from app.api.deps import get_db
 from app.services.kit_service import (
@@ -34,6 +34,7 @@ from app.schemas.kit import (
     KitUpdate,
     KitResponse,
     KitListResponse,
+    KitSummaryListResponse,
     PadAssignmentRequest,
     PadAssignmentResponse,
     PadAssignmentInfo,
@@ -94,16 +95,41 @@ def kit_to_response(kit: Kit) -> KitResponse:
 # Kit CRUD Endpoints
 # ===========================
 
-@router.get("", response_model=KitListResponse)
+@router.get("", response_model=Union[KitListResponse, KitSummaryListResponse])
 async def list_kits(
     skip: int = Query(0, ge=0, description="Number of kits to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Maximum kits to return"),
+    view: str = Query(
+        "full",
+        pattern="^(full|summary)$",
+        description="'summary' returns pad counts and cover info without pad assignments",
+    ),
     db: AsyncSession = Depends(get_db),
 ):
     """List all kits for the user with pagination."""
-    logger.info(f"Listing kits (skip={skip}, limit={limit})")
+    logger.info(f"Listing kits (skip={skip}, limit={limit}, view={view})")
+
+    # Get total count (separate query for accurate pagination)
+    from sqlalchemy import select, func
+    count_query = select(func.count()).select_from(Kit).where(Kit.user_id == DEFAULT_USER_ID)
+    result = await db.execute(count_query)
+    total = result.scalar() or 0
 
     kit_service = KitService()
+    if view == "summary":
+        summaries = await kit_service.get_user_kit_summaries(
+            db=db,
+            user_id=DEFAULT_USER_ID,
+            skip=skip,
+            limit=limit,
+        )
+        return KitSummaryListResponse(
+            kits=summaries,
+            total=total,
+            skip=skip,
+            limit=limit,
+        )
+
     kits = await kit_service.get_user_kits(
         db=db,
         user_id=DEFAULT_USER_ID,
@@ -111,12 +137,6 @@ async def list_kits(
         limit=limit,
     )
 
-    # Get total count (separate query for accurate pagination)
-    from sqlalchemy import select, func
-    count_query = select(func.count()).select_from(Kit).where(Kit.user_id == DEFAULT_USER_ID)
-    result = await db.execute(count_query)
-    total = result.scalar() or 0
-
     # JSON response
     kit_responses = [kit_to_response(kit) for kit in kits]
     return KitListResponse(
@@ -3,6 +3,7 @@ SP-404MK2 Project Builder API Endpoints
 
 Provides REST API for building complete SP-404 projects from kits:
 - POST /from-kit/{kit_id} - Build project from kit with PADCONF.BIN
+- POST /from-kit/{kit_id}/jobs - Queue the build as a background export job
 - GET /download/{export_id} - Download generated project ZIP
 
 Returns:
@@ -14,14 +15,17 @@ import logging
 from pathlib import Path
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from fastapi.responses import FileResponse
-from sqlalchemy import select
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_db
+from app.models.kit import Kit, KitSample
 from app.models.sp404_export import SP404Export
+from app.schemas.sp404_export import ExportJobInfo
 from app.schemas.sp404_project import ProjectBuildRequest, ProjectBuildResult
+from app.services.export_jobs import get_export_job_manager, session_factory_for
 from app.services.sp404_project_builder_service import SP404ProjectBuilderService
 
 logger = logging.getLogger(__name__)
@@ -110,6 +114,47 @@ async def build_project_from_kit(
     return result
 
 
+@router.post(
+    "/from-kit/{kit_id}/jobs",
+    response_model=ExportJobInfo,
+    status_code=status.HTTP_202_ACCEPTED
+)
+async def submit_project_build_job(
+    kit_id: int,
+    request: ProjectBuildRequest,
+    output_base_path: Optional[str] = Query(None, description="Custom export directory"),
+    db: AsyncSession = Depends(get_db)
+) -> ExportJobInfo:
+    """
+    Queue a project build and return its job id immediately.
+
+    Progress (one event per pad) streams from /api/v1/sp404/jobs/{job_id}/events
+    or the job's WebSocket; the finished job's result is a ProjectBuildResult.
+
+    Errors:
+        - 404: Kit not found
+    """
+    kit = await db.get(Kit, kit_id)
+    if not kit:
+        raise HTTPException(status_code=404, detail=f"Kit {kit_id} not found")
+
+    pad_count = await db.scalar(
+        select(func.count()).select_from(KitSample).where(KitSample.kit_id == kit_id)
+    )
+    output_path = Path(output_base_path) if output_base_path else None
+
+    async def run(session, on_result):
+        return await SP404ProjectBuilderService(session).build_project(
+            kit_id=kit_id,
+            request=request,
+            output_base_path=output_path,
+            on_result=on_result
+        )
+
+    job = get_export_job_manager().submit("project", pad_count or 0, run, session_factory_for(db))
+    return job.info()
+
+
 @router.get("/download/{export_id}")
 async def download_project(
     export_id: int,
@@ -132,7 +177,7 @@ async def download_project(
 
     Example:
         GET /api/v1/projects/download/42
-        → Returns: project_name.zip (streaming download)
+        → Returns: project_name_kitN.zip (streaming download)
 
     Errors:
         - 404: Export not found or file doesn't exist
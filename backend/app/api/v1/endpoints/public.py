@@ -1,13 +1,18 @@
 """
 Public endpoints (no auth required) - for development/testing
 """
-from typing import Optional
-from fastapi import APIRouter, Depends, Request, HTTPException, status, UploadFile, File, Form
+from typing import Optional, Union
+from fastapi import APIRouter, Depends, Request, HTTPException, Query, status, UploadFile, File, Form
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_db
 from app.services.sample_service import SampleService
-from app.schemas.sample import SampleCreate, SampleListResponse, Sample
+from app.schemas.sample import (
+    SampleCreate, SampleListResponse, SampleProjectionListResponse, Sample, VibeAnalysisResponse
+)
+from app.core.http_cache import not_modified_response
+from app.core.responses import ORJSONResponse
+from app.api.v1.endpoints.samples import resolve_list_fields, sample_list_validators, set_file_url
 import os
 import json
 from pathlib import Path
@@ -15,8 +20,9 @@ from pathlib import Path
 router = APIRouter()
 
 
-@router.get("/samples/", response_model=SampleListResponse)
+@router.get("/samples/", response_model=Union[SampleListResponse, SampleProjectionListResponse])
 async def list_public_samples(
+    request: Request,
     page: int = 1,
     limit: int = 100,
     search: Optional[str] = None,
@@ -25,9 +31,16 @@ async def list_public_samples(
     bpm_max: Optional[float] = None,
     instrument_type: Optional[str] = None,
     sample_type: Optional[str] = None,
+    view: str = Query("full", pattern="^(full|summary)$"),
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return"),
     db: AsyncSession = Depends(get_db)
 ):
-    """List all samples without authentication (for development)."""
+    """
+    List all samples without authentication (for development).
+
+    `view=summary` or `fields=` return plain column projections. Responds
+    304 when the client's ETag/Last-Modified is still current.
+    """
     if page < 1:
         page = 1
     if limit < 1 or limit > 10000:
@@ -36,28 +49,54 @@ async def list_public_samples(
     skip = (page - 1) * limit
 
     sample_service = SampleService(db)
+    columns = resolve_list_fields(view, fields)
+
+    total, headers, fresh = await sample_list_validators(request, sample_service, None)
+    if fresh:
+        return not_modified_response(headers)
 
     # Get samples with filters (no user_id filter)
-    if search or genre or bpm_min or bpm_max or instrument_type or sample_type:
-        samples = await sample_service.search_samples(
-            user_id=None,  # Show all samples
-            search=search,
-            genre=genre,
-            bpm_min=bpm_min,
-            bpm_max=bpm_max,
-            instrument_type=instrument_type,
-            sample_type=sample_type,
-            skip=skip,
-            limit=limit
-        )
-    else:
-        samples = await sample_service.get_samples(
-            user_id=None,  # Show all samples
-            skip=skip,
-            limit=limit
+    try:
+        if search or genre or bpm_min or bpm_max or instrument_type or sample_type:
+            samples = await sample_service.search_samples(
+                user_id=None,  # Show all samples
+                search=search,
+                genre=genre,
+                bpm_min=bpm_min,
+                bpm_max=bpm_max,
+                instrument_type=instrument_type,
+                sample_type=sample_type,
+                skip=skip,
+                limit=limit,
+                fields=columns,
+                with_relationships=False
+            )
+        else:
+            samples = await sample_service.get_samples(
+                user_id=None,  # Show all samples
+                skip=skip,
+                limit=limit,
+                fields=columns,
+                with_relationships=False
+            )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
         )
 
-    total = await sample_service.count_user_samples(None)
+    pages = (total + limit - 1) // limit
+
+    if columns:
+        for sample in samples:
+            set_file_url(sample, "/api/v1/public/samples")
+        return ORJSONResponse({
+            "items": samples,
+            "total": total,
+            "page": page,
+            "pages": pages,
+            "limit": limit
+        }, headers=headers)
 
     # Convert ORM models to dicts to avoid lazy loading issues with Pydantic
     sample_dicts = []
@@ -67,7 +106,7 @@ async def list_public_samples(
         if sample.extra_metadata and isinstance(sample.extra_metadata, dict):
             vibe_data = sample.extra_metadata.get('vibe_analysis')
             if vibe_data:
-                vibe_analysis = vibe_data
+                vibe_analysis = VibeAnalysisResponse.model_validate(vibe_data).model_dump(mode="json")
 
         # Convert ORM object to dict, handling NULL values
         sample_dict = {
@@ -92,19 +131,15 @@ async def list_public_samples(
         }
         sample_dicts.append(sample_dict)
 
-    # Calculate pages
-    pages = (total + limit - 1) // limit
-    has_more = page < pages
-
-    # Return JSON for API requests - create Sample objects from dicts for Pydantic validation
-    sample_objects = [Sample(**d) for d in sample_dicts]
-    return SampleListResponse(
-        items=sample_objects,
-        total=total,
-        page=page,
-        pages=pages,
-        limit=limit
-    )
+    # Rows come straight from the database in the Sample schema's shape, so
+    # serialize them directly instead of validating every item again
+    return ORJSONResponse({
+        "items": sample_dicts,
+        "total": total,
+        "page": page,
+        "pages": pages,
+        "limit": limit
+    }, headers=headers)
 
 
 @router.post("/samples/", response_model=Sample, status_code=status.HTTP_201_CREATED)
@@ -1,19 +1,33 @@
 """
 Sample management endpoints
 """
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime, timezone
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status, UploadFile, File, Form
+from fastapi.responses import FileResponse, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 import json
+import os
 
 from app.api.deps import get_db, get_current_user
+from app.core.config import settings
+from app.core.http_cache import (
+    IMMUTABLE_CACHE_CONTROL,
+    REVALIDATE_CACHE_CONTROL,
+    cache_headers,
+    file_etag,
+    is_not_modified,
+    make_etag,
+    not_modified_response,
+)
 from app.models.user import User
 from app.schemas.sample import (
     SampleCreate, Sample, SampleUpdate,
-    SampleListResponse, AnalysisRequest, AnalysisResponse
+    SampleListResponse, AnalysisRequest, AnalysisResponse,
+    SampleBulkIds, SampleBulkUpdate, SampleBulkGetResponse, BulkOperationResponse
 )
 from app.schemas.audio_features import AnalysisDebugResponse, BPMDebugInfo, GenreDebugInfo
-from app.services.sample_service import SampleService
+from app.services.sample_service import SampleService, SAMPLE_SUMMARY_FIELDS
 
 router = APIRouter()
 public_router = APIRouter()
@@ -38,6 +52,111 @@ def validate_audio_file(file: UploadFile) -> None:
         )
 
 
+def resolve_list_fields(view: str, fields: Optional[str]) -> Optional[List[str]]:
+    """
+    Work out which columns a list request should select.
+
+    Returns None for the full view. `fields` (comma-separated) takes
+    precedence over `view=summary`; `id` is always included so file URLs
+    can be built.
+    """
+    if fields:
+        requested = [name.strip() for name in fields.split(",") if name.strip()]
+    elif view == "summary":
+        requested = list(SAMPLE_SUMMARY_FIELDS)
+    else:
+        return None
+
+    if "id" not in requested:
+        requested.insert(0, "id")
+    return requested
+
+
+async def sample_list_validators(
+    request: Request,
+    sample_service: SampleService,
+    user_id: Optional[int]
+) -> Tuple[int, Dict[str, str], bool]:
+    """
+    Compute list cache headers before any rows are loaded.
+
+    Returns (total samples, cache headers, whether the client copy is fresh).
+    The ETag covers the sample rows visible to the user plus the query
+    string, so every page/filter combination validates independently.
+    """
+    total, max_id, last_modified = await sample_service.get_list_version(user_id)
+    etag = make_etag(
+        user_id, total, max_id,
+        last_modified.isoformat() if last_modified else "",
+        request.url.query,
+        weak=True
+    )
+    headers = cache_headers(etag, last_modified, REVALIDATE_CACHE_CONTROL)
+    return total, headers, is_not_modified(request, etag, last_modified)
+
+
+def resolve_sample_path(file_path: str) -> str:
+    """Find a sample's audio file on disk, raising 404 if it is missing."""
+    # List of places to look for the file
+    possible_paths = []
+
+    if os.path.isabs(file_path):
+        possible_paths.append(file_path)
+    else:
+        # Try relative to UPLOAD_DIR
+        possible_paths.append(os.path.join(settings.UPLOAD_DIR, file_path))
+
+        # Try relative to project root (parent of backend)
+        project_root = os.path.dirname(os.path.dirname(settings.UPLOAD_DIR))
+        possible_paths.append(os.path.join(project_root, file_path))
+
+    # Find the first path that exists
+    for path in possible_paths:
+        if os.path.exists(path):
+            return path
+
+    raise HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail=f"Sample file not found at any of: {', '.join(possible_paths)}"
+    )
+
+
+def build_download_response(
+    request: Request,
+    title: str,
+    resolved_path: str,
+    cache_control: str
+) -> Response:
+    """
+    FileResponse with immutable caching, or 304 when the client copy matches.
+
+    The file is stat'ed once; the validators come from its size and mtime,
+    so a revalidation never opens the file.
+    """
+    stat_result = os.stat(resolved_path)
+    last_modified = datetime.fromtimestamp(stat_result.st_mtime, tz=timezone.utc)
+    headers = cache_headers(file_etag(stat_result), last_modified, cache_control)
+
+    if is_not_modified(request, headers["ETag"], last_modified):
+        return not_modified_response(headers)
+
+    return FileResponse(
+        path=resolved_path,
+        filename=f"{title}{os.path.splitext(resolved_path)[1]}",
+        media_type="audio/*",
+        headers=headers,
+        stat_result=stat_result
+    )
+
+
+def set_file_url(sample, prefix: str) -> None:
+    """Attach the download URL to an ORM sample or a projected row."""
+    if isinstance(sample, dict):
+        sample["file_url"] = f"{prefix}/{sample['id']}/download"
+    else:
+        sample.file_url = f"{prefix}/{sample.id}/download"
+
+
 @router.post("/", response_model=Sample, status_code=status.HTTP_201_CREATED)
 async def create_sample(
     file: UploadFile = File(...),
@@ -87,16 +206,26 @@ async def create_sample(
 
 @router.get("/")
 async def list_samples(
+    request: Request,
+    response: Response,
     page: int = 1,
     limit: int = 100,
     search: Optional[str] = None,
     genre: Optional[str] = None,
     bpm_min: Optional[float] = None,
     bpm_max: Optional[float] = None,
+    view: str = Query("full", pattern="^(full|summary)$"),
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return"),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    """List user's samples with pagination."""
+    """
+    List user's samples with pagination.
+
+    `view=summary` or `fields=` return plain column projections without
+    relationships, which is much cheaper for large pages. Responds 304 when
+    the client's ETag/Last-Modified is still current.
+    """
     if page < 1:
         page = 1
     if limit < 1 or limit > 10000:
@@ -107,30 +236,42 @@ async def list_samples(
     sample_service = SampleService(db)
 
     user_id = current_user.id
+    columns = resolve_list_fields(view, fields)
+
+    total, headers, fresh = await sample_list_validators(request, sample_service, user_id)
+    if fresh:
+        return not_modified_response(headers)
+    response.headers.update(headers)
 
     # Get samples with filters
-    if search or genre or bpm_min or bpm_max:
-        samples = await sample_service.search_samples(
-            user_id=user_id,
-            search=search,
-            genre=genre,
-            bpm_min=bpm_min,
-            bpm_max=bpm_max,
-            skip=skip,
-            limit=limit
-        )
-    else:
-        samples = await sample_service.get_samples(
-            user_id=user_id,
-            skip=skip,
-            limit=limit
+    try:
+        if search or genre or bpm_min or bpm_max:
+            samples = await sample_service.search_samples(
+                user_id=user_id,
+                search=search,
+                genre=genre,
+                bpm_min=bpm_min,
+                bpm_max=bpm_max,
+                skip=skip,
+                limit=limit,
+                fields=columns
+            )
+        else:
+            samples = await sample_service.get_samples(
+                user_id=user_id,
+                skip=skip,
+                limit=limit,
+                fields=columns
+            )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
         )
 
-    total = await sample_service.count_user_samples(user_id)
-
     # Add file URLs
     for sample in samples:
-        sample.file_url = f"/api/v1/samples/{sample.id}/download"
+        set_file_url(sample, "/api/v1/samples")
 
     # Calculate pages
     pages = (total + limit - 1) // limit
@@ -175,6 +316,80 @@ async def search_samples(
     return samples
 
 
+@router.post("/bulk-get", response_model=SampleBulkGetResponse)
+async def bulk_get_samples(
+    request: SampleBulkIds,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get many samples by ID in one request."""
+    sample_service = SampleService(db)
+
+    samples, not_found = await sample_service.bulk_get_samples(
+        sample_ids=request.sample_ids,
+        user_id=current_user.id
+    )
+
+    # Add file URLs
+    for sample in samples:
+        sample.file_url = f"/api/v1/samples/{sample.id}/download"
+
+    return {"items": samples, "not_found": not_found}
+
+
+@router.post("/bulk-update", response_model=BulkOperationResponse)
+async def bulk_update_samples(
+    update_data: SampleBulkUpdate,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Update metadata, tags and collection membership of many samples at once.
+
+    Samples that don't exist or belong to another user are skipped and
+    reported in `not_found`.
+    """
+    sample_service = SampleService(db)
+
+    try:
+        updated, not_found = await sample_service.bulk_update_samples(
+            update_data=update_data,
+            user_id=current_user.id
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    return {
+        "requested": len(update_data.sample_ids),
+        "affected": len(updated),
+        "not_found": not_found
+    }
+
+
+@router.post("/bulk-delete", response_model=BulkOperationResponse)
+async def bulk_delete_samples(
+    request: SampleBulkIds,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Delete many samples (and their files) at once."""
+    sample_service = SampleService(db)
+
+    deleted, not_found = await sample_service.bulk_delete_samples(
+        sample_ids=request.sample_ids,
+        user_id=current_user.id
+    )
+
+    return {
+        "requested": len(request.sample_ids),
+        "affected": len(deleted),
+        "not_found": not_found
+    }
+
+
 @router.get("/{sample_id}", response_model=Sample)
 async def get_sample(
     sample_id: int,
@@ -338,62 +553,31 @@ async def analyze_sample(
 @router.get("/{sample_id}/download")
 async def download_sample(
     sample_id: int,
+    request: Request,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
-    """Download sample file."""
-    from fastapi.responses import FileResponse
-    import os
-    from app.core.config import settings
-
+    """Download sample file. Supports conditional requests (ETag/Last-Modified)."""
     sample_service = SampleService(db)
 
-    # Get sample
-    sample = await sample_service.get_sample_by_id(
+    # Get sample title and path
+    sample_file = await sample_service.get_sample_file(
         sample_id=sample_id,
         user_id=current_user.id
     )
 
-    if not sample:
+    if not sample_file:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Sample not found"
         )
 
-    # Resolve file path - try multiple possible locations
-    file_path = sample.file_path
-
-    # List of places to look for the file
-    possible_paths = []
-
-    if os.path.isabs(file_path):
-        possible_paths.append(file_path)
-    else:
-        # Try relative to UPLOAD_DIR
-        possible_paths.append(os.path.join(settings.UPLOAD_DIR, file_path))
-
-        # Try relative to project root (parent of backend)
-        project_root = os.path.dirname(os.path.dirname(settings.UPLOAD_DIR))
-        possible_paths.append(os.path.join(project_root, file_path))
-
-    # Find the first path that exists
-    resolved_path = None
-    for path in possible_paths:
-        if os.path.exists(path):
-            resolved_path = path
-            break
-
-    if not resolved_path:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Sample file not found at any of: {', '.join(possible_paths)}"
-        )
+    title, file_path = sample_file
+    resolved_path = resolve_sample_path(file_path)
 
-    # Return file
-    return FileResponse(
-        path=resolved_path,
-        filename=f"{sample.title}{os.path.splitext(resolved_path)[1]}",
-        media_type="audio/*"
+    # Private to the owner, but the bytes behind this URL never change
+    return build_download_response(
+        request, title, resolved_path, f"private, {IMMUTABLE_CACHE_CONTROL}"
     )
 
 
@@ -406,9 +590,11 @@ async def list_samples_public(
     genre: Optional[str] = None,
     bpm_min: Optional[float] = None,
     bpm_max: Optional[float] = None,
+    view: str = Query("full", pattern="^(full|summary)$"),
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return"),
     db: AsyncSession = Depends(get_db),
 ):
-    """List all samples without authentication (public endpoint)."""
+    """List all samples without authentication (public endpoint). Supports `view`/`fields` like list_samples."""
     if page < 1:
         page = 1
     if limit < 1 or limit > 10000:
@@ -418,29 +604,39 @@ async def list_samples_public(
 
     sample_service = SampleService(db)
 
+    columns = resolve_list_fields(view, fields)
+
     # Get samples with filters (all users)
-    if search or genre or bpm_min or bpm_max:
-        samples = await sample_service.search_samples(
-            user_id=None,  # No user filter for public endpoint
-            search=search,
-            genre=genre,
-            bpm_min=bpm_min,
-            bpm_max=bpm_max,
-            skip=skip,
-            limit=limit
-        )
-    else:
-        samples = await sample_service.get_samples(
-            user_id=None,  # No user filter for public endpoint
-            skip=skip,
-            limit=limit
+    try:
+        if search or genre or bpm_min or bpm_max:
+            samples = await sample_service.search_samples(
+                user_id=None,  # No user filter for public endpoint
+                search=search,
+                genre=genre,
+                bpm_min=bpm_min,
+                bpm_max=bpm_max,
+                skip=skip,
+                limit=limit,
+                fields=columns
+            )
+        else:
+            samples = await sample_service.get_samples(
+                user_id=None,  # No user filter for public endpoint
+                skip=skip,
+                limit=limit,
+                fields=columns
+            )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
         )
 
     total = await sample_service.count_all_samples()
 
     # Add file URLs
     for sample in samples:
-        sample.file_url = f"/api/v1/public/samples/{sample.id}/download"
+        set_file_url(sample, "/api/v1/public/samples")
 
     # Calculate pages
     pages = (total + limit - 1) // limit
@@ -459,59 +655,28 @@ async def list_samples_public(
 @public_router.api_route("/{sample_id}/download", methods=["GET", "HEAD"])
 async def download_sample_public(
     sample_id: int,
+    request: Request,
     db: AsyncSession = Depends(get_db)
 ):
     """Download sample file without authentication (public endpoint). Supports both GET and HEAD requests."""
-    from fastapi.responses import FileResponse
-    import os
-    from app.core.config import settings
-
     sample_service = SampleService(db)
 
-    # Get sample (no user filter)
-    sample = await sample_service.get_sample_by_id(
+    # Get sample title and path (no user filter)
+    sample_file = await sample_service.get_sample_file(
         sample_id=sample_id,
         user_id=None  # No user filter for public endpoint
     )
 
-    if not sample:
+    if not sample_file:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Sample not found"
         )
 
-    # Resolve file path - try multiple possible locations
-    file_path = sample.file_path
-
-    # List of places to look for the file
-    possible_paths = []
-
-    if os.path.isabs(file_path):
-        possible_paths.append(file_path)
-    else:
-        # Try relative to UPLOAD_DIR
-        possible_paths.append(os.path.join(settings.UPLOAD_DIR, file_path))
-
-        # Try relative to project root (parent of backend)
-        project_root = os.path.dirname(os.path.dirname(settings.UPLOAD_DIR))
-        possible_paths.append(os.path.join(project_root, file_path))
-
-    # Find the first path that exists
-    resolved_path = None
-    for path in possible_paths:
-        if os.path.exists(path):
-            resolved_path = path
-            break
-
-    if not resolved_path:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Sample file not found at any of: {', '.join(possible_paths)}"
-        )
+    title, file_path = sample_file
+    resolved_path = resolve_sample_path(file_path)
 
-    # Return file (FileResponse handles both GET and HEAD automatically)
-    return FileResponse(
-        path=resolved_path,
-        filename=f"{sample.title}{os.path.splitext(resolved_path)[1]}",
-        media_type="audio/*"
-    )
\ No newline at end of file
+    # FileResponse handles both GET and HEAD automatically
+    return build_download_response(
+        request, title, resolved_path, f"public, {IMMUTABLE_CACHE_CONTROL}"
+    )
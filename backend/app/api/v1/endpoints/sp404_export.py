@@ -3,16 +3,15 @@ SP-404MK2 Export API endpoints.
 
 Provides REST endpoints for exporting samples to SP-404MK2 compatible format.
 """
+import json
 import logging
 from typing import List
 from pathlib import Path
 
-from fastapi import APIRouter, Depends, BackgroundTasks, HTTPException, status
-from fastapi.responses import FileResponse, StreamingResponse
+from fastapi import APIRouter, Depends, BackgroundTasks, HTTPException, status, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-import zipfile
-import io
+from sqlalchemy import func, select
 
 from app.api.deps import get_db
 from app.schemas.sp404_export import (
@@ -20,10 +19,14 @@ from app.schemas.sp404_export import (
     ExportResult,
     BatchExportRequest,
     BatchExportResult,
+    ExportSyncRequest,
+    ExportSyncResult,
+    ExportJobInfo,
 )
 from app.models.sp404_export import SP404Export, SP404ExportSample
 from app.models.sample import Sample
-from app.models.kit import Kit
+from app.models.kit import Kit, KitSample
+from app.services.export_jobs import get_export_job_manager, session_factory_for
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -143,11 +146,7 @@ async def export_batch(
 
         service = SP404ExportService(db)
 
-        # For batches >= 10 samples, use background tasks
-        if len(sample_ids) >= 10:
-            # TODO: Implement background task handling
-            pass
-
+        # Large batches should use POST /samples/export-batch/jobs instead
         # Process batch
         batch_result = await service.export_batch(sample_ids, config, db)
 
@@ -334,6 +333,193 @@ async def export_kit(
         )
 
 
+@router.post(
+    "/samples/export-batch/jobs",
+    response_model=ExportJobInfo,
+    status_code=status.HTTP_202_ACCEPTED
+)
+async def submit_batch_export_job(
+    batch_request: BatchExportRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Queue a batch export and return its job id immediately.
+
+    Follow progress at the returned events_url (SSE) or the job's WebSocket,
+    and fetch the BatchExportResult from status_url when it completes.
+    """
+    sample_ids = batch_request.sample_ids
+    config = batch_request.config
+
+    if not sample_ids:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="sample_ids list cannot be empty"
+        )
+
+    if len(sample_ids) > 1000:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Maximum 1000 samples per batch"
+        )
+
+    from app.services.sp404_export_service import SP404ExportService
+
+    async def run(session, on_result):
+        return await SP404ExportService(session).export_batch(
+            sample_ids, config, session, on_result=on_result
+        )
+
+    job = get_export_job_manager().submit("batch", len(sample_ids), run, session_factory_for(db))
+    return job.info()
+
+
+@router.post(
+    "/kits/{kit_id}/export/jobs",
+    response_model=ExportJobInfo,
+    status_code=status.HTTP_202_ACCEPTED
+)
+async def submit_kit_export_job(
+    kit_id: int,
+    config: ExportConfig,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Queue a kit export and return its job id immediately.
+
+    The finished job's result is a KitExportResult.
+    """
+    kit = await db.get(Kit, kit_id)
+    if not kit:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Kit {kit_id} not found"
+        )
+
+    pad_count = await db.scalar(
+        select(func.count()).select_from(KitSample).where(KitSample.kit_id == kit_id)
+    )
+
+    from app.services.sp404_export_service import SP404ExportService
+
+    async def run(session, on_result):
+        return await SP404ExportService(session).export_kit(
+            kit_id, config, session, on_result=on_result
+        )
+
+    job = get_export_job_manager().submit("kit", pad_count or 0, run, session_factory_for(db))
+    return job.info()
+
+
+@router.get("/jobs/{job_id}", response_model=ExportJobInfo)
+async def get_export_job(job_id: str):
+    """Get the status of an export job, including its result once finished."""
+    job = get_export_job_manager().get(job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Export job {job_id} not found"
+        )
+    return job.info()
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_export_job_events(job_id: str, after: int = -1):
+    """
+    Stream an export job's progress as server-sent events.
+
+    Emits queued/started, one `file` event per exported file, and a final
+    completed/failed event carrying the result. Reconnecting clients can pass
+    the last seen `seq` as `after` to resume.
+    """
+    job = get_export_job_manager().get(job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Export job {job_id} not found"
+        )
+
+    async def event_stream():
+        async for event in job.subscribe(after=after):
+            if event["type"] == "heartbeat":
+                yield ": heartbeat\n\n"
+                continue
+            yield f"id: {event['seq']}\nevent: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.websocket("/jobs/{job_id}/ws")
+async def export_job_websocket(websocket: WebSocket, job_id: str):
+    """WebSocket stream of an export job's progress events (same events as SSE)."""
+    await websocket.accept()
+
+    job = get_export_job_manager().get(job_id)
+    if not job:
+        await websocket.close(code=4004, reason="Export job not found")
+        return
+
+    try:
+        async for event in job.subscribe():
+            await websocket.send_json(event)
+        await websocket.close()
+    except WebSocketDisconnect:
+        pass
+
+
+@router.post("/sync", response_model=ExportSyncResult)
+async def sync_export(
+    sync_request: ExportSyncRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Sync samples or a kit onto a mounted SD card directory.
+
+    Only new or changed files are copied and files from earlier syncs that
+    are no longer exported are deleted. With dry_run the diff is returned
+    without touching the target.
+    """
+    if (sync_request.kit_id is None) == (not sync_request.sample_ids):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Provide either sample_ids or kit_id"
+        )
+
+    target_path = Path(sync_request.target_path)
+    if not target_path.is_dir():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Sync target not found: {sync_request.target_path}"
+        )
+
+    # Import service here to avoid circular dependency issues
+    from app.services.sp404_export_service import SP404ExportService, SP404ExportError
+
+    try:
+        service = SP404ExportService(db)
+        return await service.sync_to_directory(
+            target_path,
+            sync_request.config,
+            sample_ids=sync_request.sample_ids,
+            kit_id=sync_request.kit_id,
+            dry_run=sync_request.dry_run,
+            delete_removed=sync_request.delete_removed,
+            db=db,
+        )
+    except SP404ExportError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except Exception as e:
+        logger.error(f"Export sync to {target_path} failed: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Export sync failed"
+        )
+
+
 @router.get("/exports/{export_id}/download")
 async def download_export(
     export_id: int,
@@ -342,8 +528,10 @@ async def download_export(
     """
     Download completed export as ZIP file.
 
-    Creates ZIP archive of all exported samples and metadata files
-    for easy download and transfer to SP-404MK2.
+    Streams a ZIP archive of all exported samples and metadata files
+    for easy download and transfer to SP-404MK2. The archive is generated
+    while it is sent (audio STORED, text deflated), so large exports start
+    downloading immediately and use constant server memory.
     """
     # Get export record
     stmt = select(SP404Export).where(SP404Export.id == export_id)
@@ -356,47 +544,16 @@ async def download_export(
             detail=f"Export {export_id} not found"
         )
 
-    try:
-        # Import service here to avoid circular dependency issues
-        from app.services.sp404_export_service import SP404ExportService
+    # Import service here to avoid circular dependency issues
+    from app.services.sp404_export_service import SP404ExportService, SP404ExportError
 
+    try:
         service = SP404ExportService(db)
-        zip_path = await service.create_export_zip(export_id, db)
-
-        return FileResponse(
-            path=str(zip_path),
-            media_type='application/zip',
-            filename=f'sp404_export_{export_id}.zip',
-            headers={
-                "Content-Disposition": f"attachment; filename=sp404_export_{export_id}.zip"
-            }
-        )
-
-    except ImportError:
-        # Service not yet implemented - return mock ZIP file
-        logger.warning("SP404ExportService not yet implemented, returning mock ZIP")
-
-        # Create a mock ZIP file in memory
-        zip_buffer = io.BytesIO()
-        with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-            # Add a simple text file to the ZIP
-            zip_file.writestr(
-                "export_info.txt",
-                f"Export ID: {export_id}\n"
-                f"Type: {export_record.export_type}\n"
-                f"Sample Count: {export_record.sample_count}\n"
-                f"Format: {export_record.format}\n"
-                f"Organization: {export_record.organized_by}\n"
-            )
-
-        zip_buffer.seek(0)
-
-        return StreamingResponse(
-            zip_buffer,
-            media_type='application/zip',
-            headers={
-                "Content-Disposition": f"attachment; filename=sp404_export_{export_id}.zip"
-            }
+        archive = await service.create_export_archive(export_record)
+    except SP404ExportError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
         )
     except Exception as e:
         logger.error(f"Download error for export {export_id}: {e}", exc_info=True)
@@ -405,6 +562,18 @@ async def download_export(
             detail="Failed to create download"
         )
 
+    headers = {
+        "Content-Disposition": f"attachment; filename=sp404_export_{export_id}.zip"
+    }
+    if archive.size is not None:
+        headers["Content-Length"] = str(archive.size)
+
+    return StreamingResponse(
+        archive,
+        media_type='application/zip',
+        headers=headers
+    )
+
 
 @router.get("/exports")
 async def list_exports(
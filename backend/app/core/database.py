@@ -1,17 +1,66 @@
 """
 Database configuration and session management
 """
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from typing import Any, Dict
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, AsyncEngine, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import declarative_base
+from sqlalchemy.pool import NullPool
 
 from app.core.config import settings
+from app.core.query_metrics import install_query_listeners
+
+
+def build_engine_kwargs(database_url: str) -> Dict[str, Any]:
+    """
+    Build create_async_engine() keyword arguments from settings.
+
+    Pool sizing only applies to server databases; SQLite picks its own pool
+    class and rejects pool_size/max_overflow. asyncpg additionally gets its
+    prepared-statement cache sizes passed through connect_args.
+    """
+    url = make_url(database_url)
+    kwargs: Dict[str, Any] = {
+        "echo": settings.DB_ECHO,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+    if url.get_backend_name() == "sqlite":
+        return kwargs
+
+    if settings.DB_USE_NULL_POOL:
+        kwargs["poolclass"] = NullPool
+    else:
+        kwargs.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+        )
+
+    if url.get_driver_name() == "asyncpg":
+        kwargs["connect_args"] = {
+            # asyncpg's own per-connection statement cache
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            # SQLAlchemy adapter cache of prepared statements
+            "prepared_statement_cache_size": settings.DB_PREPARED_STATEMENT_CACHE_SIZE,
+        }
+
+    return kwargs
+
+
+def create_engine_from_settings(database_url: str = None) -> AsyncEngine:
+    """Create the application async engine with pool and query metrics configured."""
+    database_url = database_url or settings.DATABASE_URL
+    new_engine = create_async_engine(database_url, **build_engine_kwargs(database_url))
+    if settings.QUERY_METRICS_ENABLED:
+        install_query_listeners(new_engine)
+    return new_engine
+
 
 # Create async engine
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=settings.ENVIRONMENT == "development",
-    future=True
-)
+engine = create_engine_from_settings()
 
 # Create async session factory
 AsyncSessionLocal = async_sessionmaker(
@@ -32,4 +81,4 @@ async def get_db() -> AsyncSession:
         try:
             yield session
         finally:
-            await session.close()
\ No newline at end of file
+            await session.close()
@@ -0,0 +1,118 @@
+"""
+Conditional GET helpers (ETag / Last-Modified / 304 Not Modified).
+
+Validators are derived from data the API already has: file size and mtime
+for audio downloads, and an aggregate "version" of the sample rows for list
+endpoints. Checking them before loading rows or opening files means a
+browser revalidating a cached page costs one cheap query and no disk reads.
+"""
+import hashlib
+import os
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Iterable, Optional
+
+from starlette.requests import Request
+from starlette.responses import Response
+
+# Audio URLs never point at different bytes (new uploads get new samples/paths)
+IMMUTABLE_CACHE_CONTROL = "max-age=31536000, immutable"
+
+# Lists change whenever samples do, so browsers must revalidate every time
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+
+def make_etag(*parts: object, weak: bool = False) -> str:
+    """Build a quoted ETag from arbitrary parts."""
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()[:32]
+    return f'W/"{digest}"' if weak else f'"{digest}"'
+
+
+def file_etag(stat_result: os.stat_result) -> str:
+    """Strong ETag for a file from its size and modification time."""
+    return f'"{stat_result.st_size:x}-{stat_result.st_mtime_ns:x}"'
+
+
+def http_date(value: datetime) -> str:
+    """Format a datetime as an RFC 7231 HTTP-date."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag."""
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def is_not_modified(
+    request: Request,
+    etag: Optional[str] = None,
+    last_modified: Optional[datetime] = None,
+) -> bool:
+    """
+    Decide whether a GET/HEAD request can be answered with 304.
+
+    If-None-Match takes precedence over If-Modified-Since (RFC 7232 §6).
+    """
+    if request.method not in ("GET", "HEAD"):
+        return False
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag is not None and _etag_matches(if_none_match, etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        if last_modified.tzinfo is None:
+            last_modified = last_modified.replace(tzinfo=timezone.utc)
+        # HTTP dates have one-second resolution
+        return last_modified.replace(microsecond=0) <= since
+
+    return False
+
+
+def cache_headers(
+    etag: Optional[str] = None,
+    last_modified: Optional[datetime] = None,
+    cache_control: Optional[str] = None,
+) -> Dict[str, str]:
+    """Validator and Cache-Control headers for a response."""
+    headers = {}
+    if etag:
+        headers["ETag"] = etag
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    if cache_control:
+        headers["Cache-Control"] = cache_control
+    return headers
+
+
+def not_modified_response(headers: Dict[str, str]) -> Response:
+    """Empty 304 response carrying the validators the client should keep."""
+    return Response(status_code=304, headers=headers)
+
+
+def latest(values: Iterable[Optional[datetime]]) -> Optional[datetime]:
+    """Most recent non-null datetime, normalised to UTC."""
+    normalised = [
+        value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+        for value in values
+        if value is not None
+    ]
+    return max(normalised) if normalised else None
@@ -0,0 +1,169 @@
+"""
+Per-request SQL query counting, timing and N+1 detection.
+
+SQLAlchemy cursor events record every statement into a QueryStats object
+held in a ContextVar. QueryMetricsMiddleware opens a fresh QueryStats for
+each HTTP request, then reports it as response headers and log lines.
+Scripts and tests can use track_queries() directly.
+"""
+import logging
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+QUERY_COUNT_HEADER = "X-DB-Query-Count"
+QUERY_TIME_HEADER = "X-DB-Query-Time-Ms"
+REPEATED_STATEMENTS_HEADER = "X-DB-Repeated-Statements"
+
+_STATEMENT_LOG_LENGTH = 200
+
+
+@dataclass
+class QueryStats:
+    """Statements executed within one tracked scope (usually one request)."""
+
+    count: int = 0
+    total_time: float = 0.0
+    statements: Counter = field(default_factory=Counter)
+
+    def record(self, statement: str, elapsed: float) -> None:
+        """Record one executed statement and its wall-clock time in seconds."""
+        self.count += 1
+        self.total_time += elapsed
+        self.statements[statement] += 1
+
+    @property
+    def total_time_ms(self) -> float:
+        return self.total_time * 1000
+
+    def repeated_statements(self, threshold: int) -> List[Tuple[str, int]]:
+        """
+        Return statements executed at least `threshold` times, most frequent first.
+
+        Bound parameters are not part of the statement text, so a loop issuing
+        `SELECT ... WHERE id = ?` once per row shows up here as one entry.
+        """
+        return [
+            (statement, count)
+            for statement, count in self.statements.most_common()
+            if count >= threshold
+        ]
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("db_query_stats", default=None)
+
+
+def get_current_stats() -> Optional[QueryStats]:
+    """Return the QueryStats of the active tracking scope, if any."""
+    return _current_stats.get()
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Collect query statistics for everything executed inside the block."""
+    stats = QueryStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start_times = conn.info.get("query_start_time")
+    if not start_times:
+        return
+    elapsed = time.perf_counter() - start_times.pop()
+
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+
+
+def install_query_listeners(engine: AsyncEngine) -> None:
+    """Attach the counting listeners to an async engine (idempotent)."""
+    sync_engine = engine.sync_engine
+    if event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class QueryMetricsMiddleware:
+    """
+    ASGI middleware reporting per-request query count and time.
+
+    Implemented as plain ASGI (not BaseHTTPMiddleware) so streaming
+    responses are passed through untouched. Headers are attached when the
+    response starts, which for regular endpoints is after all queries ran.
+    """
+
+    def __init__(
+        self,
+        app,
+        detect_n_plus_one: bool = False,
+        n_plus_one_threshold: int = 10,
+        include_headers: bool = True,
+    ):
+        self.app = app
+        self.detect_n_plus_one = detect_n_plus_one
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.include_headers = include_headers
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries() as stats:
+            repeated: List[Tuple[str, int]] = []
+
+            async def send_with_metrics(message):
+                nonlocal repeated
+                if message["type"] == "http.response.start":
+                    if self.detect_n_plus_one:
+                        repeated = stats.repeated_statements(self.n_plus_one_threshold)
+                    if self.include_headers:
+                        headers = list(message.get("headers", []))
+                        headers.append((QUERY_COUNT_HEADER.lower().encode(), str(stats.count).encode()))
+                        headers.append((QUERY_TIME_HEADER.lower().encode(), f"{stats.total_time_ms:.2f}".encode()))
+                        if repeated:
+                            headers.append((
+                                REPEATED_STATEMENTS_HEADER.lower().encode(),
+                                str(len(repeated)).encode()
+                            ))
+                        message = {**message, "headers": headers}
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_metrics)
+            finally:
+                self._log(scope, stats, repeated)
+
+    def _log(self, scope, stats: QueryStats, repeated: List[Tuple[str, int]]) -> None:
+        if stats.count == 0:
+            return
+
+        path = scope.get("path", "")
+        method = scope.get("method", "")
+        logger.debug(
+            f"{method} {path}: {stats.count} queries in {stats.total_time_ms:.1f}ms"
+        )
+
+        for statement, count in repeated:
+            logger.warning(
+                f"Possible N+1 in {method} {path}: statement executed {count} times: "
+                f"{' '.join(statement.split())[:_STATEMENT_LOG_LENGTH]}"
+            )
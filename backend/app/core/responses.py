@@ -0,0 +1,55 @@
+"""
+High-throughput JSON responses for large list endpoints.
+
+Endpoints that return thousands of rows build plain dicts and hand them
+to ORJSONResponse directly, so FastAPI neither re-validates them against
+the response_model nor walks them through jsonable_encoder.
+response_model is still declared on the route for the OpenAPI schema.
+"""
+import json
+from typing import Any
+
+from pydantic import BaseModel
+from starlette.responses import JSONResponse
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+
+def _default(obj: Any) -> Any:
+    """Fallback encoder for types orjson/json do not handle natively."""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if hasattr(obj, "isoformat"):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize content to JSON bytes, using orjson when it is installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(
+            content,
+            default=_default,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_UTC_Z,
+        )
+    return json.dumps(
+        content,
+        default=_default,
+        ensure_ascii=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+class ORJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson (stdlib json fallback)."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
@@ -1,26 +1,19 @@
 """
 Database base configuration
 """
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.pool import NullPool
 
-from app.core.config import settings
+# Share the engine (and therefore its connection pool and query metrics
+# listeners) with app.core.database. Pool size, overflow, pre-ping, recycle
+# and asyncpg statement caching are configured through DB_* settings.
+from app.core.database import engine
 
-# Create async engine with connection pooling configuration
-# NullPool: Let asyncpg handle connection pooling for async operations
-# pool_pre_ping: Verify connections are alive before using them (handles stale connections)
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=False,
-    poolclass=NullPool,
-    pool_pre_ping=True,
-)
 AsyncSessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 Base = declarative_base()
 
 async def get_db():
     async with AsyncSessionLocal() as session:
-        yield session
\ No newline at end of file
+        yield session
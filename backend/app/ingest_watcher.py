@@ -0,0 +1,393 @@
+"""
+Watch-folder ingestion daemon.
+
+Watches UPLOAD_DIR and WATCH_FOLDERS for new audio files and submits them to
+the analysis pipeline: each new file becomes a Sample right away (searchable
+by title within seconds of landing on disk) and gets a "sample.analyze" job,
+which the job queue workers pick up for audio features and vibe analysis.
+
+    python -m app.ingest_watcher
+    python -m app.ingest_watcher --folders ~/Packs,/mnt/crates --user-id 2
+    python -m app.ingest_watcher --poll   # Never use inotify
+    python -m app.ingest_watcher --once   # Ingest what is there, then exit
+
+Changes are detected with inotify (through watchfiles; FSEvents/kqueue on
+macOS) where available, otherwise by polling with the incremental
+CollectionScanner, which only re-lists directories whose mtime changed.
+Either way nothing rescans the whole tree after startup.
+
+A file is ingested once its size and mtime have been stable for
+WATCH_DEBOUNCE_SECONDS, so packs still being copied or extracted are not
+picked up half-written; settled files are inserted up to WATCH_BATCH_SIZE
+per transaction. Files that already have a sample (uploads made through the
+API, earlier imports) are skipped, so the watcher can run next to the API
+and be restarted freely: on startup it ingests whatever arrived while it
+was down.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import signal
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from sqlalchemy import exists, insert, literal, or_, select
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.sample import Sample
+from app.services.job_queue import SessionFactory, enqueue_job
+
+# The collection scanner lives in the repository-level src/ package
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from src.tools.collection_scanner import AUDIO_EXTENSIONS, CollectionScanner, scan_files  # noqa: E402
+
+try:
+    import watchfiles
+    WATCHFILES_AVAILABLE = True
+except ImportError:
+    WATCHFILES_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Seconds between checks of files waiting for their writes to settle
+SETTLE_CHECK_INTERVAL = 0.5
+
+
+class PendingFile(NamedTuple):
+    """A candidate file as last observed."""
+    size: int
+    mtime_ns: int
+    changed_at: float  # When a change was last observed (0 for files found at startup)
+
+
+def is_audio_file(path: str) -> bool:
+    """Audio file by extension; hidden files (e.g. rsync temporaries) are ignored."""
+    name = os.path.basename(path)
+    return not name.startswith(".") and os.path.splitext(name)[1].lower() in AUDIO_EXTENSIONS
+
+
+def sample_title(path: str) -> str:
+    """Title from a filename: "Kick 01 (Artist - Song).wav" -> "Kick 01"."""
+    title = Path(path).stem
+    if "(" in title:
+        title = title.split("(")[0].strip() or title
+    return title
+
+
+def _insert_if_new(row: Dict[str, object]):
+    """INSERT of one sample that does nothing if its file_path already has one."""
+    return insert(Sample).from_select(
+        list(row),
+        select(*(literal(value) for value in row.values())).where(
+            ~exists().where(Sample.file_path == row["file_path"])
+        )
+    )
+
+
+def watch_folders(extra: Optional[str] = None) -> List[str]:
+    """UPLOAD_DIR plus the extra folders (default: WATCH_FOLDERS), as absolute paths."""
+    extra = settings.WATCH_FOLDERS if extra is None else extra
+    folders = []
+    for folder in [settings.UPLOAD_DIR] + extra.split(","):
+        if folder.strip():
+            path = os.path.abspath(os.path.expanduser(folder.strip()))
+            if path not in folders:
+                folders.append(path)
+    return folders
+
+
+async def _wait(stop: asyncio.Event, timeout: float) -> bool:
+    """Sleep up to `timeout` seconds; True if `stop` was set."""
+    try:
+        await asyncio.wait_for(stop.wait(), timeout=timeout)
+        return True
+    except asyncio.TimeoutError:
+        return False
+
+
+class IngestWatcher:
+    """
+    Turns new audio files under the watched folders into samples.
+
+    Candidate files wait in `pending` until their writes settle, then are
+    inserted in batches together with their analysis jobs.
+    """
+
+    def __init__(
+        self,
+        folders: Optional[List[str]] = None,
+        user_id: Optional[int] = None,
+        session_factory: SessionFactory = AsyncSessionLocal,
+        debounce: Optional[float] = None,
+        batch_size: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+        use_inotify: Optional[bool] = None,
+    ):
+        self.folders = [os.path.abspath(f) for f in folders] if folders is not None else watch_folders()
+        self.user_id = user_id if user_id is not None else settings.WATCH_USER_ID
+        self.session_factory = session_factory
+        self.debounce = debounce if debounce is not None else settings.WATCH_DEBOUNCE_SECONDS
+        self.batch_size = batch_size or settings.WATCH_BATCH_SIZE
+        self.poll_interval = poll_interval if poll_interval is not None else settings.WATCH_POLL_INTERVAL
+        use_inotify = settings.WATCH_USE_INOTIFY if use_inotify is None else use_inotify
+        if use_inotify and not WATCHFILES_AVAILABLE:
+            logger.warning("watchfiles not installed; polling for changes")
+        self.use_inotify = use_inotify and WATCHFILES_AVAILABLE
+        self.upload_dir = os.path.abspath(settings.UPLOAD_DIR)
+        self.pending: Dict[str, PendingFile] = {}
+        self.ingested = 0
+        self.skipped = 0
+        self._scanners = {folder: CollectionScanner(folder) for folder in self.folders}
+
+    def owner_of(self, path: str) -> int:
+        """Files in UPLOAD_DIR/<user_id>/ belong to that user, others to `user_id`."""
+        parts = os.path.relpath(path, self.upload_dir).split(os.sep)
+        if len(parts) > 1 and parts[0].isdigit():
+            return int(parts[0])
+        return self.user_id
+
+    def recorded_as(self, path: str) -> List[str]:
+        """
+        Forms a sample's file_path may take for `path`.
+
+        Samples store absolute paths, but uploads made before that stored
+        UPLOAD_DIR as configured (e.g. "./uploads/3/x.wav").
+        """
+        forms = [path]
+        if not os.path.isabs(settings.UPLOAD_DIR) and (
+            path == self.upload_dir or path.startswith(self.upload_dir + os.sep)
+        ):
+            relative = os.path.relpath(path, self.upload_dir)
+            forms.append(settings.UPLOAD_DIR if relative == os.curdir else os.path.join(settings.UPLOAD_DIR, relative))
+        return forms
+
+    def observe(self, paths: Iterable[str], settled: bool = False) -> None:
+        """
+        Track candidate files until their writes settle.
+
+        Args:
+            paths: Changed or new files (non-audio paths are ignored)
+            settled: The files were found at startup rather than reported as
+                changing, so an mtime older than the debounce is enough
+        """
+        changed_at = 0.0 if settled else time.time()
+        for path in paths:
+            if path not in self.pending and is_audio_file(path):
+                self.pending[path] = PendingFile(-1, -1, changed_at)
+
+    def take_settled(self, now: Optional[float] = None) -> List[Tuple[str, int]]:
+        """
+        Remove and return pending files that stopped changing.
+
+        A file has settled when it is non-empty and neither its mtime nor an
+        observed size/mtime change is within the last `debounce` seconds.
+
+        Returns:
+            (path, size) of each settled file
+        """
+        now = time.time() if now is None else now
+        settled = []
+        for path, state in list(self.pending.items()):
+            try:
+                st = os.stat(path)
+            except OSError:
+                # Deleted or renamed before it settled
+                del self.pending[path]
+                continue
+            changed_at = state.changed_at
+            if state.size >= 0 and (st.st_size, st.st_mtime_ns) != (state.size, state.mtime_ns):
+                changed_at = now
+            if st.st_size > 0 and now - max(st.st_mtime_ns / 1e9, changed_at) >= self.debounce:
+                del self.pending[path]
+                settled.append((path, st.st_size))
+            else:
+                self.pending[path] = PendingFile(st.st_size, st.st_mtime_ns, changed_at)
+        return settled
+
+    async def ingest(self, files: List[Tuple[str, int]]) -> int:
+        """
+        Create samples for files that have none and queue their analysis.
+
+        Args:
+            files: (path, size) pairs
+
+        Returns:
+            Number of samples created
+        """
+        created = 0
+        for start in range(0, len(files), self.batch_size):
+            created += await self._ingest_batch(files[start:start + self.batch_size])
+        return created
+
+    async def _ingest_batch(self, files: List[Tuple[str, int]]) -> int:
+        """Insert one batch of samples and their jobs in a single transaction."""
+        async with self.session_factory() as session:
+            paths = [form for path, _ in files for form in self.recorded_as(path)]
+            existing = {os.path.abspath(path) for path in (await session.execute(
+                select(Sample.file_path).where(Sample.file_path.in_(paths))
+            )).scalars()}
+            rows = [
+                {
+                    "user_id": self.owner_of(path),
+                    "title": sample_title(path),
+                    "file_path": path,
+                    "file_size": size,
+                }
+                for path, size in files
+                if path not in existing
+            ]
+            if not rows:
+                self.skipped += len(files)
+                return 0
+
+            # Conditional inserts: a sample created since the lookup (e.g. by an upload) wins
+            created = []
+            for row in rows:
+                result = await session.execute(_insert_if_new(row).returning(Sample.id, Sample.user_id))
+                created.extend(result.all())
+            for sample_id, user_id in created:
+                await enqueue_job(
+                    session, "sample.analyze", {"sample_id": sample_id},
+                    queue="analysis", commit=False, user_id=user_id
+                )
+            await session.commit()
+
+        self.ingested += len(created)
+        self.skipped += len(files) - len(created)
+        logger.info(f"Ingested {len(created)} new samples ({len(files) - len(created)} already imported)")
+        return len(created)
+
+    async def _known_paths(self) -> Set[str]:
+        """File paths of existing samples under the watched folders."""
+        async with self.session_factory() as session:
+            result = await session.execute(
+                select(Sample.file_path).where(or_(*(
+                    Sample.file_path.startswith(os.path.join(form, ""), autoescape=True)
+                    for folder in self.folders
+                    for form in self.recorded_as(folder)
+                )))
+            )
+            return {os.path.abspath(path) for path in result.scalars()}
+
+    async def catch_up(self) -> None:
+        """
+        Queue files that arrived while the watcher was not running.
+
+        Each folder is scanned once (this scan is also the baseline for
+        polling) and only files without a sample become candidates.
+        """
+        if self.upload_dir in self.folders:
+            os.makedirs(self.upload_dir, exist_ok=True)
+        known = await self._known_paths()
+        for folder, scanner in self._scanners.items():
+            if not os.path.isdir(folder):
+                logger.warning(f"Watch folder {folder} does not exist; skipping")
+                continue
+            result = await asyncio.to_thread(scanner.scan)
+            self.observe((path for path in result.files if path not in known), settled=True)
+        if self.pending:
+            logger.info(f"Found {len(self.pending)} files not yet imported")
+
+    async def _poll(self, stop: asyncio.Event) -> None:
+        """Detect changes by rescanning changed directories every poll_interval."""
+        while not await _wait(stop, self.poll_interval):
+            for scanner in self._scanners.values():
+                changes = (await asyncio.to_thread(scanner.scan)).changes
+                self.observe(str(path) for path in changes.added + changes.modified)
+
+    async def _watch(self, stop: asyncio.Event) -> None:
+        """Detect changes from inotify events, falling back to polling on failure."""
+        folders = [folder for folder in self.folders if os.path.isdir(folder)]
+        try:
+            async for changes in watchfiles.awatch(
+                *folders,
+                watch_filter=lambda change, path: is_audio_file(path) or os.path.isdir(path),
+                debounce=200,
+                stop_event=stop,
+            ):
+                for change, path in changes:
+                    if change == watchfiles.Change.deleted:
+                        self.pending.pop(path, None)
+                    elif os.path.isdir(path):
+                        # A directory moved or extracted in: its files may predate our watch on it
+                        self.observe(list(await asyncio.to_thread(scan_files, Path(path))))
+                    else:
+                        self.observe([path])
+        except Exception as e:
+            logger.warning(f"inotify watch failed ({e}); polling every {self.poll_interval:g}s instead")
+            await self._poll(stop)
+
+    async def run(self, stop: asyncio.Event) -> None:
+        """Watch and ingest until `stop` is set."""
+        await self.catch_up()
+        mode = "inotify" if self.use_inotify else f"polling every {self.poll_interval:g}s"
+        logger.info(f"Watching {', '.join(self.folders)} ({mode})")
+
+        detector = asyncio.create_task(self._watch(stop) if self.use_inotify else self._poll(stop))
+        try:
+            while not await _wait(stop, SETTLE_CHECK_INTERVAL):
+                if detector.done():
+                    detector.result()
+                settled = self.take_settled()
+                if not settled:
+                    continue
+                try:
+                    await self.ingest(settled)
+                except Exception as e:
+                    # Database unavailable: keep the files and retry on the next check
+                    logger.error(f"Ingesting {len(settled)} files failed: {e}")
+                    self.observe((path for path, _ in settled), settled=True)
+        finally:
+            detector.cancel()
+        logger.info(f"Watcher stopped ({self.ingested} samples ingested)")
+
+    async def run_once(self) -> int:
+        """Ingest every file without a sample (waiting for writes to settle), then return."""
+        await self.catch_up()
+        created = 0
+        while self.pending:
+            created += await self.ingest(self.take_settled())
+            if self.pending:
+                await asyncio.sleep(SETTLE_CHECK_INTERVAL)
+        return created
+
+
+async def _main(args: argparse.Namespace) -> None:
+    watcher = IngestWatcher(
+        folders=watch_folders(args.folders),
+        user_id=args.user_id,
+        use_inotify=False if args.poll else None,
+    )
+    if args.once:
+        count = await watcher.run_once()
+        logger.info(f"Ingested {count} samples")
+        return
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    await watcher.run(stop)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Ingest new audio files from watched folders")
+    parser.add_argument("--folders", help="Comma-separated folders to watch besides UPLOAD_DIR (default: WATCH_FOLDERS)")
+    parser.add_argument("--user-id", type=int, help="Owner of ingested samples (default: WATCH_USER_ID)")
+    parser.add_argument("--poll", action="store_true", help="Poll for changes instead of using inotify")
+    parser.add_argument("--once", action="store_true", help="Ingest files not yet imported, then exit")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=settings.LOG_LEVEL,
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
+    asyncio.run(_main(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -9,9 +9,15 @@ from contextlib import asynccontextmanager
 import os
 
 from app.core.config import settings
+from app.core.compression import CompressionMiddleware
+from app.core.query_metrics import QueryMetricsMiddleware
 from app.api.v1.api import api_router
 from app.api.v1.websocket import websocket_endpoint
 from app.db import init_models  # Import all models
+from app.services.export_executor import shutdown_export_executor
+from app.services.export_jobs import shutdown_export_jobs
+from app.services.progress_broadcast import shutdown_progress_broadcaster
+from app.worker import start_embedded_worker, stop_embedded_worker
 
 
 @asynccontextmanager
@@ -19,9 +25,15 @@ async def lifespan(app: FastAPI):
     """Manage application lifespan."""
     # Startup
     print("Starting up SP404MK2 Sample Agent API...")
+    if settings.JOB_WORKER_EMBEDDED:
+        start_embedded_worker()
     yield
     # Shutdown
     print("Shutting down...")
+    await stop_embedded_worker()
+    await shutdown_export_jobs()
+    await shutdown_progress_broadcaster()
+    shutdown_export_executor()
 
 
 app = FastAPI(
@@ -40,6 +52,23 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-request SQL query count/time headers and optional N+1 detection
+if settings.QUERY_METRICS_ENABLED:
+    app.add_middleware(
+        QueryMetricsMiddleware,
+        detect_n_plus_one=settings.N_PLUS_ONE_DETECTION,
+        n_plus_one_threshold=settings.N_PLUS_ONE_THRESHOLD,
+    )
+
+# Compress large JSON/HTML responses; audio and zip downloads pass through
+if settings.RESPONSE_COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.RESPONSE_COMPRESSION_MIN_SIZE,
+        gzip_level=settings.RESPONSE_GZIP_LEVEL,
+        brotli_quality=settings.RESPONSE_BROTLI_QUALITY,
+    )
+
 # Custom exception handler to convert Pydantic ValidationError to 400 instead of 422
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
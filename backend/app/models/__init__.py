@@ -19,6 +19,8 @@ from .youtube import (
     YouTubeQuotaUsage
 )
 from .sp404_export import SP404Export, SP404ExportSample
+from .padconf_backup import PadconfBackup, PadconfBackupPad
+from .job import Job, JobStatus
 
 __all__ = [
     "User",
@@ -42,5 +44,9 @@ __all__ = [
     "ChannelCrawlHistory",
     "YouTubeQuotaUsage",
     "SP404Export",
-    "SP404ExportSample"
+    "SP404ExportSample",
+    "PadconfBackup",
+    "PadconfBackupPad",
+    "Job",
+    "JobStatus"
 ]
\ No newline at end of file
@@ -51,6 +51,11 @@ class AudioFeatures(BaseModel):
     zero_crossing_rate: Optional[float] = Field(None, description="Average zero crossing rate")
     rms_energy: Optional[float] = Field(None, description="Average RMS energy")
 
+    # EBU R128 loudness
+    loudness_lufs: Optional[float] = Field(None, description="Integrated loudness (LUFS)")
+    true_peak_dbtp: Optional[float] = Field(None, description="True peak (dBTP)")
+    loudness_range_lu: Optional[float] = Field(None, description="Loudness range (LU)")
+
     # Harmonic/percussive features
     harmonic_ratio: Optional[float] = Field(None, description="Ratio of harmonic to percussive content")
 
@@ -14,6 +14,7 @@ class BatchStatus(str, Enum):
     """Batch processing status"""
     PENDING = "pending"
     PROCESSING = "processing"
+    PAUSED = "paused"
     COMPLETED = "completed"
     FAILED = "failed"
     CANCELLED = "cancelled"
@@ -46,6 +47,10 @@ class Batch(Base):
     started_at = Column(DateTime(timezone=True))
     completed_at = Column(DateTime(timezone=True))
     
+    # Job currently responsible for processing the batch; a job that is no
+    # longer current (the batch was paused and resumed) stops at its next sample
+    job_id = Column(String)
+
     # Results
     cache_dir = Column(String)
     export_path = Column(String)
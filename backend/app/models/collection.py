@@ -40,8 +40,7 @@ class Collection(Base):
     samples = relationship(
         "Sample",
         secondary="collection_samples",
-        back_populates="collections",
-        lazy="selectin"
+        back_populates="collections"
     )
 
     # Self-referential for nested collections
@@ -0,0 +1,68 @@
+"""
+Durable background job model
+"""
+from sqlalchemy import Column, Integer, String, DateTime, JSON, Text, Index, ForeignKey
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+
+
+class JobStatus:
+    """Job lifecycle states"""
+    QUEUED = "queued"  # Waiting (possibly until run_after for a retry)
+    RUNNING = "running"  # Leased by a worker
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"  # Out of attempts
+    CANCELLED = "cancelled"
+
+    FINISHED = (SUCCEEDED, FAILED, CANCELLED)
+
+
+class Job(Base):
+    """
+    One unit of background work (analysis, vibe, batch, export).
+
+    Workers claim a job by taking a lease (lease_owner/lease_expires_at) and
+    renew it with heartbeats. A job whose lease expires without a heartbeat
+    (worker crashed or was redeployed) is claimed again by another worker.
+    """
+    __tablename__ = "jobs"
+
+    id = Column(String, primary_key=True)
+    queue = Column(String, nullable=False, default="default")
+    kind = Column(String, nullable=False)  # Handler name, e.g. "sample.analyze"
+    payload = Column(JSON, default=dict)
+    status = Column(String, nullable=False, default=JobStatus.QUEUED)
+    priority = Column(Integer, nullable=False, default=0)  # Higher runs first
+
+    # User the job was queued for (None for system jobs); only they may see or cancel it
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+
+    # Retries
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    run_after = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    # Lease held by the worker running the job
+    lease_owner = Column(String)
+    lease_expires_at = Column(DateTime(timezone=True))
+    heartbeat_at = Column(DateTime(timezone=True))
+
+    # Outcome
+    result = Column(JSON)
+    last_error = Column(Text)
+
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    started_at = Column(DateTime(timezone=True))
+    finished_at = Column(DateTime(timezone=True))
+
+    __table_args__ = (
+        # Claim query: next runnable job per queue by priority
+        Index("idx_jobs_claim", "queue", "status", "priority", "run_after"),
+        Index("idx_jobs_lease_expires_at", "lease_expires_at"),
+    )
+
+    @property
+    def finished(self) -> bool:
+        return self.status in JobStatus.FINISHED
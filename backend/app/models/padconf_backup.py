@@ -0,0 +1,65 @@
+"""
+Index of PADCONF.BIN files found in SP-404MK2 project backups
+"""
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, BigInteger, Boolean, Index
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+
+
+class PadconfBackup(Base):
+    """One indexed PADCONF.BIN (a project in a backup)"""
+    __tablename__ = "padconf_backups"
+
+    id = Column(Integer, primary_key=True, index=True)
+    path = Column(String, nullable=False, unique=True)
+
+    # File state when indexed; unchanged files are skipped on re-index
+    size_bytes = Column(Integer, nullable=False)
+    mtime_ns = Column(BigInteger, nullable=False)
+
+    # Project header
+    project_name = Column(String, nullable=True)
+    project_bpm = Column(Float, nullable=True)
+    tempo_mode = Column(String, nullable=True)
+    pad_count = Column(Integer, default=0)
+
+    # Why the file could not be read; it is retried once its size or mtime changes
+    error = Column(String, nullable=True)
+
+    indexed_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    pads = relationship(
+        "PadconfBackupPad",
+        back_populates="backup",
+        cascade="all, delete-orphan",
+        passive_deletes=True
+    )
+
+
+class PadconfBackupPad(Base):
+    """A pad with a sample assigned in an indexed PADCONF.BIN"""
+    __tablename__ = "padconf_backup_pads"
+
+    id = Column(Integer, primary_key=True)
+    backup_id = Column(Integer, ForeignKey("padconf_backups.id", ondelete="CASCADE"), nullable=False)
+
+    pad_index = Column(Integer, nullable=False)  # 1-160
+    bank = Column(String(1), nullable=False)  # A-J
+    pad_number = Column(Integer, nullable=False)  # 1-16
+
+    filename = Column(String(24), nullable=False)
+    filename_key = Column(String(24), nullable=False)  # Lowercased for lookups
+
+    bpm = Column(Float, nullable=True)
+    loop = Column(Boolean, default=False)
+    sample_start = Column(BigInteger, default=0)
+    sample_end = Column(BigInteger, default=0)
+
+    backup = relationship("PadconfBackup", back_populates="pads")
+
+    __table_args__ = (
+        Index("idx_padconf_backup_pads_filename_key", "filename_key"),
+        Index("idx_padconf_backup_pads_backup_id", "backup_id"),
+    )
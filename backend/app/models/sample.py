@@ -31,6 +31,11 @@ class Sample(Base):
     genre_confidence = Column(Integer, nullable=True, comment="Genre classification confidence score (0-100)")
     key_confidence = Column(Integer, nullable=True, comment="Musical key detection confidence score (0-100)")
 
+    # EBU R128 loudness, measured at analysis time for gain-matched exports
+    loudness_lufs = Column(Float, nullable=True, comment="Integrated loudness (LUFS)")
+    true_peak_dbtp = Column(Float, nullable=True, comment="True peak (dBTP)")
+    loudness_range_lu = Column(Float, nullable=True, comment="Loudness range (LU)")
+
     # JSON fields for flexible data
     tags = Column(JSON, default=list)
     extra_metadata = Column(JSON, default=dict)  # For additional properties
@@ -38,6 +43,7 @@ class Sample(Base):
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     analyzed_at = Column(DateTime(timezone=True))
     last_accessed_at = Column(DateTime(timezone=True))
     
@@ -57,8 +63,7 @@ class Sample(Base):
     collections = relationship(
         "Collection",
         secondary="collection_samples",
-        back_populates="samples",
-        lazy="selectin"
+        back_populates="samples"
     )
     api_usage = relationship(
         "ApiUsage",
@@ -69,8 +74,7 @@ class Sample(Base):
         "SampleSource",
         back_populates="sample",
         uselist=False,
-        cascade="all, delete-orphan",
-        lazy="selectin"
+        cascade="all, delete-orphan"
     )
 
     # Helper properties
@@ -11,6 +11,7 @@ class BatchStatus(str, Enum):
     """Batch processing status"""
     PENDING = "pending"
     PROCESSING = "processing"
+    PAUSED = "paused"
     COMPLETED = "completed"
     FAILED = "failed"
     CANCELLED = "cancelled"
@@ -80,3 +80,22 @@ class CollectionListResponse(BaseModel):
     """Response schema for paginated collection list."""
     items: list[CollectionResponse]
     total: int
+
+
+class CollectionSummaryResponse(BaseModel):
+    """Column-only collection row for lightweight list views."""
+    id: int
+    name: str
+    parent_collection_id: int | None
+    is_smart: bool
+    sample_count: int
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class CollectionSummaryListResponse(BaseModel):
+    """Response schema for paginated collection summaries."""
+    items: list[CollectionSummaryResponse]
+    total: int
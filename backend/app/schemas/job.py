@@ -0,0 +1,26 @@
+"""
+Background job schemas
+"""
+from typing import Optional, Dict, Any
+from datetime import datetime
+from pydantic import BaseModel
+
+
+class JobResponse(BaseModel):
+    """State of a queued background job"""
+    id: str
+    queue: str
+    kind: str
+    status: str
+    priority: int
+    attempts: int
+    max_attempts: int
+    run_after: Optional[datetime] = None
+    result: Optional[Dict[str, Any]] = None
+    last_error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
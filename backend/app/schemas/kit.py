@@ -108,6 +108,41 @@ class KitListResponse(BaseModel):
     limit: int = Field(..., description="Maximum items returned")
 
 
+class KitCoverInfo(BaseModel):
+    """Sample shown as the kit's cover (its first assigned pad)."""
+
+    sample_id: int = Field(..., description="Sample database ID")
+    title: str = Field(..., description="Sample title")
+    pad_bank: str = Field(..., description="Pad bank of the cover sample")
+    pad_number: int = Field(..., description="Pad number of the cover sample")
+
+
+class KitSummary(BaseModel):
+    """Lightweight kit row for list views (no pad assignments)."""
+
+    id: int = Field(..., description="Kit database ID")
+    user_id: int = Field(..., description="Owner user ID")
+    name: str = Field(..., description="Kit name")
+    description: Optional[str] = Field(None, description="Kit description")
+    is_public: bool = Field(..., description="Whether kit is public")
+    created_at: datetime = Field(..., description="Creation timestamp")
+    updated_at: Optional[datetime] = Field(None, description="Last update timestamp")
+    pad_count: int = Field(..., description="Number of assigned pads")
+    cover: Optional[KitCoverInfo] = Field(None, description="First assigned pad, if any")
+
+    class Config:
+        from_attributes = True
+
+
+class KitSummaryListResponse(BaseModel):
+    """Schema for paginated kit summary list (view=summary)."""
+
+    kits: List[KitSummary] = Field(..., description="List of kit summaries")
+    total: int = Field(..., description="Total number of kits")
+    skip: int = Field(..., description="Number of items skipped")
+    limit: int = Field(..., description="Maximum items returned")
+
+
 # ===========================
 # Pad Assignment Schemas
 # ===========================
@@ -44,6 +44,9 @@ class SampleInDBBase(SampleBase):
     file_path: str
     file_size: Optional[int] = None
     duration: Optional[float] = None
+    loudness_lufs: Optional[float] = Field(None, description="Integrated loudness (LUFS)")
+    true_peak_dbtp: Optional[float] = Field(None, description="True peak (dBTP)")
+    loudness_range_lu: Optional[float] = Field(None, description="Loudness range (LU)")
     created_at: datetime
     analyzed_at: Optional[datetime] = None
     last_accessed_at: Optional[datetime] = None
@@ -73,6 +76,15 @@ class SampleListResponse(BaseModel):
     limit: int
 
 
+class SampleProjectionListResponse(BaseModel):
+    """Paginated sample list for `view=summary`/`fields=` requests (column dicts only)."""
+    items: List[Dict[str, Any]]
+    total: int
+    page: int
+    pages: int
+    limit: int
+
+
 class VibeAnalysisResponse(BaseModel):
     """Schema for vibe analysis results."""
     mood_primary: str
@@ -89,6 +101,45 @@ class VibeAnalysisResponse(BaseModel):
         from_attributes = True
 
 
+MAX_BULK_SAMPLES = 5000
+
+
+class SampleBulkIds(BaseModel):
+    """Request body for bulk operations addressed by sample IDs."""
+    sample_ids: List[int] = Field(..., min_length=1, max_length=MAX_BULK_SAMPLES)
+
+
+class SampleBulkUpdate(SampleBulkIds):
+    """
+    Schema for updating many samples at once.
+
+    Scalar fields that are explicitly set are applied to every sample.
+    `tags` replaces the tag list; `add_tags`/`remove_tags` edit it in place.
+    Collection membership changes only apply to the user's manual collections.
+    """
+    genre: Optional[str] = None
+    bpm: Optional[float] = Field(None, ge=20, le=300)
+    musical_key: Optional[str] = None
+    tags: Optional[List[str]] = None
+    add_tags: List[str] = Field(default_factory=list)
+    remove_tags: List[str] = Field(default_factory=list)
+    add_to_collections: List[int] = Field(default_factory=list)
+    remove_from_collections: List[int] = Field(default_factory=list)
+
+
+class BulkOperationResponse(BaseModel):
+    """Result of a bulk update or delete."""
+    requested: int
+    affected: int
+    not_found: List[int] = Field(default_factory=list)
+
+
+class SampleBulkGetResponse(BaseModel):
+    """Result of fetching many samples by ID."""
+    items: List[Sample]
+    not_found: List[int] = Field(default_factory=list)
+
+
 class AnalysisRequest(BaseModel):
     """Request to analyze a sample."""
     force_reanalyze: bool = False
@@ -102,4 +153,5 @@ class AnalysisResponse(BaseModel):
 
 
 # Update forward reference
-Sample.model_rebuild()
\ No newline at end of file
+Sample.model_rebuild()
+SampleBulkGetResponse.model_rebuild()
\ No newline at end of file
@@ -1,7 +1,8 @@
 """
 SP-404MK2 Export schemas
 """
-from typing import Optional, List
+from datetime import datetime
+from typing import Any, Dict, Optional, List
 from pathlib import Path
 from pydantic import BaseModel, Field, field_validator
 
@@ -10,10 +11,29 @@ class ExportConfig(BaseModel):
     """Configuration for SP-404 export"""
     organize_by: str = Field(default="flat", description="Organization strategy")
     format: str = Field(default="wav", description="Output format")
-    include_metadata: bool = Field(default=True, description="Include metadata files")
+    include_metadata: bool = Field(
+        default=False,
+        description="Also write a metadata .txt sidecar next to each sample"
+    )
+    manifest_format: str = Field(
+        default="json",
+        description="One manifest per batch/kit export covering all samples: json, csv or none"
+    )
     sanitize_filenames: bool = Field(default=True, description="Sanitize filenames")
     output_base_path: Optional[str] = Field(default=None, description="Output directory")
     include_bank_layout: bool = Field(default=False, description="Include bank layout for kits")
+    target_lufs: Optional[float] = Field(
+        default=None,
+        ge=-40.0,
+        le=0.0,
+        description="Gain-match every sample to this integrated loudness (LUFS) using analyzed values"
+    )
+    true_peak_ceiling: float = Field(
+        default=-1.0,
+        ge=-20.0,
+        le=0.0,
+        description="Maximum true peak (dBTP) after loudness gain"
+    )
 
     @field_validator("organize_by")
     @classmethod
@@ -33,6 +53,15 @@ class ExportConfig(BaseModel):
             raise ValueError(f"format must be one of {allowed}")
         return v
 
+    @field_validator("manifest_format")
+    @classmethod
+    def validate_manifest_format(cls, v: str) -> str:
+        """Validate manifest format"""
+        allowed = ["json", "csv", "none"]
+        if v not in allowed:
+            raise ValueError(f"manifest_format must be one of {allowed}")
+        return v
+
 
 class ConversionResult(BaseModel):
     """Result of audio conversion"""
@@ -43,6 +72,7 @@ class ConversionResult(BaseModel):
     converted_sample_rate: int = 48000
     converted_bit_depth: int = 16
     original_duration: Optional[float] = None
+    gain_db: float = 0.0
     error_message: Optional[str] = None
 
     class Config:
@@ -93,6 +123,7 @@ class BatchExportResult(BaseModel):
     average_time_per_sample: float = 0.0
     total_samples: int = 0
     output_base_path: str = ""
+    manifest_path: Optional[str] = Field(None, description="Export manifest file")
     job_id: Optional[int] = Field(None, description="Export job ID for tracking")
     export_id: Optional[int] = Field(None, description="Export record ID")
 
@@ -117,3 +148,48 @@ class KitExportResult(BaseModel):
     total_size_bytes: int = 0
     export_time_seconds: float = 0.0
     errors: List[str] = Field(default_factory=list)
+    manifest_path: Optional[str] = Field(None, description="Export manifest file")
+
+
+class ExportSyncRequest(BaseModel):
+    """Request to sync an export onto a mounted SD card directory"""
+    target_path: str = Field(..., description="Target directory, e.g. the mounted SD card")
+    sample_ids: Optional[List[int]] = Field(default=None, description="Samples to sync")
+    kit_id: Optional[int] = Field(default=None, description="Kit to sync (uses the kit layout)")
+    config: ExportConfig = Field(default_factory=ExportConfig, description="Export configuration")
+    dry_run: bool = Field(default=False, description="Only report what would change")
+    delete_removed: bool = Field(
+        default=True,
+        description="Delete previously synced files that are no longer exported"
+    )
+
+
+class ExportSyncResult(BaseModel):
+    """Diff applied (or, for a dry run, planned) by an export sync"""
+    target_path: str
+    dry_run: bool = False
+    added: List[str] = Field(default_factory=list)
+    replaced: List[str] = Field(default_factory=list)
+    deleted: List[str] = Field(default_factory=list)
+    unchanged_count: int = 0
+    bytes_to_copy: int = 0
+    bytes_copied: int = 0
+    export_errors: List[str] = Field(default_factory=list)
+    duration_seconds: float = 0.0
+
+
+class ExportJobInfo(BaseModel):
+    """Status of a background export job"""
+    job_id: str
+    kind: str = Field(..., description="batch, kit or project")
+    status: str = Field(..., description="queued, running, completed or failed")
+    total: int = Field(0, description="Files the job will produce")
+    completed: int = 0
+    failed: int = 0
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    result: Optional[Dict[str, Any]] = Field(None, description="Export result once finished")
+    error: Optional[str] = None
+    status_url: str
+    events_url: str = Field(..., description="Server-sent events stream of per-file progress")
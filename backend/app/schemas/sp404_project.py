@@ -34,6 +34,18 @@ class ProjectBuildRequest(BaseModel):
         False,
         description="Include bank layout configuration in export"
     )
+    target_lufs: Optional[float] = Field(
+        None,
+        ge=-40.0,
+        le=0.0,
+        description="Gain-match every pad to this integrated loudness (LUFS) using analyzed values"
+    )
+    true_peak_ceiling: float = Field(
+        -1.0,
+        ge=-20.0,
+        le=0.0,
+        description="Maximum true peak (dBTP) after loudness gain"
+    )
 
     @field_validator("project_name")
     @classmethod
@@ -64,6 +76,11 @@ class ProjectBuildResult(BaseModel):
         ge=0,
         description="Number of samples included in project"
     )
+    converted_count: int = Field(
+        0,
+        ge=0,
+        description="Samples converted in this build (the rest were reused from the previous build)"
+    )
     file_size_bytes: int = Field(
         0,
         ge=0,
@@ -8,13 +8,14 @@ available analyzer (Essentia or librosa) with graceful fallback.
 import asyncio
 import logging
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Iterable, Optional, Tuple
 from datetime import datetime, timezone
 
 try:
     import librosa
     import numpy as np
     import scipy.stats as stats
+    from app.utils.loudness import LoudnessResult, measure_loudness
     LIBROSA_AVAILABLE = True
 except ImportError:
     LIBROSA_AVAILABLE = False
@@ -32,6 +33,45 @@ if ESSENTIA_AVAILABLE:
 
 logger = logging.getLogger(__name__)
 
+# Version of each feature's extraction algorithm, recorded per feature in
+# analysis_metadata["analyzers"]. Bump a feature's version when its algorithm
+# changes: the reprocess planner then re-extracts that feature only, and only
+# for samples analyzed with an older version.
+ANALYZER_VERSIONS = {
+    "bpm": 1,
+    "key": 1,
+    "genre": 1,
+    "spectral": 1,
+}
+
+ANALYSIS_FEATURES = tuple(ANALYZER_VERSIONS)
+
+
+def enabled_features() -> Tuple[str, ...]:
+    """
+    Features this installation extracts (and so records analyzer versions for).
+
+    Genre needs Essentia with ENABLE_GENRE_CLASSIFICATION; every other
+    feature is always extracted.
+    """
+    genre = settings.ENABLE_GENRE_CLASSIFICATION and settings.USE_ESSENTIA and ESSENTIA_AVAILABLE
+    return tuple(feature for feature in ANALYSIS_FEATURES if feature != "genre" or genre)
+
+
+def analyzer_record(**analyzers: Optional[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Build analysis_metadata["analyzers"] from the analyzer used per feature.
+
+    Example:
+        >>> analyzer_record(bpm="essentia", key="librosa", genre=None)
+        {'bpm': {'name': 'essentia', 'version': 1}, 'key': {'name': 'librosa', 'version': 1}}
+    """
+    return {
+        feature: {"name": name, "version": ANALYZER_VERSIONS[feature]}
+        for feature, name in analyzers.items()
+        if name is not None
+    }
+
 
 class AudioFeaturesService:
     """
@@ -47,6 +87,7 @@ class AudioFeaturesService:
     - Key detection
     - Spectral features (centroid, rolloff, bandwidth)
     - Temporal features (zero crossing rate, RMS energy)
+    - EBU R128 loudness (integrated LUFS, true peak, loudness range)
     - Genre classification (Essentia only, if enabled)
 
     Configuration:
@@ -142,37 +183,184 @@ class AudioFeaturesService:
             AudioError: If the file doesn't exist, is corrupted, or both
                        analyzers fail
         """
-        # Validate file exists
+        self._validate_file(file_path)
+
+        # Try Essentia first if available
+        if self.analyzer_type == "essentia" and self.essentia_analyzer:
+            try:
+                logger.debug(f"Attempting Essentia analysis for {file_path.name}")
+                features = await self._analyze_with_essentia(file_path)
+                logger.info(f"Successfully analyzed {file_path.name} with Essentia")
+                return features
+
+            except Exception as e:
+                logger.error(
+                    f"Essentia analysis failed for {file_path.name}: {e}. "
+                    f"Falling back to librosa."
+                )
+                # Fall through to librosa fallback
+
+        # Use librosa (either as primary or fallback)
+        return await self._analyze_with_librosa(file_path)
+
+    def _validate_file(self, file_path: Path) -> None:
+        """Raise AudioError if the file is missing or empty."""
         if not file_path.exists():
             raise AudioError(
                 message=f"Audio file not found: {file_path}",
                 file_path=file_path
             )
 
-        # Validate file is not empty
         if file_path.stat().st_size == 0:
             raise AudioError(
                 message=f"Audio file is empty: {file_path}",
                 file_path=file_path
             )
 
-        # Try Essentia first if available
-        if self.analyzer_type == "essentia" and self.essentia_analyzer:
+    def _select_bpm_method(self, file_path: Path) -> str:
+        """Essentia BPM method: ESSENTIA_BPM_METHOD, or chosen by duration for "auto"."""
+        method = settings.ESSENTIA_BPM_METHOD
+        if method == "auto":
             try:
-                logger.debug(f"Attempting Essentia analysis for {file_path.name}")
-                features = await self._analyze_with_essentia(file_path)
-                logger.info(f"Successfully analyzed {file_path.name} with Essentia")
-                return features
+                duration = librosa.get_duration(path=str(file_path))
+            except Exception as e:
+                raise RuntimeError(f"Failed to get audio duration: {e}")
+            method = self.essentia_analyzer.get_recommended_method(duration)
+        return method
+
+    async def analyze_features(self, file_path: Path, features: Iterable[str]) -> AudioFeatures:
+        """
+        Re-extract only some features of an audio file.
+
+        Used by the reprocess planner when a single feature's algorithm
+        changes: a BPM upgrade re-runs BPM detection and nothing else.
+
+        Args:
+            file_path: Path to the audio file
+            features: Names from ANALYSIS_FEATURES ("bpm", "key", "genre", "spectral")
 
+        Returns:
+            AudioFeatures with only the requested features filled in;
+            metadata["analyzers"] lists the features actually extracted
+            (genre is skipped unless Essentia genre classification is enabled)
+
+        Raises:
+            ValueError: If a feature name is unknown
+            AudioError: If the file is missing, empty or cannot be analyzed
+        """
+        features = set(features)
+        unknown = features - set(ANALYSIS_FEATURES)
+        if unknown:
+            raise ValueError(f"Unknown analysis features: {sorted(unknown)}")
+
+        self._validate_file(file_path)
+        metadata: Dict[str, Any] = {"timestamp": datetime.now(timezone.utc).isoformat()}
+        analyzers: Dict[str, Optional[str]] = {}
+        values: Dict[str, Any] = {}
+
+        use_essentia = self.analyzer_type == "essentia" and self.essentia_analyzer is not None
+        if use_essentia and "bpm" in features:
+            try:
+                method = self._select_bpm_method(file_path)
+                bpm_result = await self.essentia_analyzer.analyze_bpm(file_path, method=method)
+                if bpm_result:
+                    values["bpm"] = bpm_result.bpm
+                    values["bpm_confidence"] = min(100, int(bpm_result.confidence * 100))
+                    metadata.update(
+                        bpm_method=method,
+                        bpm_raw=bpm_result.bpm,
+                        bpm_confidence_raw=bpm_result.confidence
+                    )
+                    analyzers["bpm"] = "essentia"
             except Exception as e:
                 logger.error(
-                    f"Essentia analysis failed for {file_path.name}: {e}. "
+                    f"Essentia BPM analysis failed for {file_path.name}: {e}. "
                     f"Falling back to librosa."
                 )
-                # Fall through to librosa fallback
 
-        # Use librosa (either as primary or fallback)
-        return await self._analyze_with_librosa(file_path)
+        if use_essentia and "genre" in features and settings.ENABLE_GENRE_CLASSIFICATION:
+            try:
+                genre_result = await self.essentia_analyzer.analyze_genre(file_path)
+                if genre_result:
+                    values["genre"] = genre_result.primary_genre
+                    values["genre_confidence"] = min(100, int(genre_result.confidence * 100))
+                    metadata.update(
+                        genre=genre_result.primary_genre,
+                        genre_confidence_raw=genre_result.confidence,
+                        sp404_category=genre_result.sp404_category
+                    )
+                    analyzers["genre"] = "essentia"
+            except Exception as e:
+                logger.warning(f"Genre classification failed for {file_path.name}: {e}")
+
+        librosa_features = features & {"key", "spectral"}
+        if "bpm" in features and "bpm" not in analyzers:
+            librosa_features.add("bpm")
+        if librosa_features:
+            if not LIBROSA_AVAILABLE:
+                raise AudioError(
+                    message="librosa library not available. Install with: pip install librosa soundfile",
+                    file_path=file_path
+                )
+            try:
+                extracted = await asyncio.to_thread(
+                    self._extract_features_sync, file_path, librosa_features
+                )
+            except Exception as e:
+                raise AudioError(
+                    message=f"Failed to analyze audio file: {str(e)}",
+                    file_path=file_path,
+                    original_error=e
+                )
+            if "bpm" in librosa_features:
+                metadata["bpm_method"] = "beat_track"
+            values.update(extracted)
+            analyzers.update({feature: "librosa" for feature in librosa_features})
+
+        metadata["analyzers"] = analyzer_record(**analyzers)
+        return AudioFeatures(
+            file_path=file_path,
+            extraction_timestamp=metadata["timestamp"],
+            metadata=metadata,
+            **values
+        )
+
+    def _extract_features_sync(self, file_path: Path, features: set) -> Dict[str, Any]:
+        """Load a file and run the librosa extractors for `features` (runs in a thread)."""
+        y, sr = librosa.load(str(file_path), sr=None, mono=True)
+        values: Dict[str, Any] = {}
+
+        if "bpm" in features:
+            from app.utils.audio_utils import detect_sample_type
+            sample_type = detect_sample_type(file_path)
+            bpm = self._extract_bpm(y, sr, sample_type)
+            values.update(
+                bpm=bpm,
+                bpm_confidence=65 if bpm is not None else None,
+                sample_type=sample_type
+            )
+
+        if "key" in features:
+            values["key"], values["scale"] = self._extract_key(y, sr)
+
+        if "spectral" in features:
+            mfcc_mean, mfcc_std = self._extract_mfcc(y, sr)
+            chroma_mean, chroma_std = self._extract_chroma(y, sr)
+            values.update(
+                spectral_centroid=self._extract_spectral_centroid(y, sr),
+                spectral_bandwidth=self._extract_spectral_bandwidth(y, sr),
+                spectral_rolloff=self._extract_spectral_rolloff(y, sr),
+                spectral_flatness=self._extract_spectral_flatness(y, sr),
+                zero_crossing_rate=self._extract_zero_crossing_rate(y),
+                rms_energy=self._extract_rms_energy(y),
+                harmonic_ratio=self._extract_harmonic_ratio(y, sr),
+                mfcc_mean=mfcc_mean,
+                mfcc_std=mfcc_std,
+                chroma_mean=chroma_mean,
+                chroma_std=chroma_std
+            )
+
+        return values
 
     async def _analyze_with_essentia(self, file_path: Path) -> AudioFeatures:
         """
@@ -198,19 +386,8 @@ class AudioFeaturesService:
         sample_type = detect_sample_type(file_path)
         logger.info(f"Sample type detected: {sample_type} for {file_path.name}")
 
-        # Determine BPM method (config override or auto-select)
-        method = settings.ESSENTIA_BPM_METHOD
-
-        # Get basic file info first (for method selection)
-        try:
-            y, sr = librosa.load(str(file_path), sr=None, mono=True, duration=0.1)
-            duration = librosa.get_duration(path=str(file_path))
-        except Exception as e:
-            raise RuntimeError(f"Failed to get audio duration: {e}")
-
-        # Auto-select method based on duration if not explicitly set
-        if method == "auto":
-            method = self.essentia_analyzer.get_recommended_method(duration)
+        # Determine BPM method (config override or auto-select by duration)
+        method = self._select_bpm_method(file_path)
 
         # Run BPM analysis
         bpm_result = await self.essentia_analyzer.analyze_bpm(
@@ -251,6 +428,7 @@ class AudioFeaturesService:
         spectral_flatness = self._extract_spectral_flatness(y_mono, sr)
         zero_crossing_rate = self._extract_zero_crossing_rate(y_mono)
         rms_energy = self._extract_rms_energy(y_mono)
+        loudness = self._extract_loudness(y, sr)
         harmonic_ratio = self._extract_harmonic_ratio(y_mono, sr)
         mfcc_mean, mfcc_std = self._extract_mfcc(y_mono, sr)
         chroma_mean, chroma_std = self._extract_chroma(y_mono, sr)
@@ -280,6 +458,9 @@ class AudioFeaturesService:
             spectral_flatness=spectral_flatness,
             zero_crossing_rate=zero_crossing_rate,
             rms_energy=rms_energy,
+            loudness_lufs=loudness.integrated_lufs,
+            true_peak_dbtp=loudness.true_peak_dbtp,
+            loudness_range_lu=loudness.loudness_range_lu,
             harmonic_ratio=harmonic_ratio,
             mfcc_mean=mfcc_mean,
             mfcc_std=mfcc_std,
@@ -295,7 +476,13 @@ class AudioFeaturesService:
                 "genre": genre_result.primary_genre if genre_result else None,
                 "genre_confidence_raw": genre_result.confidence if genre_result else None,
                 "sp404_category": genre_result.sp404_category if genre_result else None,
-                "timestamp": datetime.now(timezone.utc).isoformat()
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "analyzers": analyzer_record(
+                    bpm="essentia" if bpm_result else None,
+                    key="librosa",
+                    genre="essentia" if genre_result else None,
+                    spectral="librosa"
+                )
             }
         )
 
@@ -392,6 +579,7 @@ class AudioFeaturesService:
 
             zero_crossing_rate = self._extract_zero_crossing_rate(y_mono)
             rms_energy = self._extract_rms_energy(y_mono)
+            loudness = self._extract_loudness(y, sr)
 
             harmonic_ratio = self._extract_harmonic_ratio(y_mono, sr)
 
@@ -419,6 +607,9 @@ class AudioFeaturesService:
                 spectral_flatness=spectral_flatness,
                 zero_crossing_rate=zero_crossing_rate,
                 rms_energy=rms_energy,
+                loudness_lufs=loudness.integrated_lufs,
+                true_peak_dbtp=loudness.true_peak_dbtp,
+                loudness_range_lu=loudness.loudness_range_lu,
                 harmonic_ratio=harmonic_ratio,
                 mfcc_mean=mfcc_mean,
                 mfcc_std=mfcc_std,
@@ -429,7 +620,8 @@ class AudioFeaturesService:
                     "analyzer": "librosa",
                     "bpm_method": "beat_track",
                     "sample_type": sample_type,
-                    "timestamp": datetime.now(timezone.utc).isoformat()
+                    "timestamp": datetime.now(timezone.utc).isoformat(),
+                    "analyzers": analyzer_record(bpm="librosa", key="librosa", spectral="librosa")
                 }
             )
 
@@ -682,6 +874,20 @@ class AudioFeaturesService:
             logger.warning(f"RMS energy extraction failed: {e}")
             return None
 
+    def _extract_loudness(self, y: np.ndarray, sr: int) -> "LoudnessResult":
+        """
+        Measure EBU R128 loudness on the original channels.
+
+        Args:
+            y: Audio as loaded by librosa (channels first when multichannel)
+            sr: Sample rate
+        """
+        try:
+            return measure_loudness(y.T if y.ndim > 1 else y, sr)
+        except Exception as e:
+            logger.warning(f"Loudness measurement failed: {e}")
+            return LoudnessResult(None, None, None)
+
     def _extract_harmonic_ratio(self, y: np.ndarray, sr: int) -> Optional[float]:
         """
         Extract ratio of harmonic to percussive content.
@@ -739,3 +945,32 @@ class AudioFeaturesService:
         except Exception as e:
             logger.warning(f"Chroma extraction failed: {e}")
             return None, None
+
+
+_worker_service: Optional[AudioFeaturesService] = None
+
+
+def analyze_in_worker(
+    file_path: str,
+    features: Optional[Iterable[str]] = None
+) -> Tuple[Optional[AudioFeatures], Optional[str]]:
+    """
+    Analyze one file in a pool process (batch import and reprocess runs).
+
+    Each process creates its service once. With `features`, only those are
+    re-extracted (see AudioFeaturesService.analyze_features); otherwise the
+    file gets a full analysis.
+
+    Returns:
+        (features, error message) - errors are returned, not raised, so one
+        bad file never stops the run
+    """
+    global _worker_service
+    if _worker_service is None:
+        _worker_service = AudioFeaturesService()
+    try:
+        if features is None:
+            return asyncio.run(_worker_service.analyze_file(Path(file_path))), None
+        return asyncio.run(_worker_service.analyze_features(Path(file_path), features)), None
+    except Exception as e:
+        return None, str(e)
@@ -0,0 +1,119 @@
+"""
+In-memory batch progress with coalesced database writes.
+
+A running batch reports progress far more often than anyone needs it
+persisted: committing the batch row on every event costs thousands of
+commits for a large collection. BatchProgressTracker keeps the latest
+progress in memory, publishes it to watchers through the progress
+broadcaster (at most every PROGRESS_PUBLISH_INTERVAL), and writes it to the
+database only every BATCH_PROGRESS_FLUSH_SECONDS or every
+BATCH_PROGRESS_FLUSH_SAMPLES processed samples (plus once at the end).
+"""
+import logging
+import time
+from typing import Awaitable, Callable, Dict, Optional
+
+from app.core.config import settings
+from app.schemas.batch import BatchProgress, BatchStatus
+from app.services.progress_broadcast import ProgressBroadcaster, get_progress_broadcaster
+
+logger = logging.getLogger(__name__)
+
+FINAL_STATUSES = (BatchStatus.COMPLETED, BatchStatus.FAILED, BatchStatus.CANCELLED)
+
+# Persists a progress snapshot (e.g. updates and commits the batch row)
+FlushCallback = Callable[[BatchProgress], Awaitable[None]]
+
+
+def batch_topic(batch_id: str) -> str:
+    """Broadcaster topic carrying a batch's progress"""
+    return f"batch:{batch_id}"
+
+
+class BatchProgressTracker:
+    """
+    Latest progress of one running batch.
+
+    Example:
+        tracker = BatchProgressTracker(initial, flush=save_to_db)
+        await tracker.update(processed_samples=120, percentage=12.0)
+        await tracker.update(status=BatchStatus.COMPLETED, force_flush=True)
+    """
+
+    def __init__(
+        self,
+        initial: BatchProgress,
+        flush: FlushCallback,
+        flush_interval: Optional[float] = None,
+        flush_every_samples: Optional[int] = None,
+        broadcaster: Optional[ProgressBroadcaster] = None,
+        publish_interval: Optional[float] = None,
+    ):
+        self.state = initial
+        self.flush_count = 0
+        self._flush = flush
+        self.broadcaster = broadcaster or get_progress_broadcaster()
+        self.topic = batch_topic(initial.batch_id)
+        self.publish_interval = (
+            publish_interval if publish_interval is not None else settings.PROGRESS_PUBLISH_INTERVAL
+        )
+        self._published_at: Optional[float] = None
+        self.flush_interval = (
+            flush_interval if flush_interval is not None else settings.BATCH_PROGRESS_FLUSH_SECONDS
+        )
+        self.flush_every_samples = flush_every_samples or settings.BATCH_PROGRESS_FLUSH_SAMPLES
+        self._flushed_at = time.monotonic()
+        self._flushed_samples = initial.processed_samples
+
+    def _flush_due(self) -> bool:
+        return (
+            time.monotonic() - self._flushed_at >= self.flush_interval
+            or self.state.processed_samples - self._flushed_samples >= self.flush_every_samples
+            or self.state.status in FINAL_STATUSES
+        )
+
+    async def update(self, force_flush: bool = False, **fields) -> BatchProgress:
+        """Apply new progress fields, publish and flush if due."""
+        previous_status = self.state.status
+        self.state = self.state.model_copy(update=fields)
+        if force_flush or self._flush_due():
+            await self.flush()
+        if (
+            self.state.status != previous_status
+            or self.state.status in FINAL_STATUSES
+            or self._published_at is None
+            or time.monotonic() - self._published_at >= self.publish_interval
+        ):
+            await self.publish()
+        return self.state
+
+    async def publish(self) -> None:
+        """Send the current snapshot to subscribers (never fails the batch)."""
+        self._published_at = time.monotonic()
+        try:
+            await self.broadcaster.publish(self.topic, self.state.model_dump(mode="json"))
+        except Exception as e:
+            logger.warning(f"Publishing progress for {self.topic} failed: {e}")
+
+    async def flush(self) -> None:
+        """Persist the current snapshot now."""
+        await self._flush(self.state)
+        self.flush_count += 1
+        self._flushed_at = time.monotonic()
+        self._flushed_samples = self.state.processed_samples
+
+
+_trackers: Dict[str, BatchProgressTracker] = {}
+
+
+def register_tracker(batch_id: str, tracker: BatchProgressTracker) -> None:
+    _trackers[batch_id] = tracker
+
+
+def get_tracker(batch_id: str) -> Optional[BatchProgressTracker]:
+    """Tracker of a batch running in this process, if any."""
+    return _trackers.get(batch_id)
+
+
+def unregister_tracker(batch_id: str) -> None:
+    _trackers.pop(batch_id, None)
@@ -1,10 +1,9 @@
 """
 Batch processing service
 """
-import asyncio
 import uuid
 from typing import Optional, List, Dict, Any, AsyncGenerator
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
 import sys
 import os
@@ -24,7 +23,9 @@ else:
         sys.path.append(src_path)
 
 try:
-    from src.tools.sample_batch_processor import SampleBatchProcessor, SampleCollection, ProcessingStatus
+    from src.tools.sample_batch_processor import (
+        SampleBatchProcessor, SampleCollection, ProcessingStatus, CancellationToken
+    )
 except ImportError:
     # Fallback: create stub classes for now
     class ProcessingStatus:
@@ -32,13 +33,29 @@ except ImportError:
         IN_PROGRESS = "in_progress"
         COMPLETED = "completed"
         FAILED = "failed"
+        PAUSED = "paused"
         CANCELLED = "cancelled"
+
+    class CancellationToken:
+        def __init__(self, refresh=None, refresh_interval=2.0):
+            self.cancelled = False
+            self.paused = False
+
+        def pause(self):
+            self.paused = True
+
+        def resume(self):
+            self.paused = False
+
+        def cancel(self):
+            self.cancelled = True
     
     class SampleCollection:
         def __init__(self, **kwargs):
             self.total_samples = kwargs.get('total_samples', 0)
             self.processed_samples = kwargs.get('processed_samples', 0)
             self.progress_percentage = 0
+            self.status = kwargs.get('status', ProcessingStatus.COMPLETED)
             self.metadata = {}
     
     class SampleBatchProcessor:
@@ -47,7 +64,7 @@ except ImportError:
             self.cache_dir = cache_dir
             self.processing_results = []
         
-        async def process_collection(self, progress_callback):
+        async def process_collection(self, progress_callback, token=None):
             # Stub implementation
             collection = SampleCollection(total_samples=0, processed_samples=0)
             if progress_callback:
@@ -57,12 +74,23 @@ except ImportError:
         def export_results(self):
             return Path(self.cache_dir) / "export.json"
 
+from app.core.config import settings
 from app.models.batch import Batch, BatchStatus
 from app.models.user import User
 from app.schemas.batch import (
     BatchCreate, BatchResponse, BatchProgress, 
     BatchListResponse, BatchUpdate
 )
+from app.services.batch_progress import (
+    FINAL_STATUSES, BatchProgressTracker, batch_topic, get_tracker, register_tracker, unregister_tracker
+)
+from app.services.progress_broadcast import get_progress_broadcaster
+
+
+# Pause/cancel tokens of batches running in this process. Control requests
+# handled by the same process take effect at the next sample; batches running
+# in another worker pick up the status change when their token refreshes.
+_batch_tokens: Dict[str, CancellationToken] = {}
 
 
 class BatchService:
@@ -71,7 +99,6 @@ class BatchService:
     def __init__(self, db: AsyncSession):
         self.db = db
         self._active_processors: Dict[str, SampleBatchProcessor] = {}
-        self._progress_queues: Dict[str, asyncio.Queue] = {}
     
     async def create_batch(
         self, 
@@ -109,54 +136,112 @@ class BatchService:
         await self.db.refresh(batch)
         
         return batch
+
+    async def enqueue_processing(self, batch_id: str, priority: int = 0) -> str:
+        """Queue a batch for processing by a job worker; returns the job id"""
+        from app.services.job_queue import enqueue_job
+
+        batch = await self.get_batch_by_id(batch_id)
+        # A job whose worker dies is claimed again once its lease expires and
+        # continues the same batch (same cache_dir) from its checkpoints
+        job = await enqueue_job(
+            self.db,
+            "batch.process",
+            {"batch_id": batch_id},
+            queue="batch",
+            priority=priority,
+            commit=False,
+            user_id=batch.user_id if batch else None,
+        )
+        if batch:
+            batch.job_id = job.id
+        await self.db.commit()
+        return job.id
     
-    async def process_batch(self, batch_id: str):
-        """Process a batch job (runs in background)"""
+    async def process_batch(self, batch_id: str, job_id: Optional[str] = None):
+        """
+        Process a batch job (run by the "batch.process" job handler).
+
+        Pausing stops processing after the sample in progress and returns, so
+        the job finishes and frees its queue slot; resuming queues a new job
+        that continues from the per-sample checkpoints in the batch's
+        cache_dir. `job_id` identifies the calling job: a job that is no
+        longer the batch's current one does nothing.
+        """
         # Get batch from database
         batch = await self.get_batch_by_id(batch_id)
-        if not batch:
+        if not batch or batch.status not in [BatchStatus.PENDING, BatchStatus.PROCESSING]:
+            # Finished, cancelled, or paused before it started (resume queues a new job)
             return
-        
+        if job_id and batch.job_id and batch.job_id != job_id:
+            return
+
+        token = CancellationToken(
+            refresh=self._control_refresher(batch_id, job_id),
+            refresh_interval=settings.BATCH_CONTROL_POLL_SECONDS
+        )
+        _batch_tokens[batch_id] = token
+
         try:
             # Update status to processing
             batch.status = BatchStatus.PROCESSING
-            batch.started_at = datetime.utcnow()
+            batch.started_at = batch.started_at or datetime.utcnow()
             await self.db.commit()
             
-            # Create processor
+            # Create processor (its cache dir holds per-sample checkpoints,
+            # so a resumed or re-run batch skips completed samples)
             processor = SampleBatchProcessor(
                 collection_path=batch.collection_path,
                 cache_dir=batch.cache_dir
             )
             self._active_processors[batch_id] = processor
             
-            # Create progress queue
-            progress_queue = asyncio.Queue()
-            self._progress_queues[batch_id] = progress_queue
+            # Progress lives in memory; the batch row is only written on coalesced flushes
+            async def persist_progress(progress: BatchProgress):
+                batch.total_samples = progress.total_samples
+                batch.processed_samples = progress.processed_samples
+                await self.db.commit()
+
+            tracker = BatchProgressTracker(self._snapshot(batch), flush=persist_progress)
+            register_tracker(batch_id, tracker)
             
             # Process with progress callback
             async def progress_callback(collection: SampleCollection):
-                # Update database
-                batch.total_samples = collection.total_samples
-                batch.processed_samples = collection.processed_samples
-                await self.db.commit()
-                
-                # Send progress update
-                progress = BatchProgress(
-                    batch_id=batch_id,
-                    status=BatchStatus.PROCESSING,
+                await tracker.update(
                     total_samples=collection.total_samples,
                     processed_samples=collection.processed_samples,
-                    success_count=batch.success_count,
-                    error_count=batch.error_count,
                     percentage=collection.progress_percentage,
                     current_sample=collection.metadata.get("current_sample"),
                     eta_minutes=self._calculate_eta(batch, collection)
                 )
-                await progress_queue.put(progress)
             
             # Run processing
-            collection = await processor.process_collection(progress_callback)
+            collection = await processor.process_collection(progress_callback, token=token)
+
+            if collection.status == ProcessingStatus.CANCELLED:
+                # Stopped between samples: cancelled, paused or superseded
+                status, current_job = (await self.db.execute(
+                    select(Batch.status, Batch.job_id).where(Batch.id == batch_id)
+                )).one()
+                if job_id and current_job != job_id:
+                    return
+                if status == BatchStatus.PAUSED:
+                    await tracker.update(
+                        status=BatchStatus.PAUSED,
+                        total_samples=collection.total_samples,
+                        processed_samples=collection.processed_samples,
+                        message="Processing paused",
+                        force_flush=True
+                    )
+                    return
+                batch.completed_at = datetime.utcnow()
+                await tracker.update(
+                    status=BatchStatus.CANCELLED,
+                    total_samples=collection.total_samples,
+                    processed_samples=collection.processed_samples,
+                    message="Processing cancelled"
+                )
+                return
             
             # Export results
             export_path = processor.export_results()
@@ -174,20 +259,17 @@ class BatchService:
                 errors.extend(result.errors)
             batch.error_log = errors
             
-            await self.db.commit()
-            
-            # Send completion progress
-            final_progress = BatchProgress(
-                batch_id=batch_id,
+            # Final flush commits the completed batch
+            await tracker.update(
                 status=BatchStatus.COMPLETED,
-                total_samples=batch.total_samples,
-                processed_samples=batch.processed_samples,
+                total_samples=collection.total_samples,
+                processed_samples=collection.processed_samples,
                 success_count=batch.success_count,
                 error_count=batch.error_count,
                 percentage=100.0,
+                eta_minutes=None,
                 message="Processing completed successfully"
             )
-            await progress_queue.put(final_progress)
             
         except Exception as e:
             # Update batch as failed
@@ -197,25 +279,19 @@ class BatchService:
             await self.db.commit()
             
             # Send failure progress
-            if batch_id in self._progress_queues:
-                error_progress = BatchProgress(
-                    batch_id=batch_id,
+            tracker = get_tracker(batch_id)
+            if tracker:
+                await tracker.update(
                     status=BatchStatus.FAILED,
-                    total_samples=batch.total_samples,
-                    processed_samples=batch.processed_samples,
-                    success_count=batch.success_count,
-                    error_count=batch.error_count,
-                    percentage=batch.progress_percentage,
                     message=f"Processing failed: {str(e)}"
                 )
-                await self._progress_queues[batch_id].put(error_progress)
         
         finally:
             # Cleanup
+            _batch_tokens.pop(batch_id, None)
+            unregister_tracker(batch_id)
             if batch_id in self._active_processors:
                 del self._active_processors[batch_id]
-            if batch_id in self._progress_queues:
-                del self._progress_queues[batch_id]
     
     async def import_results_to_samples(self, batch_id: str) -> int:
         """Import batch processing results into samples table"""
@@ -339,70 +415,149 @@ class BatchService:
         if not batch:
             return False
         
-        if batch.status not in [BatchStatus.PENDING, BatchStatus.PROCESSING]:
+        if batch.status not in [BatchStatus.PENDING, BatchStatus.PROCESSING, BatchStatus.PAUSED]:
             return False
         
-        # Update status
+        # Update status; the running processor stops at its next checkpoint
         batch.status = BatchStatus.CANCELLED
         batch.completed_at = datetime.utcnow()
         await self.db.commit()
+
+        token = _batch_tokens.get(batch_id)
+        if token:
+            token.cancel()
         
-        # TODO: Implement actual cancellation of running process
-        # For now, just mark as cancelled in DB
-        
         return True
+
+    async def pause_batch(self, batch_id: str, user_id: int) -> bool:
+        """
+        Pause a pending or running batch between samples.
+
+        The running job stops after the sample in progress and finishes, so
+        a paused batch does not hold a worker or the batch queue's slot.
+        """
+        batch = await self.get_batch(batch_id, user_id)
+        if not batch or batch.status not in [BatchStatus.PENDING, BatchStatus.PROCESSING]:
+            return False
+
+        batch.status = BatchStatus.PAUSED
+        await self.db.commit()
+
+        token = _batch_tokens.get(batch_id)
+        if token:
+            token.cancel()
+
+        return True
+
+    async def resume_batch(self, batch_id: str, user_id: int) -> bool:
+        """Resume a paused batch from its last completed sample (queues a new job)"""
+        batch = await self.get_batch(batch_id, user_id)
+        if not batch or batch.status != BatchStatus.PAUSED:
+            return False
+
+        batch.status = BatchStatus.PENDING
+        await self.enqueue_processing(batch_id)
+        return True
+
+    async def retry_batch(self, batch_id: str, user_id: int) -> bool:
+        """
+        Run a failed or cancelled batch again.
+
+        The batch keeps its id and cache_dir, so samples completed before it
+        stopped are not processed again.
+        """
+        batch = await self.get_batch(batch_id, user_id)
+        if not batch or batch.status not in [BatchStatus.FAILED, BatchStatus.CANCELLED]:
+            return False
+
+        batch.status = BatchStatus.PENDING
+        batch.completed_at = None
+        await self.enqueue_processing(batch_id)
+        return True
+
+    def _control_refresher(self, batch_id: str, job_id: Optional[str] = None):
+        """
+        Token refresh hook applying control changes made by other processes.
+
+        The token is stopped when the batch is cancelled or paused, or when
+        another job has taken it over.
+        """
+        async def refresh(token: CancellationToken):
+            status, current_job = (await self.db.execute(
+                select(Batch.status, Batch.job_id).where(Batch.id == batch_id)
+            )).one()
+            superseded = job_id is not None and current_job != job_id
+            if superseded or status in [BatchStatus.CANCELLED, BatchStatus.PAUSED]:
+                token.cancel()
+        return refresh
     
     async def watch_progress(self, batch_id: str) -> AsyncGenerator[BatchProgress, None]:
-        """Watch progress updates for a batch"""
-        if batch_id not in self._progress_queues:
-            # Batch might be completed or not started
-            batch = await self.get_batch_by_id(batch_id)
-            if batch:
-                yield BatchProgress(
-                    batch_id=batch_id,
-                    status=batch.status,
-                    total_samples=batch.total_samples,
-                    processed_samples=batch.processed_samples,
-                    success_count=batch.success_count,
-                    error_count=batch.error_count,
-                    percentage=batch.progress_percentage,
-                    message=f"Batch is {batch.status.value}"
-                )
-            return
-        
-        # Stream progress updates
-        queue = self._progress_queues[batch_id]
-        while True:
-            try:
-                progress = await asyncio.wait_for(queue.get(), timeout=30.0)
+        """
+        Watch progress updates for a batch.
+
+        Every watcher has its own subscription to the batch's broadcaster
+        topic, so any number of tabs (in any API process, with the Postgres
+        backend) see every update.
+
+        Raises:
+            SlowConsumerError: If the watcher fell too far behind and was evicted
+        """
+        broadcaster = get_progress_broadcaster()
+        async with broadcaster.subscribe(batch_topic(batch_id)) as subscription:
+            # Subscribe first so nothing published after the snapshot is missed
+            progress = await self._current_progress(batch_id)
+            if progress is None:
+                return
+            yield progress
+            
+            while progress.status not in FINAL_STATUSES:
+                message = await subscription.get(timeout=30.0)
+                if message is None:
+                    # Heartbeat
+                    progress = await self._current_progress(batch_id)
+                    if progress is None:
+                        return
+                    if progress.status not in FINAL_STATUSES:
+                        progress = progress.model_copy(update={"message": "Processing..."})
+                else:
+                    progress = BatchProgress(**message)
                 yield progress
-                
-                # Stop if completed/failed/cancelled
-                if progress.status in [BatchStatus.COMPLETED, BatchStatus.FAILED, BatchStatus.CANCELLED]:
-                    break
-                    
-            except asyncio.TimeoutError:
-                # Send heartbeat
-                batch = await self.get_batch_by_id(batch_id)
-                if batch:
-                    yield BatchProgress(
-                        batch_id=batch_id,
-                        status=batch.status,
-                        total_samples=batch.total_samples,
-                        processed_samples=batch.processed_samples,
-                        success_count=batch.success_count,
-                        error_count=batch.error_count,
-                        percentage=batch.progress_percentage,
-                        message="Processing..."
-                    )
+
+    async def _current_progress(self, batch_id: str) -> Optional[BatchProgress]:
+        """Live progress if the batch runs in this process, else its stored row"""
+        tracker = get_tracker(batch_id)
+        if tracker is not None:
+            return tracker.state
+        batch = await self.get_batch_by_id(batch_id)
+        if not batch:
+            return None
+        await self.db.refresh(batch)
+        return self._snapshot(batch)
+
+    def _snapshot(self, batch: Batch) -> BatchProgress:
+        """Progress of a batch as stored in its row"""
+        return BatchProgress(
+            batch_id=batch.id,
+            status=batch.status,
+            total_samples=batch.total_samples or 0,
+            processed_samples=batch.processed_samples or 0,
+            success_count=batch.success_count or 0,
+            error_count=batch.error_count or 0,
+            percentage=batch.progress_percentage,
+            message=f"Batch is {BatchStatus(batch.status).value}"
+        )
     
     def _calculate_eta(self, batch: Batch, collection: SampleCollection) -> float:
         """Calculate estimated time remaining in minutes"""
-        if batch.processed_samples == 0:
+        # The batch row is only flushed periodically; the collection is current
+        if collection.processed_samples == 0:
             return 0
         
-        elapsed = (datetime.utcnow() - batch.started_at).total_seconds()
-        rate = batch.processed_samples / elapsed  # samples per second
+        now = datetime.utcnow()
+        if batch.started_at.tzinfo is not None:
+            now = now.replace(tzinfo=timezone.utc)
+        elapsed = (now - batch.started_at).total_seconds()
+        rate = collection.processed_samples / elapsed  # samples per second
         
         if rate > 0:
             remaining = collection.total_samples - collection.processed_samples
@@ -94,13 +94,7 @@ class CollectionService:
         if not include_smart:
             query = query.where(Collection.is_smart == False)
 
-        # Get total count
-        count_query = select(func.count(Collection.id)).where(Collection.user_id == user_id)
-        if not include_smart:
-            count_query = count_query.where(Collection.is_smart == False)
-
-        total_result = await self.db.execute(count_query)
-        total = total_result.scalar() or 0
+        total = await self._count_collections(user_id, include_smart)
 
         # Get paginated results
         query = query.order_by(Collection.created_at.desc()).offset(skip).limit(limit)
@@ -109,6 +103,43 @@ class CollectionService:
 
         return collections, total
 
+    async def list_collection_summaries(
+        self,
+        user_id: int,
+        skip: int = 0,
+        limit: int = 50,
+        include_smart: bool = True
+    ) -> tuple[list[dict[str, Any]], int]:
+        """List collections as column-only rows (no ORM objects or relationships)."""
+        query = select(
+            Collection.id,
+            Collection.name,
+            Collection.parent_collection_id,
+            Collection.is_smart,
+            Collection.sample_count,
+            Collection.updated_at,
+        ).where(Collection.user_id == user_id)
+
+        if not include_smart:
+            query = query.where(Collection.is_smart == False)
+
+        total = await self._count_collections(user_id, include_smart)
+
+        query = query.order_by(Collection.created_at.desc()).offset(skip).limit(limit)
+        result = await self.db.execute(query)
+        rows = [dict(row) for row in result.mappings().all()]
+
+        return rows, total
+
+    async def _count_collections(self, user_id: int, include_smart: bool) -> int:
+        """Count a user's collections for pagination."""
+        count_query = select(func.count(Collection.id)).where(Collection.user_id == user_id)
+        if not include_smart:
+            count_query = count_query.where(Collection.is_smart == False)
+
+        total_result = await self.db.execute(count_query)
+        return total_result.scalar() or 0
+
     # UPDATE
     async def update_collection(
         self,
@@ -0,0 +1,268 @@
+"""
+Parallel audio conversion executor for SP-404MK2 exports.
+
+Conversions (decode → resample → 16-bit write) are CPU-bound, so exports fan
+them out to a bounded process pool instead of converting one file at a time
+on a single thread. Results are yielded as each file finishes so callers can
+stream progress while the rest of the batch is still running.
+
+Jobs are checked against the rendition cache first; only misses reach the
+pool, and their output is added to the cache for the next export.
+"""
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterable, Optional, Tuple
+
+try:
+    from app.utils.resampling import DEFAULT_QUALITY, convert_file
+    AUDIO_LIBS_AVAILABLE = True
+except ImportError:
+    DEFAULT_QUALITY = "balanced"
+    AUDIO_LIBS_AVAILABLE = False
+
+from app.core.config import settings
+from app.schemas.sp404_export import ConversionResult
+from app.services.rendition_cache import RenditionSpec, gain_normalization, get_rendition_cache
+
+logger = logging.getLogger(__name__)
+
+
+def convert_audio_file(
+    input_path: Path,
+    output_path: Path,
+    format: str,
+    target_sample_rate: int = 48000,
+    quality: str = DEFAULT_QUALITY,
+    gain_db: float = 0.0,
+) -> ConversionResult:
+    """
+    Convert one audio file to 16-bit PCM at the target sample rate.
+
+    Module-level so it can run in a worker process.
+
+    Args:
+        input_path: Input audio file
+        output_path: Output file path
+        format: Output format (wav/aiff)
+        target_sample_rate: Output sample rate in Hz
+        quality: Resampling preset (fast, balanced, archival)
+        gain_db: Gain applied in the same pass (loudness normalization)
+
+    Returns:
+        ConversionResult with conversion details
+    """
+    # Ensure output directory exists
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    # Write beside the target and swap it in, so an existing output that is a
+    # hardlink into the rendition cache is replaced rather than overwritten
+    temp_path = output_path.with_name(f".{output_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+    try:
+        # Decode → resample (all channels at once) → gain → 16-bit write, block by block
+        converted = convert_file(
+            input_path,
+            temp_path,
+            target_sample_rate,
+            format=format,
+            subtype='PCM_16',
+            quality=quality,
+            gain_db=gain_db,
+        )
+        os.replace(temp_path, output_path)
+    finally:
+        temp_path.unlink(missing_ok=True)
+
+    return ConversionResult(
+        success=True,
+        output_path=output_path,
+        original_format=input_path.suffix.lower(),
+        original_sample_rate=converted.original_sample_rate,
+        original_duration=converted.original_duration,
+        converted_sample_rate=target_sample_rate,
+        gain_db=gain_db,
+    )
+
+
+def _run_conversion(
+    input_path: Path,
+    output_path: Path,
+    format: str,
+    target_sample_rate: int,
+    quality: str = DEFAULT_QUALITY,
+    gain_db: float = 0.0,
+) -> Tuple[ConversionResult, float]:
+    """Worker entry point: convert and time one file, never raising."""
+    start = time.perf_counter()
+    try:
+        result = convert_audio_file(
+            input_path, output_path, format, target_sample_rate, quality, gain_db
+        )
+    except Exception as e:
+        result = ConversionResult(
+            success=False,
+            output_path=None,
+            original_format=input_path.suffix.lower(),
+            original_sample_rate=0,
+            original_duration=0.0,
+            error_message=str(e),
+        )
+    return result, time.perf_counter() - start
+
+
+@dataclass
+class ConversionJob:
+    """One file to convert. `key` identifies the job to the caller."""
+    key: Any
+    input_path: Path
+    output_path: Path
+    format: str
+    target_sample_rate: int = 48000
+    quality: str = field(default_factory=lambda: settings.EXPORT_RESAMPLE_QUALITY)
+    gain_db: float = 0.0
+    context: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def spec(self) -> RenditionSpec:
+        """Rendition cache spec for this job's output settings."""
+        return RenditionSpec(
+            format=self.format,
+            sample_rate=self.target_sample_rate,
+            quality=self.quality,
+            normalization=gain_normalization(self.gain_db),
+        )
+
+
+@dataclass
+class ConversionOutcome:
+    """Result of a ConversionJob, yielded as soon as the file is done."""
+    job: ConversionJob
+    result: ConversionResult
+    elapsed_seconds: float
+    cached: bool = False
+
+
+class ExportExecutor:
+    """
+    Bounded pool that runs conversion jobs in parallel.
+
+    Uses worker processes by default (spawned, so they are safe to start
+    from a threaded server); falls back to threads when process pools are
+    disabled or unavailable.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, use_processes: bool = True):
+        self.max_workers = max_workers or min(os.cpu_count() or 1, 8)
+        self.use_processes = use_processes
+        self._executor: Optional[Executor] = None
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.use_processes:
+                try:
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                    )
+                except (OSError, NotImplementedError) as e:
+                    logger.warning(f"Process pool unavailable ({e}), converting in threads")
+                    self.use_processes = False
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="sp404-export",
+                )
+            logger.info(
+                f"Export executor started: {self.max_workers} "
+                f"{'processes' if self.use_processes else 'threads'}"
+            )
+        return self._executor
+
+    async def convert_all(
+        self,
+        jobs: Iterable[ConversionJob],
+    ) -> AsyncIterator[ConversionOutcome]:
+        """
+        Convert jobs in parallel, yielding outcomes in completion order.
+
+        At most 2 × max_workers conversions are submitted at once so a huge
+        export does not queue every file in the pool up front. Cache hits are
+        materialized on a thread without touching the pool.
+        """
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        semaphore = asyncio.Semaphore(self.max_workers * 2)
+        cache = get_rendition_cache()
+
+        async def run(job: ConversionJob) -> ConversionOutcome:
+            async with semaphore:
+                key = None
+                if cache is not None:
+                    start = time.perf_counter()
+                    key, hit = await asyncio.to_thread(
+                        cache.fetch, job.input_path, job.spec, job.output_path
+                    )
+                    if hit is not None:
+                        return ConversionOutcome(
+                            job=job,
+                            result=hit,
+                            elapsed_seconds=time.perf_counter() - start,
+                            cached=True,
+                        )
+
+                result, elapsed = await loop.run_in_executor(
+                    executor,
+                    _run_conversion,
+                    job.input_path,
+                    job.output_path,
+                    job.format,
+                    job.target_sample_rate,
+                    job.quality,
+                    job.gain_db,
+                )
+                if key is not None and result.success:
+                    await asyncio.to_thread(cache.store, key, job.spec, job.output_path, result)
+            return ConversionOutcome(job=job, result=result, elapsed_seconds=elapsed)
+
+        tasks = [asyncio.ensure_future(run(job)) for job in jobs]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def shutdown(self) -> None:
+        """Stop worker processes/threads."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+_export_executor: Optional[ExportExecutor] = None
+
+
+def get_export_executor() -> ExportExecutor:
+    """Process-wide executor shared by all exports."""
+    global _export_executor
+    if _export_executor is None:
+        _export_executor = ExportExecutor(
+            max_workers=settings.EXPORT_MAX_WORKERS or None,
+            use_processes=settings.EXPORT_USE_PROCESS_POOL,
+        )
+    return _export_executor
+
+
+def shutdown_export_executor() -> None:
+    """Shut down the shared executor (application shutdown)."""
+    global _export_executor
+    if _export_executor is not None:
+        _export_executor.shutdown()
+        _export_executor = None
@@ -0,0 +1,269 @@
+"""
+Background export jobs.
+
+Batch, kit and project exports can take minutes, which is longer than a proxy
+will hold an HTTP request open. Instead of converting inside the request, the
+export endpoints submit a job here and return its id immediately. The job runs
+on the event loop with its own database session (the conversions themselves
+already run on the shared export executor), and every finished file is
+published as an event that clients follow over SSE or WebSocket.
+
+Events are kept in a per-job history and each subscriber reads it with its own
+cursor, so a client that connects late, or reconnects, replays everything it
+missed and a slow client never holds up the job. Finished jobs and their
+results are kept for EXPORT_JOB_RETENTION_SECONDS.
+"""
+import asyncio
+import logging
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set
+
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.schemas.sp404_export import ExportJobInfo, ExportResult
+
+logger = logging.getLogger(__name__)
+
+# Runs the export with the job's session and a per-file progress callback
+JobRunner = Callable[[AsyncSession, Callable[[ExportResult], None]], Awaitable[BaseModel]]
+SessionFactory = Callable[[], AsyncSession]
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+
+FINISHED_STATES = {JOB_COMPLETED, JOB_FAILED}
+
+# Seconds without an event before subscribers get a heartbeat
+HEARTBEAT_SECONDS = 15.0
+
+
+def session_factory_for(db: AsyncSession) -> SessionFactory:
+    """Session factory bound to the same engine as a request's session."""
+    return async_sessionmaker(db.bind, class_=AsyncSession, expire_on_commit=False)
+
+
+class ExportJob:
+    """One submitted export and its event history."""
+
+    def __init__(self, kind: str, total: int):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.total = total
+        self.status = JOB_QUEUED
+        self.completed = 0
+        self.failed = 0
+        self.created_at = datetime.now(timezone.utc)
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self.finished_monotonic: Optional[float] = None
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.events: List[dict] = []
+        self._closed = False  # Set once the final event is in the history
+        self._changed = asyncio.Condition()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATES
+
+    def info(self) -> ExportJobInfo:
+        return ExportJobInfo(
+            job_id=self.id,
+            kind=self.kind,
+            status=self.status,
+            total=self.total,
+            completed=self.completed,
+            failed=self.failed,
+            created_at=self.created_at,
+            started_at=self.started_at,
+            finished_at=self.finished_at,
+            result=self.result,
+            error=self.error,
+            status_url=f"/api/v1/sp404/jobs/{self.id}",
+            events_url=f"/api/v1/sp404/jobs/{self.id}/events",
+        )
+
+    async def publish(self, event_type: str, **data: Any) -> None:
+        """Append an event to the history and wake subscribers."""
+        event = {
+            "type": event_type,
+            "job_id": self.id,
+            "seq": len(self.events),
+            "status": self.status,
+            "completed": self.completed,
+            "failed": self.failed,
+            "total": self.total,
+            **data,
+        }
+        async with self._changed:
+            self.events.append(event)
+            self._closed = event_type in FINISHED_STATES
+            self._changed.notify_all()
+
+    async def subscribe(
+        self,
+        after: int = -1,
+        heartbeat: float = HEARTBEAT_SECONDS,
+    ) -> AsyncIterator[dict]:
+        """
+        Yield events with seq > `after` until the job finishes.
+
+        Yields a `heartbeat` event whenever nothing happened for `heartbeat`
+        seconds so proxies keep the connection open.
+        """
+        cursor = after + 1
+        while True:
+            async with self._changed:
+                if cursor >= len(self.events) and not self._closed:
+                    try:
+                        await asyncio.wait_for(self._changed.wait(), timeout=heartbeat)
+                    except asyncio.TimeoutError:
+                        pass
+                pending = self.events[cursor:]
+                done = self._closed
+
+            if not pending and not done:
+                yield {"type": "heartbeat", "job_id": self.id, "status": self.status}
+            for event in pending:
+                yield event
+            cursor += len(pending)
+            if done and cursor >= len(self.events):
+                return
+
+
+class ExportJobManager:
+    """
+    In-process registry and runner for export jobs.
+
+    At most `max_concurrent` jobs run at once; further jobs stay queued.
+    """
+
+    def __init__(self, max_concurrent: int, retention_seconds: int):
+        self.max_concurrent = max(1, max_concurrent)
+        self.retention_seconds = retention_seconds
+        self._jobs: Dict[str, ExportJob] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _slots(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+            self._loop = loop
+        return self._semaphore
+
+    def submit(
+        self,
+        kind: str,
+        total: int,
+        runner: JobRunner,
+        session_factory: SessionFactory,
+    ) -> ExportJob:
+        """
+        Queue an export and return immediately.
+
+        Args:
+            kind: Job kind (batch, kit, project)
+            total: Number of files the export will produce
+            runner: Coroutine function running the export
+            session_factory: Creates the job's own database session
+
+        Returns:
+            The queued ExportJob
+        """
+        self._prune()
+        job = ExportJob(kind, total)
+        self._jobs[job.id] = job
+        task = asyncio.create_task(self._run(job, runner, session_factory))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        logger.info(f"Queued {kind} export job {job.id} ({total} files)")
+        return job
+
+    def get(self, job_id: str) -> Optional[ExportJob]:
+        return self._jobs.get(job_id)
+
+    async def _run(self, job: ExportJob, runner: JobRunner, session_factory: SessionFactory) -> None:
+        await job.publish("queued")
+
+        async def on_result(result: ExportResult) -> None:
+            if result.success:
+                job.completed += 1
+            else:
+                job.failed += 1
+            await job.publish("file", result=result.model_dump(mode="json"))
+
+        async with self._slots():
+            job.status = JOB_RUNNING
+            job.started_at = datetime.now(timezone.utc)
+            await job.publish("started")
+            try:
+                async with session_factory() as session:
+                    result = await runner(session, on_result)
+                job.result = result.model_dump(mode="json")
+                if getattr(result, "success", True) is False:
+                    job.status = JOB_FAILED
+                    job.error = getattr(result, "error_message", None) or "Export failed"
+                else:
+                    job.status = JOB_COMPLETED
+            except asyncio.CancelledError:
+                job.status = JOB_FAILED
+                job.error = "Export cancelled"
+                raise
+            except Exception as e:
+                logger.error(f"Export job {job.id} failed: {e}", exc_info=True)
+                job.status = JOB_FAILED
+                job.error = str(e)
+            finally:
+                job.finished_at = datetime.now(timezone.utc)
+                job.finished_monotonic = time.monotonic()
+                await job.publish(job.status, result=job.result, error=job.error)
+
+        logger.info(
+            f"Export job {job.id} {job.status}: "
+            f"{job.completed} completed, {job.failed} failed"
+        )
+
+    def _prune(self) -> None:
+        """Forget finished jobs older than the retention period."""
+        cutoff = time.monotonic() - self.retention_seconds
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished_monotonic is not None and job.finished_monotonic < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    async def shutdown(self) -> None:
+        """Cancel running jobs (called on application shutdown)."""
+        for task in list(self._tasks):
+            task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+
+_export_job_manager: Optional[ExportJobManager] = None
+
+
+def get_export_job_manager() -> ExportJobManager:
+    """Process-wide export job manager."""
+    global _export_job_manager
+    if _export_job_manager is None:
+        _export_job_manager = ExportJobManager(
+            settings.EXPORT_JOB_MAX_CONCURRENT,
+            settings.EXPORT_JOB_RETENTION_SECONDS,
+        )
+    return _export_job_manager
+
+
+async def shutdown_export_jobs() -> None:
+    """Cancel running export jobs if the manager was ever used."""
+    if _export_job_manager is not None:
+        await _export_job_manager.shutdown()
@@ -0,0 +1,348 @@
+"""
+Incremental sync of an export tree onto an SP-404MK2 SD card.
+
+Instead of copying the whole export every time, the target directory keeps a
+manifest (`.sp404_sync.json`) recording, for every file this tool put there,
+its content hash plus the size/mtime of both the source it came from and the
+copy on the card. A sync compares the export against that manifest and only
+copies new or changed files, replaces files whose content differs and deletes
+files it previously synced that are no longer part of the export. Files on
+the card that the manifest does not know about are never deleted.
+
+Unchanged files are recognised from size and mtime alone, so a sync after a
+small edit reads only the files that actually changed.
+
+Syncs of samples and kits go one step further (plan_keyed_sync): each file
+to publish is identified by the rendition cache key of its source and
+conversion settings, recorded in the manifest as `source_key`. The diff is
+worked out from those keys before anything is rendered, so only added or
+changed files are converted and a dry run converts nothing.
+"""
+import hashlib
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from app.schemas.sp404_export import ExportSyncResult
+from app.services.rendition_cache import hash_file
+
+logger = logging.getLogger(__name__)
+
+SYNC_MANIFEST_NAME = ".sp404_sync.json"
+SYNC_MANIFEST_VERSION = 1
+
+
+@dataclass
+class SyncPlan:
+    """What a sync will do. Paths are relative to the source/target roots."""
+    add: List[str] = field(default_factory=list)
+    replace: List[str] = field(default_factory=list)
+    delete: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+    bytes_to_copy: int = 0
+    # Manifest entries for files that need no copy
+    entries: Dict[str, dict] = field(default_factory=dict)
+    # Content hashes computed while planning, reused when copying
+    hashes: Dict[str, str] = field(default_factory=dict)
+    # Manifest entries of files planned for replacement
+    previous: Dict[str, dict] = field(default_factory=dict)
+
+    def skip(self, relative: str) -> None:
+        """Drop a planned copy (e.g. its render failed), keeping any earlier copy tracked."""
+        for planned in (self.add, self.replace):
+            if relative in planned:
+                planned.remove(relative)
+        if relative in self.previous:
+            self.entries[relative] = self.previous.pop(relative)
+
+
+def _load_manifest(target_dir: Path) -> Dict[str, dict]:
+    try:
+        manifest = json.loads((target_dir / SYNC_MANIFEST_NAME).read_text())
+    except (OSError, ValueError):
+        return {}
+    if manifest.get("version") != SYNC_MANIFEST_VERSION:
+        return {}
+    return manifest.get("files", {})
+
+
+def _save_manifest(target_dir: Path, files: Dict[str, dict]) -> None:
+    manifest_path = target_dir / SYNC_MANIFEST_NAME
+    temp_path = manifest_path.with_name(manifest_path.name + ".tmp")
+    temp_path.write_text(json.dumps({"version": SYNC_MANIFEST_VERSION, "files": files}))
+    os.replace(temp_path, manifest_path)
+
+
+def _scan(root: Path) -> Dict[str, os.stat_result]:
+    """Relative POSIX path -> stat for every regular file under root."""
+    found = {}
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(Path(entry.path))
+                elif entry.is_file(follow_symlinks=False):
+                    relative = Path(entry.path).relative_to(root).as_posix()
+                    if relative != SYNC_MANIFEST_NAME:
+                        found[relative] = entry.stat()
+    return found
+
+
+def _copy_with_hash(source_path: Path, target_path: Path) -> str:
+    """Copy a file, hashing it on the way so it is only read once."""
+    digest = hashlib.sha256()
+    with open(source_path, "rb") as src, open(target_path, "wb") as dst:
+        for chunk in iter(lambda: src.read(1024 * 1024), b""):
+            digest.update(chunk)
+            dst.write(chunk)
+    return digest.hexdigest()
+
+
+def _stat(path: Path) -> Optional[os.stat_result]:
+    try:
+        return path.stat()
+    except FileNotFoundError:
+        return None
+
+
+def _target_intact(recorded: Optional[dict], target_stat: Optional[os.stat_result]) -> bool:
+    """The card copy is the one the manifest recorded."""
+    return (
+        recorded is not None
+        and target_stat is not None
+        and recorded["size"] == target_stat.st_size
+        and recorded["mtime_ns"] == target_stat.st_mtime_ns
+    )
+
+
+def _plan_removals(plan: SyncPlan, manifest: Dict[str, dict], published, delete: bool) -> None:
+    removed = sorted(relative for relative in manifest if relative not in published)
+    if delete:
+        plan.delete = removed
+    else:
+        # Keep tracking them so a later sync with delete enabled can remove them
+        plan.entries.update({relative: manifest[relative] for relative in removed})
+
+
+def _entry(source_stat: os.stat_result, target_stat: os.stat_result, content_hash: str) -> dict:
+    return {
+        "hash": content_hash,
+        "size": target_stat.st_size,
+        "mtime_ns": target_stat.st_mtime_ns,
+        "source_size": source_stat.st_size,
+        "source_mtime_ns": source_stat.st_mtime_ns,
+    }
+
+
+def plan_sync(source_dir: Path, target_dir: Path, delete: bool = True) -> SyncPlan:
+    """
+    Compare an export tree with a target directory.
+
+    Args:
+        source_dir: Export tree to publish
+        target_dir: Mounted SD card directory
+        delete: Remove previously synced files that are no longer exported
+
+    Returns:
+        SyncPlan describing the copies and deletions needed
+    """
+    manifest = _load_manifest(target_dir)
+    sources = _scan(source_dir)
+    plan = SyncPlan()
+
+    for relative, source_stat in sorted(sources.items()):
+        target_path = target_dir / relative
+        recorded = manifest.get(relative)
+        target_stat = _stat(target_path)
+        target_intact = _target_intact(recorded, target_stat)
+        source_known = (
+            recorded is not None
+            and recorded["source_size"] == source_stat.st_size
+            and recorded["source_mtime_ns"] == source_stat.st_mtime_ns
+        )
+
+        if target_intact and source_known:
+            plan.unchanged.append(relative)
+            plan.entries[relative] = recorded
+            continue
+
+        if target_stat is None:
+            plan.add.append(relative)
+            plan.bytes_to_copy += source_stat.st_size
+            continue
+
+        # Something moved: compare content before copying
+        source_hash = plan.hashes[relative] = hash_file(source_dir / relative)
+        if target_intact:
+            target_hash = recorded["hash"]
+        elif target_stat.st_size == source_stat.st_size:
+            target_hash = hash_file(target_path)
+        else:
+            target_hash = None
+
+        if target_hash == source_hash:
+            plan.unchanged.append(relative)
+            plan.entries[relative] = _entry(source_stat, target_stat, source_hash)
+        else:
+            plan.replace.append(relative)
+            plan.bytes_to_copy += source_stat.st_size
+
+    _plan_removals(plan, manifest, sources, delete)
+    return plan
+
+
+def plan_keyed_sync(
+    sources: Dict[str, str],
+    target_dir: Path,
+    delete: bool = True,
+) -> SyncPlan:
+    """
+    Compare files identified by source key with a target directory.
+
+    Nothing needs to exist on the source side yet: a file is unchanged when
+    the manifest recorded the same source key for it and the card copy still
+    has the recorded size and mtime. Any other existing file is replaced.
+
+    Args:
+        sources: Relative target path -> source key of the file to publish
+        target_dir: Mounted SD card directory
+        delete: Remove previously synced files that are no longer published
+
+    Returns:
+        SyncPlan; bytes_to_copy is left for the caller to fill in
+    """
+    manifest = _load_manifest(target_dir)
+    plan = SyncPlan()
+
+    for relative, source_key in sorted(sources.items()):
+        recorded = manifest.get(relative)
+        target_stat = _stat(target_dir / relative)
+        if target_stat is None:
+            plan.add.append(relative)
+        elif (
+            recorded is not None
+            and recorded.get("source_key") == source_key
+            and _target_intact(recorded, target_stat)
+        ):
+            plan.unchanged.append(relative)
+            plan.entries[relative] = recorded
+        else:
+            plan.replace.append(relative)
+        if recorded is not None and relative not in plan.entries:
+            plan.previous[relative] = recorded
+
+    _plan_removals(plan, manifest, sources, delete)
+    return plan
+
+
+def apply_sync(
+    plan: SyncPlan,
+    source_dir: Path,
+    target_dir: Path,
+    source_keys: Optional[Dict[str, str]] = None,
+) -> int:
+    """
+    Carry out a sync plan and update the target manifest.
+
+    Args:
+        plan: Plan from plan_sync or plan_keyed_sync
+        source_dir: Directory holding the files to copy
+        target_dir: Mounted SD card directory
+        source_keys: Source key to record for each copied file
+
+    Returns:
+        Bytes copied
+    """
+    files = dict(plan.entries)
+    copied = 0
+
+    for relative in plan.add + plan.replace:
+        source_path = source_dir / relative
+        target_path = target_dir / relative
+        target_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Copy then rename so an interrupted sync never leaves a torn file
+        temp_path = target_path.with_name(f".{target_path.name}.sync.tmp")
+        content_hash = _copy_with_hash(source_path, temp_path)
+        os.replace(temp_path, target_path)
+
+        source_stat = source_path.stat()
+        files[relative] = _entry(source_stat, target_path.stat(), content_hash)
+        if source_keys and relative in source_keys:
+            files[relative]["source_key"] = source_keys[relative]
+        copied += source_stat.st_size
+
+    for relative in plan.delete:
+        target_path = target_dir / relative
+        try:
+            target_path.unlink()
+        except FileNotFoundError:
+            pass
+        # Drop directories the deletion emptied
+        parent = target_path.parent
+        while parent != target_dir:
+            try:
+                parent.rmdir()
+            except OSError:
+                break
+            parent = parent.parent
+
+    _save_manifest(target_dir, files)
+    return copied
+
+
+def sync_directory(
+    source_dir: Path,
+    target_dir: Path,
+    dry_run: bool = False,
+    delete: bool = True,
+) -> ExportSyncResult:
+    """
+    Mirror an export tree onto a target directory, copying only changes.
+
+    Args:
+        source_dir: Export tree to publish
+        target_dir: Mounted SD card directory (must exist)
+        dry_run: Only report the diff, change nothing
+        delete: Remove previously synced files that are no longer exported
+
+    Returns:
+        ExportSyncResult with the diff and bytes copied
+    """
+    start = time.perf_counter()
+    plan = plan_sync(source_dir, target_dir, delete=delete)
+    copied = 0 if dry_run else apply_sync(plan, source_dir, target_dir)
+    return sync_result(plan, target_dir, dry_run, copied, time.perf_counter() - start)
+
+
+def sync_result(
+    plan: SyncPlan,
+    target_dir: Path,
+    dry_run: bool,
+    copied: int,
+    duration_seconds: float,
+) -> ExportSyncResult:
+    """Log a finished (or planned) sync and describe it as an ExportSyncResult."""
+    logger.info(
+        f"{'Dry-run ' if dry_run else ''}sync -> {target_dir}: "
+        f"{len(plan.add)} added, {len(plan.replace)} replaced, "
+        f"{len(plan.delete)} deleted, {len(plan.unchanged)} unchanged"
+    )
+
+    return ExportSyncResult(
+        target_path=str(target_dir),
+        dry_run=dry_run,
+        added=plan.add,
+        replaced=plan.replace,
+        deleted=plan.delete,
+        unchanged_count=len(plan.unchanged),
+        bytes_to_copy=plan.bytes_to_copy,
+        bytes_copied=copied,
+        duration_seconds=duration_seconds,
+    )
@@ -159,6 +159,11 @@ class HybridAnalysisService:
                 if audio_features.duration_seconds:
                     sample.duration = audio_features.duration_seconds
 
+                # Save loudness so exports can gain-match without decoding again
+                sample.loudness_lufs = audio_features.loudness_lufs
+                sample.true_peak_dbtp = audio_features.true_peak_dbtp
+                sample.loudness_range_lu = audio_features.loudness_range_lu
+
                 # Save analysis metadata
                 if audio_features.metadata:
                     sample.analysis_metadata = audio_features.metadata
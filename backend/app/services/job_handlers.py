@@ -0,0 +1,52 @@
+"""
+Job handlers for the durable job queue.
+
+Importing this module registers every job kind with app.services.job_queue.
+Each handler receives a session of its own (opened by the worker) and the
+job payload, and returns a JSON-serializable result. Raising marks the
+attempt failed; the queue retries it with backoff while attempts remain.
+"""
+import logging
+from typing import Any, Dict
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services.job_queue import job_handler
+
+logger = logging.getLogger(__name__)
+
+
+@job_handler("sample.vibe", queue="vibe")
+async def run_vibe_analysis(db: AsyncSession, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """AI vibe analysis of one sample (queued by SampleService.analyze_sample)."""
+    from app.services.sample_service import SampleService
+
+    service = SampleService(db)
+    sample = await service.get_sample_by_id(payload["sample_id"], user_id=None)
+    if not sample:
+        raise ValueError(f"Sample {payload['sample_id']} not found")
+    await service._perform_analysis(sample, payload.get("job_id", ""))
+    return {"sample_id": sample.id}
+
+
+@job_handler("sample.analyze", queue="analysis")
+async def run_hybrid_analysis(db: AsyncSession, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Audio feature + vibe analysis of one sample."""
+    from app.services.hybrid_analysis_service import HybridAnalysisService
+
+    result = await HybridAnalysisService(db).analyze_sample(
+        payload["sample_id"],
+        force_analyze=payload.get("force_analyze", False),
+        override_model=payload.get("model"),
+    )
+    return result.model_dump(mode="json")
+
+
+@job_handler("batch.process", queue="batch")
+async def run_batch(db: AsyncSession, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Process a sample collection batch (queued by BatchService.enqueue_processing)."""
+    from app.services.batch_service import BatchService
+
+    await BatchService(db).process_batch(payload["batch_id"], job_id=payload.get("job_id"))
+    return {"batch_id": payload["batch_id"]}
+
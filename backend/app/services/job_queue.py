@@ -0,0 +1,363 @@
+"""
+Durable background job queue.
+
+Work that used to run in a bare asyncio task inside the API process
+(sample analysis, vibe analysis, batch processing, exports) is recorded as a
+row in the jobs table instead, so it survives restarts and can be consumed by
+any number of worker processes (`python -m app.worker`) on any machine.
+
+- Claiming: a worker picks the highest-priority runnable job in the queues it
+  serves and takes a lease on it with a conditional UPDATE, so two workers
+  never run the same job. On PostgreSQL candidates are selected with
+  FOR UPDATE SKIP LOCKED; SQLite serializes writers, so the conditional
+  UPDATE alone is enough.
+- Leases and heartbeats: the running worker renews its lease every third of
+  JOB_LEASE_SECONDS. A job whose lease runs out (crashed worker, redeploy) is
+  claimed again.
+- Retries: a failed attempt is re-queued with exponential backoff until
+  max_attempts is reached.
+- Concurrency: per-queue limits (JOB_QUEUE_LIMITS) are enforced across all
+  workers by counting live leases at claim time.
+"""
+import logging
+import random
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional
+
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.job import Job, JobStatus
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUEUE = "default"
+
+# Candidate rows fetched per claim attempt (losing a race falls through to the next)
+CLAIM_CANDIDATES = 5
+
+# Runs a job with its own session and the job payload (plus its "job_id");
+# the return value is stored as the job result
+JobHandler = Callable[[AsyncSession, Dict[str, Any]], Awaitable[Optional[Dict[str, Any]]]]
+SessionFactory = Callable[[], AsyncSession]
+
+
+@dataclass
+class JobDefinition:
+    """A registered job kind"""
+    kind: str
+    handler: JobHandler
+    queue: str
+
+
+_handlers: Dict[str, JobDefinition] = {}
+
+
+def job_handler(kind: str, queue: str = DEFAULT_QUEUE):
+    """
+    Register a coroutine function as the handler for a job kind.
+
+    Example:
+        @job_handler("sample.analyze", queue="analysis")
+        async def analyze(session, payload):
+            ...
+    """
+    def decorator(handler: JobHandler) -> JobHandler:
+        _handlers[kind] = JobDefinition(kind=kind, handler=handler, queue=queue)
+        return handler
+    return decorator
+
+
+def get_job_definition(kind: str) -> Optional[JobDefinition]:
+    return _handlers.get(kind)
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def parse_queue_limits(spec: str) -> Dict[str, int]:
+    """Parse "vibe=2,batch=1" into {"vibe": 2, "batch": 1}."""
+    limits = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, value = item.partition("=")
+        try:
+            limits[name.strip()] = int(value)
+        except ValueError:
+            raise ValueError(f"Invalid queue limit {item!r}, expected queue=N")
+    return limits
+
+
+def retry_delay_seconds(attempts: int) -> float:
+    """Exponential backoff (with up to 10% jitter) before retry number `attempts`."""
+    delay = min(
+        settings.JOB_RETRY_MAX_DELAY,
+        settings.JOB_RETRY_BASE_DELAY * (2 ** max(0, attempts - 1)),
+    )
+    return delay * (1 + random.random() * 0.1)
+
+
+async def enqueue_job(
+    db: AsyncSession,
+    kind: str,
+    payload: Optional[Dict[str, Any]] = None,
+    queue: str = DEFAULT_QUEUE,
+    priority: int = 0,
+    max_attempts: Optional[int] = None,
+    delay_seconds: float = 0,
+    commit: bool = True,
+    user_id: Optional[int] = None,
+) -> Job:
+    """
+    Add a job to the queue.
+
+    Args:
+        db: Session to write the job with
+        kind: Registered handler name
+        payload: JSON-serializable handler arguments
+        queue: Queue the job is consumed from
+        priority: Higher priorities are claimed first
+        max_attempts: Attempts before the job is marked failed (default JOB_MAX_ATTEMPTS)
+        delay_seconds: Do not run before this many seconds from now
+        commit: Commit immediately (False to enqueue inside a larger transaction)
+        user_id: Owner of the job, who may read and cancel it through the API
+
+    Returns:
+        The queued Job
+    """
+    job = Job(
+        id=uuid.uuid4().hex,
+        queue=queue,
+        kind=kind,
+        payload=payload or {},
+        status=JobStatus.QUEUED,
+        priority=priority,
+        user_id=user_id,
+        attempts=0,
+        max_attempts=max_attempts or settings.JOB_MAX_ATTEMPTS,
+        run_after=utcnow() + timedelta(seconds=delay_seconds),
+    )
+    db.add(job)
+    if commit:
+        await db.commit()
+    else:
+        await db.flush()
+    logger.info(f"Queued job {job.id} ({kind}) on {queue}")
+    return job
+
+
+async def get_job(db: AsyncSession, job_id: str, user_id: Optional[int] = None) -> Optional[Job]:
+    """Get a job by ID, optionally only if it belongs to `user_id`."""
+    job = await db.get(Job, job_id)
+    if job is None or (user_id is not None and job.user_id != user_id):
+        return None
+    return job
+
+
+async def cancel_job(db: AsyncSession, job_id: str, user_id: Optional[int] = None) -> bool:
+    """
+    Cancel a queued or running job, optionally only if it belongs to `user_id`.
+
+    A running job loses its lease; its worker notices on the next heartbeat
+    and stops the handler.
+    """
+    conditions = [Job.id == job_id, Job.status.in_([JobStatus.QUEUED, JobStatus.RUNNING])]
+    if user_id is not None:
+        conditions.append(Job.user_id == user_id)
+    result = await db.execute(
+        update(Job)
+        .where(*conditions)
+        .values(
+            status=JobStatus.CANCELLED,
+            finished_at=utcnow(),
+            lease_owner=None,
+            lease_expires_at=None,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    return result.rowcount == 1
+
+
+class JobQueue:
+    """
+    Worker-side queue operations: claim, heartbeat, complete, fail.
+
+    Every operation uses a short-lived session of its own so a lease is never
+    held open inside a long transaction.
+    """
+
+    def __init__(
+        self,
+        session_factory: SessionFactory,
+        worker_id: str,
+        lease_seconds: Optional[int] = None,
+    ):
+        self.session_factory = session_factory
+        self.worker_id = worker_id
+        self.lease_seconds = lease_seconds or settings.JOB_LEASE_SECONDS
+
+    @staticmethod
+    def _runnable(now: datetime):
+        return or_(
+            and_(Job.status == JobStatus.QUEUED, Job.run_after <= now),
+            and_(Job.status == JobStatus.RUNNING, Job.lease_expires_at < now),
+        )
+
+    def _owned(self, job_id: str):
+        return and_(
+            Job.id == job_id,
+            Job.status == JobStatus.RUNNING,
+            Job.lease_owner == self.worker_id,
+        )
+
+    async def claim(
+        self,
+        queues: Iterable[str],
+        limits: Optional[Dict[str, int]] = None,
+    ) -> Optional[Job]:
+        """
+        Lease the next runnable job from `queues`.
+
+        Args:
+            queues: Queue names this worker serves
+            limits: Max concurrently running jobs per queue (across all workers)
+
+        Returns:
+            The claimed Job, or None if nothing is runnable
+        """
+        queues = list(queues)
+        limits = limits or {}
+        now = utcnow()
+
+        async with self.session_factory() as session:
+            if limits:
+                running = dict((await session.execute(
+                    select(Job.queue, func.count())
+                    .where(
+                        Job.queue.in_(queues),
+                        Job.status == JobStatus.RUNNING,
+                        Job.lease_expires_at >= now,
+                    )
+                    .group_by(Job.queue)
+                )).all())
+                queues = [q for q in queues if q not in limits or running.get(q, 0) < limits[q]]
+                if not queues:
+                    return None
+
+            candidates = (await session.execute(
+                select(Job.id)
+                .where(Job.queue.in_(queues), self._runnable(now))
+                .order_by(Job.priority.desc(), Job.run_after, Job.created_at)
+                .limit(CLAIM_CANDIDATES)
+                .with_for_update(skip_locked=True)
+            )).scalars().all()
+
+            for job_id in candidates:
+                result = await session.execute(
+                    update(Job)
+                    .where(Job.id == job_id, self._runnable(now))
+                    .values(
+                        status=JobStatus.RUNNING,
+                        attempts=Job.attempts + 1,
+                        lease_owner=self.worker_id,
+                        lease_expires_at=now + timedelta(seconds=self.lease_seconds),
+                        heartbeat_at=now,
+                        started_at=func.coalesce(Job.started_at, now),
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+                if result.rowcount == 1:
+                    await session.commit()
+                    return await session.get(Job, job_id)
+
+            await session.commit()
+            return None
+
+    async def heartbeat(self, job_id: str) -> bool:
+        """Extend the lease. False means it was lost (expired and reclaimed, or cancelled)."""
+        now = utcnow()
+        async with self.session_factory() as session:
+            result = await session.execute(
+                update(Job)
+                .where(self._owned(job_id))
+                .values(
+                    lease_expires_at=now + timedelta(seconds=self.lease_seconds),
+                    heartbeat_at=now,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            await session.commit()
+            return result.rowcount == 1
+
+    async def complete(self, job_id: str, result: Optional[Dict[str, Any]] = None) -> bool:
+        """Mark a leased job succeeded and store its result."""
+        async with self.session_factory() as session:
+            updated = await session.execute(
+                update(Job)
+                .where(self._owned(job_id))
+                .values(
+                    status=JobStatus.SUCCEEDED,
+                    result=result,
+                    finished_at=utcnow(),
+                    lease_owner=None,
+                    lease_expires_at=None,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            await session.commit()
+            return updated.rowcount == 1
+
+    async def fail(self, job: Job, error: str, retry: bool = True) -> str:
+        """
+        Record a failed attempt.
+
+        Re-queues the job with backoff while attempts remain, otherwise marks
+        it failed.
+
+        Returns:
+            The job's new status
+        """
+        now = utcnow()
+        if retry and job.attempts < job.max_attempts:
+            status = JobStatus.QUEUED
+            values = {"run_after": now + timedelta(seconds=retry_delay_seconds(job.attempts))}
+        else:
+            status = JobStatus.FAILED
+            values = {"finished_at": now}
+
+        async with self.session_factory() as session:
+            updated = await session.execute(
+                update(Job)
+                .where(self._owned(job.id))
+                .values(
+                    status=status,
+                    last_error=error,
+                    lease_owner=None,
+                    lease_expires_at=None,
+                    **values,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            await session.commit()
+        return status if updated.rowcount == 1 else JobStatus.CANCELLED
+
+    async def release(self, job_id: str) -> None:
+        """Hand an unfinished job back (worker shutdown) without using up an attempt."""
+        async with self.session_factory() as session:
+            await session.execute(
+                update(Job)
+                .where(self._owned(job_id))
+                .values(
+                    status=JobStatus.QUEUED,
+                    attempts=Job.attempts - 1,
+                    run_after=utcnow(),
+                    lease_owner=None,
+                    lease_expires_at=None,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            await session.commit()
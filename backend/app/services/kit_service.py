@@ -24,6 +24,8 @@ from app.models.sample import Sample
 from app.schemas.kit import (
     ExportManifest,
     ExportSampleInfo,
+    KitCoverInfo,
+    KitSummary,
     SampleRecommendation,
 )
 
@@ -236,6 +238,103 @@ class KitService:
         logger.info(f"Retrieved {len(kits)} kits for user {user_id}")
         return kits
 
+    async def get_user_kit_summaries(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        skip: int = 0,
+        limit: int = 100,
+    ) -> List[KitSummary]:
+        """
+        Get lightweight kit summaries for list views.
+
+        Unlike get_user_kits(), no pad assignments or samples are loaded.
+        Pad counts come from an aggregate and the cover (first assigned pad,
+        ordered by bank then pad number) from a single windowed query.
+
+        Args:
+            db: Database session
+            user_id: User ID
+            skip: Number of kits to skip
+            limit: Maximum number of kits to return
+
+        Returns:
+            List[KitSummary]: Summaries ordered by creation date (newest first)
+        """
+        logger.debug(f"Fetching kit summaries for user {user_id} (skip={skip}, limit={limit})")
+
+        pad_counts = (
+            select(KitSample.kit_id, func.count().label("pad_count"))
+            .group_by(KitSample.kit_id)
+            .subquery()
+        )
+        result = await db.execute(
+            select(
+                Kit.id,
+                Kit.user_id,
+                Kit.name,
+                Kit.description,
+                Kit.is_public,
+                Kit.created_at,
+                Kit.updated_at,
+                func.coalesce(pad_counts.c.pad_count, 0).label("pad_count"),
+            )
+            .outerjoin(pad_counts, pad_counts.c.kit_id == Kit.id)
+            .where(Kit.user_id == user_id)
+            .order_by(Kit.created_at.desc())
+            .offset(skip)
+            .limit(limit)
+        )
+        rows = result.all()
+
+        kit_ids = [row.id for row in rows if row.pad_count]
+        covers: Dict[int, KitCoverInfo] = {}
+        if kit_ids:
+            ranked = (
+                select(
+                    KitSample.kit_id,
+                    KitSample.sample_id,
+                    KitSample.pad_bank,
+                    KitSample.pad_number,
+                    func.row_number().over(
+                        partition_by=KitSample.kit_id,
+                        order_by=(KitSample.pad_bank, KitSample.pad_number),
+                    ).label("rank"),
+                )
+                .where(KitSample.kit_id.in_(kit_ids))
+                .subquery()
+            )
+            cover_result = await db.execute(
+                select(ranked, Sample.title)
+                .join(Sample, Sample.id == ranked.c.sample_id)
+                .where(ranked.c.rank == 1)
+            )
+            for row in cover_result.all():
+                covers[row.kit_id] = KitCoverInfo(
+                    sample_id=row.sample_id,
+                    title=row.title,
+                    pad_bank=row.pad_bank,
+                    pad_number=row.pad_number,
+                )
+
+        summaries = [
+            KitSummary(
+                id=row.id,
+                user_id=row.user_id,
+                name=row.name,
+                description=row.description,
+                is_public=bool(row.is_public),
+                created_at=row.created_at,
+                updated_at=row.updated_at,
+                pad_count=row.pad_count,
+                cover=covers.get(row.id),
+            )
+            for row in rows
+        ]
+
+        logger.info(f"Retrieved {len(summaries)} kit summaries for user {user_id}")
+        return summaries
+
     async def update_kit(
         self,
         db: AsyncSession,
@@ -0,0 +1,254 @@
+"""
+PADCONF.BIN Backup Index Service
+
+Indexes every PADCONF.BIN under a directory tree of SP-404MK2 project
+backups into the padconf_backups / padconf_backup_pads tables, so questions
+like "which of my projects use this sample" become a single indexed lookup
+instead of re-parsing hundreds of 52 KB files.
+
+Files are decoded with PadconfService.read_pad_table (all 160 pads per
+call). Re-indexing skips files whose size and mtime are unchanged (including
+unreadable files, which are recorded with their error) and drops entries for
+files that disappeared.
+"""
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.padconf_backup import PadconfBackup, PadconfBackupPad
+from app.services.padconf_service import PadconfService, pad_location
+
+logger = logging.getLogger(__name__)
+
+PADCONF_FILENAME = "PADCONF.BIN"
+
+
+@dataclass
+class PadconfIndexStats:
+    """Outcome of indexing a backup directory"""
+    scanned: int = 0
+    indexed: int = 0
+    unchanged: int = 0
+    removed: int = 0
+    pads: int = 0
+    errors: List[str] = field(default_factory=list)
+    duration_seconds: float = 0.0
+
+
+@dataclass
+class PadUsage:
+    """One pad in an indexed project that uses a given sample"""
+    path: str
+    project_name: Optional[str]
+    bank: str
+    pad_number: int
+    pad_index: int
+    filename: str
+    bpm: Optional[float]
+
+
+def find_padconf_files(root: Path) -> Dict[str, os.stat_result]:
+    """Path -> stat for every PADCONF.BIN (any case) under root."""
+    found = {}
+    stack = [str(root)]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.name.upper() == PADCONF_FILENAME and entry.is_file():
+                        found[entry.path] = entry.stat()
+        except OSError as e:
+            logger.warning(f"Cannot scan {directory}: {e}")
+    return found
+
+
+class PadconfIndexService:
+    """
+    Service for indexing and searching PADCONF.BIN project backups.
+
+    Example:
+        service = PadconfIndexService(db)
+        await service.index_directory(Path("~/SP404 Backups").expanduser())
+        usages = await service.find_sample("Kick_001.wav")
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.padconf_service = PadconfService()
+
+    def _parse(self, path: str) -> Tuple[PadconfBackup, List[dict]]:
+        """Read one PADCONF.BIN into a backup row and its pad rows."""
+        with open(path, "rb") as f:
+            data = f.read()
+        table = self.padconf_service.read_pad_table(data)
+
+        pads = []
+        for pad_index, filename, record in table.used_pads():
+            bank, pad_number = pad_location(pad_index)
+            pads.append({
+                "pad_index": pad_index,
+                "bank": bank,
+                "pad_number": pad_number,
+                "filename": filename,
+                "filename_key": filename.lower(),
+                "bpm": record["bpm"] / 100.0 if record["bpm"] > 0 else None,
+                "loop": record["loop"] == 0x7FFFFFFF,
+                "sample_start": record["sample_start"],
+                "sample_end": record["sample_end"],
+            })
+
+        backup = PadconfBackup(
+            project_name=table.project.project_name or None,
+            project_bpm=table.project.project_bpm,
+            tempo_mode=table.project.tempo_mode,
+            pad_count=len(pads),
+        )
+        return backup, pads
+
+    def _parse_all(self, paths: List[str]) -> Tuple[Dict[str, Tuple[PadconfBackup, List[dict]]], Dict[str, str]]:
+        parsed, failed = {}, {}
+        for path in paths:
+            try:
+                parsed[path] = self._parse(path)
+            except (OSError, ValueError) as e:
+                failed[path] = str(e)
+        return parsed, failed
+
+    async def index_directory(self, root: Path, prune: bool = True) -> PadconfIndexStats:
+        """
+        Index (or re-index) every PADCONF.BIN under a directory.
+
+        Args:
+            root: Backup directory tree
+            prune: Drop entries under root whose file no longer exists
+
+        Returns:
+            PadconfIndexStats for the run
+        """
+        start = time.perf_counter()
+        stats = PadconfIndexStats()
+
+        files = await asyncio.to_thread(find_padconf_files, root)
+        stats.scanned = len(files)
+
+        prefix = str(root).rstrip(os.sep) + os.sep
+        result = await self.db.execute(
+            select(PadconfBackup).where(PadconfBackup.path.startswith(prefix, autoescape=True))
+        )
+        existing = {backup.path: backup for backup in result.scalars()}
+
+        changed = [
+            path for path, stat in files.items()
+            if path not in existing
+            or existing[path].size_bytes != stat.st_size
+            or existing[path].mtime_ns != stat.st_mtime_ns
+        ]
+        stats.unchanged = len(files) - len(changed)
+
+        parsed, failed = await asyncio.to_thread(self._parse_all, changed)
+        stats.errors = [f"{path}: {error}" for path, error in failed.items()]
+        # Unreadable files are indexed without pads so they are not re-read until they change
+        parsed.update({
+            path: (PadconfBackup(pad_count=0, error=error), [])
+            for path, error in failed.items()
+        })
+
+        # Replace stale rows: drop old pads, then upsert backups and bulk insert pads
+        stale_ids = [existing[path].id for path in parsed if path in existing]
+        removed = [backup for path, backup in existing.items() if path not in files] if prune else []
+        drop_ids = stale_ids + [backup.id for backup in removed]
+        if drop_ids:
+            await self.db.execute(delete(PadconfBackupPad).where(PadconfBackupPad.backup_id.in_(drop_ids)))
+        for backup in removed:
+            await self.db.delete(backup)
+        stats.removed = len(removed)
+
+        pad_rows = []
+        for path, (parsed_backup, pads) in parsed.items():
+            stat = files[path]
+            backup = existing.get(path)
+            if backup is None:
+                backup = parsed_backup
+                backup.path = path
+                self.db.add(backup)
+            else:
+                backup.project_name = parsed_backup.project_name
+                backup.project_bpm = parsed_backup.project_bpm
+                backup.tempo_mode = parsed_backup.tempo_mode
+                backup.pad_count = parsed_backup.pad_count
+                backup.error = parsed_backup.error
+            backup.size_bytes = stat.st_size
+            backup.mtime_ns = stat.st_mtime_ns
+            pad_rows.append((backup, pads))
+
+        await self.db.flush()  # Assign ids to new backups
+
+        rows = [
+            {"backup_id": backup.id, **pad}
+            for backup, pads in pad_rows
+            for pad in pads
+        ]
+        if rows:
+            await self.db.execute(insert(PadconfBackupPad), rows)
+        await self.db.commit()
+
+        stats.indexed = len(parsed) - len(failed)
+        stats.pads = len(rows)
+        stats.duration_seconds = time.perf_counter() - start
+
+        logger.info(
+            f"Indexed {root}: {stats.indexed} projects ({stats.pads} pads), "
+            f"{stats.unchanged} unchanged, {stats.removed} removed, "
+            f"{len(stats.errors)} errors in {stats.duration_seconds:.2f}s"
+        )
+        for error in stats.errors:
+            logger.warning(f"Skipped unreadable PADCONF.BIN {error}")
+
+        return stats
+
+    async def find_sample(self, filename: str, contains: bool = False) -> List[PadUsage]:
+        """
+        Find every indexed project pad that uses a sample.
+
+        Args:
+            filename: Pad filename (case-insensitive), e.g. "Kick_001.wav"
+            contains: Match any filename containing `filename`
+
+        Returns:
+            PadUsage entries ordered by project path and pad
+        """
+        key = filename.lower()
+        condition = (
+            PadconfBackupPad.filename_key.contains(key, autoescape=True)
+            if contains else PadconfBackupPad.filename_key == key
+        )
+        stmt = (
+            select(PadconfBackupPad, PadconfBackup.path, PadconfBackup.project_name)
+            .join(PadconfBackup, PadconfBackupPad.backup_id == PadconfBackup.id)
+            .where(condition)
+            .order_by(PadconfBackup.path, PadconfBackupPad.pad_index)
+        )
+        result = await self.db.execute(stmt)
+
+        return [
+            PadUsage(
+                path=path,
+                project_name=project_name,
+                bank=pad.bank,
+                pad_number=pad.pad_number,
+                pad_index=pad.pad_index,
+                filename=pad.filename,
+                bpm=pad.bpm,
+            )
+            for pad, path, project_name in result.all()
+        ]
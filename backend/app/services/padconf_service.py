@@ -11,15 +11,98 @@ PADCONF.BIN Format Specification:
 - Total: 160 + 27,520 + 3,840 = 31,520 bytes used
 
 Reference: https://github.com/gsterlin/sp404mk2-tools/blob/main/padconf/mk2_notes.txt
+
+Reading uses NumPy structured dtypes laid over the file buffer, so all 160
+pad records (and all 160 filenames) are decoded in a single call without
+copying; see `PadconfService.read_pad_table`.
 """
 
-from typing import Optional, Dict, List
+from dataclasses import dataclass
+from typing import Optional, Dict, List, Union
 from pydantic import BaseModel, Field
 from pathlib import Path
 import logging
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
+# One 172-byte pad metadata record; all fields big-endian
+PAD_RECORD_DTYPE = np.dtype({
+    "names": [
+        "sample_start", "sample_end", "volume", "gate", "loop", "mute_group",
+        "bpm_sync", "bpm", "loop_point", "pitch", "fine_tune", "loop_mode",
+        "speed", "vinyl_effect", "pan", "pad_link", "bus_route",
+        "attack", "hold", "release",
+    ],
+    "formats": [
+        ">u4", ">u4", ">u4", ">u4", ">u4", ">u4",
+        ">u4", ">u2", ">u4", ">i4", ">i4", ">u4",
+        ">u4", ">u4", ">u4", ">u4", ">u4",
+        ">u4", ">u4", ">u4",
+    ],
+    "offsets": [
+        0x00, 0x04, 0x08, 0x0C, 0x10, 0x18,
+        0x1C, 0x22, 0x28, 0x30, 0x34, 0x38,
+        0x3C, 0x40, 0x44, 0x48, 0x4C,
+        0x54, 0x58, 0x5C,
+    ],
+    "itemsize": 172,
+})
+
+PAD_FILENAME_DTYPE = np.dtype("S24")
+
+BANKS = "ABCDEFGHIJ"
+
+
+def pad_location(pad_index: int) -> tuple[str, int]:
+    """(bank letter, pad number 1-16) for a 1-based pad index."""
+    return BANKS[(pad_index - 1) // 16], (pad_index - 1) % 16 + 1
+
+
+def _clamp_to_fields(model: type, values: Dict[str, object], drop: tuple = ()) -> Dict[str, object]:
+    """
+    Clamp numbers into a model's ge/le bounds and cut strings to max_length.
+
+    Files written by the device can hold values outside the ranges this
+    module writes; reading them should not fail validation. Fields named in
+    `drop` become None when out of range instead of being clamped.
+    """
+    clamped = {}
+    for name, value in values.items():
+        for bound in model.model_fields[name].metadata:
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                limited = value
+                if getattr(bound, "ge", None) is not None:
+                    limited = max(limited, bound.ge)
+                if getattr(bound, "le", None) is not None:
+                    limited = min(limited, bound.le)
+                if limited != value and name in drop:
+                    limited = None
+                value = limited
+            elif isinstance(value, str) and getattr(bound, "max_length", None) is not None:
+                value = value[:bound.max_length]
+        clamped[name] = value
+    return clamped
+
+
+@dataclass
+class PadTable:
+    """All pads of one PADCONF.BIN, decoded in bulk."""
+    project: "ProjectConfig"
+    records: np.ndarray  # PAD_RECORD_DTYPE, one row per pad (index 0 = pad 1)
+    filenames: List[str]  # One entry per pad, "" for empty pads
+
+    def used_pads(self) -> List[tuple[int, str, Dict[str, int]]]:
+        """(pad_index, filename, record fields) for each pad with a sample assigned."""
+        names = self.records.dtype.names
+        # tolist() converts all 160 records to Python ints in one call
+        return [
+            (row + 1, filename, dict(zip(names, values)))
+            for row, (filename, values) in enumerate(zip(self.filenames, self.records.tolist()))
+            if filename
+        ]
+
 
 class PadConfig(BaseModel):
     """Configuration for a single pad (Pads 1-160, Banks A-J)"""
@@ -262,6 +345,57 @@ class PadconfService:
 
         return bytes(buffer)
 
+    def patch_padconf(
+        self,
+        data: bytes,
+        pad_configs: List[PadConfig],
+        cleared_pad_indices: Optional[List[int]] = None
+    ) -> bytes:
+        """
+        Rewrite selected pads of an existing PADCONF.BIN, leaving the rest intact.
+
+        Used by incremental project rebuilds so only pads whose sample or
+        settings changed are touched.
+
+        Args:
+            data: Existing PADCONF.BIN bytes
+            pad_configs: Pads to (re)write
+            cleared_pad_indices: Pads to reset to empty
+
+        Returns:
+            Patched PADCONF.BIN data
+
+        Raises:
+            ValueError: If data is not a PADCONF.BIN
+        """
+        if len(data) != self.FILE_SIZE:
+            raise ValueError(f"Invalid PADCONF.BIN size: {len(data)} bytes (expected {self.FILE_SIZE})")
+
+        buffer = bytearray(data)
+
+        for pad_index in list(cleared_pad_indices or []) + [p.pad_index for p in pad_configs]:
+            self._clear_pad(buffer, pad_index)
+
+        for pad_config in pad_configs:
+            self._write_pad_metadata(buffer, pad_config)
+            self._write_pad_filename(buffer, pad_config)
+
+        logger.debug(
+            f"Patched PADCONF.BIN: {len(pad_configs)} pads written, "
+            f"{len(cleared_pad_indices or [])} cleared"
+        )
+
+        return bytes(buffer)
+
+    def _clear_pad(self, buffer: bytearray, pad_index: int) -> None:
+        """Zero one pad's metadata and filename sections."""
+        offset = self.PAD_METADATA_START + ((pad_index - 1) * self.PAD_METADATA_SIZE)
+        # The last pad's metadata block runs into the filename table; stop there
+        end = min(offset + self.PAD_METADATA_SIZE, self.PAD_FILENAME_START)
+        buffer[offset:end] = bytes(end - offset)
+        offset = self.PAD_FILENAME_START + ((pad_index - 1) * self.PAD_FILENAME_SIZE)
+        buffer[offset:offset+self.PAD_FILENAME_SIZE] = bytes(self.PAD_FILENAME_SIZE)
+
     def _write_header(
         self,
         buffer: bytearray,
@@ -423,6 +557,9 @@ class PadconfService:
         Returns:
             Tuple of (ProjectConfig, List[PadConfig])
 
+        Values outside the ranges PadConfig allows are clamped into them (an
+        out-of-range BPM is dropped), so any file from the device can be read.
+
         Raises:
             FileNotFoundError: If file does not exist
             ValueError: If file size is incorrect
@@ -430,25 +567,77 @@ class PadconfService:
         with open(file_path, 'rb') as f:
             data = f.read()
 
-        if len(data) != self.FILE_SIZE:
-            raise ValueError(f"Invalid PADCONF.BIN size: {len(data)} (expected {self.FILE_SIZE})")
-
-        # Parse header
-        project_config = self._read_header(data)
+        table = self.read_pad_table(data)
 
-        # Parse all 160 pads
+        # Only include pads with filenames
         pad_configs = []
-        for i in range(1, self.PAD_COUNT + 1):
-            pad_config = self._read_pad_metadata(data, i)
-            pad_config.filename = self._read_pad_filename(data, i)
-
-            # Only include pads with filenames
-            if pad_config.filename:
-                pad_configs.append(pad_config)
+        for pad_index, filename, record in table.used_pads():
+            pad_configs.append(PadConfig(**_clamp_to_fields(PadConfig, dict(
+                pad_index=pad_index,
+                filename=filename,
+                sample_start=record["sample_start"],
+                sample_end=record["sample_end"],
+                volume=record["volume"],
+                bpm=record["bpm"] / 100.0 if record["bpm"] > 0 else None,
+                gate=record["gate"] == 1,
+                loop=record["loop"] == 0x7FFFFFFF,
+                bpm_sync=record["bpm_sync"] == 1,
+                pitch=record["pitch"],
+                fine_tune=record["fine_tune"],
+                speed=record["speed"],
+                pan=record["pan"],
+                loop_point=record["loop_point"],
+                loop_mode=record["loop_mode"],
+                vinyl_effect=record["vinyl_effect"] == 1,
+                mute_group=record["mute_group"],
+                pad_link=record["pad_link"],
+                bus_route=record["bus_route"],
+                attack=record["attack"],
+                hold=record["hold"],
+                release=record["release"]
+            ), drop=("bpm",))))
 
         logger.debug(f"Read PADCONF.BIN: {len(pad_configs)} pads with filenames")
 
-        return project_config, pad_configs
+        return table.project, pad_configs
+
+    def read_pad_table(self, data: Union[bytes, bytearray, memoryview]) -> PadTable:
+        """
+        Decode the header and all 160 pads of a PADCONF.BIN in bulk.
+
+        The pad records and filenames are NumPy views over `data` (no copy),
+        so this is cheap enough to run over hundreds of project backups.
+
+        Args:
+            data: PADCONF.BIN contents
+
+        Returns:
+            PadTable with the project settings, pad records and filenames
+
+        Raises:
+            ValueError: If data is not a PADCONF.BIN
+        """
+        view = memoryview(data)
+        if view.nbytes != self.FILE_SIZE:
+            raise ValueError(f"Invalid PADCONF.BIN size: {view.nbytes} (expected {self.FILE_SIZE})")
+
+        records = np.frombuffer(
+            view, dtype=PAD_RECORD_DTYPE, count=self.PAD_COUNT, offset=self.PAD_METADATA_START
+        )
+        raw_names = np.frombuffer(
+            view, dtype=PAD_FILENAME_DTYPE, count=self.PAD_COUNT, offset=self.PAD_FILENAME_START
+        )
+        # NumPy strips trailing NULs; anything after an embedded NUL is junk
+        filenames = [
+            name.split(b'\x00', 1)[0].decode('ascii', errors='ignore')
+            for name in raw_names.tolist()
+        ]
+
+        return PadTable(
+            project=self._read_header(view),
+            records=records,
+            filenames=filenames
+        )
 
     def _read_header(self, data: bytes) -> ProjectConfig:
         """Parse header section (bytes 0-159)"""
@@ -460,70 +649,15 @@ class PadconfService:
         project_bpm = bpm_int / 100.0 if bpm_int > 0 else 120.0
 
         # Project name (0x81-0xA0): Null-terminated ASCII
-        name_bytes = data[self.HEADER_PROJECT_NAME:self.HEADER_PROJECT_NAME+32]
+        name_bytes = bytes(data[self.HEADER_PROJECT_NAME:self.HEADER_PROJECT_NAME+32])
         project_name = name_bytes.split(b'\x00')[0].decode('ascii', errors='ignore')
 
         # Bank BPMs (optional for future enhancement)
         bank_bpms = {}
 
-        return ProjectConfig(
+        return ProjectConfig(**_clamp_to_fields(ProjectConfig, dict(
             project_name=project_name,
             project_bpm=project_bpm,
             tempo_mode=tempo_mode,
             bank_bpms=bank_bpms
-        )
-
-    def _read_pad_metadata(self, data: bytes, pad_index: int) -> PadConfig:
-        """Parse single pad metadata (172 bytes)"""
-        offset = self.PAD_METADATA_START + ((pad_index - 1) * self.PAD_METADATA_SIZE)
-
-        # Sample start/end
-        sample_start = int.from_bytes(data[offset:offset+4], 'big')
-        sample_end = int.from_bytes(data[offset+4:offset+8], 'big')
-
-        # Volume
-        volume = int.from_bytes(data[offset+8:offset+12], 'big')
-
-        # Gate
-        gate = int.from_bytes(data[offset+12:offset+16], 'big') == 1
-
-        # Loop
-        loop_value = int.from_bytes(data[offset+16:offset+20], 'big')
-        loop = loop_value == 0x7FFFFFFF
-
-        # BPM (offset +0x22): 2-byte big-endian
-        bpm_int = int.from_bytes(data[offset+34:offset+36], 'big')
-        bpm = bpm_int / 100.0 if bpm_int > 0 else None
-
-        # BPM sync
-        bpm_sync = int.from_bytes(data[offset+28:offset+32], 'big') == 1
-
-        # Other fields
-        pitch = int.from_bytes(data[offset+48:offset+52], 'big', signed=True)
-        speed = int.from_bytes(data[offset+60:offset+64], 'big')
-        pan = int.from_bytes(data[offset+68:offset+72], 'big')
-        loop_mode = int.from_bytes(data[offset+56:offset+60], 'big')
-        vinyl_effect = int.from_bytes(data[offset+64:offset+68], 'big') == 1
-
-        return PadConfig(
-            pad_index=pad_index,
-            filename="",  # Set separately
-            sample_start=sample_start,
-            sample_end=sample_end,
-            volume=volume,
-            bpm=bpm,
-            gate=gate,
-            loop=loop,
-            bpm_sync=bpm_sync,
-            pitch=pitch,
-            speed=speed,
-            pan=pan,
-            loop_mode=loop_mode,
-            vinyl_effect=vinyl_effect
-        )
-
-    def _read_pad_filename(self, data: bytes, pad_index: int) -> str:
-        """Parse pad filename (24 bytes, null-terminated ASCII)"""
-        offset = self.PAD_FILENAME_START + ((pad_index - 1) * self.PAD_FILENAME_SIZE)
-        filename_bytes = data[offset:offset+24]
-        return filename_bytes.split(b'\x00')[0].decode('ascii', errors='ignore')
+        )))
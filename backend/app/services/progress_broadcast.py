@@ -0,0 +1,249 @@
+"""
+Fan-out progress broadcaster.
+
+Progress events (e.g. batch progress) are published to a topic and delivered
+to every subscriber of that topic: two browser tabs watching the same batch
+each get every event. Each subscriber has its own bounded buffer; one that
+stops reading until its buffer overflows is evicted instead of slowing the
+publisher or growing memory without bound.
+
+Delivery across processes goes through a pluggable backend:
+
+- InProcessBackend: subscribers in the publishing process only (SQLite,
+  tests, single-process deployments)
+- PostgresNotifyBackend: LISTEN/NOTIFY on one channel, so a batch processed
+  by a queue worker reaches watchers connected to any uvicorn worker
+
+PROGRESS_BROADCAST_BACKEND selects one ("auto" uses Postgres when
+DATABASE_URL points at PostgreSQL).
+"""
+import asyncio
+import json
+import logging
+from typing import Any, Callable, Dict, Optional, Set
+
+from sqlalchemy.engine import make_url
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_CHANNEL = "sp404_progress"
+
+# NOTIFY payloads are limited to 8000 bytes by PostgreSQL
+MAX_NOTIFY_PAYLOAD = 7900
+
+_EVICTED = object()
+
+Deliver = Callable[[str, Dict[str, Any]], None]
+
+
+class SlowConsumerError(Exception):
+    """A subscriber's buffer overflowed and it was disconnected."""
+
+
+class Subscription:
+    """One subscriber's bounded buffer of events for a topic."""
+
+    def __init__(self, topic: str, buffer_size: int):
+        self.topic = topic
+        self.evicted = False
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=buffer_size)
+
+    def _offer(self, message: Dict[str, Any]) -> bool:
+        """Buffer a message; False if the subscriber is too far behind."""
+        if self.evicted:
+            return False
+        try:
+            self._queue.put_nowait(message)
+            return True
+        except asyncio.QueueFull:
+            self.evicted = True
+            # Drop the backlog and leave a marker so the reader stops promptly
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            self._queue.put_nowait(_EVICTED)
+            return False
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Next message, or None after `timeout` seconds without one.
+
+        Raises:
+            SlowConsumerError: If this subscriber was evicted
+        """
+        if not self._queue.empty():
+            message = self._queue.get_nowait()
+        else:
+            try:
+                message = await asyncio.wait_for(self._queue.get(), timeout=timeout)
+            except asyncio.TimeoutError:
+                return None
+        if message is _EVICTED:
+            raise SlowConsumerError(self.topic)
+        return message
+
+
+class InProcessBackend:
+    """Delivers published messages to subscribers in this process only."""
+
+    def __init__(self):
+        self._deliver: Optional[Deliver] = None
+
+    async def start(self, deliver: Deliver) -> None:
+        self._deliver = deliver
+
+    async def publish(self, topic: str, message: Dict[str, Any]) -> None:
+        self._deliver(topic, message)
+
+    async def stop(self) -> None:
+        pass
+
+
+class PostgresNotifyBackend:
+    """
+    Cross-process delivery with PostgreSQL LISTEN/NOTIFY.
+
+    One dedicated asyncpg connection listens on NOTIFY_CHANNEL and hands
+    every notification to local subscribers; publishing is a pg_notify()
+    on the same connection. Messages are JSON {"topic", "message"}.
+    """
+
+    def __init__(self, dsn: str):
+        self.dsn = dsn
+        self._conn = None
+        self._deliver: Optional[Deliver] = None
+        self._lock = asyncio.Lock()
+
+    async def start(self, deliver: Deliver) -> None:
+        import asyncpg
+
+        self._deliver = deliver
+        self._conn = await asyncpg.connect(self.dsn, timeout=10)
+        await self._conn.add_listener(NOTIFY_CHANNEL, self._on_notify)
+
+    def _on_notify(self, connection, pid, channel, payload: str) -> None:
+        try:
+            data = json.loads(payload)
+            self._deliver(data["topic"], data["message"])
+        except (ValueError, KeyError) as e:
+            logger.warning(f"Ignoring malformed progress notification: {e}")
+
+    async def publish(self, topic: str, message: Dict[str, Any]) -> None:
+        payload = json.dumps({"topic": topic, "message": message}, default=str)
+        if len(payload) > MAX_NOTIFY_PAYLOAD:
+            logger.warning(f"Progress message for {topic} too large to NOTIFY ({len(payload)} bytes)")
+            return
+        async with self._lock:
+            await self._conn.execute("SELECT pg_notify($1, $2)", NOTIFY_CHANNEL, payload)
+
+    async def stop(self) -> None:
+        if self._conn is not None:
+            await self._conn.remove_listener(NOTIFY_CHANNEL, self._on_notify)
+            await self._conn.close()
+            self._conn = None
+
+
+class ProgressBroadcaster:
+    """
+    Topic-based pub/sub with per-subscriber bounded buffers.
+
+    Example:
+        broadcaster = get_progress_broadcaster()
+        async with broadcaster.subscribe("batch:abc") as subscription:
+            message = await subscription.get(timeout=30)
+        await broadcaster.publish("batch:abc", {"processed_samples": 10})
+    """
+
+    def __init__(self, backend=None, buffer_size: Optional[int] = None):
+        self.backend = backend or InProcessBackend()
+        self.buffer_size = buffer_size or settings.PROGRESS_SUBSCRIBER_BUFFER
+        self._subscribers: Dict[str, Set[Subscription]] = {}
+        self._started = False
+        self._start_lock = asyncio.Lock()
+        self.evictions = 0
+
+    async def start(self) -> None:
+        async with self._start_lock:
+            if self._started:
+                return
+            try:
+                await self.backend.start(self._deliver)
+            except Exception as e:
+                # Degrade to in-process delivery rather than losing progress entirely
+                logger.warning(f"Progress backend {type(self.backend).__name__} unavailable ({e}); using in-process delivery")
+                self.backend = InProcessBackend()
+                await self.backend.start(self._deliver)
+            self._started = True
+
+    async def stop(self) -> None:
+        if self._started:
+            await self.backend.stop()
+            self._started = False
+
+    def _deliver(self, topic: str, message: Dict[str, Any]) -> None:
+        """Fan a message out to this process's subscribers of `topic`."""
+        for subscription in list(self._subscribers.get(topic, ())):
+            if not subscription._offer(message):
+                self.evictions += 1
+                self._remove(subscription)
+                logger.warning(f"Evicted slow progress subscriber on {topic}")
+
+    async def publish(self, topic: str, message: Dict[str, Any]) -> None:
+        await self.start()
+        await self.backend.publish(topic, message)
+
+    def subscriber_count(self, topic: str) -> int:
+        return len(self._subscribers.get(topic, ()))
+
+    def _remove(self, subscription: Subscription) -> None:
+        subscribers = self._subscribers.get(subscription.topic)
+        if subscribers is not None:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[subscription.topic]
+
+    def subscribe(self, topic: str) -> "_SubscriptionContext":
+        """Subscribe to a topic for the duration of an `async with` block."""
+        return _SubscriptionContext(self, topic)
+
+
+class _SubscriptionContext:
+    def __init__(self, broadcaster: ProgressBroadcaster, topic: str):
+        self.broadcaster = broadcaster
+        self.subscription = Subscription(topic, broadcaster.buffer_size)
+
+    async def __aenter__(self) -> Subscription:
+        await self.broadcaster.start()
+        self.broadcaster._subscribers.setdefault(self.subscription.topic, set()).add(self.subscription)
+        return self.subscription
+
+    async def __aexit__(self, *exc) -> None:
+        self.broadcaster._remove(self.subscription)
+
+
+def _backend_from_settings():
+    choice = settings.PROGRESS_BROADCAST_BACKEND
+    url = make_url(settings.DATABASE_URL)
+    if choice == "postgres" or (choice == "auto" and url.get_backend_name() == "postgresql"):
+        dsn = url.set(drivername="postgresql").render_as_string(hide_password=False)
+        return PostgresNotifyBackend(dsn)
+    return InProcessBackend()
+
+
+_broadcaster: Optional[ProgressBroadcaster] = None
+
+
+def get_progress_broadcaster() -> ProgressBroadcaster:
+    """Process-wide progress broadcaster."""
+    global _broadcaster
+    if _broadcaster is None:
+        _broadcaster = ProgressBroadcaster(_backend_from_settings())
+    return _broadcaster
+
+
+async def shutdown_progress_broadcaster() -> None:
+    """Close the backend connection (called on application shutdown)."""
+    if _broadcaster is not None:
+        await _broadcaster.stop()
+
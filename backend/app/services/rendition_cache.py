@@ -0,0 +1,347 @@
+"""
+Content-addressed cache of SP-404-ready renditions.
+
+Converting a sample (decode → resample → 16-bit write) is the expensive part
+of every export, and the same sample is exported again and again: into
+several kits, into project bundles, and into re-exports of an unchanged kit.
+Renditions are therefore cached on disk keyed by the *content* of the source
+file plus every setting that affects the output (format, sample rate, bit
+depth, resampling quality, normalization). A cache hit is materialized with a hardlink (or a copy
+across filesystems), so re-exporting an unchanged kit is pure file I/O.
+
+The cache is bounded by total size and evicts least recently used entries.
+File I/O happens under a per-key lock stripe; the shared lock only guards the
+in-memory LRU index, so renditions of different samples never wait on each
+other.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.schemas.sp404_export import ConversionResult
+
+logger = logging.getLogger(__name__)
+
+# Bump when the conversion pipeline changes output for the same settings
+RENDITION_PIPELINE_VERSION = 2
+
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+# Per-key locks are striped so the number of locks stays fixed
+_KEY_LOCK_STRIPES = 64
+
+# Content hashes remembered per (path, size, mtime)
+_HASH_MEMO_SIZE = 4096
+
+# Pre-render tasks in flight; the event loop only keeps weak references
+_prerender_tasks: Set[asyncio.Task] = set()
+
+
+@dataclass(frozen=True)
+class RenditionSpec:
+    """Every setting that affects the bytes of a rendition."""
+    format: str
+    sample_rate: int = 48000
+    bit_depth: int = 16
+    quality: str = "balanced"
+    normalization: str = "none"
+
+    def cache_key(self, content_hash: str) -> str:
+        """Cache key for this spec applied to a source with `content_hash`."""
+        parts = (
+            content_hash,
+            self.format.lower(),
+            self.sample_rate,
+            self.bit_depth,
+            self.quality,
+            self.normalization,
+            RENDITION_PIPELINE_VERSION,
+        )
+        return hashlib.sha256("|".join(str(part) for part in parts).encode()).hexdigest()
+
+
+def gain_normalization(gain_db: float) -> str:
+    """RenditionSpec.normalization value for a fixed gain ("none" at 0 dB)."""
+    return f"gain{gain_db:+.2f}dB" if gain_db else "none"
+
+
+def hash_file(path: Path) -> str:
+    """SHA-256 of a file's contents, read in 1 MiB chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def link_or_copy(source: Path, destination: Path) -> None:
+    """
+    Place `source` at `destination`, hardlinking when possible.
+
+    Any existing destination is replaced rather than written through, so a
+    hardlinked cache entry is never modified by a later export.
+    """
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = destination.with_name(f".{destination.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        os.link(source, temp_path)
+    except OSError:
+        shutil.copyfile(source, temp_path)
+    os.replace(temp_path, destination)
+
+
+class RenditionCache:
+    """
+    Size-bounded LRU cache of converted audio files.
+
+    Entries live at `<cache_dir>/<key[:2]>/<key>.<format>` with a `<key>.json`
+    sidecar holding the ConversionResult details of the original conversion.
+    Recency is tracked in memory and seeded from file modification times when
+    the cache is first used, so LRU order survives restarts approximately.
+    """
+
+    def __init__(self, cache_dir: Path, max_bytes: int, hash_memo_size: int = _HASH_MEMO_SIZE):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.hash_memo_size = hash_memo_size
+        self._lock = threading.Lock()
+        self._key_locks = [threading.Lock() for _ in range(_KEY_LOCK_STRIPES)]
+        self._entries: Optional["OrderedDict[str, int]"] = None
+        self._total_bytes = 0
+        self._hashes: "OrderedDict[Tuple[str, int, int], str]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _key_lock(self, key: str) -> threading.Lock:
+        """Lock serializing file I/O on one cache entry."""
+        return self._key_locks[hash(key) % _KEY_LOCK_STRIPES]
+
+    def _entry_paths(self, key: str, format: str) -> Tuple[Path, Path]:
+        directory = self.cache_dir / key[:2]
+        return directory / f"{key}.{format.lower()}", directory / f"{key}.json"
+
+    def _load_index(self) -> "OrderedDict[str, int]":
+        """Build the LRU index from disk (oldest first). Caller holds the lock."""
+        if self._entries is None:
+            found = []
+            if self.cache_dir.exists():
+                for meta_path in self.cache_dir.glob("*/*.json"):
+                    key = meta_path.stem
+                    audio = [p for p in meta_path.parent.glob(f"{key}.*") if p.suffix != ".json"]
+                    if not audio:
+                        continue
+                    stat = audio[0].stat()
+                    found.append((stat.st_mtime, key, stat.st_size))
+            found.sort()
+            self._entries = OrderedDict((key, size) for _, key, size in found)
+            self._total_bytes = sum(self._entries.values())
+        return self._entries
+
+    def content_hash(self, path: Path) -> str:
+        """
+        Content hash of a source file.
+
+        Memoized per (path, size, mtime) so repeat exports of an unchanged
+        file do not re-read it; the memo keeps the most recently used
+        `hash_memo_size` files.
+        """
+        stat = path.stat()
+        memo_key = (str(path.resolve()), stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            cached = self._hashes.get(memo_key)
+            if cached is not None:
+                self._hashes.move_to_end(memo_key)
+                return cached
+        digest = hash_file(path)
+        with self._lock:
+            self._hashes[memo_key] = digest
+            while len(self._hashes) > self.hash_memo_size:
+                self._hashes.popitem(last=False)
+        return digest
+
+    def key_for(self, input_path: Path, spec: RenditionSpec) -> str:
+        """Cache key for rendering `input_path` with `spec`."""
+        return spec.cache_key(self.content_hash(input_path))
+
+    def fetch(
+        self,
+        input_path: Path,
+        spec: RenditionSpec,
+        output_path: Path,
+    ) -> Tuple[Optional[str], Optional[ConversionResult]]:
+        """
+        Look up a rendition of `input_path` and materialize it on a hit.
+
+        Returns:
+            (cache key, ConversionResult on a hit or None on a miss). The key
+            is None when the source cannot be read.
+        """
+        try:
+            key = self.key_for(input_path, spec)
+        except OSError:
+            return None, None
+        return key, self.materialize(key, spec, output_path)
+
+    def materialize(
+        self,
+        key: str,
+        spec: RenditionSpec,
+        output_path: Path,
+    ) -> Optional[ConversionResult]:
+        """
+        Place a cached rendition at `output_path`.
+
+        Returns:
+            ConversionResult for the cached rendition, or None on a miss
+        """
+        audio_path, meta_path = self._entry_paths(key, spec.format)
+        with self._key_lock(key):
+            try:
+                details = json.loads(meta_path.read_text())
+                link_or_copy(audio_path, output_path)
+            except (OSError, ValueError):
+                details = None
+
+        with self._lock:
+            entries = self._load_index()
+            if details is None:
+                self.misses += 1
+                if key in entries:
+                    self._total_bytes -= entries.pop(key)
+                return None
+            if key in entries:
+                entries.move_to_end(key)
+            self.hits += 1
+
+        return ConversionResult(success=True, output_path=output_path, **details)
+
+    def store(self, key: str, spec: RenditionSpec, rendered_path: Path, result: ConversionResult) -> None:
+        """Add a freshly converted file to the cache, evicting old entries if needed."""
+        audio_path, meta_path = self._entry_paths(key, spec.format)
+        details = {
+            "original_format": result.original_format,
+            "original_sample_rate": result.original_sample_rate,
+            "original_duration": result.original_duration,
+            "converted_sample_rate": result.converted_sample_rate,
+            "converted_bit_depth": result.converted_bit_depth,
+            "gain_db": result.gain_db,
+        }
+        with self._key_lock(key):
+            try:
+                link_or_copy(rendered_path, audio_path)
+                meta_path.write_text(json.dumps(details))
+                size = audio_path.stat().st_size
+            except OSError as e:
+                logger.warning(f"Could not cache rendition of {rendered_path}: {e}")
+                return
+
+        with self._lock:
+            entries = self._load_index()
+            if key in entries:
+                self._total_bytes -= entries.pop(key)
+            entries[key] = size
+            self._total_bytes += size
+            evicted = self._evict()
+
+        for old_key in evicted:
+            self._remove_entry(old_key)
+
+    def _evict(self) -> List[str]:
+        """
+        Drop least recently used entries from the index until under max_bytes.
+
+        Caller holds the lock and removes the returned keys' files afterwards.
+        """
+        entries = self._entries
+        evicted = []
+        while entries and self._total_bytes > self.max_bytes:
+            key, size = entries.popitem(last=False)
+            self._total_bytes -= size
+            evicted.append(key)
+            logger.debug(f"Evicted rendition {key} ({size} bytes)")
+        return evicted
+
+    def _remove_entry(self, key: str) -> None:
+        """Delete an evicted entry's files, unless it was stored again meanwhile."""
+        with self._key_lock(key):
+            with self._lock:
+                if key in self._entries:
+                    return
+            for path in (self.cache_dir / key[:2]).glob(f"{key}.*"):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+
+    @property
+    def total_bytes(self) -> int:
+        with self._lock:
+            self._load_index()
+            return self._total_bytes
+
+
+_rendition_cache: Optional[RenditionCache] = None
+
+
+def get_rendition_cache() -> Optional[RenditionCache]:
+    """Process-wide rendition cache, or None when caching is disabled."""
+    global _rendition_cache
+    if not settings.RENDITION_CACHE_ENABLED:
+        return None
+    if _rendition_cache is None or _rendition_cache.cache_dir != Path(settings.RENDITION_CACHE_DIR):
+        _rendition_cache = RenditionCache(
+            Path(settings.RENDITION_CACHE_DIR),
+            settings.RENDITION_CACHE_MAX_BYTES,
+        )
+    return _rendition_cache
+
+
+async def prerender_sample(file_path: str, format: Optional[str] = None) -> None:
+    """
+    Render the default SP-404 rendition of a newly ingested sample.
+
+    Runs as a background task after upload when RENDITION_PRERENDER_ON_INGEST
+    is enabled, so the first export of the sample is already a cache hit.
+    Failures are logged and otherwise ignored.
+    """
+    from app.services.export_executor import ConversionJob, get_export_executor
+
+    input_path = Path(file_path)
+    format = format or settings.RENDITION_PRERENDER_FORMAT
+    staging_dir = Path(settings.RENDITION_CACHE_DIR) / "staging"
+    job = ConversionJob(
+        key=file_path,
+        input_path=input_path,
+        output_path=staging_dir / f"{input_path.stem}.{os.getpid()}.{format}",
+        format=format,
+    )
+    try:
+        async for outcome in get_export_executor().convert_all([job]):
+            if not outcome.result.success:
+                logger.warning(f"Pre-render failed for {file_path}: {outcome.result.error_message}")
+    except Exception as e:
+        logger.warning(f"Pre-render failed for {file_path}: {e}")
+    finally:
+        await asyncio.to_thread(job.output_path.unlink, True)
+
+
+def schedule_prerender(file_path: str) -> asyncio.Task:
+    """
+    Start prerender_sample in the background.
+
+    The task is referenced until it finishes so it cannot be garbage
+    collected mid-render.
+    """
+    task = asyncio.create_task(prerender_sample(file_path))
+    _prerender_tasks.add(task)
+    task.add_done_callback(_prerender_tasks.discard)
+    return task
@@ -0,0 +1,310 @@
+"""
+Reprocess planner: re-extract only the features whose analyzer is out of date.
+
+Every analysis records the analyzer name and version of each feature in
+Sample.analysis_metadata["analyzers"] (see ANALYZER_VERSIONS in
+audio_features_service). When a feature's algorithm changes its version is
+bumped, and the planner selects just the samples whose stored version for
+that feature is older (or missing), together with the stale features of each
+one. A BPM upgrade therefore re-runs BPM detection only, and only where the
+stored BPM came from an older detector.
+
+ReprocessRunner executes a plan: files are analyzed in a process pool
+(AudioFeaturesService.analyze_features) and results are written back with
+one bulk UPDATE per batch, merging the new values into the existing
+analysis_metadata and extra_metadata["audio_features"].
+
+Example:
+    async with async_session() as session:
+        plan = await plan_reprocess(session, features=["bpm"])
+    results = await ReprocessRunner(async_session).run(plan)
+"""
+import asyncio
+import logging
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.audio_features import AudioFeatures
+from app.models.sample import Sample
+from app.services.audio_features_service import (
+    ANALYSIS_FEATURES,
+    ANALYZER_VERSIONS,
+    analyze_in_worker,
+    enabled_features,
+)
+
+logger = logging.getLogger(__name__)
+
+# AudioFeatures fields kept in extra_metadata["audio_features"] per feature
+FEATURE_FIELDS = {
+    "bpm": ("bpm", "bpm_confidence"),
+    "key": ("key", "scale", "key_confidence"),
+    "genre": ("genre", "genre_confidence"),
+    "spectral": (
+        "spectral_centroid", "spectral_bandwidth", "spectral_rolloff", "spectral_flatness",
+        "zero_crossing_rate", "rms_energy", "harmonic_ratio",
+        "mfcc_mean", "mfcc_std", "chroma_mean", "chroma_std",
+    ),
+}
+
+def stale_features(
+    analysis_metadata: Optional[Dict[str, Any]],
+    features: Optional[Iterable[str]] = None
+) -> List[str]:
+    """
+    Features whose stored analyzer version is older than the current one.
+
+    Samples analyzed before versions were recorded have no "analyzers" entry
+    and are stale for every feature. Features this installation does not
+    extract (see enabled_features) are never stale: re-running the analysis
+    would not record them either. `features` defaults to every enabled one.
+    """
+    analyzers = (analysis_metadata or {}).get("analyzers") or {}
+    enabled = enabled_features()
+    stale = []
+    for feature in enabled if features is None else features:
+        if feature not in enabled:
+            continue
+        record = analyzers.get(feature) or {}
+        if record.get("version", 0) < ANALYZER_VERSIONS[feature]:
+            stale.append(feature)
+    return stale
+
+
+@dataclass
+class PlannedSample:
+    """One sample to reprocess and the features to re-extract."""
+    id: int
+    title: str
+    file_path: str
+    bpm: Optional[float]
+    features: Tuple[str, ...]
+
+
+@dataclass
+class ReprocessPlan:
+    """Samples selected by plan_reprocess."""
+    features: Tuple[str, ...]
+    samples: List[PlannedSample] = field(default_factory=list)
+    up_to_date: int = 0
+
+    def feature_counts(self) -> Dict[str, int]:
+        """Number of planned samples per feature."""
+        counts = {feature: 0 for feature in self.features}
+        for sample in self.samples:
+            for feature in sample.features:
+                counts[feature] += 1
+        return counts
+
+
+@dataclass
+class ReprocessResult:
+    """Outcome of reprocessing one sample."""
+    sample: PlannedSample
+    features: Optional[AudioFeatures] = None
+    error: Optional[str] = None
+
+    @property
+    def status(self) -> str:
+        return "error" if self.error else "success"
+
+
+async def plan_reprocess(
+    db: AsyncSession,
+    features: Optional[Iterable[str]] = None,
+    where: Optional[List[Any]] = None,
+    force: bool = False,
+    limit: Optional[int] = None
+) -> ReprocessPlan:
+    """
+    Select the samples whose analysis is stale for any of `features`.
+
+    Only the columns needed for planning are loaded, and staleness is judged
+    in Python so the same code works on SQLite and PostgreSQL JSON columns.
+
+    Args:
+        db: Database session
+        features: Features to consider (subset of ANALYSIS_FEATURES;
+            default: enabled_features())
+        where: Extra SQLAlchemy filters on Sample (e.g. a BPM range)
+        force: Plan every feature of every matching sample, stale or not
+        limit: Plan at most this many samples
+
+    Returns:
+        ReprocessPlan listing each sample with its stale features
+
+    Raises:
+        ValueError: If a feature name is unknown
+    """
+    features = tuple(enabled_features() if features is None else features)
+    unknown = set(features) - set(ANALYSIS_FEATURES)
+    if unknown:
+        raise ValueError(f"Unknown analysis features: {sorted(unknown)}")
+
+    query = select(
+        Sample.id, Sample.title, Sample.file_path, Sample.bpm, Sample.analysis_metadata
+    ).order_by(Sample.id)
+    for condition in where or []:
+        query = query.where(condition)
+
+    plan = ReprocessPlan(features=features)
+    result = await db.execute(query)
+    for row in result:
+        stale = features if force else tuple(stale_features(row.analysis_metadata, features))
+        if not stale:
+            plan.up_to_date += 1
+            continue
+        plan.samples.append(PlannedSample(row.id, row.title, row.file_path, row.bpm, stale))
+        if limit and len(plan.samples) >= limit:
+            break
+    return plan
+
+
+def build_update(
+    sample_id: int,
+    features: AudioFeatures,
+    analysis_metadata: Optional[Dict[str, Any]],
+    extra_metadata: Optional[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """
+    Column values for one sample after a partial reprocess.
+
+    Only the features listed in features.metadata["analyzers"] are applied;
+    other columns, and the other features' metadata, are left as they are.
+    """
+    metadata = dict(features.metadata or {})
+    analyzers = metadata.pop("analyzers", {})
+    values: Dict[str, Any] = {"id": sample_id}
+
+    if "bpm" in analyzers:
+        values["bpm"] = features.bpm
+        values["bpm_confidence"] = features.bpm_confidence if features.bpm else None
+    if "key" in analyzers:
+        values["musical_key"] = f"{features.key} {features.scale or ''}".strip() if features.key else None
+        values["key_confidence"] = features.key_confidence if features.key else None
+    if "genre" in analyzers:
+        values["genre"] = features.genre
+        values["genre_confidence"] = features.genre_confidence
+
+    merged_metadata = dict(analysis_metadata or {})
+    merged_metadata.update(metadata)
+    merged_metadata["analyzers"] = {**(merged_metadata.get("analyzers") or {}), **analyzers}
+    values["analysis_metadata"] = merged_metadata
+
+    extracted = features.to_dict()
+    audio_features = dict((extra_metadata or {}).get("audio_features") or {})
+    for feature in analyzers:
+        for name in FEATURE_FIELDS[feature]:
+            audio_features[name] = extracted.get(name)
+    values["extra_metadata"] = {**(extra_metadata or {}), "audio_features": audio_features}
+    values["analyzed_at"] = datetime.now(timezone.utc)
+    return values
+
+
+class ReprocessRunner:
+    """Runs a ReprocessPlan: pooled analysis, batched bulk updates."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        workers: Optional[int] = None,
+        batch_size: int = 200,
+        executor: Optional[Executor] = None
+    ):
+        """
+        Initialize the runner.
+
+        Args:
+            session_factory: async_sessionmaker for the writer session
+            workers: Files analyzed in parallel (default: CPU count)
+            batch_size: Samples per bulk UPDATE
+            executor: Executor to analyze in (default: a process pool of `workers`)
+        """
+        self.session_factory = session_factory
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.executor = executor
+
+    async def run(
+        self,
+        plan: ReprocessPlan,
+        on_result: Optional[Callable[[ReprocessResult], None]] = None
+    ) -> List[ReprocessResult]:
+        """
+        Reprocess every planned sample.
+
+        Args:
+            plan: Samples and stale features from plan_reprocess
+            on_result: Called for each sample as its analysis finishes
+
+        Returns:
+            Results in completion order
+        """
+        if not plan.samples:
+            return []
+
+        executor = self.executor or ProcessPoolExecutor(max_workers=self.workers)
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(self.workers * 2)
+
+        async def analyze(sample: PlannedSample) -> ReprocessResult:
+            async with semaphore:
+                features, error = await loop.run_in_executor(
+                    executor, analyze_in_worker, sample.file_path, sample.features
+                )
+            return ReprocessResult(sample, features, error)
+
+        results: List[ReprocessResult] = []
+        pending: List[ReprocessResult] = []
+        tasks = [asyncio.create_task(analyze(sample)) for sample in plan.samples]
+        try:
+            async with self.session_factory() as session:
+                for task in asyncio.as_completed(tasks):
+                    result = await task
+                    results.append(result)
+                    if on_result:
+                        on_result(result)
+                    if result.features is not None:
+                        pending.append(result)
+                    if len(pending) >= self.batch_size:
+                        await self._write_batch(session, pending)
+                        pending = []
+                await self._write_batch(session, pending)
+        finally:
+            for task in tasks:
+                task.cancel()
+            if self.executor is None:
+                executor.shutdown(wait=True, cancel_futures=True)
+        return results
+
+    async def _write_batch(self, session: AsyncSession, batch: List[ReprocessResult]) -> None:
+        """Merge a batch of results into their samples with one bulk UPDATE."""
+        if not batch:
+            return
+        ids = [result.sample.id for result in batch]
+        current = {
+            row.id: row
+            for row in await session.execute(
+                select(Sample.id, Sample.analysis_metadata, Sample.extra_metadata).where(Sample.id.in_(ids))
+            )
+        }
+        updates = [
+            build_update(
+                result.sample.id,
+                result.features,
+                current[result.sample.id].analysis_metadata,
+                current[result.sample.id].extra_metadata
+            )
+            for result in batch
+            if result.sample.id in current
+        ]
+        if updates:
+            await session.execute(update(Sample), updates)
+        await session.commit()
+        logger.info(f"Reprocessed batch of {len(updates)} samples")
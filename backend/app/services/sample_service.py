@@ -2,9 +2,9 @@
 Sample service implementation
 Following TDD - implementing to pass the tests
 """
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_, func
+from sqlalchemy import select, and_, or_, func, update, delete, insert
 from sqlalchemy.orm import selectinload
 from fastapi import UploadFile
 import os
@@ -13,8 +13,29 @@ from datetime import datetime
 import uuid
 
 from app.models.sample import Sample
-from app.schemas.sample import SampleCreate, SampleUpdate
+from app.models.api_usage import ApiUsage
+from app.models.collection import Collection, CollectionSample
+from app.models.kit import KitSample
+from app.models.sample_embedding import SampleEmbedding
+from app.models.sample_source import SampleSource
+from app.models.vibe_analysis import VibeAnalysis
+from app.schemas.sample import SampleCreate, SampleUpdate, SampleBulkUpdate
 from app.core.config import settings
+from app.core.http_cache import latest
+
+
+# Columns that list endpoints may project with `fields=`
+SAMPLE_PROJECTABLE_FIELDS = (
+    "id", "user_id", "title", "genre", "bpm", "musical_key", "tags",
+    "duration", "file_size", "file_path", "created_at", "analyzed_at",
+    "bpm_confidence", "genre_confidence", "key_confidence",
+    "loudness_lufs", "true_peak_dbtp", "loudness_range_lu",
+)
+
+# Columns returned by `view=summary`
+SAMPLE_SUMMARY_FIELDS = (
+    "id", "title", "genre", "bpm", "musical_key", "duration", "tags", "created_at",
+)
 
 
 class SampleService:
@@ -53,13 +74,17 @@ class SampleService:
         self.db.add(db_sample)
         await self.db.commit()
         await self.db.refresh(db_sample)
+
+        if settings.RENDITION_PRERENDER_ON_INGEST and settings.RENDITION_CACHE_ENABLED:
+            from app.services.rendition_cache import schedule_prerender
+            schedule_prerender(file_path)
         
         return db_sample
     
     async def _save_file(self, file: UploadFile, user_id: int) -> str:
         """Save uploaded file to disk."""
-        # Create user directory
-        user_dir = os.path.join(settings.UPLOAD_DIR, str(user_id))
+        # Create user directory (absolute, so file_path is the same from any process)
+        user_dir = os.path.join(os.path.abspath(settings.UPLOAD_DIR), str(user_id))
         os.makedirs(user_dir, exist_ok=True)
         
         # Generate unique filename
@@ -91,18 +116,57 @@ class SampleService:
         self,
         user_id: Optional[int] = None,
         skip: int = 0,
-        limit: int = 100
-    ) -> List[Sample]:
-        """Get samples for a user with pagination."""
-        query = select(Sample)
-        
+        limit: int = 100,
+        fields: Optional[Sequence[str]] = None,
+        with_relationships: bool = True,
+    ) -> List[Any]:
+        """
+        Get samples for a user with pagination.
+
+        When `fields` is given only those columns are selected and plain
+        dicts are returned; otherwise full Sample objects are returned with
+        their collections and source loaded (unless with_relationships is
+        False).
+        """
+        query = self._base_list_query(fields, with_relationships)
+
         # Only filter by user if user_id provided
         if user_id is not None:
             query = query.where(Sample.user_id == user_id)
-        
+
         query = query.order_by(Sample.created_at.desc()).offset(skip).limit(limit)
-        
+
+        return await self._execute_list_query(query, fields)
+
+    def _base_list_query(
+        self,
+        fields: Optional[Sequence[str]] = None,
+        with_relationships: bool = True
+    ):
+        """Build the SELECT for list queries, either projected or full."""
+        if fields:
+            unknown = [name for name in fields if name not in SAMPLE_PROJECTABLE_FIELDS]
+            if unknown:
+                raise ValueError(f"Unknown sample fields: {', '.join(unknown)}")
+            return select(*(getattr(Sample, name) for name in fields))
+
+        if not with_relationships:
+            return select(Sample)
+
+        return select(Sample).options(
+            selectinload(Sample.collections),
+            selectinload(Sample.source),
+        )
+
+    async def _execute_list_query(
+        self,
+        query,
+        fields: Optional[Sequence[str]] = None
+    ) -> List[Any]:
+        """Run a query built by _base_list_query()."""
         result = await self.db.execute(query)
+        if fields:
+            return [dict(row) for row in result.mappings().all()]
         return result.scalars().all()
     
     async def count_user_samples(self, user_id: Optional[int] = None) -> int:
@@ -116,6 +180,43 @@ class SampleService:
         result = await self.db.execute(query)
         return result.scalar() or 0
     
+    async def get_list_version(
+        self,
+        user_id: Optional[int] = None
+    ) -> Tuple[int, Optional[int], Optional[datetime]]:
+        """
+        Summarize the state of a user's samples (all samples when user_id is None).
+
+        Returns (count, max id, latest created/updated/analyzed timestamp).
+        Any insert, delete, edit or re-analysis changes at least one value,
+        which makes the tuple usable as a list ETag without loading rows.
+        """
+        query = select(
+            func.count(Sample.id),
+            func.max(Sample.id),
+            func.max(Sample.created_at),
+            func.max(Sample.updated_at),
+            func.max(Sample.analyzed_at),
+        )
+        if user_id is not None:
+            query = query.where(Sample.user_id == user_id)
+
+        count, max_id, created, updated, analyzed = (await self.db.execute(query)).one()
+        return count or 0, max_id, latest([created, updated, analyzed])
+
+    async def get_sample_file(
+        self,
+        sample_id: int,
+        user_id: Optional[int] = None
+    ) -> Optional[Tuple[str, str]]:
+        """Get (title, file_path) for a download without loading the full row."""
+        query = select(Sample.title, Sample.file_path).where(Sample.id == sample_id)
+        if user_id is not None:
+            query = query.where(Sample.user_id == user_id)
+
+        row = (await self.db.execute(query)).first()
+        return (row.title, row.file_path) if row else None
+
     async def count_all_samples(self) -> int:
         """Count total samples across all users."""
         result = await self.db.execute(
@@ -133,10 +234,12 @@ class SampleService:
         instrument_type: Optional[str] = None,
         sample_type: Optional[str] = None,
         skip: int = 0,
-        limit: int = 100
-    ) -> List[Sample]:
-        """Search samples with filters."""
-        query = select(Sample)
+        limit: int = 100,
+        fields: Optional[Sequence[str]] = None,
+        with_relationships: bool = True,
+    ) -> List[Any]:
+        """Search samples with filters. See get_samples() for `fields`."""
+        query = self._base_list_query(fields, with_relationships)
 
         # Only filter by user if user_id provided
         if user_id is not None:
@@ -195,9 +298,8 @@ class SampleService:
 
         query = query.order_by(Sample.created_at.desc()).offset(skip).limit(limit)
 
-        result = await self.db.execute(query)
-        return result.scalars().all()
-    
+        return await self._execute_list_query(query, fields)
+
     async def update_sample(
         self,
         sample_id: int,
@@ -235,57 +337,241 @@ class SampleService:
         await self.db.commit()
         
         return True
-    
-    async def analyze_sample(self, sample_id: int, queue = None) -> str:
-        """Queue a sample for analysis."""
-        job_id = f"job_{sample_id}_{uuid.uuid4().hex[:8]}"
-        
+
+    # BULK OPERATIONS
+    # Each bulk method runs a single ownership query, then set-based
+    # UPDATE/DELETE/INSERT statements, and commits once.
+
+    async def _get_owned_rows(self, sample_ids: List[int], user_id: int, *columns):
+        """Return rows for the user's samples among sample_ids, plus the IDs not found."""
+        requested = list(dict.fromkeys(sample_ids))
+        result = await self.db.execute(
+            select(Sample.id, *columns).where(
+                and_(Sample.id.in_(requested), Sample.user_id == user_id)
+            )
+        )
+        rows = result.all()
+        found = {row.id for row in rows}
+        not_found = [sample_id for sample_id in requested if sample_id not in found]
+        return rows, not_found
+
+    async def bulk_get_samples(
+        self,
+        sample_ids: List[int],
+        user_id: int
+    ) -> Tuple[List[Sample], List[int]]:
+        """Get many samples in one query, preserving request order."""
+        requested = list(dict.fromkeys(sample_ids))
+        result = await self.db.execute(
+            select(Sample)
+            .where(and_(Sample.id.in_(requested), Sample.user_id == user_id))
+            .options(selectinload(Sample.vibe_analysis))
+        )
+        by_id = {sample.id: sample for sample in result.scalars().all()}
+
+        samples = [by_id[sample_id] for sample_id in requested if sample_id in by_id]
+        not_found = [sample_id for sample_id in requested if sample_id not in by_id]
+        return samples, not_found
+
+    async def bulk_update_samples(
+        self,
+        update_data: SampleBulkUpdate,
+        user_id: int
+    ) -> Tuple[List[int], List[int]]:
+        """
+        Apply one set of changes to many samples.
+
+        Returns:
+            Tuple of (updated sample IDs, requested IDs not found for this user)
+
+        Raises:
+            ValueError: If a referenced collection is missing, not owned or smart
+        """
+        rows, not_found = await self._get_owned_rows(
+            update_data.sample_ids, user_id, Sample.tags
+        )
+        sample_ids = [row.id for row in rows]
+        if not sample_ids:
+            return [], not_found
+
+        # Scalar fields: one UPDATE for all samples
+        scalar_fields = {"genre", "bpm", "musical_key", "tags"}
+        values = {
+            field: getattr(update_data, field)
+            for field in scalar_fields & update_data.model_fields_set
+        }
+        if values.get("tags") is None:
+            values.pop("tags", None)
+        if values:
+            await self.db.execute(
+                update(Sample).where(Sample.id.in_(sample_ids)).values(**values)
+            )
+
+        # Tag edits: one UPDATE per distinct resulting tag list
+        if update_data.add_tags or update_data.remove_tags:
+            groups: Dict[Tuple[str, ...], List[int]] = {}
+            for row in rows:
+                current = values["tags"] if "tags" in values else (row.tags or [])
+                new_tags = [t for t in current if t not in update_data.remove_tags]
+                new_tags += [t for t in update_data.add_tags if t not in new_tags]
+                groups.setdefault(tuple(new_tags), []).append(row.id)
+
+            for new_tags, ids in groups.items():
+                await self.db.execute(
+                    update(Sample).where(Sample.id.in_(ids)).values(tags=list(new_tags))
+                )
+
+        # Collection membership
+        collection_ids = set(update_data.add_to_collections) | set(update_data.remove_from_collections)
+        if collection_ids:
+            await self._check_manual_collections(collection_ids, user_id)
+
+            if update_data.remove_from_collections:
+                await self.db.execute(
+                    delete(CollectionSample).where(
+                        and_(
+                            CollectionSample.collection_id.in_(update_data.remove_from_collections),
+                            CollectionSample.sample_id.in_(sample_ids)
+                        )
+                    )
+                )
+
+            if update_data.add_to_collections:
+                existing = await self.db.execute(
+                    select(CollectionSample.collection_id, CollectionSample.sample_id).where(
+                        and_(
+                            CollectionSample.collection_id.in_(update_data.add_to_collections),
+                            CollectionSample.sample_id.in_(sample_ids)
+                        )
+                    )
+                )
+                existing_pairs = set(existing.all())
+                new_rows = [
+                    {"collection_id": collection_id, "sample_id": sample_id}
+                    for collection_id in dict.fromkeys(update_data.add_to_collections)
+                    for sample_id in sample_ids
+                    if (collection_id, sample_id) not in existing_pairs
+                ]
+                if new_rows:
+                    await self.db.execute(insert(CollectionSample), new_rows)
+
+            await self._refresh_collection_counts(collection_ids)
+
+        await self.db.commit()
+        return sample_ids, not_found
+
+    async def bulk_delete_samples(
+        self,
+        sample_ids: List[int],
+        user_id: int
+    ) -> Tuple[List[int], List[int]]:
+        """
+        Delete many samples and their dependent rows, then their files.
+
+        Mirrors the ORM cascades on Sample with one DELETE per table.
+
+        Returns:
+            Tuple of (deleted sample IDs, requested IDs not found for this user)
+        """
+        rows, not_found = await self._get_owned_rows(sample_ids, user_id, Sample.file_path)
+        ids = [row.id for row in rows]
+        if not ids:
+            return [], not_found
+
+        affected_collections = await self.db.execute(
+            select(CollectionSample.collection_id)
+            .where(CollectionSample.sample_id.in_(ids))
+            .distinct()
+        )
+        collection_ids = set(affected_collections.scalars().all())
+
+        for model in (VibeAnalysis, KitSample, ApiUsage, SampleSource, SampleEmbedding, CollectionSample):
+            await self.db.execute(delete(model).where(model.sample_id.in_(ids)))
+        await self.db.execute(delete(Sample).where(Sample.id.in_(ids)))
+
+        if collection_ids:
+            await self._refresh_collection_counts(collection_ids)
+
+        await self.db.commit()
+
+        # Remove files only once the rows are gone
+        for row in rows:
+            if row.file_path and os.path.exists(row.file_path):
+                os.remove(row.file_path)
+
+        return ids, not_found
+
+    async def _check_manual_collections(self, collection_ids, user_id: int) -> None:
+        """Ensure all collections exist, belong to the user and are not smart."""
+        result = await self.db.execute(
+            select(Collection.id, Collection.is_smart).where(
+                and_(Collection.id.in_(collection_ids), Collection.user_id == user_id)
+            )
+        )
+        rows = result.all()
+        if len(rows) != len(set(collection_ids)):
+            raise ValueError("Some collections not found or unauthorized")
+        if any(row.is_smart for row in rows):
+            raise ValueError("Cannot manually change samples of a smart collection")
+
+    async def _refresh_collection_counts(self, collection_ids) -> None:
+        """Recompute denormalized Collection.sample_count in one UPDATE."""
+        count_subquery = (
+            select(func.count(CollectionSample.sample_id))
+            .where(CollectionSample.collection_id == Collection.id)
+            .scalar_subquery()
+        )
+        await self.db.execute(
+            update(Collection)
+            .where(Collection.id.in_(collection_ids))
+            .values(sample_count=count_subquery, updated_at=func.now())
+            .execution_options(synchronize_session=False)
+        )
+
+    async def analyze_sample(self, sample_id: int) -> str:
+        """Queue a sample for vibe analysis on the durable job queue."""
+        from app.services.job_queue import enqueue_job
+
         # Get the sample
         sample = await self.get_sample_by_id(sample_id, user_id=None)
         if not sample:
             raise ValueError(f"Sample {sample_id} not found")
-        
-        # Start background analysis task
-        import asyncio
-        asyncio.create_task(self._perform_analysis(sample, job_id))
-        
-        return job_id
-    
+
+        job = await enqueue_job(
+            self.db, "sample.vibe", {"sample_id": sample_id}, queue="vibe", user_id=sample.user_id
+        )
+        return job.id
+
     async def _perform_analysis(self, sample, job_id: str):
-        """Perform the actual AI analysis in background."""
-        try:
-            # Import vibe analysis agent
-            import sys
-            import os
-            sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
-            
-            from src.agents.vibe_analysis import VibeAnalysisAgent
-            
-            # Create agent instance
-            agent = VibeAnalysisAgent()
-            
-            # Check if API key is configured
-            if not agent.api_key or agent.api_key == "your-openrouter-api-key-here":
-                raise ValueError("OpenRouter API key not configured. Please set OPENROUTER_API_KEY in .env file")
-            
-            # Prepare sample data for analysis
-            sample_data = {
-                'filename': os.path.basename(sample.file_path),
-                'bpm': sample.bpm or 120,  # Default BPM if not set
-                'key': sample.musical_key or 'C',  # Default key if not set
-                'spectral_centroid': 'unknown'  # Could add audio analysis later
-            }
-            
-            # Perform vibe analysis
-            vibe_result = await agent.analyze_vibe(sample_data)
-            
-            # Update the sample with analysis results
-            await self._save_vibe_analysis(sample.id, vibe_result, job_id)
-            
-        except Exception as e:
-            print(f"Analysis failed for sample {sample.id}: {str(e)}")
-            # Could update sample with error status here
-    
+        """Perform the actual AI analysis (run by the "sample.vibe" job handler)."""
+        # Import vibe analysis agent
+        import sys
+        import os
+        sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+
+        from src.agents.vibe_analysis import VibeAnalysisAgent
+
+        # Create agent instance
+        agent = VibeAnalysisAgent()
+
+        # Check if API key is configured
+        if not agent.api_key or agent.api_key == "your-openrouter-api-key-here":
+            raise ValueError("OpenRouter API key not configured. Please set OPENROUTER_API_KEY in .env file")
+
+        # Prepare sample data for analysis
+        sample_data = {
+            'filename': os.path.basename(sample.file_path),
+            'bpm': sample.bpm or 120,  # Default BPM if not set
+            'key': sample.musical_key or 'C',  # Default key if not set
+            'spectral_centroid': 'unknown'  # Could add audio analysis later
+        }
+
+        # Perform vibe analysis
+        vibe_result = await agent.analyze_vibe(sample_data)
+
+        # Update the sample with analysis results
+        await self._save_vibe_analysis(sample.id, vibe_result, job_id)
+
     async def _save_vibe_analysis(self, sample_id: int, vibe_result, job_id: str):
         """Save vibe analysis results to database."""
         from sqlalchemy import update
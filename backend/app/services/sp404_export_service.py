@@ -5,26 +5,31 @@ Provides comprehensive export functionality including format conversion,
 validation, filename sanitization, and organization strategies.
 """
 import asyncio
+import csv
+import io
+import json
 import logging
 import os
 import re
+import tempfile
 import time
 import unicodedata
 from pathlib import Path
-from typing import List, Optional
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple, Union
 from datetime import datetime, timezone
 
 try:
     import librosa
     import soundfile as sf
-    import numpy as np
+    from app.utils.loudness import normalization_gain_db
     AUDIO_LIBS_AVAILABLE = True
 except ImportError:
     AUDIO_LIBS_AVAILABLE = False
 
-from sqlalchemy import select
+from sqlalchemy import insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.models.sample import Sample
 from app.models.kit import Kit, KitSample
 from app.models.sp404_export import SP404Export, SP404ExportSample
@@ -34,10 +39,27 @@ from app.schemas.sp404_export import (
     ValidationResult,
     ExportResult,
     BatchExportResult,
+    ExportSyncResult,
 )
+from app.services.export_executor import (
+    ConversionJob,
+    convert_audio_file,
+    get_export_executor,
+)
+from app.services.export_sync import SyncPlan, apply_sync, plan_keyed_sync, sync_result
+from app.services.rendition_cache import (
+    RenditionSpec,
+    gain_normalization,
+    get_rendition_cache,
+    hash_file,
+)
+from app.utils.zip_stream import ZipStream
 
 logger = logging.getLogger(__name__)
 
+# Called with each per-file ExportResult as soon as that file is finished
+ResultCallback = Callable[[ExportResult], Union[None, Awaitable[None]]]
+
 
 class SP404ExportError(Exception):
     """Base exception for SP-404 export errors."""
@@ -76,6 +98,15 @@ class SP404ExportService:
         (150, 300, "fast")
     ]
 
+    # Consolidated manifest written once per batch/kit export
+    MANIFEST_BASENAME = "export_manifest"
+    MANIFEST_COLUMNS = [
+        "sample_id", "path", "title", "genre", "bpm", "musical_key",
+        "bank", "pad", "success", "file_size_bytes", "original_format",
+        "original_sample_rate", "original_duration", "loudness_lufs",
+        "gain_db", "error",
+    ]
+
     def __init__(self, db_session: Optional[AsyncSession]):
         """
         Initialize SP404ExportService.
@@ -94,22 +125,48 @@ class SP404ExportService:
 
         self.db = db_session
 
+    @staticmethod
+    def loudness_gain_db(
+        sample: Sample,
+        target_lufs: Optional[float],
+        true_peak_ceiling: float = -1.0
+    ) -> float:
+        """
+        Gain (dB) matching a sample to `target_lufs` from its stored loudness.
+
+        Returns 0 dB when no target is set or the sample has not been
+        analyzed, so those samples keep their source level.
+        """
+        if target_lufs is None:
+            return 0.0
+        if sample.loudness_lufs is None:
+            logger.warning(
+                f"Sample {sample.id} has no loudness analysis; exporting at source level"
+            )
+        return normalization_gain_db(
+            sample.loudness_lufs, sample.true_peak_dbtp, target_lufs, true_peak_ceiling
+        )
+
     async def convert_to_sp404_format(
         self,
         input_path: Path,
         output_path: Path,
-        format: str = "wav"
+        format: str = "wav",
+        gain_db: float = 0.0
     ) -> ConversionResult:
         """
         Convert audio file to SP-404MK2 compatible format (48kHz/16-bit).
 
-        Uses librosa for sample rate conversion and soundfile for writing.
+        Uses the shared resampling module (soxr presets) and soundfile for writing.
         Runs CPU-intensive work in thread pool to avoid blocking event loop.
+        Renditions already in the rendition cache are linked into place
+        instead of being converted again.
 
         Args:
             input_path: Path to input audio file
             output_path: Path where converted file will be saved
             format: Output format - "wav" or "aiff"
+            gain_db: Gain applied while resampling (see loudness_gain_db)
 
         Returns:
             ConversionResult with details about the conversion
@@ -136,13 +193,30 @@ class SP404ExportService:
             )
 
         try:
+            cache = get_rendition_cache()
+            spec = RenditionSpec(
+                format=format,
+                sample_rate=self.TARGET_SAMPLE_RATE,
+                quality=settings.EXPORT_RESAMPLE_QUALITY,
+                normalization=gain_normalization(gain_db),
+            )
+            key = None
+            if cache is not None:
+                key, cached = await asyncio.to_thread(cache.fetch, input_path, spec, output_path)
+                if cached is not None:
+                    logger.debug(f"Rendition cache hit for {input_path.name}")
+                    return cached
+
             # Run conversion in thread pool (CPU-intensive)
             result = await asyncio.to_thread(
                 self._convert_sync,
                 input_path,
                 output_path,
-                format
+                format,
+                gain_db
             )
+            if key is not None:
+                await asyncio.to_thread(cache.store, key, spec, output_path, result)
 
             logger.info(
                 f"Converted {input_path.name}: "
@@ -166,7 +240,8 @@ class SP404ExportService:
         self,
         input_path: Path,
         output_path: Path,
-        format: str
+        format: str,
+        gain_db: float = 0.0
     ) -> ConversionResult:
         """
         Synchronous audio conversion (runs in thread pool).
@@ -175,71 +250,18 @@ class SP404ExportService:
             input_path: Input audio file
             output_path: Output file path
             format: Output format (wav/aiff)
+            gain_db: Gain applied while resampling
 
         Returns:
             ConversionResult with conversion details
         """
-        # Load audio file with librosa
-        y, sr = librosa.load(str(input_path), sr=None, mono=False)
-
-        # Store original properties
-        original_format = input_path.suffix.lower()
-        original_sr = sr
-
-        # Calculate original duration
-        if y.ndim > 1:
-            # Stereo - use first channel for duration
-            original_duration = len(y[0]) / sr
-        else:
-            original_duration = len(y) / sr
-
-        # Resample if needed
-        if sr != self.TARGET_SAMPLE_RATE:
-            if y.ndim > 1:
-                # Resample each channel separately for stereo
-                y_resampled = np.array([
-                    librosa.resample(
-                        y[ch],
-                        orig_sr=sr,
-                        target_sr=self.TARGET_SAMPLE_RATE
-                    )
-                    for ch in range(y.shape[0])
-                ])
-            else:
-                # Mono resampling
-                y_resampled = librosa.resample(
-                    y,
-                    orig_sr=sr,
-                    target_sr=self.TARGET_SAMPLE_RATE
-                )
-            y = y_resampled
-            sr = self.TARGET_SAMPLE_RATE
-
-        # Ensure output directory exists
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-
-        # Transpose for soundfile (expects time x channels for stereo)
-        if y.ndim > 1:
-            y_transposed = y.T
-        else:
-            y_transposed = y
-
-        # Write with soundfile (automatically handles 16-bit conversion)
-        sf.write(
-            str(output_path),
-            y_transposed,
-            sr,
-            subtype='PCM_16',  # 16-bit PCM
-            format=format.upper()
-        )
-
-        return ConversionResult(
-            success=True,
-            output_path=output_path,
-            original_format=original_format,
-            original_sample_rate=original_sr,
-            original_duration=original_duration,
-            converted_sample_rate=self.TARGET_SAMPLE_RATE,
+        return convert_audio_file(
+            input_path,
+            output_path,
+            format,
+            self.TARGET_SAMPLE_RATE,
+            settings.EXPORT_RESAMPLE_QUALITY,
+            gain_db
         )
 
     def validate_sample(self, file_path: Path) -> ValidationResult:
@@ -436,7 +458,75 @@ class SP404ExportService:
                 error=f"Validation failed: {', '.join(validation.errors)}"
             )
 
-        # 3. Sanitize filename - use sample title if available
+        # 3-4. Sanitize filename and determine output path
+        output_path, output_filename, sanitized_stem = self._plan_sample_export(sample, config)
+
+        # 5. Convert
+        conversion = await self.convert_to_sp404_format(
+            input_path,
+            output_path / output_filename,
+            config.format,
+            self.loudness_gain_db(sample, config.target_lufs, config.true_peak_ceiling)
+        )
+
+        # 6-7. Collect file size and optionally create metadata file
+        export_result = await self._finish_sample_export(
+            sample,
+            config,
+            conversion,
+            output_path,
+            output_filename,
+            sanitized_stem,
+            time.time() - start_time
+        )
+        if not export_result.success:
+            return export_result
+
+        file_size = export_result.file_size_bytes
+        duration_seconds = export_result.conversion_time_seconds
+
+        # 8. Track export in database (only if requested)
+        if track_export:
+            await self._create_export_record(
+                export_type="single",
+                sample_count=1,
+                output_path=str(output_path),
+                organized_by=config.organize_by,
+                format=config.format,
+                total_size_bytes=file_size,
+                export_duration_seconds=duration_seconds,
+                results=[ExportResult(
+                    success=True,
+                    sample_id=sample_id,
+                    output_path=str(output_path),
+                    output_filename=output_filename,
+                    format=config.format,
+                    file_size_bytes=file_size,
+                    conversion_time_seconds=duration_seconds
+                )],
+                db=db
+            )
+
+        return export_result
+
+    def _plan_sample_export(
+        self,
+        sample: Sample,
+        config: ExportConfig
+    ) -> Tuple[Path, str, str]:
+        """
+        Work out where a sample will be exported.
+
+        Args:
+            sample: Sample being exported
+            config: Export configuration
+
+        Returns:
+            Tuple of (output directory, output filename, sanitized stem)
+        """
+        input_path = Path(sample.file_path)
+
+        # Sanitize filename - use sample title if available
         if sample.title:
             base_name = sample.title
         else:
@@ -451,7 +541,7 @@ class SP404ExportService:
         # Append format extension
         output_filename = f"{sanitized_stem}.{config.format}"
 
-        # 4. Determine output path
+        # Determine output path
         output_base = Path(config.output_base_path or "/tmp/sp404_exports")
         output_path = self._organize_export_path(
             output_base,
@@ -459,19 +549,37 @@ class SP404ExportService:
             config.organize_by
         )
 
-        full_output_path = output_path / output_filename
+        return output_path, output_filename, sanitized_stem
 
-        # 5. Convert
-        conversion = await self.convert_to_sp404_format(
-            input_path,
-            full_output_path,
-            config.format
-        )
+    async def _finish_sample_export(
+        self,
+        sample: Sample,
+        config: ExportConfig,
+        conversion: ConversionResult,
+        output_path: Path,
+        output_filename: str,
+        sanitized_stem: str,
+        duration_seconds: float
+    ) -> ExportResult:
+        """
+        Build the ExportResult for a converted sample.
 
+        Args:
+            sample: Sample that was exported
+            config: Export configuration
+            conversion: Result of the audio conversion
+            output_path: Output directory
+            output_filename: Output filename
+            sanitized_stem: Filename stem (used for the metadata file)
+            duration_seconds: Time spent exporting this sample
+
+        Returns:
+            ExportResult for the sample
+        """
         if not conversion.success:
             return ExportResult(
                 success=False,
-                sample_id=sample_id,
+                sample_id=sample.id,
                 output_path=str(output_path),
                 output_filename=output_filename,
                 format=config.format,
@@ -480,13 +588,10 @@ class SP404ExportService:
                 error=conversion.error_message
             )
 
-        # 6. Get file size
-        file_size = full_output_path.stat().st_size
-
-        # Calculate duration
-        duration_seconds = time.time() - start_time
+        # Get file size
+        file_size = (output_path / output_filename).stat().st_size
 
-        # 7. Optionally create metadata file
+        # Optionally create metadata file
         metadata_created = False
         if config.include_metadata:
             metadata_path = output_path / f"{sanitized_stem}_metadata.txt"
@@ -497,31 +602,9 @@ class SP404ExportService:
             )
             metadata_created = True
 
-        # 8. Track export in database (only if requested)
-        if track_export:
-            await self._create_export_record(
-                export_type="single",
-                sample_count=1,
-                output_path=str(output_path),
-                organized_by=config.organize_by,
-                format=config.format,
-                total_size_bytes=file_size,
-                export_duration_seconds=duration_seconds,
-                results=[ExportResult(
-                    success=True,
-                    sample_id=sample_id,
-                    output_path=str(output_path),
-                    output_filename=output_filename,
-                    format=config.format,
-                    file_size_bytes=file_size,
-                    conversion_time_seconds=duration_seconds
-                )],
-                db=db
-            )
-
         return ExportResult(
             success=True,
-            sample_id=sample_id,
+            sample_id=sample.id,
             output_path=str(output_path),
             output_filename=output_filename,
             format=config.format,
@@ -530,22 +613,45 @@ class SP404ExportService:
             metadata_file_created=metadata_created
         )
 
+    async def _load_samples(self, sample_ids: List[int], db: AsyncSession) -> Dict[int, Sample]:
+        """Load all requested samples in one query, keyed by ID."""
+        if not sample_ids:
+            return {}
+        result = await db.execute(select(Sample).where(Sample.id.in_(set(sample_ids))))
+        return {sample.id: sample for sample in result.scalars().all()}
+
+    @staticmethod
+    async def _emit(on_result: Optional[ResultCallback], result: ExportResult) -> None:
+        """Hand a finished per-file result to the caller's callback."""
+        if on_result is None:
+            return
+        outcome = on_result(result)
+        if asyncio.iscoroutine(outcome):
+            await outcome
+
     async def export_batch(
         self,
         sample_ids: List[int],
         config: ExportConfig,
-        db: Optional[AsyncSession] = None
+        db: Optional[AsyncSession] = None,
+        on_result: Optional[ResultCallback] = None,
+        track_export: bool = True
     ) -> BatchExportResult:
         """
         Export multiple samples with organization.
 
-        Processes all samples and aggregates results. Continues on error
-        to export as many samples as possible.
+        Loads all samples in one query, then converts them in parallel on
+        the shared export executor. Continues on error to export as many
+        samples as possible. Results and errors are reported in request
+        order regardless of which conversion finishes first.
 
         Args:
             sample_ids: List of sample IDs to export
             config: Export configuration
             db: Database session (uses self.db if not provided)
+            on_result: Optional callback receiving each ExportResult as soon
+                as that sample is finished
+            track_export: Whether to create an export record in the database
 
         Returns:
             BatchExportResult with aggregated statistics
@@ -555,42 +661,108 @@ class SP404ExportService:
 
         start_time = time.time()
 
-        results = []
-        errors = []
-        successful = 0
-        failed = 0
-        total_size = 0
-
         output_base = Path(config.output_base_path or "/tmp/sp404_exports")
+        samples = await self._load_samples(sample_ids, db)
+
+        # One slot per requested ID so the aggregate keeps request order
+        slot_results: List[Optional[ExportResult]] = [None] * len(sample_ids)
+        slot_errors: List[Optional[str]] = [None] * len(sample_ids)
+        slot_rows: List[Optional[dict]] = [None] * len(sample_ids)
+
+        # Requests that resolve to the same output file share one conversion
+        jobs: Dict[Path, ConversionJob] = {}
+        for index, sample_id in enumerate(sample_ids):
+            sample = samples.get(sample_id)
+            if sample is None:
+                slot_errors[index] = f"Sample {sample_id}: Sample {sample_id} not found"
+                logger.error(f"Failed to export sample {sample_id}: not found")
+                continue
 
-        for sample_id in sample_ids:
             try:
-                # Don't track individual exports - we'll track the batch
-                result = await self.export_single_sample(sample_id, config, db, track_export=False)
-                results.append(result)
+                validation = self.validate_sample(Path(sample.file_path))
+                if not validation.valid:
+                    result = ExportResult(
+                        success=False,
+                        sample_id=sample_id,
+                        output_path="",
+                        output_filename="",
+                        format=config.format,
+                        file_size_bytes=0,
+                        conversion_time_seconds=0,
+                        error=f"Validation failed: {', '.join(validation.errors)}"
+                    )
+                    slot_results[index] = result
+                    slot_errors[index] = f"Sample {sample_id}: {result.error}"
+                    await self._emit(on_result, result)
+                    continue
 
-                if result.success:
-                    successful += 1
-                    total_size += result.file_size_bytes
-                else:
-                    failed += 1
-                    if result.error:
-                        errors.append(f"Sample {sample_id}: {result.error}")
+                output_path, output_filename, sanitized_stem = self._plan_sample_export(sample, config)
+                full_output_path = output_path / output_filename
+                job = jobs.get(full_output_path)
+                if job is None:
+                    job = jobs[full_output_path] = ConversionJob(
+                        key=full_output_path,
+                        input_path=Path(sample.file_path),
+                        output_path=full_output_path,
+                        format=config.format,
+                        target_sample_rate=self.TARGET_SAMPLE_RATE,
+                        gain_db=self.loudness_gain_db(
+                            sample, config.target_lufs, config.true_peak_ceiling
+                        ),
+                        context={"slots": []}
+                    )
+                job.context["slots"].append((index, sample, output_path, output_filename, sanitized_stem))
 
             except Exception as e:
-                failed += 1
-                error_msg = f"Sample {sample_id}: {str(e)}"
-                errors.append(error_msg)
+                slot_errors[index] = f"Sample {sample_id}: {str(e)}"
                 logger.error(f"Failed to export sample {sample_id}: {e}")
 
+        async for outcome in get_export_executor().convert_all(jobs.values()):
+            for index, sample, output_path, output_filename, sanitized_stem in outcome.job.context["slots"]:
+                try:
+                    result = await self._finish_sample_export(
+                        sample,
+                        config,
+                        outcome.result,
+                        output_path,
+                        output_filename,
+                        sanitized_stem,
+                        outcome.elapsed_seconds
+                    )
+                except Exception as e:
+                    slot_errors[index] = f"Sample {sample.id}: {str(e)}"
+                    logger.error(f"Failed to export sample {sample.id}: {e}")
+                    continue
+
+                slot_results[index] = result
+                slot_rows[index] = self._manifest_row(
+                    sample, result, outcome.result, output_path / output_filename, output_base
+                )
+                if not result.success and result.error:
+                    slot_errors[index] = f"Sample {sample.id}: {result.error}"
+                await self._emit(on_result, result)
+
+        results = [result for result in slot_results if result is not None]
+        errors = [error for error in slot_errors if error is not None]
+        successful = sum(1 for result in results if result.success)
+        failed = len(sample_ids) - successful
+        total_size = sum(result.file_size_bytes for result in results if result.success)
+
         # Calculate total time
         total_time = time.time() - start_time
 
         # Calculate averages
         avg_time = total_time / len(sample_ids) if sample_ids else 0
 
+        manifest_path = await self._write_manifest(
+            output_base,
+            config,
+            "batch",
+            [row for row in slot_rows if row is not None]
+        )
+
         # Track batch export in database
-        if successful > 0:  # Only track if we exported at least one sample
+        if track_export and successful > 0:  # Only track if we exported at least one sample
             await self._create_export_record(
                 export_type="batch",
                 sample_count=len(sample_ids),
@@ -613,15 +785,64 @@ class SP404ExportService:
             total_samples=len(sample_ids),
             output_base_path=str(output_base),
             organized_by=config.organize_by,
+            manifest_path=str(manifest_path) if manifest_path else None,
             results=results,
             errors=errors
         )
 
+    async def _load_kit(
+        self,
+        kit_id: int,
+        db: AsyncSession
+    ) -> Tuple[Kit, List[Tuple[KitSample, Sample]]]:
+        """
+        Load a kit with its pad assignments and their samples.
+
+        Raises:
+            SP404ExportError: If the kit is missing or has no samples
+        """
+        stmt = select(Kit).where(Kit.id == kit_id)
+        result = await db.execute(stmt)
+        kit = result.scalar_one_or_none()
+
+        if not kit:
+            raise SP404ExportError(f"Kit {kit_id} not found")
+
+        # Get kit assignments and their samples in a single query
+        # (one row per pad, so a sample used on several pads appears once per pad)
+        stmt = (
+            select(KitSample, Sample)
+            .join(Sample, KitSample.sample_id == Sample.id)
+            .where(KitSample.kit_id == kit_id)
+            .order_by(KitSample.pad_bank, KitSample.pad_number)
+        )
+        result = await db.execute(stmt)
+        assignments = result.all()
+
+        if not assignments:
+            raise SP404ExportError(f"Kit {kit_id} has no samples")
+
+        return kit, assignments
+
+    def _kit_folder_name(self, kit: Kit) -> str:
+        """Folder a kit is exported into."""
+        return self.sanitize_filename(kit.name).replace('.', '')
+
+    def _kit_pad_path(self, kit_sample: KitSample, sample: Sample, config: ExportConfig) -> Path:
+        """Path of a pad's file relative to the kit folder."""
+        sanitized_name = self.sanitize_filename(Path(sample.file_path).stem)
+        if config.organize_by == "bank" or getattr(config, 'include_bank_layout', False):
+            # Bank organization with pad-numbered filenames
+            return Path(f"bank_{kit_sample.pad_bank}") / f"pad_{kit_sample.pad_number:02d}_{sanitized_name}.{config.format}"
+        # Kit organization (flat within kit folder)
+        return Path(f"{sanitized_name}.{config.format}")
+
     async def export_kit(
         self,
         kit_id: int,
         config: ExportConfig,
-        db: Optional[AsyncSession] = None
+        db: Optional[AsyncSession] = None,
+        on_result: Optional[ResultCallback] = None
     ) -> "KitExportResult":
         """
         Export entire kit with structure preservation.
@@ -639,10 +860,15 @@ class SP404ExportService:
               pad_02_sample.wav
               ...
 
+        Pad assignments and samples are loaded in one query and the
+        conversions run in parallel on the shared export executor.
+
         Args:
             kit_id: Database ID of kit to export
             config: Export configuration
             db: Database session (uses self.db if not provided)
+            on_result: Optional callback receiving a per-pad ExportResult as
+                soon as that pad is finished
 
         Returns:
             KitExportResult with kit export details
@@ -655,94 +881,100 @@ class SP404ExportService:
 
         start_time = time.time()
 
-        # Get kit
-        stmt = select(Kit).where(Kit.id == kit_id)
-        result = await db.execute(stmt)
-        kit = result.scalar_one_or_none()
-
-        if not kit:
-            raise SP404ExportError(f"Kit {kit_id} not found")
-
-        # Get kit samples
-        stmt = select(Sample).join(KitSample).where(KitSample.kit_id == kit_id)
-        result = await db.execute(stmt)
-        samples = result.scalars().all()
-
-        if not samples:
-            raise SP404ExportError(f"Kit {kit_id} has no samples")
+        kit, assignments = await self._load_kit(kit_id, db)
 
         # Create kit folder
         output_base = Path(config.output_base_path or "/tmp/sp404_exports")
-        sanitized_kit_name = self.sanitize_filename(kit.name).replace('.', '')
-        kit_folder = output_base / sanitized_kit_name
+        kit_folder = output_base / self._kit_folder_name(kit)
         kit_folder.mkdir(parents=True, exist_ok=True)
 
-        # Export samples
-        successful = 0
-        failed = 0
-        total_size = 0
-        error_list = []
+        # Plan every pad, then convert them in parallel
+        slot_sizes: List[Optional[int]] = [None] * len(assignments)
+        slot_errors: List[Optional[str]] = [None] * len(assignments)
+        slot_rows: List[Optional[dict]] = [None] * len(assignments)
+        jobs: Dict[Path, ConversionJob] = {}
 
-        for sample in samples:
+        for index, (kit_sample, sample) in enumerate(assignments):
             try:
-                # Get kit sample info for pad/bank
-                stmt = select(KitSample).where(
-                    KitSample.kit_id == kit_id,
-                    KitSample.sample_id == sample.id
-                )
-                result = await db.execute(stmt)
-                kit_sample = result.scalar_one_or_none()
-
-                if not kit_sample:
-                    failed += 1
-                    continue
-
                 # Determine output based on organization
-                if config.organize_by == "bank" or getattr(config, 'include_bank_layout', False):
-                    # Bank organization
-                    bank_folder = kit_folder / f"bank_{kit_sample.pad_bank}"
-                    bank_folder.mkdir(exist_ok=True)
-                    output_dir = bank_folder
-
-                    # Create pad-numbered filename
-                    input_path = Path(sample.file_path)
-                    sanitized_name = self.sanitize_filename(input_path.stem)
-                    output_filename = f"pad_{kit_sample.pad_number:02d}_{sanitized_name}.{config.format}"
-                else:
-                    # Kit organization (flat within kit folder)
-                    output_dir = kit_folder
-                    input_path = Path(sample.file_path)
-                    sanitized_name = self.sanitize_filename(input_path.stem)
-                    output_filename = f"{sanitized_name}.{config.format}"
-
-                output_path = output_dir / output_filename
+                input_path = Path(sample.file_path)
+                output_path = kit_folder / self._kit_pad_path(kit_sample, sample, config)
+                output_path.parent.mkdir(exist_ok=True)
 
                 # Validate
                 validation = self.validate_sample(Path(sample.file_path))
                 if not validation.valid:
-                    failed += 1
-                    error_list.append(f"Sample {sample.id} validation failed")
+                    slot_errors[index] = f"Sample {sample.id} validation failed"
+                    await self._emit(on_result, ExportResult(
+                        success=False,
+                        sample_id=sample.id,
+                        format=config.format,
+                        error=f"Validation failed: {', '.join(validation.errors)}"
+                    ))
                     continue
 
-                # Convert
-                conversion = await self.convert_to_sp404_format(
-                    Path(sample.file_path),
-                    output_path,
-                    config.format
-                )
-
-                if conversion.success:
-                    successful += 1
-                    total_size += output_path.stat().st_size
-                else:
-                    failed += 1
-                    error_list.append(f"Sample {sample.id} conversion failed")
+                job = jobs.get(output_path)
+                if job is None:
+                    job = jobs[output_path] = ConversionJob(
+                        key=output_path,
+                        input_path=input_path,
+                        output_path=output_path,
+                        format=config.format,
+                        target_sample_rate=self.TARGET_SAMPLE_RATE,
+                        gain_db=self.loudness_gain_db(
+                            sample, config.target_lufs, config.true_peak_ceiling
+                        ),
+                        context={"slots": []}
+                    )
+                job.context["slots"].append((index, sample))
 
             except Exception as e:
-                failed += 1
-                error_list.append(f"Sample {sample.id}: {str(e)}")
+                slot_errors[index] = f"Sample {sample.id}: {str(e)}"
                 logger.error(f"Failed to export kit sample {sample.id}: {e}")
 
+        async for outcome in get_export_executor().convert_all(jobs.values()):
+            output_path = outcome.job.output_path
+            for index, sample in outcome.job.context["slots"]:
+                try:
+                    if outcome.result.success:
+                        slot_sizes[index] = output_path.stat().st_size
+                    else:
+                        slot_errors[index] = f"Sample {sample.id} conversion failed"
+                except Exception as e:
+                    slot_errors[index] = f"Sample {sample.id}: {str(e)}"
+                    logger.error(f"Failed to export kit sample {sample.id}: {e}")
+
+                pad_result = ExportResult(
+                    success=slot_sizes[index] is not None,
+                    sample_id=sample.id,
+                    format=config.format,
+                    output_path=str(output_path.parent),
+                    output_filename=output_path.name,
+                    file_size_bytes=slot_sizes[index] or 0,
+                    conversion_time_seconds=outcome.elapsed_seconds,
+                    error=outcome.result.error_message
+                )
+                kit_sample = assignments[index][0]
+                slot_rows[index] = self._manifest_row(
+                    sample, pad_result, outcome.result, output_path, kit_folder,
+                    bank=kit_sample.pad_bank, pad=kit_sample.pad_number
+                )
+                await self._emit(on_result, pad_result)
+
+        successful = sum(1 for size in slot_sizes if size is not None)
+        failed = len(assignments) - successful
+        total_size = sum(size for size in slot_sizes if size is not None)
+        error_list = [error for error in slot_errors if error is not None]
+
+        manifest_path = await self._write_manifest(
+            kit_folder,
+            config,
+            "kit",
+            [row for row in slot_rows if row is not None],
+            kit_id=kit_id,
+            kit_name=kit.name
+        )
+
         # Calculate duration
         duration_seconds = time.time() - start_time
 
@@ -753,16 +985,197 @@ class SP404ExportService:
             success=successful > 0,
             kit_id=kit_id,
             kit_name=kit.name,
-            sample_count=len(samples),
+            sample_count=len(assignments),
             successful=successful,
             failed=failed,
             output_path=str(kit_folder),
             format=config.format,
             total_size_bytes=total_size,
             export_time_seconds=duration_seconds,
-            errors=error_list
+            errors=error_list,
+            manifest_path=str(manifest_path) if manifest_path else None
         )
 
+    async def sync_to_directory(
+        self,
+        target_path: Path,
+        config: ExportConfig,
+        sample_ids: Optional[List[int]] = None,
+        kit_id: Optional[int] = None,
+        dry_run: bool = False,
+        delete_removed: bool = True,
+        db: Optional[AsyncSession] = None
+    ) -> ExportSyncResult:
+        """
+        Sync samples or a kit onto a mounted SD card directory.
+
+        Files are laid out like export_batch (organize_by) and export_kit
+        (kit/bank folders). Each one is identified by the rendition cache key
+        of its source content and conversion settings, and that key is diffed
+        against the card's sync manifest before anything is converted: only
+        added or changed files are rendered (into a scratch directory) and
+        copied, and files from earlier syncs that are no longer exported are
+        deleted. A dry run renders nothing; its bytes_to_copy is estimated
+        from the source headers. Only audio is synced, never the export
+        manifest or per-sample metadata files.
+
+        Args:
+            target_path: Target directory (must already exist)
+            config: Export configuration (output_base_path is ignored)
+            sample_ids: Samples to sync
+            kit_id: Kit to sync (takes precedence over sample_ids)
+            dry_run: Only report the diff, change nothing on the target
+            delete_removed: Delete previously synced files no longer exported
+            db: Database session (uses self.db if not provided)
+
+        Returns:
+            ExportSyncResult with the applied (or planned) diff
+
+        Raises:
+            SP404ExportError: If the target does not exist or nothing is selected
+        """
+        if not target_path.is_dir():
+            raise SP404ExportError(f"Sync target not found: {target_path}")
+        if kit_id is None and not sample_ids:
+            raise SP404ExportError("Provide sample_ids or kit_id to sync")
+        if db is None:
+            db = self.db
+
+        start = time.perf_counter()
+        jobs, errors = await self._plan_sync_jobs(config, sample_ids, kit_id, db)
+        keys = await asyncio.to_thread(self._sync_source_keys, jobs, errors)
+        plan = await asyncio.to_thread(plan_keyed_sync, keys, target_path, delete_removed)
+
+        if dry_run:
+            plan.bytes_to_copy = await asyncio.to_thread(
+                lambda: sum(self._estimate_rendition_size(jobs[relative]) for relative in plan.add + plan.replace)
+            )
+            copied = 0
+        else:
+            with tempfile.TemporaryDirectory(prefix="sp404_sync_") as staging:
+                staging_dir = Path(staging)
+                await self._render_sync_files(plan, jobs, staging_dir, errors)
+                plan.bytes_to_copy = sum(
+                    (staging_dir / relative).stat().st_size for relative in plan.add + plan.replace
+                )
+                copied = await asyncio.to_thread(apply_sync, plan, staging_dir, target_path, keys)
+
+        result = sync_result(plan, target_path, dry_run, copied, time.perf_counter() - start)
+        result.export_errors = errors
+        return result
+
+    async def _plan_sync_jobs(
+        self,
+        config: ExportConfig,
+        sample_ids: Optional[List[int]],
+        kit_id: Optional[int],
+        db: AsyncSession
+    ) -> Tuple[Dict[str, ConversionJob], List[str]]:
+        """
+        Conversion jobs for a sync, keyed by relative target path.
+
+        Output paths are relative until the job is rendered; when several
+        samples map to one path the first one wins, as in an export.
+
+        Returns:
+            Tuple of (jobs, errors for samples that could not be planned)
+        """
+        selection: List[Tuple[Sample, Path]] = []
+        errors: List[str] = []
+        if kit_id is not None:
+            kit, assignments = await self._load_kit(kit_id, db)
+            kit_folder = Path(self._kit_folder_name(kit))
+            selection = [
+                (sample, kit_folder / self._kit_pad_path(kit_sample, sample, config))
+                for kit_sample, sample in assignments
+            ]
+        else:
+            samples = await self._load_samples(sample_ids, db)
+            relative_config = config.model_copy(update={"output_base_path": "."})
+            for sample_id in sample_ids:
+                sample = samples.get(sample_id)
+                if sample is None:
+                    errors.append(f"Sample {sample_id}: Sample {sample_id} not found")
+                    continue
+                output_dir, output_filename, _ = self._plan_sample_export(sample, relative_config)
+                selection.append((sample, output_dir / output_filename))
+
+        jobs: Dict[str, ConversionJob] = {}
+        for sample, relative_path in selection:
+            relative = relative_path.as_posix()
+            if relative in jobs:
+                continue
+            jobs[relative] = ConversionJob(
+                key=relative,
+                input_path=Path(sample.file_path),
+                output_path=relative_path,
+                format=config.format,
+                target_sample_rate=self.TARGET_SAMPLE_RATE,
+                gain_db=self.loudness_gain_db(sample, config.target_lufs, config.true_peak_ceiling),
+                context={"sample_id": sample.id}
+            )
+        return jobs, errors
+
+    @staticmethod
+    def _sync_source_keys(jobs: Dict[str, ConversionJob], errors: List[str]) -> Dict[str, str]:
+        """
+        Rendition key of every planned file (run in a thread).
+
+        Sources that cannot be read are reported in `errors` and left out of
+        the sync.
+        """
+        cache = get_rendition_cache()
+        keys = {}
+        for relative, job in jobs.items():
+            try:
+                if cache is not None:
+                    keys[relative] = cache.key_for(job.input_path, job.spec)
+                else:
+                    keys[relative] = job.spec.cache_key(hash_file(job.input_path))
+            except OSError as e:
+                errors.append(f"Sample {job.context['sample_id']}: {e}")
+        return keys
+
+    def _estimate_rendition_size(self, job: ConversionJob) -> int:
+        """Size of a job's 16-bit output, estimated from the source header."""
+        try:
+            info = sf.info(str(job.input_path))
+        except Exception:
+            return 0
+        frames = int(info.frames * job.target_sample_rate / info.samplerate)
+        return frames * info.channels * self.TARGET_BIT_DEPTH // 8 + 44
+
+    async def _render_sync_files(
+        self,
+        plan: SyncPlan,
+        jobs: Dict[str, ConversionJob],
+        staging_dir: Path,
+        errors: List[str]
+    ) -> None:
+        """
+        Convert the files a sync plan copies into staging_dir.
+
+        Samples that fail validation or conversion are reported in `errors`
+        and skipped; a copy they replace stays on the card.
+        """
+        render_jobs = []
+        for relative in plan.add + plan.replace:
+            job = jobs[relative]
+            validation = self.validate_sample(job.input_path)
+            if not validation.valid:
+                errors.append(
+                    f"Sample {job.context['sample_id']}: Validation failed: {', '.join(validation.errors)}"
+                )
+                plan.skip(relative)
+                continue
+            job.output_path = staging_dir / relative
+            render_jobs.append(job)
+
+        async for outcome in get_export_executor().convert_all(render_jobs):
+            if not outcome.result.success:
+                errors.append(f"Sample {outcome.job.context['sample_id']}: {outcome.result.error_message}")
+                plan.skip(outcome.job.key)
+
     def _get_bpm_folder_name(self, bpm: Optional[float]) -> str:
         """
         Map BPM value to folder name.
@@ -824,6 +1237,132 @@ class SP404ExportService:
             logger.warning(f"Unknown organization strategy: {organize_by}, using flat")
             return base_path
 
+    async def create_export_archive(self, export_record: SP404Export) -> ZipStream:
+        """
+        Prepare a streaming ZIP of an export's files.
+
+        Single-sample exports contain the one file; batch and kit exports
+        contain everything under the export directory, keeping its folder
+        organization. Files are only read while the archive is iterated.
+
+        Args:
+            export_record: Export to package
+
+        Returns:
+            ZipStream ready to iterate
+
+        Raises:
+            SP404ExportError: If the exported files no longer exist
+        """
+        root = Path(export_record.output_path)
+
+        def collect() -> ZipStream:
+            archive = ZipStream()
+            if root.is_file():
+                archive.add_file(root, root.name)
+            elif root.is_dir():
+                for path in sorted(p for p in root.rglob("*") if p.is_file()):
+                    archive.add_file(path, path.relative_to(root).as_posix())
+            return archive
+
+        archive = await asyncio.to_thread(collect)
+        if not len(archive):
+            raise SP404ExportError(f"Export files not found: {root}")
+        return archive
+
+    def _manifest_row(
+        self,
+        sample: Sample,
+        result: ExportResult,
+        conversion: ConversionResult,
+        output_file: Path,
+        root: Path,
+        bank: Optional[str] = None,
+        pad: Optional[int] = None
+    ) -> dict:
+        """Manifest entry for one exported sample (path relative to the manifest)."""
+        try:
+            relative_path = output_file.relative_to(root).as_posix()
+        except ValueError:
+            relative_path = str(output_file)
+
+        return {
+            "sample_id": sample.id,
+            "path": relative_path,
+            "title": sample.title,
+            "genre": sample.genre,
+            "bpm": sample.bpm,
+            "musical_key": sample.musical_key,
+            "bank": bank,
+            "pad": pad,
+            "success": result.success,
+            "file_size_bytes": result.file_size_bytes,
+            "original_format": conversion.original_format,
+            "original_sample_rate": conversion.original_sample_rate,
+            "original_duration": conversion.original_duration,
+            "loudness_lufs": sample.loudness_lufs,
+            "gain_db": conversion.gain_db,
+            "error": result.error,
+        }
+
+    async def _write_manifest(
+        self,
+        root: Path,
+        config: ExportConfig,
+        export_type: str,
+        rows: List[dict],
+        **export_info
+    ) -> Optional[Path]:
+        """
+        Write one manifest covering every sample of an export.
+
+        Replaces a metadata file per sample: the whole export is described
+        by a single JSON (export settings plus one entry per sample) or CSV
+        (one row per sample) file in the export root.
+
+        Args:
+            root: Export root directory
+            config: Export configuration (manifest_format selects the format)
+            export_type: "batch" or "kit"
+            rows: Manifest entries in export order
+            **export_info: Extra export-level fields (JSON only)
+
+        Returns:
+            Path of the manifest, or None if disabled or nothing was exported
+        """
+        if config.manifest_format == "none" or not rows:
+            return None
+
+        manifest_path = root / f"{self.MANIFEST_BASENAME}.{config.manifest_format}"
+
+        if config.manifest_format == "csv":
+            buffer = io.StringIO()
+            writer = csv.DictWriter(buffer, fieldnames=self.MANIFEST_COLUMNS)
+            writer.writeheader()
+            writer.writerows(rows)
+            content = buffer.getvalue()
+        else:
+            content = json.dumps({
+                "export_type": export_type,
+                **export_info,
+                "format": config.format,
+                "organized_by": config.organize_by,
+                "sample_rate": self.TARGET_SAMPLE_RATE,
+                "bit_depth": self.TARGET_BIT_DEPTH,
+                "sample_count": len(rows),
+                "samples": rows,
+            }, indent=2)
+
+        def write() -> None:
+            root.mkdir(parents=True, exist_ok=True)
+            temp_path = manifest_path.with_name(f".{manifest_path.name}.tmp")
+            temp_path.write_text(content)
+            os.replace(temp_path, manifest_path)
+
+        await asyncio.to_thread(write)
+        logger.debug(f"Wrote export manifest: {manifest_path} ({len(rows)} samples)")
+        return manifest_path
+
     async def _write_metadata_file(
         self,
         metadata_path: Path,
@@ -908,30 +1447,21 @@ class SP404ExportService:
         db.add(export_record)
         await db.flush()  # Get ID without committing
 
-        # Create records for each exported sample
-        for result in results:
-            if result.success:
-                export_sample = SP404ExportSample(
-                    export_id=export_record.id,
-                    sample_id=result.sample_id,
-                    output_filename=result.output_filename,
-                    conversion_successful=True,
-                    conversion_error=None,
-                    file_size_bytes=result.file_size_bytes,
-                    conversion_time_seconds=result.conversion_time_seconds
-                )
-            else:
-                export_sample = SP404ExportSample(
-                    export_id=export_record.id,
-                    sample_id=result.sample_id,
-                    output_filename=result.output_filename or "",
-                    conversion_successful=False,
-                    conversion_error=result.error,
-                    file_size_bytes=0,
-                    conversion_time_seconds=0
-                )
-
-            db.add(export_sample)
+        # Create records for all exported samples in one multi-row INSERT
+        rows = [
+            {
+                "export_id": export_record.id,
+                "sample_id": result.sample_id,
+                "output_filename": result.output_filename or "",
+                "conversion_successful": result.success,
+                "conversion_error": None if result.success else result.error,
+                "file_size_bytes": result.file_size_bytes if result.success else 0,
+                "conversion_time_seconds": result.conversion_time_seconds if result.success else 0,
+            }
+            for result in results
+        ]
+        if rows:
+            await db.execute(insert(SP404ExportSample), rows)
 
         await db.commit()
         await db.refresh(export_record)
@@ -10,7 +10,7 @@ Orchestrates complete project generation from kits:
 6. Tracks export in database
 
 Output structure:
-    project_name.zip
+    project_name_kitN.zip
         ├── PADCONF.BIN (52,000 bytes)
         ├── PROJECT_INFO.txt (metadata)
         └── samples/
@@ -19,14 +19,15 @@ Output structure:
             └── ...
 """
 
+import hashlib
+import json
 import logging
 import time
-import uuid
 import statistics
-import zipfile
 import asyncio
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import List, Optional
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 from datetime import datetime, timezone
 
 from sqlalchemy import select
@@ -37,10 +38,44 @@ from app.models.sample import Sample
 from app.models.sp404_export import SP404Export, SP404ExportSample
 from app.schemas.sp404_project import ProjectBuildRequest, ProjectBuildResult
 from app.services.padconf_service import PadconfService, PadConfig, ProjectConfig
-from app.services.sp404_export_service import SP404ExportService
+from app.services.rendition_cache import hash_file
+from app.schemas.sp404_export import ExportResult
+from app.services.sp404_export_service import ResultCallback, SP404ExportService
+from app.utils.zip_stream import ZipStream
 
 logger = logging.getLogger(__name__)
 
+# Build manifest kept in each project directory for incremental rebuilds
+MANIFEST_FILENAME = ".build_manifest.json"
+MANIFEST_VERSION = 1
+
+# Project directory -> [lock, builds holding or waiting for it]
+_project_locks: Dict[Path, list] = {}
+
+
+@asynccontextmanager
+async def _project_lock(project_dir: Path) -> AsyncIterator[None]:
+    """Serialize builds that share a project directory."""
+    entry = _project_locks.setdefault(project_dir, [asyncio.Lock(), 0])
+    entry[1] += 1
+    try:
+        async with entry[0]:
+            yield
+    finally:
+        entry[1] -= 1
+        if not entry[1]:
+            # Last user: drop the lock so the dict does not grow per project
+            del _project_locks[project_dir]
+
+
+def _archive_state(zip_path: Path) -> Optional[dict]:
+    """Manifest record of a built archive, or None if it is missing."""
+    try:
+        stat = zip_path.stat()
+    except OSError:
+        return None
+    return {"path": str(zip_path), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
 
 class SP404ProjectBuilderError(Exception):
     """Base exception for project builder errors"""
@@ -75,7 +110,8 @@ class SP404ProjectBuilderService:
         self,
         kit_id: int,
         request: ProjectBuildRequest,
-        output_base_path: Optional[Path] = None
+        output_base_path: Optional[Path] = None,
+        on_result: Optional[ResultCallback] = None
     ) -> ProjectBuildResult:
         """
         Build complete SP-404MK2 project from kit.
@@ -83,7 +119,7 @@ class SP404ProjectBuilderService:
         Process:
         1. Validate kit exists and has samples
         2. Auto-detect or use custom BPM
-        3. Create temporary working directory
+        3. Create (or reuse) the kit's project working directory
         4. Export audio samples to samples/ directory
         5. Build PADCONF.BIN from kit layout
         6. Create PROJECT_INFO.txt
@@ -91,10 +127,17 @@ class SP404ProjectBuilderService:
         8. Save export record to database
         9. Return result with download URL
 
+        Builds are incremental: a manifest in the project directory records
+        each pad's source hash and conversion settings, so a rebuild only
+        reconverts changed pads, patches PADCONF.BIN in place and skips
+        re-zipping when nothing changed.
+
         Args:
             kit_id: Database ID of kit to export
             request: Project build configuration
             output_base_path: Optional custom export directory (defaults to /tmp/sp404_projects)
+            on_result: Optional callback receiving a per-pad ExportResult as
+                soon as that pad's audio is in place
 
         Returns:
             ProjectBuildResult with success status and download information
@@ -125,69 +168,98 @@ class SP404ProjectBuilderService:
             # 3. Detect or use custom BPM
             project_bpm = request.project_bpm or self._detect_project_bpm(samples)
 
-            # 4. Create temporary working directory
+            # 4. Create (or reuse) the project working directory
             if output_base_path is None:
                 output_base_path = Path("/tmp/sp404_projects")
 
             output_base_path.mkdir(parents=True, exist_ok=True)
 
-            # Create unique project directory
-            project_id = uuid.uuid4().hex[:8]
-            project_dir = output_base_path / f"{request.project_name}_{project_id}"
+            # One directory per kit/project so rebuilds can reuse earlier output
+            project_dir = output_base_path / f"{request.project_name}_kit{kit_id}"
             project_dir.mkdir(parents=True, exist_ok=True)
 
             samples_dir = project_dir / "samples"
             samples_dir.mkdir(exist_ok=True)
 
-            # 5. Export audio samples with format conversion
-            logger.info(f"Exporting {len(samples)} samples to {samples_dir}")
-            exported_paths = await self._export_audio_samples(
-                samples=samples,
-                format=request.audio_format,
-                output_dir=samples_dir
-            )
-
-            # 6. Build PadConfig objects for PADCONF.BIN
-            pad_configs = await self._build_pad_configs(
-                kit_id=kit_id,
-                samples=samples,
-                project_bpm=project_bpm
-            )
-
-            # 7. Generate PADCONF.BIN
-            project_config = ProjectConfig(
-                project_name=request.project_name,
-                project_bpm=project_bpm,
-                tempo_mode="project"
-            )
-
-            padconf_data = self.padconf_service.create_padconf(
-                project_config=project_config,
-                pad_configs=pad_configs
-            )
+            async with _project_lock(project_dir):
+                manifest = self._load_manifest(project_dir)
+                previous_pads = manifest.get("pads", {})
+
+                # 5. Export audio samples, reconverting only changed pads
+                logger.info(f"Exporting {len(samples)} samples to {samples_dir}")
+                pad_entries, converted_count = await self._export_audio_samples(
+                    samples=samples,
+                    format=request.audio_format,
+                    output_dir=samples_dir,
+                    previous_entries=previous_pads,
+                    on_result=on_result,
+                    target_lufs=request.target_lufs,
+                    true_peak_ceiling=request.true_peak_ceiling
+                )
+                removed_count = self._remove_stale_files(samples_dir, pad_entries)
 
-            # Write PADCONF.BIN to project directory
-            padconf_path = project_dir / "PADCONF.BIN"
-            padconf_path.write_bytes(padconf_data)
+                # 6. Build PadConfig objects for PADCONF.BIN
+                pad_configs = await self._build_pad_configs(
+                    kit_id=kit_id,
+                    samples=samples,
+                    project_bpm=project_bpm
+                )
 
-            logger.info(f"Generated PADCONF.BIN: {len(padconf_data)} bytes")
+                # 7. Generate or patch PADCONF.BIN
+                project_config = ProjectConfig(
+                    project_name=request.project_name,
+                    project_bpm=project_bpm,
+                    tempo_mode="project"
+                )
 
-            # 8. Create PROJECT_INFO.txt
-            info_path = project_dir / "PROJECT_INFO.txt"
-            await self._create_project_info(
-                info_path=info_path,
-                kit=kit,
-                request=request,
-                project_bpm=project_bpm,
-                sample_count=len(samples)
-            )
+                padconf_state, padconf_changed = self._write_padconf(
+                    project_dir=project_dir,
+                    project_config=project_config,
+                    pad_configs=pad_configs,
+                    previous_state=manifest.get("padconf")
+                )
 
-            # 9. Create ZIP archive
-            zip_path = await self._create_project_zip(
-                project_dir=project_dir,
-                project_name=request.project_name,
-                output_base_path=output_base_path
-            )
+                # 8. Create PROJECT_INFO.txt (only when its inputs changed)
+                info_path = project_dir / "PROJECT_INFO.txt"
+                info_fingerprint = self._fingerprint(
+                    kit.name, kit.description, request.project_name,
+                    project_bpm, request.audio_format, len(samples)
+                )
+                info_changed = (
+                    manifest.get("info") != info_fingerprint or not info_path.exists()
+                )
+                if info_changed:
+                    await self._create_project_info(
+                        info_path=info_path,
+                        kit=kit,
+                        request=request,
+                        project_bpm=project_bpm,
+                        sample_count=len(samples)
+                    )
+
+                # 9. Create ZIP archive (skipped when nothing changed and the
+                # archive on disk is the one this build wrote)
+                safe_project_name = self.export_service.sanitize_filename(
+                    request.project_name
+                ).replace('.', '')
+                zip_path = output_base_path / f"{safe_project_name}_kit{kit_id}.zip"
+                unchanged = (
+                    not (converted_count or removed_count or padconf_changed or info_changed)
+                    and manifest.get("archive") is not None
+                    and manifest.get("archive") == _archive_state(zip_path)
+                )
+                if unchanged:
+                    logger.info(f"Project unchanged, reusing {zip_path}")
+                else:
+                    await self._create_project_zip(project_dir=project_dir, zip_path=zip_path)
+
+                self._save_manifest(project_dir, {
+                    "version": MANIFEST_VERSION,
+                    "pads": pad_entries,
+                    "padconf": padconf_state,
+                    "info": info_fingerprint,
+                    "archive": _archive_state(zip_path),
+                })
 
             # Calculate file size
             file_size = zip_path.stat().st_size
@@ -220,6 +292,7 @@ class SP404ProjectBuilderService:
                 export_id=str(export_id),
                 project_name=request.project_name,
                 sample_count=len(samples),
+                converted_count=converted_count,
                 file_size_bytes=file_size,
                 download_url=download_url
             )
@@ -263,25 +336,39 @@ class SP404ProjectBuilderService:
         self,
         samples: List[Sample],
         format: str,
-        output_dir: Path
-    ) -> List[Path]:
+        output_dir: Path,
+        previous_entries: Optional[Dict[str, dict]] = None,
+        on_result: Optional[ResultCallback] = None,
+        target_lufs: Optional[float] = None,
+        true_peak_ceiling: float = -1.0
+    ) -> Tuple[Dict[str, dict], int]:
         """
         Export and convert audio samples to SP-404 format.
 
-        Converts all samples to 48kHz/16-bit WAV or AIFF.
+        Converts samples to 48kHz/16-bit WAV or AIFF. A sample whose
+        manifest entry from the previous build matches its current source
+        hash and conversion settings is left as is. With a loudness target,
+        each pad's gain comes from the sample's stored EBU R128 values and is
+        applied during conversion.
 
         Args:
             samples: List of samples to export
             format: Output format (wav or aiff)
             output_dir: Directory to write converted samples
+            previous_entries: Manifest pad entries from the previous build
+            on_result: Optional callback receiving each pad's ExportResult
+            target_lufs: Integrated loudness to gain-match pads to (None keeps levels)
+            true_peak_ceiling: Maximum true peak (dBTP) after gain
 
         Returns:
-            List of paths to converted audio files
+            Tuple of (manifest entries keyed by output filename, number converted)
 
         Raises:
             SP404ProjectBuilderError: If conversion fails
         """
-        exported_paths = []
+        previous_entries = previous_entries or {}
+        entries: Dict[str, dict] = {}
+        converted = 0
 
         for i, sample in enumerate(samples):
             input_path = Path(sample.file_path)
@@ -295,23 +382,192 @@ class SP404ProjectBuilderService:
             output_filename = f"{sanitized_name}_{i+1:03d}.{format}"
             output_path = output_dir / output_filename
 
-            # Convert using SP404ExportService
-            conversion_result = await self.export_service.convert_to_sp404_format(
-                input_path=input_path,
-                output_path=output_path,
-                format=format
+            previous = previous_entries.get(output_filename)
+            try:
+                entry = await asyncio.to_thread(
+                    self._source_entry, sample, input_path, format, previous
+                )
+            except OSError as e:
+                raise SP404ProjectBuilderError(f"Failed to read sample {sample.id}: {e}")
+            entry["gain_db"] = self.export_service.loudness_gain_db(
+                sample, target_lufs, true_peak_ceiling
             )
 
-            if not conversion_result.success:
-                raise SP404ProjectBuilderError(
-                    f"Failed to convert sample {sample.id}: {conversion_result.error_message}"
+            pad_start = time.time()
+            if previous is not None and output_path.exists() and all(
+                previous.get(field) == entry[field]
+                for field in ("source_hash", "format", "sample_rate")
+            ) and previous.get("gain_db", 0.0) == entry["gain_db"]:
+                entries[output_filename] = entry
+            else:
+                # Convert using SP404ExportService
+                conversion_result = await self.export_service.convert_to_sp404_format(
+                    input_path=input_path,
+                    output_path=output_path,
+                    format=format,
+                    gain_db=entry["gain_db"]
                 )
 
-            exported_paths.append(output_path)
+                if not conversion_result.success:
+                    await self.export_service._emit(on_result, ExportResult(
+                        success=False,
+                        sample_id=sample.id,
+                        format=format,
+                        error=conversion_result.error_message
+                    ))
+                    raise SP404ProjectBuilderError(
+                        f"Failed to convert sample {sample.id}: {conversion_result.error_message}"
+                    )
+
+                entries[output_filename] = entry
+                converted += 1
+
+            await self.export_service._emit(on_result, ExportResult(
+                success=True,
+                sample_id=sample.id,
+                format=format,
+                output_path=str(output_dir),
+                output_filename=output_filename,
+                file_size_bytes=output_path.stat().st_size,
+                conversion_time_seconds=time.time() - pad_start
+            ))
+
+        logger.info(
+            f"Exported {len(entries)} audio files to {output_dir} "
+            f"({converted} converted, {len(entries) - converted} unchanged)"
+        )
 
-        logger.info(f"Exported {len(exported_paths)} audio files to {output_dir}")
+        return entries, converted
 
-        return exported_paths
+    def _source_entry(
+        self,
+        sample: Sample,
+        input_path: Path,
+        format: str,
+        previous: Optional[dict]
+    ) -> dict:
+        """
+        Manifest entry for one pad's source file.
+
+        The content hash is reused from the previous entry when the file's
+        size and mtime are unchanged, so unchanged pads are never re-read.
+        """
+        stat = input_path.stat()
+        if (
+            previous is not None
+            and previous.get("source_path") == str(input_path)
+            and previous.get("source_size") == stat.st_size
+            and previous.get("source_mtime_ns") == stat.st_mtime_ns
+        ):
+            source_hash = previous["source_hash"]
+        else:
+            source_hash = hash_file(input_path)
+
+        return {
+            "sample_id": sample.id,
+            "source_path": str(input_path),
+            "source_size": stat.st_size,
+            "source_mtime_ns": stat.st_mtime_ns,
+            "source_hash": source_hash,
+            "format": format,
+            "sample_rate": self.export_service.TARGET_SAMPLE_RATE,
+        }
+
+    @staticmethod
+    def _remove_stale_files(samples_dir: Path, entries: Dict[str, dict]) -> int:
+        """Delete converted files left over from pads no longer in the kit."""
+        removed = 0
+        for path in samples_dir.iterdir():
+            if path.is_file() and path.name not in entries:
+                path.unlink()
+                removed += 1
+        if removed:
+            logger.info(f"Removed {removed} stale files from {samples_dir}")
+        return removed
+
+    def _write_padconf(
+        self,
+        project_dir: Path,
+        project_config: ProjectConfig,
+        pad_configs: List[PadConfig],
+        previous_state: Optional[dict]
+    ) -> Tuple[dict, bool]:
+        """
+        Write PADCONF.BIN, patching only changed pads when possible.
+
+        Args:
+            project_dir: Project working directory
+            project_config: Global project settings
+            pad_configs: Pad configurations for this build
+            previous_state: PADCONF state from the previous build's manifest
+
+        Returns:
+            Tuple of (PADCONF state for the manifest, whether the file changed)
+        """
+        padconf_path = project_dir / "PADCONF.BIN"
+        header = self._fingerprint(project_config.model_dump_json())
+        pads = {
+            str(pad.pad_index): self._fingerprint(pad.model_dump_json())
+            for pad in pad_configs
+        }
+        state = {"header": header, "pads": pads}
+
+        if (
+            previous_state
+            and previous_state.get("header") == header
+            and padconf_path.exists()
+        ):
+            previous_pads = previous_state.get("pads", {})
+            changed = [pad for pad in pad_configs if previous_pads.get(str(pad.pad_index)) != pads[str(pad.pad_index)]]
+            cleared = [int(index) for index in previous_pads if index not in pads]
+            if not changed and not cleared:
+                return state, False
+            try:
+                padconf_data = self.padconf_service.patch_padconf(
+                    padconf_path.read_bytes(), changed, cleared
+                )
+                padconf_path.write_bytes(padconf_data)
+                logger.info(
+                    f"Patched PADCONF.BIN: {len(changed)} pads updated, {len(cleared)} cleared"
+                )
+                return state, True
+            except ValueError as e:
+                logger.warning(f"Rebuilding PADCONF.BIN: {e}")
+
+        padconf_data = self.padconf_service.create_padconf(
+            project_config=project_config,
+            pad_configs=pad_configs
+        )
+        padconf_path.write_bytes(padconf_data)
+
+        logger.info(f"Generated PADCONF.BIN: {len(padconf_data)} bytes")
+
+        return state, True
+
+    @staticmethod
+    def _fingerprint(*parts) -> str:
+        """Stable short hash of build inputs."""
+        return hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()
+
+    @staticmethod
+    def _load_manifest(project_dir: Path) -> dict:
+        """Read the previous build's manifest, or an empty one."""
+        manifest_path = project_dir / MANIFEST_FILENAME
+        try:
+            manifest = json.loads(manifest_path.read_text())
+        except (OSError, ValueError):
+            return {}
+        if manifest.get("version") != MANIFEST_VERSION:
+            return {}
+        return manifest
+
+    @staticmethod
+    def _save_manifest(project_dir: Path, manifest: dict) -> None:
+        """Write the build manifest atomically."""
+        manifest_path = project_dir / MANIFEST_FILENAME
+        temp_path = manifest_path.with_suffix(".tmp")
+        temp_path.write_text(json.dumps(manifest, indent=2))
+        temp_path.replace(manifest_path)
 
     async def _build_pad_configs(
         self,
@@ -400,14 +656,16 @@ class SP404ProjectBuilderService:
     async def _create_project_zip(
         self,
         project_dir: Path,
-        project_name: str,
-        output_base_path: Path
+        zip_path: Path
     ) -> Path:
         """
         Package project into ZIP archive.
 
+        Audio is STORED (PCM does not compress) and only PROJECT_INFO.txt is
+        deflated; the archive is streamed to disk in constant memory.
+
         Structure:
-            project_name.zip
+            project_name_kitN.zip
                 ├── PADCONF.BIN
                 ├── PROJECT_INFO.txt
                 └── samples/
@@ -416,38 +674,38 @@ class SP404ProjectBuilderService:
 
         Args:
             project_dir: Directory containing project files
-            project_name: Name for ZIP file
-            output_base_path: Directory to save ZIP
+            zip_path: Where to write the archive (one per kit)
 
         Returns:
             Path to created ZIP file
         """
-        # Sanitize project name for filename
-        safe_project_name = self.export_service.sanitize_filename(project_name).replace('.', '')
-
-        zip_path = output_base_path / f"{safe_project_name}.zip"
-
-        # Create ZIP archive
-        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zf:
-            # Add PADCONF.BIN
-            padconf_path = project_dir / "PADCONF.BIN"
-            if padconf_path.exists():
-                zf.write(padconf_path, "PADCONF.BIN")
-
-            # Add PROJECT_INFO.txt
-            info_path = project_dir / "PROJECT_INFO.txt"
-            if info_path.exists():
-                zf.write(info_path, "PROJECT_INFO.txt")
-
-            # Add all samples
-            samples_dir = project_dir / "samples"
-            if samples_dir.exists():
-                for sample_file in samples_dir.iterdir():
-                    if sample_file.is_file():
-                        # Add with samples/ prefix
-                        zf.write(sample_file, f"samples/{sample_file.name}")
-
-        logger.info(f"Created ZIP archive: {zip_path} ({zip_path.stat().st_size} bytes)")
+        archive = ZipStream()
+
+        # Add PADCONF.BIN
+        padconf_path = project_dir / "PADCONF.BIN"
+        if padconf_path.exists():
+            archive.add_file(padconf_path, "PADCONF.BIN")
+
+        # Add PROJECT_INFO.txt
+        info_path = project_dir / "PROJECT_INFO.txt"
+        if info_path.exists():
+            archive.add_file(info_path, "PROJECT_INFO.txt")
+
+        # Add all samples
+        samples_dir = project_dir / "samples"
+        if samples_dir.exists():
+            for sample_file in sorted(samples_dir.iterdir()):
+                if sample_file.is_file():
+                    # Add with samples/ prefix
+                    archive.add_file(sample_file, f"samples/{sample_file.name}")
+
+        # Write beside the target and swap in, so a download in progress keeps
+        # reading the previous archive
+        temp_path = zip_path.with_name(f".{zip_path.name}.tmp")
+        size = await asyncio.to_thread(archive.write_to, temp_path)
+        temp_path.replace(zip_path)
+
+        logger.info(f"Created ZIP archive: {zip_path} ({size} bytes)")
 
         return zip_path
 
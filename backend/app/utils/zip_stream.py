@@ -0,0 +1,323 @@
+"""Streaming ZIP writer for export and project downloads.
+
+Builds a ZIP archive as a sequence of byte chunks while reading the source
+files, so a multi-GB download starts immediately and the server only ever
+holds one chunk in memory. Audio is STORED (PCM barely compresses, and
+deflating it costs CPU for nothing); only text entries are DEFLATEd. Entries
+use data descriptors so nothing has to be buffered to learn a CRC first, and
+ZIP64 records are written when sizes, offsets or the entry count need them.
+
+When every entry's compressed size is known up front (all STORED, plus small
+text entries that are compressed eagerly) the exact archive size is available
+as `ZipStream.size` for a Content-Length header.
+"""
+
+import struct
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+# Entries with these suffixes are DEFLATEd; everything else is STORED
+TEXT_SUFFIXES = {".txt", ".json", ".csv", ".md", ".xml", ".log"}
+
+# Text entries up to this size are compressed eagerly so the archive size is known
+EAGER_DEFLATE_LIMIT = 4 * 1024 * 1024
+
+CHUNK_SIZE = 1024 * 1024
+
+ZIP32_LIMIT = 0xFFFFFFFF
+ZIP32_MAX_ENTRIES = 0xFFFF
+
+_LOCAL_HEADER = struct.Struct("<4sHHHHHLLLHH")
+_CENTRAL_HEADER = struct.Struct("<4sBBHHHHHLLLHHHHHLL")
+_END_RECORD = struct.Struct("<4sHHHHLLH")
+_ZIP64_END_RECORD = struct.Struct("<4sQHHLLQQQQ")
+_ZIP64_LOCATOR = struct.Struct("<4sLQL")
+
+_FLAG_DATA_DESCRIPTOR = 0x08
+_FLAG_UTF8 = 0x800
+_STORED = 0
+_DEFLATED = 8
+
+
+def _dos_datetime(timestamp: float) -> Tuple[int, int]:
+    """Convert a UNIX timestamp to (DOS time, DOS date)."""
+    t = time.localtime(timestamp)
+    year = max(t.tm_year, 1980)
+    dos_time = (t.tm_hour << 11) | (t.tm_min << 5) | (t.tm_sec // 2)
+    dos_date = ((year - 1980) << 9) | (t.tm_mon << 5) | t.tm_mday
+    return dos_time, dos_date
+
+
+@dataclass
+class _Entry:
+    arcname: bytes
+    method: int
+    size: int
+    mtime: float
+    path: Optional[Path] = None
+    data: Optional[bytes] = None  # Raw (stored) or pre-compressed (deflated) bytes
+    crc: Optional[int] = None
+    compressed_size: Optional[int] = None
+
+    @property
+    def zip64(self) -> bool:
+        # Decided from the uncompressed size alone so the layout is known before
+        # any data is read; deflate output never meaningfully exceeds its input
+        return self.size >= ZIP32_LIMIT - 0x10000
+
+
+class ZipStream:
+    """
+    ZIP archive produced incrementally from files on disk.
+
+    Example:
+        archive = ZipStream()
+        archive.add_file(Path("kick.wav"), "samples/kick.wav")
+        archive.add_bytes(b"BPM: 90", "PROJECT_INFO.txt")
+        for chunk in archive:
+            ...
+    """
+
+    def __init__(self, chunk_size: int = CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self._entries: List[_Entry] = []
+
+    @staticmethod
+    def _should_compress(arcname: str, compress: Optional[bool]) -> bool:
+        if compress is not None:
+            return compress
+        return Path(arcname).suffix.lower() in TEXT_SUFFIXES
+
+    def add_file(self, path: Path, arcname: str, compress: Optional[bool] = None) -> None:
+        """
+        Add a file to the archive. The file is read when the archive is iterated.
+
+        Args:
+            path: File on disk
+            arcname: Name inside the archive
+            compress: Force DEFLATE (True) or STORED (False); default by suffix
+        """
+        stat = path.stat()
+        method = _DEFLATED if self._should_compress(arcname, compress) else _STORED
+        entry = _Entry(
+            arcname=arcname.encode("utf-8"),
+            method=method,
+            size=stat.st_size,
+            mtime=stat.st_mtime,
+            path=path,
+        )
+        if method == _STORED:
+            entry.compressed_size = stat.st_size
+        elif stat.st_size <= EAGER_DEFLATE_LIMIT:
+            self._compress_eagerly(entry, path.read_bytes())
+        self._entries.append(entry)
+
+    def add_bytes(self, data: bytes, arcname: str, compress: Optional[bool] = None) -> None:
+        """Add in-memory content (small generated files such as info text)."""
+        method = _DEFLATED if self._should_compress(arcname, compress) else _STORED
+        entry = _Entry(
+            arcname=arcname.encode("utf-8"),
+            method=method,
+            size=len(data),
+            mtime=time.time(),
+        )
+        if method == _STORED:
+            entry.data = data
+            entry.crc = zlib.crc32(data)
+            entry.compressed_size = len(data)
+        else:
+            self._compress_eagerly(entry, data)
+        self._entries.append(entry)
+
+    @staticmethod
+    def _compress_eagerly(entry: _Entry, data: bytes) -> None:
+        compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+        entry.data = compressor.compress(data) + compressor.flush()
+        entry.crc = zlib.crc32(data)
+        entry.compressed_size = len(entry.data)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size(self) -> Optional[int]:
+        """Exact archive size in bytes, or None if it depends on streamed compression."""
+        if any(entry.compressed_size is None for entry in self._entries):
+            return None
+        offset = 0
+        central_size = 0
+        for entry in self._entries:
+            local_offset = offset
+            offset += _LOCAL_HEADER.size + len(entry.arcname) + self._local_extra_size(entry)
+            offset += entry.compressed_size + self._descriptor_size(entry)
+            central_size += _CENTRAL_HEADER.size + len(entry.arcname)
+            central_size += len(self._central_extra(entry, entry.compressed_size, local_offset))
+        return offset + central_size + len(self._end_records(offset, central_size))
+
+    @staticmethod
+    def _local_extra_size(entry: _Entry) -> int:
+        return 20 if entry.zip64 else 0
+
+    @staticmethod
+    def _descriptor_size(entry: _Entry) -> int:
+        return 24 if entry.zip64 else 16
+
+    def _local_header(self, entry: _Entry) -> bytes:
+        dos_time, dos_date = _dos_datetime(entry.mtime)
+        extra = b""
+        placeholder = 0
+        if entry.zip64:
+            extra = struct.pack("<HHQQ", 0x0001, 16, 0, 0)
+            placeholder = ZIP32_LIMIT
+        header = _LOCAL_HEADER.pack(
+            b"PK\x03\x04",
+            45 if entry.zip64 else 20,
+            _FLAG_DATA_DESCRIPTOR | _FLAG_UTF8,
+            entry.method,
+            dos_time,
+            dos_date,
+            0,  # CRC and sizes follow in the data descriptor
+            placeholder,
+            placeholder,
+            len(entry.arcname),
+            len(extra),
+        )
+        return header + entry.arcname + extra
+
+    @staticmethod
+    def _data_descriptor(entry: _Entry, crc: int, compressed_size: int) -> bytes:
+        if entry.zip64:
+            return struct.pack("<4sLQQ", b"PK\x07\x08", crc, compressed_size, entry.size)
+        return struct.pack("<4sLLL", b"PK\x07\x08", crc, compressed_size, entry.size)
+
+    @staticmethod
+    def _central_extra(entry: _Entry, compressed_size: int, offset: int) -> bytes:
+        fields = []
+        if entry.size >= ZIP32_LIMIT or entry.zip64:
+            fields.append(entry.size)
+        if compressed_size >= ZIP32_LIMIT or entry.zip64:
+            fields.append(compressed_size)
+        if offset >= ZIP32_LIMIT:
+            fields.append(offset)
+        if not fields:
+            return b""
+        return struct.pack(f"<HH{len(fields)}Q", 0x0001, 8 * len(fields), *fields)
+
+    def _central_header(self, entry: _Entry, crc: int, compressed_size: int, offset: int) -> bytes:
+        dos_time, dos_date = _dos_datetime(entry.mtime)
+        extra = self._central_extra(entry, compressed_size, offset)
+        version = 45 if extra else 20
+        header = _CENTRAL_HEADER.pack(
+            b"PK\x01\x02",
+            version,
+            3,  # Made by UNIX, so external attributes carry file modes
+            version,
+            _FLAG_DATA_DESCRIPTOR | _FLAG_UTF8,
+            entry.method,
+            dos_time,
+            dos_date,
+            crc,
+            ZIP32_LIMIT if entry.zip64 or compressed_size >= ZIP32_LIMIT else compressed_size,
+            ZIP32_LIMIT if entry.zip64 or entry.size >= ZIP32_LIMIT else entry.size,
+            len(entry.arcname),
+            len(extra),
+            0,
+            0,
+            0,
+            0o100644 << 16,
+            min(offset, ZIP32_LIMIT),
+        )
+        return header + entry.arcname + extra
+
+    def _end_records(self, central_offset: int, central_size: int) -> bytes:
+        count = len(self._entries)
+        records = b""
+        needs_zip64 = (
+            count >= ZIP32_MAX_ENTRIES
+            or central_offset >= ZIP32_LIMIT
+            or central_size >= ZIP32_LIMIT
+        )
+        if needs_zip64:
+            zip64_end_offset = central_offset + central_size
+            records += _ZIP64_END_RECORD.pack(
+                b"PK\x06\x06", 44, 45, 45, 0, 0, count, count, central_size, central_offset
+            )
+            records += _ZIP64_LOCATOR.pack(b"PK\x06\x07", 0, zip64_end_offset, 1)
+        records += _END_RECORD.pack(
+            b"PK\x05\x06",
+            0,
+            0,
+            min(count, ZIP32_MAX_ENTRIES),
+            min(count, ZIP32_MAX_ENTRIES),
+            min(central_size, ZIP32_LIMIT),
+            min(central_offset, ZIP32_LIMIT),
+            0,
+        )
+        return records
+
+    def _entry_data(self, entry: _Entry) -> Iterator[Tuple[bytes, int]]:
+        """Yield (compressed chunk, running CRC of the uncompressed data)."""
+        if entry.data is not None:
+            yield entry.data, entry.crc
+            return
+
+        crc = 0
+        remaining = entry.size
+        compressor = (
+            zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+            if entry.method == _DEFLATED else None
+        )
+        with open(entry.path, "rb") as f:
+            while remaining > 0:
+                chunk = f.read(min(self.chunk_size, remaining))
+                if not chunk:
+                    raise IOError(f"{entry.path} shrank while being archived")
+                remaining -= len(chunk)
+                crc = zlib.crc32(chunk, crc)
+                if compressor is not None:
+                    chunk = compressor.compress(chunk)
+                    if not chunk:
+                        continue
+                yield chunk, crc
+        if compressor is not None:
+            yield compressor.flush(), crc
+        elif entry.size == 0:
+            yield b"", crc
+
+    def __iter__(self) -> Iterator[bytes]:
+        offset = 0
+        central = []
+        for entry in self._entries:
+            local_offset = offset
+            header = self._local_header(entry)
+            yield header
+            offset += len(header)
+
+            crc = 0
+            compressed_size = 0
+            for chunk, crc in self._entry_data(entry):
+                compressed_size += len(chunk)
+                if chunk:
+                    yield chunk
+            offset += compressed_size
+
+            descriptor = self._data_descriptor(entry, crc, compressed_size)
+            yield descriptor
+            offset += len(descriptor)
+            central.append(self._central_header(entry, crc, compressed_size, local_offset))
+
+        central_directory = b"".join(central)
+        yield central_directory
+        yield self._end_records(offset, len(central_directory))
+
+    def write_to(self, path: Path) -> int:
+        """Write the archive to a file. Returns the number of bytes written."""
+        written = 0
+        with open(path, "wb") as f:
+            for chunk in self:
+                f.write(chunk)
+                written += len(chunk)
+        return written
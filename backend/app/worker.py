@@ -0,0 +1,215 @@
+"""
+Job queue worker.
+
+Consumes the durable job queue (app.services.job_queue) and runs the
+registered handlers. Run any number of these, on any machine that can reach
+the database:
+
+    python -m app.worker
+    python -m app.worker --queues analysis,vibe --concurrency 8
+    python -m app.worker --once   # Drain runnable jobs and exit
+
+With JOB_WORKER_EMBEDDED enabled (the default, convenient for development)
+the API process also runs one worker; disable it when running dedicated
+workers.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import signal
+import socket
+import uuid
+from typing import Dict, List, Optional, Set
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.job import Job
+from app.services import job_handlers  # noqa: F401  (registers job kinds)
+from app.services.job_queue import (
+    JobQueue,
+    SessionFactory,
+    get_job_definition,
+    parse_queue_limits,
+)
+from app.services.progress_broadcast import shutdown_progress_broadcaster
+
+logger = logging.getLogger(__name__)
+
+
+class JobWorker:
+    """
+    Claims jobs and runs up to `concurrency` of them at once.
+
+    Each running job has a heartbeat task renewing its lease. If the lease is
+    lost (the job was cancelled, or the worker stalled long enough for another
+    worker to reclaim it) the handler is cancelled.
+    """
+
+    def __init__(
+        self,
+        queues: Optional[List[str]] = None,
+        concurrency: Optional[int] = None,
+        queue_limits: Optional[Dict[str, int]] = None,
+        session_factory: SessionFactory = AsyncSessionLocal,
+        poll_interval: Optional[float] = None,
+        lease_seconds: Optional[int] = None,
+        worker_id: Optional[str] = None,
+    ):
+        self.queues = queues or [q.strip() for q in settings.JOB_QUEUES.split(",") if q.strip()]
+        self.concurrency = concurrency or settings.JOB_WORKER_CONCURRENCY
+        self.queue_limits = (
+            queue_limits if queue_limits is not None
+            else parse_queue_limits(settings.JOB_QUEUE_LIMITS)
+        )
+        self.session_factory = session_factory
+        self.poll_interval = poll_interval if poll_interval is not None else settings.JOB_POLL_INTERVAL
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.queue = JobQueue(session_factory, self.worker_id, lease_seconds)
+        self._running: Set[asyncio.Task] = set()
+
+    async def run(self, stop: asyncio.Event) -> None:
+        """Claim and run jobs until `stop` is set, then let running jobs finish."""
+        logger.info(
+            f"Worker {self.worker_id} consuming {','.join(self.queues)} "
+            f"(concurrency {self.concurrency})"
+        )
+        while not stop.is_set():
+            if len(self._running) >= self.concurrency or not await self._claim_and_start():
+                try:
+                    await asyncio.wait_for(stop.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+        if self._running:
+            await asyncio.wait(self._running)
+        logger.info(f"Worker {self.worker_id} stopped")
+
+    async def run_until_idle(self) -> int:
+        """Run jobs until none is runnable; returns the number of jobs run."""
+        count = 0
+        while True:
+            while len(self._running) < self.concurrency and await self._claim_and_start():
+                count += 1
+            if not self._running:
+                return count
+            await asyncio.wait(self._running, return_when=asyncio.FIRST_COMPLETED)
+
+    async def _claim_and_start(self) -> bool:
+        try:
+            job = await self.queue.claim(self.queues, self.queue_limits)
+        except Exception as e:
+            logger.error(f"Claiming a job failed: {e}")
+            return False
+        if job is None:
+            return False
+        task = asyncio.create_task(self._run_job(job))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+        return True
+
+    async def _run_job(self, job: Job) -> None:
+        definition = get_job_definition(job.kind)
+        if definition is None:
+            await self.queue.fail(job, f"No handler registered for {job.kind!r}", retry=False)
+            logger.error(f"Job {job.id}: unknown kind {job.kind!r}")
+            return
+        if job.attempts > job.max_attempts:
+            # Reclaimed after its last attempt's worker died mid-run
+            await self.queue.fail(job, "Lease expired on final attempt", retry=False)
+            logger.error(f"Job {job.id} ({job.kind}) out of attempts")
+            return
+
+        logger.info(f"Job {job.id} ({job.kind}) attempt {job.attempts}/{job.max_attempts}")
+        handler = asyncio.create_task(self._call_handler(definition.handler, job))
+        heartbeat = asyncio.create_task(self._heartbeat(job.id, handler))
+        try:
+            result = await handler
+        except asyncio.CancelledError:
+            if heartbeat.done() and not heartbeat.cancelled():
+                logger.warning(f"Job {job.id} stopped: lease lost or job cancelled")
+            else:
+                await self.queue.release(job.id)
+                raise
+        except Exception as e:
+            status = await self.queue.fail(job, f"{type(e).__name__}: {e}")
+            logger.error(f"Job {job.id} ({job.kind}) failed, now {status}: {e}")
+        else:
+            await self.queue.complete(job.id, result)
+            logger.info(f"Job {job.id} ({job.kind}) succeeded")
+        finally:
+            heartbeat.cancel()
+
+    async def _call_handler(self, handler, job: Job):
+        async with self.session_factory() as session:
+            return await handler(session, {**(job.payload or {}), "job_id": job.id})
+
+    async def _heartbeat(self, job_id: str, handler: asyncio.Task) -> None:
+        """Renew the lease every third of its length; cancel the handler if it is lost."""
+        interval = self.queue.lease_seconds / 3
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                alive = await self.queue.heartbeat(job_id)
+            except Exception as e:
+                logger.warning(f"Heartbeat for job {job_id} failed: {e}")
+                continue
+            if not alive:
+                handler.cancel()
+                return
+
+
+_embedded_stop: Optional[asyncio.Event] = None
+_embedded_task: Optional[asyncio.Task] = None
+
+
+def start_embedded_worker() -> None:
+    """Run a worker inside the API process (JOB_WORKER_EMBEDDED)."""
+    global _embedded_stop, _embedded_task
+    _embedded_stop = asyncio.Event()
+    _embedded_task = asyncio.create_task(JobWorker().run(_embedded_stop))
+
+
+async def stop_embedded_worker() -> None:
+    """Stop the embedded worker, letting running jobs finish."""
+    if _embedded_task is None:
+        return
+    _embedded_stop.set()
+    await _embedded_task
+
+
+async def _main(args: argparse.Namespace) -> None:
+    worker = JobWorker(
+        queues=[q.strip() for q in args.queues.split(",") if q.strip()] if args.queues else None,
+        concurrency=args.concurrency,
+    )
+    try:
+        if args.once:
+            count = await worker.run_until_idle()
+            logger.info(f"Ran {count} jobs")
+            return
+
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop.set)
+        await worker.run(stop)
+    finally:
+        await shutdown_progress_broadcaster()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the SP404MK2 job queue worker")
+    parser.add_argument("--queues", help=f"Comma-separated queues (default: {settings.JOB_QUEUES})")
+    parser.add_argument("--concurrency", type=int, help="Jobs run at once (default: JOB_WORKER_CONCURRENCY)")
+    parser.add_argument("--once", action="store_true", help="Run runnable jobs, then exit")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=settings.LOG_LEVEL,
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
+    asyncio.run(_main(args))
+
+
+if __name__ == "__main__":
+    main()
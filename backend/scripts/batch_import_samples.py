@@ -4,47 +4,69 @@ Batch import audio samples from directory with hybrid analysis.
 
 Uses production backend services:
 - AudioFeaturesService (librosa analysis)
-- HybridAnalysisService (audio + AI orchestration)
-- OpenRouterService (AI vibe analysis)
+- The job queue (AI vibe analysis by the job workers)
 
 Features:
 - Recursive directory scanning
-- Parallel audio processing (10 cores)
+- Parallel audio processing (--parallel-audio processes, default: CPU count)
 - Real-time CPU/memory monitoring
-- Progress tracking and resume capability
+- Progress tracking and resume capability (files already imported are skipped)
 - Batch database commits
+
+Import runs as a three-stage pipeline connected by bounded queues, so a slow
+stage applies backpressure instead of buffering the whole library:
+
+    scanner -> [analysis queue] -> process pool (librosa/Essentia)
+            -> [write queue] -> single writer (multi-row INSERT ... RETURNING)
+
+The writer commits --batch-size samples per transaction (files already in the
+database, e.g. modified since the last run, are updated in place) and, unless
+--audio-only, queues a sample.vibe job per sample for the job workers (AI
+vibe analysis is network-bound and rate limited, so it does not belong in the
+CPU pipeline).
 """
 import argparse
 import asyncio
 import json
+import os
 import sys
 import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Optional, Tuple
 from datetime import datetime
 
-# Add backend to path
+# Add backend (app) and repository root (src) to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(1, str(Path(__file__).parent.parent.parent))
 
 import psutil
 from rich.console import Console
 from rich.table import Table
 from rich.live import Live
 from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, BarColumn, TextColumn, TimeRemainingColumn
 
+from sqlalchemy import insert, select, update
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 
-from app.core.config import settings
-from app.services.hybrid_analysis_service import HybridAnalysisService
-from app.services.audio_features_service import AudioFeaturesService
-from app.services.openrouter_service import OpenRouterService
-from app.services.preferences_service import PreferencesService
+from app.services.audio_features_service import analyze_in_worker
+from app.models.audio_features import AudioFeatures
 from app.models.sample import Sample
+from app.services.job_queue import enqueue_job
+from src.tools.collection_scanner import CollectionScanner, ScanResult
 
 console = Console()
 
+# End-of-stream marker passed through the pipeline queues
+_DONE = None
+
+# Seconds the writer waits to fill a batch before writing a partial one
+WRITE_FLUSH_SECONDS = 2.0
+
+# Columns a re-import leaves alone (they may have been edited since)
+KEPT_ON_UPDATE = {"user_id", "title", "file_path", "tags"}
+
 
 # Folder name to genre/tag mapping
 FOLDER_TAG_MAP = {
@@ -77,23 +99,28 @@ class PerformanceMonitor:
         self.samples_successful = 0
         self.samples_failed = 0
         self.total_samples = 0
-        self.total_cost = 0.0
 
-    def update(self, success: bool = True, cost: float = 0.0):
+        # Pipeline stage counters
+        self.scanned = 0
+        self.analyzed = 0
+        self.write_batches = 0
+        self.queues: Dict[str, asyncio.Queue] = {}
+
+    def update(self, success: bool = True):
         """Update counters"""
         self.samples_processed += 1
         if success:
             self.samples_successful += 1
         else:
             self.samples_failed += 1
-        self.total_cost += cost
 
     def get_stats(self) -> Dict:
         """Get current performance statistics"""
         elapsed = time.time() - self.start_time
-        cpu_percent = self.process.cpu_percent(interval=0.1)
+        # Non-blocking: usage since the previous call (the dashboard refreshes in the event loop)
+        cpu_percent = self.process.cpu_percent(interval=None)
         memory_mb = self.process.memory_info().rss / 1024 / 1024
-        per_core = psutil.cpu_percent(interval=0.1, percpu=True)
+        per_core = psutil.cpu_percent(interval=None, percpu=True)
 
         rate = self.samples_processed / elapsed if elapsed > 0 else 0
         eta_seconds = (self.total_samples - self.samples_processed) / rate if rate > 0 else 0
@@ -128,13 +155,17 @@ class PerformanceMonitor:
         table.add_row("Elapsed", f"{stats['elapsed_seconds']/60:.1f} minutes")
         table.add_row("", "")
 
-        # Resources
-        table.add_row("CPU", f"{stats['cpu_total']:.1f}%")
-        table.add_row("Memory", f"{stats['memory_mb']:.1f} MB")
+        # Pipeline
+        table.add_row("Scanned", str(self.scanned))
+        table.add_row("Analyzed", f"{self.analyzed} ({self.analyzed / max(stats['elapsed_seconds'], 1e-9):.1f}/s)")
+        table.add_row("Written", f"{self.samples_processed} in {self.write_batches} batches")
+        for name, queue in self.queues.items():
+            table.add_row(f"{name.title()} queue", f"{queue.qsize()}/{queue.maxsize}")
         table.add_row("", "")
 
-        # Cost
-        table.add_row("Total Cost", f"${self.total_cost:.4f}")
+        # Resources
+        table.add_row("CPU", f"{stats['cpu_total']:.1f}% ({sum(stats['cpu_per_core']):.0f}% all cores)")
+        table.add_row("Memory", f"{stats['memory_mb']:.1f} MB")
 
         return Panel(table, title="[bold]Batch Import Monitor[/bold]", border_style="blue")
 
@@ -146,7 +177,7 @@ class BatchImporter:
         self,
         db_path: str,
         parallel_audio: int = 10,
-        batch_size: int = 10,
+        batch_size: int = 500,
         user_id: int = 1,
         monitor_interval: int = 5
     ):
@@ -167,17 +198,42 @@ class BatchImporter:
         self.monitor = PerformanceMonitor()
         self.progress_file = None
         self.failed_files = []
+        # Manifest scan recorded once its files are written
+        self._pending_scan: Optional[Tuple[CollectionScanner, ScanResult]] = None
 
-    def discover_samples(self, directory: Path) -> List[Tuple[Path, List[str]]]:
+    def discover_samples(
+        self,
+        directory: Path,
+        manifest: Optional[Path] = None
+    ) -> List[Tuple[Path, List[str]]]:
         """
         Recursively find all WAV files and extract tags from folder structure.
 
+        Args:
+            directory: Library root
+            manifest: Scan manifest; when given, only files added or modified
+                since the previous completed run with the same manifest are
+                returned (run() records the scan after the import)
+
         Returns:
             List of (file_path, tags) tuples
         """
         samples = []
 
-        for wav_file in directory.rglob("*.wav"):
+        scanner = CollectionScanner(directory, manifest_path=manifest, extensions={".wav"})
+        result = scanner.scan(update_manifest=False)
+        if manifest:
+            self._pending_scan = (scanner, result)
+            changes = result.changes
+            console.print(
+                f"[cyan]{len(changes.added)} new, {len(changes.modified)} modified, "
+                f"{len(changes.deleted)} deleted, {changes.unchanged} unchanged[/cyan]"
+            )
+            wav_files = changes.added + changes.modified
+        else:
+            wav_files = result.paths
+
+        for wav_file in wav_files:
             # Extract tags from folder name
             folder_name = wav_file.parent.name.lower()
             # Make a copy of tags to avoid mutating shared list from FOLDER_TAG_MAP
@@ -202,184 +258,250 @@ class BatchImporter:
 
         return title
 
-    async def process_sample(
+    def _sample_row(
         self,
         file_path: Path,
         tags: List[str],
-        session: AsyncSession
-    ) -> Tuple[bool, float]:
-        """
-        Process a single sample with hybrid analysis.
-
-        Returns:
-            (success, cost)
-        """
-        try:
-            # Create sample record
-            title = self.extract_title(file_path)
-
-            sample = Sample(
-                user_id=self.user_id,
-                title=title,
-                file_path=str(file_path.absolute()),
-                tags=tags,
-                genre="percussion" if any(t in ["kick", "snare", "hihat", "tom"] for t in tags) else "misc"
+        file_size: Optional[int],
+        features: Optional[AudioFeatures]
+    ) -> Dict:
+        """Column values for one sample (same fields HybridAnalysisService sets)."""
+        row = {
+            "user_id": self.user_id,
+            "title": self.extract_title(file_path),
+            "file_path": str(file_path.absolute()),
+            "file_size": file_size,
+            "tags": tags,
+            "genre": "percussion" if any(t in ["kick", "snare", "hihat", "tom"] for t in tags) else "misc",
+            "genre_confidence": None,
+            "bpm": None,
+            "bpm_confidence": None,
+            "musical_key": None,
+            "key_confidence": None,
+            "duration": None,
+            "loudness_lufs": None,
+            "true_peak_dbtp": None,
+            "loudness_range_lu": None,
+            "analysis_metadata": None,
+            "extra_metadata": {},
+        }
+        if features:
+            row.update(
+                bpm=features.bpm,
+                bpm_confidence=features.bpm_confidence if features.bpm else None,
+                duration=features.duration_seconds,
+                loudness_lufs=features.loudness_lufs,
+                true_peak_dbtp=features.true_peak_dbtp,
+                loudness_range_lu=features.loudness_range_lu,
+                analysis_metadata=features.metadata or None,
+                extra_metadata={"audio_features": features.to_dict()},
             )
-
-            session.add(sample)
-            await session.flush()  # Get sample ID - MUST be sequential
-            sample_id = sample.id
-
-            # Return sample data for parallel processing
-            return (sample_id, file_path, sample)
-
-        except Exception as e:
-            console.print(f"[red]Error creating sample {file_path.name}: {e}[/red]")
-            self.failed_files.append(str(file_path))
-            return None
-
-    async def analyze_sample_batch(
+            if features.key:
+                row["musical_key"] = f"{features.key} {features.scale or ''}".strip()
+                row["key_confidence"] = features.key_confidence
+            if features.genre:
+                row["genre"] = features.genre
+                row["genre_confidence"] = features.genre_confidence
+        return row
+
+    async def _scan_stage(self, samples: List[Tuple[Path, List[str]]], analysis_queue: asyncio.Queue):
+        """Stage 1: feed discovered files to the analysis stage."""
+        for item in samples:
+            await analysis_queue.put(item)
+            self.monitor.scanned += 1
+        for _ in range(self.parallel_audio):
+            await analysis_queue.put(_DONE)
+
+    async def _analysis_stage(
         self,
-        sample_data: List[Tuple[int, Path, Sample]],
-        session: AsyncSession
-    ) -> List[Tuple[bool, float]]:
-        """Analyze a batch of samples in parallel"""
-        # Create analysis tasks for all samples
-        async def analyze_one(sample_id: int, file_path: Path, sample: Sample):
-            try:
-                # Create hybrid service with session
-                hybrid_service = HybridAnalysisService(session)
-
-                # Run hybrid analysis
-                result = await hybrid_service.analyze_sample(
-                    sample_id=sample_id,
-                    force_analyze=True
-                )
-
-                # Update sample with analysis results (no flush)
-                if result.audio_features:
-                    sample.bpm = result.audio_features.bpm
-                    sample.musical_key = result.audio_features.key
-                    sample.extra_metadata = sample.extra_metadata or {}
-                    sample.extra_metadata["audio_features"] = result.audio_features.model_dump()
-
-                if result.vibe_analysis:
-                    sample.extra_metadata = sample.extra_metadata or {}
-                    sample.extra_metadata["vibe_analysis"] = result.vibe_analysis  # Already a string
-                    sample.analyzed_at = datetime.utcnow()
-
-                return True, result.cost
-
-            except Exception as e:
-                console.print(f"[red]Error analyzing {file_path.name}: {e}[/red]")
-                return False, 0.0
-
-        # Run analyses in parallel
-        tasks = [analyze_one(sid, fp, s) for sid, fp, s in sample_data]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-
-        # Convert exceptions to failures
-        final_results = []
-        for r in results:
-            if isinstance(r, Exception):
-                final_results.append((False, 0.0))
-            else:
-                final_results.append(r)
-
-        return final_results
-
-    async def process_batch(
+        pool: ProcessPoolExecutor,
+        analysis_queue: asyncio.Queue,
+        write_queue: asyncio.Queue
+    ):
+        """Stage 2: one of `parallel_audio` feeders keeping a pool process busy."""
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await analysis_queue.get()
+            if item is _DONE:
+                return
+            file_path, tags = item
+            features, error = await loop.run_in_executor(pool, analyze_in_worker, str(file_path))
+            file_size = file_path.stat().st_size if features is not None else None
+            self.monitor.analyzed += 1
+            await write_queue.put((file_path, tags, file_size, features, error))
+
+    async def _analysis_stages(
         self,
-        batch: List[Tuple[Path, List[str]]],
-        session: AsyncSession
+        pool: ProcessPoolExecutor,
+        analysis_queue: asyncio.Queue,
+        write_queue: asyncio.Queue
     ):
-        """Process a batch of samples - sequential for database stability"""
-        # Process samples one at a time to avoid async context issues
-        for file_path, tags in batch:
-            try:
-                # Create sample record
-                title = self.extract_title(file_path)
-                sample = Sample(
-                    user_id=self.user_id,
-                    title=title,
-                    file_path=str(file_path.absolute()),
-                    file_size=file_path.stat().st_size,
-                    tags=tags,
-                    genre="percussion" if any(t in ["kick", "snare", "hihat", "tom"] for t in tags) else "misc"
-                )
-
-                session.add(sample)
-                await session.flush()
+        await asyncio.gather(*(
+            self._analysis_stage(pool, analysis_queue, write_queue)
+            for _ in range(self.parallel_audio)
+        ))
+        await write_queue.put(_DONE)
 
-                # Create hybrid service and analyze
-                hybrid_service = HybridAnalysisService(session)
-                result = await hybrid_service.analyze_sample(
-                    sample_id=sample.id,
-                    force_analyze=True
+    async def _write_stage(
+        self,
+        write_queue: asyncio.Queue,
+        full_analysis: bool,
+        save_progress: Optional[Path]
+    ):
+        """Stage 3: the only database writer, one multi-row INSERT per batch."""
+        loop = asyncio.get_running_loop()
+        async with self.async_session() as session:
+            pending = []
+            deadline = None
+
+            async def flush():
+                nonlocal pending, deadline
+                if pending:
+                    await self._write_batch(session, pending, full_analysis)
+                    if save_progress:
+                        self.save_progress_file(save_progress, self.monitor.samples_processed)
+                pending, deadline = [], None
+
+            while True:
+                timeout = None if deadline is None else max(deadline - loop.time(), 0)
+                try:
+                    item = await asyncio.wait_for(write_queue.get(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    # Analysis is the bottleneck; don't hold rows back
+                    await flush()
+                    continue
+                if item is _DONE:
+                    await flush()
+                    return
+                pending.append(item)
+                if deadline is None:
+                    deadline = loop.time() + WRITE_FLUSH_SECONDS
+                if len(pending) >= self.batch_size:
+                    await flush()
+
+    async def _write_batch(self, session: AsyncSession, batch: List[Tuple], full_analysis: bool):
+        """Insert or update a batch of samples (and queue their vibe jobs) in one transaction."""
+        rows = [
+            self._sample_row(file_path, tags, file_size, features)
+            for file_path, tags, file_size, features, _ in batch
+        ]
+        existing = dict((await session.execute(
+            select(Sample.file_path, Sample.id).where(Sample.file_path.in_([row["file_path"] for row in rows]))
+        )).all())
+
+        sample_ids = []
+        new_rows = [row for row in rows if row["file_path"] not in existing]
+        if new_rows:
+            result = await session.execute(insert(Sample).returning(Sample.id), new_rows)
+            sample_ids.extend(result.scalars().all())
+        updates = [
+            {"id": existing[row["file_path"]], **{k: v for k, v in row.items() if k not in KEPT_ON_UPDATE}}
+            for row in rows if row["file_path"] in existing
+        ]
+        if updates:
+            await session.execute(update(Sample), updates)
+            sample_ids.extend(row["id"] for row in updates)
+
+        if full_analysis:
+            for sample_id in sample_ids:
+                await enqueue_job(
+                    session, "sample.vibe", {"sample_id": sample_id},
+                    queue="vibe", commit=False, user_id=self.user_id
                 )
+        await session.commit()
 
-                # Update sample with results
-                if result.audio_features:
-                    sample.bpm = result.audio_features.bpm
-                    sample.musical_key = result.audio_features.key
-                    sample.duration = result.audio_features.duration_seconds
-                    sample.extra_metadata = sample.extra_metadata or {}
-                    sample.extra_metadata["audio_features"] = result.audio_features.model_dump()
-
-                if result.vibe_analysis:
-                    sample.extra_metadata = sample.extra_metadata or {}
-                    sample.extra_metadata["vibe_analysis"] = result.vibe_analysis
-                    sample.analyzed_at = datetime.utcnow()
-
-                self.monitor.update(success=True, cost=result.cost)
-
-            except Exception as e:
-                console.print(f"[red]Error processing {file_path.name}: {e}[/red]")
+        self.monitor.write_batches += 1
+        for file_path, _, _, features, error in batch:
+            if error:
+                console.print(f"[red]Error analyzing {file_path.name}: {error}[/red]")
                 self.failed_files.append(str(file_path))
-                self.monitor.update(success=False, cost=0.0)
-
-        # Commit batch
-        await session.commit()
+            self.monitor.update(success=error is None)
 
     async def run(
         self,
         directory: Path,
         full_analysis: bool = True,
-        save_progress: Optional[Path] = None
+        save_progress: Optional[Path] = None,
+        manifest: Optional[Path] = None,
+        live: bool = False
     ):
         """Run batch import"""
 
         # Discover samples
         console.print(f"\n[cyan]Scanning directory: {directory}[/cyan]")
-        samples = self.discover_samples(directory)
+        samples = self.discover_samples(directory, manifest)
 
         if not samples:
             console.print("[red]No WAV files found![/red]")
+            self._record_scan()
             return
 
         console.print(f"[green]Found {len(samples)} samples[/green]\n")
 
+        found = len(samples)
+        samples = await self._skip_imported(samples)
+        if len(samples) < found:
+            console.print(f"[cyan]Skipping {found - len(samples)} samples already imported[/cyan]\n")
+        if not samples:
+            self._record_scan()
+            return
+
         self.monitor.total_samples = len(samples)
         self.progress_file = save_progress
 
-        # Process in batches
-        start_time = time.time()
-
-        async with self.async_session() as session:
-            for i in range(0, len(samples), self.batch_size):
-                batch = samples[i:i + self.batch_size]
+        # Bounded queues: a full queue pauses the stage feeding it
+        analysis_queue: asyncio.Queue = asyncio.Queue(maxsize=self.parallel_audio * 2)
+        write_queue: asyncio.Queue = asyncio.Queue(maxsize=self.batch_size * 2)
+        self.monitor.queues = {"analysis": analysis_queue, "write": write_queue}
 
-                # Process batch
-                await self.process_batch(batch, session)
-
-                # Save progress
-                if save_progress:
-                    self.save_progress_file(save_progress, i + len(batch))
+        start_time = time.time()
+        with ProcessPoolExecutor(max_workers=self.parallel_audio) as pool:
+            stages = [
+                asyncio.create_task(self._scan_stage(samples, analysis_queue)),
+                asyncio.create_task(self._analysis_stages(pool, analysis_queue, write_queue)),
+                asyncio.create_task(self._write_stage(write_queue, full_analysis, save_progress)),
+            ]
+            try:
+                if live:
+                    with Live(self.monitor.create_dashboard(), console=console, refresh_per_second=1) as display:
+                        while not all(stage.done() for stage in stages):
+                            await asyncio.wait(stages, timeout=self.monitor_interval)
+                            display.update(self.monitor.create_dashboard())
+                await asyncio.gather(*stages)
+            except BaseException:
+                # A failed stage would leave the others blocked on its queue
+                for stage in stages:
+                    stage.cancel()
+                raise
+        self._record_scan()
 
         # Final report
         elapsed = time.time() - start_time
         self.print_final_report(elapsed)
 
+    async def _skip_imported(self, samples: List[Tuple[Path, List[str]]]) -> List[Tuple[Path, List[str]]]:
+        """Drop files already in the database, unless modified since the last manifest scan."""
+        modified = set(self._pending_scan[1].changes.modified) if self._pending_scan else set()
+        paths = [str(file_path.absolute()) for file_path, _ in samples]
+        imported = set()
+        async with self.async_session() as session:
+            for start in range(0, len(paths), self.batch_size):
+                result = await session.execute(
+                    select(Sample.file_path).where(Sample.file_path.in_(paths[start:start + self.batch_size]))
+                )
+                imported.update(result.scalars())
+        return [
+            (file_path, tags) for file_path, tags in samples
+            if file_path in modified or str(file_path.absolute()) not in imported
+        ]
+
+    def _record_scan(self):
+        """Save the manifest scan now that its files are in the database."""
+        if self._pending_scan:
+            scanner, result = self._pending_scan
+            scanner.record(result)
+            self._pending_scan = None
+
     def save_progress_file(self, path: Path, last_index: int):
         """Save progress to file"""
         progress = {
@@ -388,7 +510,6 @@ class BatchImporter:
             "successful": self.monitor.samples_successful,
             "failed": self.monitor.samples_failed,
             "failed_files": self.failed_files,
-            "total_cost": self.monitor.total_cost,
             "timestamp": datetime.utcnow().isoformat()
         }
 
@@ -407,8 +528,6 @@ Success Rate: {self.monitor.samples_successful/self.monitor.total_samples*100:.1
 
 Processing Time: {elapsed/60:.1f} minutes
 Rate: {self.monitor.total_samples/(elapsed/60):.1f} samples/min
-
-Total Cost: ${self.monitor.total_cost:.4f}
 """,
             title="Final Report",
             border_style="green"
@@ -445,15 +564,15 @@ async def main():
     parser.add_argument(
         "--parallel-audio",
         type=int,
-        default=10,
-        help="Number of parallel audio analysis tasks (default: 10)"
+        default=os.cpu_count() or 4,
+        help="Audio analysis worker processes (default: CPU count)"
     )
 
     parser.add_argument(
         "--batch-size",
         type=int,
-        default=10,
-        help="Samples per database batch commit (default: 10)"
+        default=500,
+        help="Samples per multi-row INSERT and commit (default: 500)"
     )
 
     parser.add_argument(
@@ -472,7 +591,7 @@ async def main():
     parser.add_argument(
         "--monitor",
         action="store_true",
-        help="Show real-time performance monitoring"
+        help="Show the live pipeline dashboard"
     )
 
     parser.add_argument(
@@ -481,6 +600,12 @@ async def main():
         help="Save progress to file for resume capability"
     )
 
+    parser.add_argument(
+        "--manifest",
+        type=Path,
+        help="Scan manifest; import only files added or modified since the last run using it"
+    )
+
     parser.add_argument(
         "--user-id",
         type=int,
@@ -505,20 +630,13 @@ async def main():
 
     # Run import
     try:
-        if args.monitor:
-            # TODO: Add live monitoring with Rich Live display
-            # For now, just run without live dashboard
-            await importer.run(
-                directory=args.directory,
-                full_analysis=not args.audio_only,
-                save_progress=args.save_progress
-            )
-        else:
-            await importer.run(
-                directory=args.directory,
-                full_analysis=not args.audio_only,
-                save_progress=args.save_progress
-            )
+        await importer.run(
+            directory=args.directory,
+            full_analysis=not args.audio_only,
+            save_progress=args.save_progress,
+            manifest=args.manifest,
+            live=args.monitor
+        )
     except KeyboardInterrupt:
         console.print("\n[yellow]Import interrupted by user[/yellow]")
         if args.save_progress:
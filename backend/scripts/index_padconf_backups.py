@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Index SP-404MK2 project backups and search them by sample.
+
+Scans a directory tree for PADCONF.BIN files and records every assigned pad
+in the database, then answers "which of my projects use this sample".
+
+Usage:
+    python scripts/index_padconf_backups.py index ~/SP404/backups
+    python scripts/index_padconf_backups.py find Kick_001.wav
+    python scripts/index_padconf_backups.py find kick --contains
+"""
+
+import asyncio
+import sys
+import argparse
+import time
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from rich.console import Console
+from rich.table import Table
+
+from app.core.database import engine
+from app.services.padconf_index_service import PadconfIndexService
+
+console = Console()
+
+
+async def index(root: Path, prune: bool) -> None:
+    """Index every PADCONF.BIN under root."""
+    async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with async_session() as session:
+        stats = await PadconfIndexService(session).index_directory(root, prune=prune)
+
+    console.print(
+        f"[green]Indexed {stats.indexed} projects ({stats.pads} pads)[/green], "
+        f"{stats.unchanged} unchanged, {stats.removed} removed "
+        f"in {stats.duration_seconds:.2f}s"
+    )
+    for error in stats.errors:
+        console.print(f"[yellow]Skipped {error}[/yellow]")
+
+
+async def find(filename: str, contains: bool) -> None:
+    """Print every indexed project pad using a sample."""
+    async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with async_session() as session:
+        start = time.perf_counter()
+        usages = await PadconfIndexService(session).find_sample(filename, contains=contains)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+    if not usages:
+        console.print(f"[yellow]No indexed project uses {filename}[/yellow]")
+        return
+
+    table = Table(title=f"Projects using {filename}")
+    table.add_column("Project", style="cyan")
+    table.add_column("Pad", style="magenta")
+    table.add_column("Filename")
+    table.add_column("BPM", justify="right")
+    table.add_column("Path", style="dim")
+    for usage in usages:
+        table.add_row(
+            usage.project_name or "-",
+            f"{usage.bank}{usage.pad_number:02d}",
+            usage.filename,
+            f"{usage.bpm:.2f}" if usage.bpm else "-",
+            usage.path
+        )
+    console.print(table)
+    console.print(f"[dim]{len(usages)} pads in {elapsed_ms:.1f}ms[/dim]")
+
+
+async def main(args) -> None:
+    try:
+        if args.command == "index":
+            await index(Path(args.root).expanduser().resolve(), prune=not args.keep_missing)
+        else:
+            await find(args.filename, contains=args.contains)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Index SP-404MK2 project backups (PADCONF.BIN) and search them by sample"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    index_parser = subparsers.add_parser("index", help="Index a backup directory tree")
+    index_parser.add_argument("root", help="Directory containing project backups")
+    index_parser.add_argument(
+        "--keep-missing",
+        action="store_true",
+        help="Keep entries for PADCONF.BIN files that no longer exist"
+    )
+
+    find_parser = subparsers.add_parser("find", help="Find projects using a sample")
+    find_parser.add_argument("filename", help="Pad filename, e.g. Kick_001.wav (case-insensitive)")
+    find_parser.add_argument(
+        "--contains", "-c",
+        action="store_true",
+        help="Match filenames containing the text"
+    )
+
+    asyncio.run(main(parser.parse_args()))
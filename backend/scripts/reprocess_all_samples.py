@@ -1,105 +1,84 @@
 #!/usr/bin/env python3
 """
-Reprocess ALL samples with improved audio analysis.
-
-Re-analyzes all samples in the database using the improved audio analysis
-system with Essentia, octave correction, and confidence scoring.
+Reprocess samples whose analysis is out of date.
+
+Every analysis records the analyzer name and version of each feature (BPM,
+key, genre, spectral) in Sample.analysis_metadata. This script plans which
+samples have a stale version of the selected features, re-extracts only
+those features in parallel worker processes, and writes the results back in
+bulk. After a BPM algorithm upgrade only BPM is re-run, and only for samples
+analyzed with the older version; --force re-runs everything.
 """
 
 import asyncio
 import sys
 import argparse
 from pathlib import Path
-from typing import List
+from typing import Optional, Sequence
 from datetime import datetime
 
 # Add backend to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from rich.console import Console
 from rich.table import Table
 from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
 from rich.panel import Panel
 
-from app.core.config import settings
 from app.core.database import engine
-from app.models.sample import Sample
-from app.services.audio_features_service import AudioFeaturesService
+from app.services.audio_features_service import enabled_features
+from app.services.reprocess_planner import ReprocessResult, ReprocessRunner, plan_reprocess
 
 console = Console()
 
 
-async def get_all_samples(session) -> List[Sample]:
-    """Get all samples from database."""
-    query = select(Sample).order_by(Sample.id)
-    result = await session.execute(query)
-    return list(result.scalars().all())
-
-
-async def reprocess_sample(sample: Sample, audio_service: AudioFeaturesService, session) -> dict:
-    """Reprocess a single sample and return results."""
-    try:
-        file_path = Path(sample.file_path)
-
-        if not file_path.exists():
-            return {
-                "id": sample.id,
-                "title": sample.title,
-                "status": "error",
-                "error": "File not found",
-                "old_bpm": sample.bpm
-            }
-
-        # Store old values
-        old_bpm = sample.bpm
-        old_genre = sample.genre
-        old_key = sample.musical_key
-
-        # Re-analyze
-        features = await audio_service.analyze_file(file_path)
-
-        # Update sample
-        sample.bpm = features.bpm
-        sample.musical_key = features.key
-        sample.genre = features.genre
-        sample.bpm_confidence = features.bpm_confidence
-        sample.genre_confidence = features.genre_confidence
-        sample.key_confidence = features.key_confidence
-        sample.analysis_metadata = features.metadata if features.metadata else {}
-        sample.analyzed_at = datetime.utcnow()
-
-        await session.commit()
-
-        return {
-            "id": sample.id,
-            "title": sample.title,
-            "status": "success",
-            "old_bpm": old_bpm,
-            "new_bpm": sample.bpm,
-            "bpm_confidence": sample.bpm_confidence,
-            "bpm_changed": abs(old_bpm - sample.bpm) > 1.0 if old_bpm else False,
-            "genre_changed": old_genre != sample.genre if old_genre else False
-        }
-
-    except Exception as e:
+def summarize(result: ReprocessResult) -> dict:
+    """Flatten a reprocess result for the report."""
+    sample = result.sample
+    if result.error:
         return {
             "id": sample.id,
             "title": sample.title,
             "status": "error",
-            "error": str(e),
+            "error": result.error,
             "old_bpm": sample.bpm
         }
 
-
-async def main(yes: bool = False, limit: int = None):
+    features = result.features
+    summary = {
+        "id": sample.id,
+        "title": sample.title,
+        "status": "success",
+        "old_bpm": sample.bpm,
+        "new_bpm": sample.bpm,
+        "bpm_changed": False
+    }
+    if "bpm" in features.metadata["analyzers"]:
+        summary["new_bpm"] = features.bpm
+        summary["bpm_confidence"] = features.bpm_confidence
+        summary["bpm_changed"] = (
+            sample.bpm is not None and features.bpm is not None
+            and abs(sample.bpm - features.bpm) > 1.0
+        )
+    return summary
+
+
+async def main(
+    yes: bool = False,
+    limit: Optional[int] = None,
+    features: Optional[Sequence[str]] = None,
+    force: bool = False,
+    workers: Optional[int] = None,
+    batch_size: int = 200
+):
     """Main execution."""
     start_time = datetime.now()
+    features = tuple(features or enabled_features())
 
     console.print(Panel.fit(
-        "[bold cyan]Full Sample Reprocessing[/bold cyan]\n"
-        "Re-analyzing all samples with improved audio analysis",
+        "[bold cyan]Incremental Sample Reprocessing[/bold cyan]\n"
+        f"Re-analyzing stale features: {', '.join(features)}",
         border_style="cyan"
     ))
 
@@ -110,125 +89,113 @@ async def main(yes: bool = False, limit: int = None):
         expire_on_commit=False
     )
 
+    # Plan
+    console.print("\n[yellow]📊 Planning from stored analyzer versions...[/yellow]")
     async with async_session() as session:
-        # Get all samples
-        console.print("\n[yellow]📊 Loading samples from database...[/yellow]")
-        samples = await get_all_samples(session)
+        plan = await plan_reprocess(session, features=features, force=force, limit=limit)
 
-        if not samples:
-            console.print("[yellow]⚠ No samples found in database![/yellow]")
-            return
+    if not plan.samples:
+        console.print(f"[green]✓ All {plan.up_to_date} samples are up to date![/green]")
+        return
 
-        # Apply limit if specified
-        if limit:
-            samples = samples[:limit]
-            console.print(f"[yellow]Limiting to first {limit} samples[/yellow]")
-
-        console.print(f"[green]✓ Found {len(samples)} samples to reprocess[/green]")
-
-        # Confirm (unless --yes flag provided)
-        if not yes:
-            console.print(f"\n[yellow]About to reprocess {len(samples)} samples[/yellow]")
-            console.print(f"[dim]Estimated time: ~{len(samples) * 3 / 60:.1f} minutes[/dim]")
-            response = console.input("[bold]Continue? [y/N]: [/bold]")
-
-            if response.lower() != 'y':
-                console.print("[red]Cancelled[/red]")
-                return
-        else:
-            console.print(f"\n[green]Auto-confirmed: Reprocessing {len(samples)} samples...[/green]")
-            console.print(f"[dim]Estimated time: ~{len(samples) * 3 / 60:.1f} minutes[/dim]")
-
-        # Initialize audio service
-        audio_service = AudioFeaturesService()
-
-        # Process samples with progress bar
-        results = []
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            BarColumn(),
-            TaskProgressColumn(),
-            console=console
-        ) as progress:
-            task = progress.add_task("[cyan]Reprocessing samples...", total=len(samples))
-
-            for i, sample in enumerate(samples, 1):
-                progress.update(
-                    task,
-                    description=f"[cyan][{i}/{len(samples)}] {sample.title[:40]}..."
-                )
-                result = await reprocess_sample(sample, audio_service, session)
-                results.append(result)
-                progress.advance(task)
-
-        # Calculate stats
-        end_time = datetime.now()
-        duration = (end_time - start_time).total_seconds()
-
-        success_count = sum(1 for r in results if r["status"] == "success")
-        error_count = sum(1 for r in results if r["status"] == "error")
-        bpm_changed_count = sum(1 for r in results if r.get("bpm_changed", False))
-        genre_changed_count = sum(1 for r in results if r.get("genre_changed", False))
-
-        # Show results
-        console.print("\n[bold green]✓ Reprocessing Complete[/bold green]\n")
-
-        # Summary stats
-        console.print("[bold]Summary Statistics:[/bold]")
-        console.print(f"  Total processed: {len(results)}")
-        console.print(f"  [green]Successful: {success_count} ({success_count/len(results)*100:.1f}%)[/green]")
-        console.print(f"  [red]Errors: {error_count}[/red]")
-        console.print(f"  [yellow]BPM changed: {bpm_changed_count} ({bpm_changed_count/len(results)*100:.1f}%)[/yellow]")
-        console.print(f"  [yellow]Genre changed: {genre_changed_count} ({genre_changed_count/len(results)*100:.1f}%)[/yellow]")
-        console.print(f"  [cyan]Duration: {duration/60:.1f} minutes[/cyan]")
-        console.print(f"  [cyan]Average: {duration/len(results):.1f}s per sample[/cyan]")
-
-        # Show some examples of changed BPMs
-        changed_samples = [r for r in results if r.get("bpm_changed", False)]
-        if changed_samples:
-            console.print("\n[bold]Sample BPM Changes (first 10):[/bold]")
-            table = Table()
-            table.add_column("Title", style="white")
-            table.add_column("Old BPM", style="red")
-            table.add_column("New BPM", style="green")
-            table.add_column("Confidence", style="cyan")
-
-            for result in changed_samples[:10]:
-                confidence = result.get("bpm_confidence", 0)
-                confidence_str = f"{confidence}%" if confidence else "N/A"
-
-                table.add_row(
-                    result["title"][:40],
-                    f"{result['old_bpm']:.1f}",
-                    f"{result['new_bpm']:.1f}",
-                    confidence_str
-                )
-
-            console.print(table)
-
-        # Log errors if any
-        error_samples = [r for r in results if r["status"] == "error"]
-        if error_samples:
-            console.print(f"\n[bold red]Errors ({len(error_samples)}):[/bold red]")
-            error_table = Table()
-            error_table.add_column("Title", style="white")
-            error_table.add_column("Error", style="red")
-
-            for result in error_samples[:10]:
-                error_table.add_row(
-                    result["title"][:40],
-                    result.get("error", "Unknown")[:50]
-                )
-
-            console.print(error_table)
-            if len(error_samples) > 10:
-                console.print(f"[dim]... and {len(error_samples) - 10} more errors[/dim]")
+    if limit:
+        console.print(f"[yellow]Limiting to first {limit} samples[/yellow]")
+
+    counts = ", ".join(f"{feature}: {count}" for feature, count in plan.feature_counts().items() if count)
+    console.print(f"[green]✓ {len(plan.samples)} samples to reprocess ({counts}); {plan.up_to_date} up to date[/green]")
+
+    # Confirm (unless --yes flag provided)
+    if not yes:
+        console.print(f"\n[yellow]About to reprocess {len(plan.samples)} samples[/yellow]")
+        response = console.input("[bold]Continue? [y/N]: [/bold]")
+
+        if response.lower() != 'y':
+            console.print("[red]Cancelled[/red]")
+            return
+    else:
+        console.print(f"\n[green]Auto-confirmed: Reprocessing {len(plan.samples)} samples...[/green]")
+
+    # Analyze in worker processes, write back in bulk
+    runner = ReprocessRunner(async_session, workers=workers, batch_size=batch_size)
+    with Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        BarColumn(),
+        TaskProgressColumn(),
+        console=console
+    ) as progress:
+        task = progress.add_task("[cyan]Reprocessing samples...", total=len(plan.samples))
+
+        def on_result(result: ReprocessResult):
+            progress.update(task, advance=1, description=f"[cyan]{result.sample.title[:40]}...")
+
+        results = [summarize(r) for r in await runner.run(plan, on_result=on_result)]
+
+    # Calculate stats
+    end_time = datetime.now()
+    duration = (end_time - start_time).total_seconds()
+
+    success_count = sum(1 for r in results if r["status"] == "success")
+    error_count = sum(1 for r in results if r["status"] == "error")
+    bpm_changed_count = sum(1 for r in results if r.get("bpm_changed", False))
+
+    # Show results
+    console.print("\n[bold green]✓ Reprocessing Complete[/bold green]\n")
+
+    # Summary stats
+    console.print("[bold]Summary Statistics:[/bold]")
+    console.print(f"  Total processed: {len(results)}")
+    console.print(f"  [green]Successful: {success_count} ({success_count/len(results)*100:.1f}%)[/green]")
+    console.print(f"  [red]Errors: {error_count}[/red]")
+    console.print(f"  [yellow]BPM changed: {bpm_changed_count} ({bpm_changed_count/len(results)*100:.1f}%)[/yellow]")
+    console.print(f"  [cyan]Duration: {duration/60:.1f} minutes[/cyan]")
+    console.print(f"  [cyan]Average: {duration/len(results):.1f}s per sample[/cyan]")
+
+    # Show some examples of changed BPMs
+    changed_samples = [r for r in results if r.get("bpm_changed", False)]
+    if changed_samples:
+        console.print("\n[bold]Sample BPM Changes (first 10):[/bold]")
+        table = Table()
+        table.add_column("Title", style="white")
+        table.add_column("Old BPM", style="red")
+        table.add_column("New BPM", style="green")
+        table.add_column("Confidence", style="cyan")
+
+        for result in changed_samples[:10]:
+            confidence = result.get("bpm_confidence", 0)
+            confidence_str = f"{confidence}%" if confidence else "N/A"
+
+            table.add_row(
+                result["title"][:40],
+                f"{result['old_bpm']:.1f}",
+                f"{result['new_bpm']:.1f}",
+                confidence_str
+            )
+
+        console.print(table)
+
+    # Log errors if any
+    error_samples = [r for r in results if r["status"] == "error"]
+    if error_samples:
+        console.print(f"\n[bold red]Errors ({len(error_samples)}):[/bold red]")
+        error_table = Table()
+        error_table.add_column("Title", style="white")
+        error_table.add_column("Error", style="red")
+
+        for result in error_samples[:10]:
+            error_table.add_row(
+                result["title"][:40],
+                result.get("error", "Unknown")[:50]
+            )
+
+        console.print(error_table)
+        if len(error_samples) > 10:
+            console.print(f"[dim]... and {len(error_samples) - 10} more errors[/dim]")
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
-        description="Reprocess all samples with improved audio analysis"
+        description="Reprocess samples whose stored analyzer versions are out of date"
     )
     parser.add_argument(
         "--yes", "-y",
@@ -240,6 +207,34 @@ if __name__ == "__main__":
         type=int,
         help="Limit number of samples to process (for testing)"
     )
+    parser.add_argument(
+        "--features", "-f",
+        default=",".join(enabled_features()),
+        help=f"Comma-separated features to check (default: {','.join(enabled_features())})"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Reprocess the selected features even where they are up to date"
+    )
+    parser.add_argument(
+        "--workers", "-w",
+        type=int,
+        help="Parallel analysis processes (default: CPU count)"
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=200,
+        help="Samples written per bulk update (default: 200)"
+    )
     args = parser.parse_args()
 
-    asyncio.run(main(yes=args.yes, limit=args.limit))
+    asyncio.run(main(
+        yes=args.yes,
+        limit=args.limit,
+        features=[f.strip() for f in args.features.split(",") if f.strip()],
+        force=args.force,
+        workers=args.workers,
+        batch_size=args.batch_size
+    ))
@@ -2,102 +2,61 @@
 """
 Reprocess samples with suspicious BPM values (octave errors).
 
-Finds samples with BPM < 60 or > 180 and re-analyzes them using the
-improved audio analysis system with octave correction.
+Finds samples with BPM < 60 or > 180 whose BPM was detected by an older
+version of the BPM analyzer (see Sample.analysis_metadata["analyzers"]) and
+re-runs BPM detection only, in parallel worker processes with bulk updates.
+Samples already analyzed by the current detector are skipped unless --force
+is given.
 """
 
 import asyncio
 import sys
 import argparse
 from pathlib import Path
-from typing import List
+from typing import Optional
 
 # Add backend to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from sqlalchemy import select, or_
+from sqlalchemy import or_
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from rich.console import Console
 from rich.table import Table
 from rich.progress import Progress, SpinnerColumn, TextColumn
 from rich.panel import Panel
 
-from app.core.config import settings
 from app.core.database import engine
 from app.models.sample import Sample
-from app.services.audio_features_service import AudioFeaturesService
+from app.services.reprocess_planner import ReprocessResult, ReprocessRunner, plan_reprocess
 
 console = Console()
 
+SUSPICIOUS_BPM = or_(Sample.bpm < 60, Sample.bpm > 180)
 
-async def find_suspicious_samples(session) -> List[Sample]:
-    """Find samples with BPM values likely to be octave errors."""
-    query = select(Sample).where(
-        or_(
-            Sample.bpm < 60,
-            Sample.bpm > 180
-        )
-    ).order_by(Sample.bpm)
-
-    result = await session.execute(query)
-    return list(result.scalars().all())
-
-
-async def reprocess_sample(sample: Sample, audio_service: AudioFeaturesService, session) -> dict:
-    """Reprocess a single sample and return results."""
-    try:
-        file_path = Path(sample.file_path)
-
-        if not file_path.exists():
-            return {
-                "id": sample.id,
-                "title": sample.title,
-                "status": "error",
-                "error": "File not found",
-                "old_bpm": sample.bpm
-            }
-
-        # Store old values
-        old_bpm = sample.bpm
-        old_genre = sample.genre
-
-        # Re-analyze
-        features = await audio_service.analyze_file(file_path)
-
-        # Update sample
-        sample.bpm = features.bpm
-        sample.musical_key = features.key
-        sample.genre = features.genre
-        sample.bpm_confidence = features.bpm_confidence
-        sample.genre_confidence = features.genre_confidence
-        sample.key_confidence = features.key_confidence
-
-        # Store analysis metadata
-        sample.analysis_metadata = features.metadata if features.metadata else {}
 
-        await session.commit()
-
-        return {
-            "id": sample.id,
-            "title": sample.title,
-            "status": "success",
-            "old_bpm": old_bpm,
-            "new_bpm": sample.bpm,
-            "bpm_confidence": sample.bpm_confidence,
-            "corrected": abs(old_bpm - sample.bpm) > 1.0
-        }
-
-    except Exception as e:
+def summarize(result: ReprocessResult) -> dict:
+    """Flatten a reprocess result for the report."""
+    sample = result.sample
+    if result.error:
         return {
             "id": sample.id,
             "title": sample.title,
             "status": "error",
-            "error": str(e),
+            "error": result.error,
             "old_bpm": sample.bpm
         }
-
-
-async def main(yes: bool = False):
+    return {
+        "id": sample.id,
+        "title": sample.title,
+        "status": "success",
+        "old_bpm": sample.bpm,
+        "new_bpm": result.features.bpm,
+        "bpm_confidence": result.features.bpm_confidence,
+        "corrected": result.features.bpm is not None and abs(sample.bpm - result.features.bpm) > 1.0
+    }
+
+
+async def main(yes: bool = False, force: bool = False, workers: Optional[int] = None):
     """Main execution."""
     console.print(Panel.fit(
         "[bold cyan]Selective BPM Reprocessing[/bold cyan]\n"
@@ -112,111 +71,113 @@ async def main(yes: bool = False):
         expire_on_commit=False
     )
 
+    # Find suspicious samples with a stale BPM analyzer
+    console.print("\n[yellow]🔍 Searching for suspicious BPM values...[/yellow]")
     async with async_session() as session:
-        # Find suspicious samples
-        console.print("\n[yellow]🔍 Searching for suspicious BPM values...[/yellow]")
-        samples = await find_suspicious_samples(session)
+        plan = await plan_reprocess(session, features=["bpm"], where=[SUSPICIOUS_BPM], force=force)
 
-        if not samples:
-            console.print("[green]✓ No suspicious BPM values found![/green]")
-            return
-
-        # Show what we found
-        table = Table(title=f"Found {len(samples)} Suspicious Samples")
-        table.add_column("ID", style="cyan")
-        table.add_column("Title", style="white")
-        table.add_column("Current BPM", style="yellow")
-        table.add_column("Issue", style="red")
-
-        for sample in samples:
-            issue = "Too Low" if sample.bpm < 60 else "Too High"
-            table.add_row(
-                str(sample.id),
-                sample.title[:50],
-                f"{sample.bpm:.1f}",
-                issue
+    if not plan.samples:
+        if plan.up_to_date:
+            console.print(
+                f"[green]✓ {plan.up_to_date} suspicious BPM values already come from the "
+                f"current detector (use --force to re-run)[/green]"
             )
+        else:
+            console.print("[green]✓ No suspicious BPM values found![/green]")
+        return
+
+    # Show what we found
+    table = Table(title=f"Found {len(plan.samples)} Suspicious Samples")
+    table.add_column("ID", style="cyan")
+    table.add_column("Title", style="white")
+    table.add_column("Current BPM", style="yellow")
+    table.add_column("Issue", style="red")
+
+    for sample in plan.samples:
+        issue = "Too Low" if sample.bpm < 60 else "Too High"
+        table.add_row(
+            str(sample.id),
+            sample.title[:50],
+            f"{sample.bpm:.1f}",
+            issue
+        )
 
-        console.print(table)
+    console.print(table)
 
-        # Confirm (unless --yes flag provided)
-        if not yes:
-            console.print(f"\n[yellow]About to reprocess {len(samples)} samples[/yellow]")
-            response = console.input("[bold]Continue? [y/N]: [/bold]")
+    # Confirm (unless --yes flag provided)
+    if not yes:
+        console.print(f"\n[yellow]About to reprocess {len(plan.samples)} samples[/yellow]")
+        response = console.input("[bold]Continue? [y/N]: [/bold]")
 
-            if response.lower() != 'y':
-                console.print("[red]Cancelled[/red]")
-                return
+        if response.lower() != 'y':
+            console.print("[red]Cancelled[/red]")
+            return
+    else:
+        console.print(f"\n[green]Auto-confirmed: Reprocessing {len(plan.samples)} samples...[/green]")
+
+    # Re-run BPM detection only, in worker processes
+    runner = ReprocessRunner(async_session, workers=workers)
+    with Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        console=console
+    ) as progress:
+        task = progress.add_task("[cyan]Reprocessing samples...", total=len(plan.samples))
+
+        def on_result(result: ReprocessResult):
+            progress.update(task, advance=1, description=f"[cyan]Processed {result.sample.title[:40]}...")
+
+        results = [summarize(r) for r in await runner.run(plan, on_result=on_result)]
+
+    # Show results
+    console.print("\n[bold green]✓ Reprocessing Complete[/bold green]\n")
+
+    # Summary table
+    summary = Table(title="Reprocessing Results")
+    summary.add_column("Title", style="white")
+    summary.add_column("Old BPM", style="red")
+    summary.add_column("New BPM", style="green")
+    summary.add_column("Confidence", style="cyan")
+    summary.add_column("Status", style="yellow")
+
+    success_count = 0
+    corrected_count = 0
+    error_count = 0
+
+    for result in results:
+        if result["status"] == "success":
+            success_count += 1
+            if result.get("corrected"):
+                corrected_count += 1
+
+            confidence = result.get("bpm_confidence", 0)
+            confidence_str = f"{confidence}%" if confidence else "N/A"
+
+            summary.add_row(
+                result["title"][:40],
+                f"{result['old_bpm']:.1f}",
+                f"{result['new_bpm']:.1f}" if result["new_bpm"] is not None else "—",
+                confidence_str,
+                "✓ Corrected" if result.get("corrected") else "✓ Same"
+            )
         else:
-            console.print(f"\n[green]Auto-confirmed: Reprocessing {len(samples)} samples...[/green]")
-
-        # Initialize audio service
-        audio_service = AudioFeaturesService()
-
-        # Process samples
-        results = []
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=console
-        ) as progress:
-            task = progress.add_task("[cyan]Reprocessing samples...", total=len(samples))
-
-            for sample in samples:
-                progress.update(task, description=f"[cyan]Processing {sample.title[:40]}...")
-                result = await reprocess_sample(sample, audio_service, session)
-                results.append(result)
-                progress.advance(task)
-
-        # Show results
-        console.print("\n[bold green]✓ Reprocessing Complete[/bold green]\n")
-
-        # Summary table
-        summary = Table(title="Reprocessing Results")
-        summary.add_column("Title", style="white")
-        summary.add_column("Old BPM", style="red")
-        summary.add_column("New BPM", style="green")
-        summary.add_column("Confidence", style="cyan")
-        summary.add_column("Status", style="yellow")
-
-        success_count = 0
-        corrected_count = 0
-        error_count = 0
-
-        for result in results:
-            if result["status"] == "success":
-                success_count += 1
-                if result.get("corrected"):
-                    corrected_count += 1
-
-                confidence = result.get("bpm_confidence", 0)
-                confidence_str = f"{confidence}%" if confidence else "N/A"
-
-                summary.add_row(
-                    result["title"][:40],
-                    f"{result['old_bpm']:.1f}",
-                    f"{result['new_bpm']:.1f}",
-                    confidence_str,
-                    "✓ Corrected" if result.get("corrected") else "✓ Same"
-                )
-            else:
-                error_count += 1
-                summary.add_row(
-                    result["title"][:40],
-                    f"{result['old_bpm']:.1f}",
-                    "—",
-                    "—",
-                    f"✗ {result.get('error', 'Unknown error')}"
-                )
-
-        console.print(summary)
-
-        # Final stats
-        console.print(f"\n[bold]Statistics:[/bold]")
-        console.print(f"  Total processed: {len(results)}")
-        console.print(f"  [green]Successful: {success_count}[/green]")
-        console.print(f"  [yellow]BPM corrected: {corrected_count}[/yellow]")
-        console.print(f"  [red]Errors: {error_count}[/red]")
+            error_count += 1
+            summary.add_row(
+                result["title"][:40],
+                f"{result['old_bpm']:.1f}",
+                "—",
+                "—",
+                f"✗ {result.get('error', 'Unknown error')}"
+            )
+
+    console.print(summary)
+
+    # Final stats
+    console.print(f"\n[bold]Statistics:[/bold]")
+    console.print(f"  Total processed: {len(results)}")
+    console.print(f"  [green]Successful: {success_count}[/green]")
+    console.print(f"  [yellow]BPM corrected: {corrected_count}[/yellow]")
+    console.print(f"  [red]Errors: {error_count}[/red]")
 
 
 if __name__ == "__main__":
@@ -228,6 +189,16 @@ if __name__ == "__main__":
         action="store_true",
         help="Auto-confirm without prompting (useful for cron jobs)"
     )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-run BPM detection even where the current detector produced it"
+    )
+    parser.add_argument(
+        "--workers", "-w",
+        type=int,
+        help="Parallel analysis processes (default: CPU count)"
+    )
     args = parser.parse_args()
 
-    asyncio.run(main(yes=args.yes))
+    asyncio.run(main(yes=args.yes, force=args.force, workers=args.workers))
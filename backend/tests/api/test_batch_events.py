@@ -0,0 +1,55 @@
+"""
+Tests for the batch progress event stream (/batch/{id}/events).
+"""
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.batch import Batch, BatchStatus
+from app.models.user import User
+
+
+async def _create_batch(db_session: AsyncSession, batch_id: str, user_id: int) -> Batch:
+    batch = Batch(
+        id=batch_id,
+        user_id=user_id,
+        name=batch_id,
+        collection_path="/fake/collection",
+        status=BatchStatus.COMPLETED,
+        total_samples=2,
+        processed_samples=2,
+        success_count=2,
+    )
+    db_session.add(batch)
+    await db_session.commit()
+    return batch
+
+
+@pytest.mark.asyncio
+async def test_events_stream_own_batch(
+    client: AsyncClient, db_session: AsyncSession, authenticated_user
+):
+    await _create_batch(db_session, "mine", authenticated_user["user"].id)
+
+    response = await client.get("/api/v1/batch/mine/events", headers=authenticated_user["headers"])
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert "event: progress" in response.text
+    assert '"status":"completed"' in response.text
+
+
+@pytest.mark.asyncio
+async def test_events_require_ownership(
+    client: AsyncClient, db_session: AsyncSession, authenticated_user
+):
+    other = User(email="other@example.com", username="other", hashed_password="x")
+    db_session.add(other)
+    await db_session.commit()
+    await _create_batch(db_session, "theirs", other.id)
+
+    response = await client.get("/api/v1/batch/theirs/events", headers=authenticated_user["headers"])
+    assert response.status_code == 404
+
+    response = await client.get("/api/v1/batch/theirs/events")
+    assert response.status_code in (401, 403)
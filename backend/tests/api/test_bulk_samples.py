@@ -0,0 +1,139 @@
+"""
+Tests for bulk sample endpoints (/samples/bulk-get, /bulk-update, /bulk-delete).
+"""
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.collection import Collection, CollectionSample
+from app.models.sample import Sample
+
+
+async def _create_samples(db_session: AsyncSession, user_id: int, count: int, tags=None):
+    samples = [
+        Sample(
+            user_id=user_id,
+            title=f"Bulk Sample {i}",
+            file_path=f"/fake/path/bulk_{i}.wav",
+            genre="jazz",
+            tags=list(tags or []),
+        )
+        for i in range(count)
+    ]
+    db_session.add_all(samples)
+    await db_session.commit()
+    return [sample.id for sample in samples]
+
+
+@pytest.mark.asyncio
+async def test_bulk_get_preserves_order_and_reports_missing(
+    client: AsyncClient, db_session: AsyncSession, authenticated_user
+):
+    ids = await _create_samples(db_session, authenticated_user["user"].id, 3)
+
+    response = await client.post(
+        "/api/v1/samples/bulk-get",
+        json={"sample_ids": [ids[2], ids[0], 99999]},
+        headers=authenticated_user["headers"],
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [item["id"] for item in data["items"]] == [ids[2], ids[0]]
+    assert data["not_found"] == [99999]
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_fields_and_tags(
+    client: AsyncClient, db_session: AsyncSession, authenticated_user
+):
+    ids = await _create_samples(db_session, authenticated_user["user"].id, 5, tags=["old", "keep"])
+
+    response = await client.post(
+        "/api/v1/samples/bulk-update",
+        json={
+            "sample_ids": ids,
+            "genre": "hip-hop",
+            "add_tags": ["boom-bap"],
+            "remove_tags": ["old"],
+        },
+        headers=authenticated_user["headers"],
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {"requested": 5, "affected": 5, "not_found": []}
+
+    db_session.expire_all()
+    result = await db_session.execute(select(Sample).where(Sample.id.in_(ids)))
+    for sample in result.scalars():
+        assert sample.genre == "hip-hop"
+        assert sample.tags == ["keep", "boom-bap"]
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_collection_membership(
+    client: AsyncClient, db_session: AsyncSession, authenticated_user
+):
+    user_id = authenticated_user["user"].id
+    ids = await _create_samples(db_session, user_id, 4)
+    collection = Collection(user_id=user_id, name="Crate", sample_count=0)
+    db_session.add(collection)
+    await db_session.commit()
+
+    response = await client.post(
+        "/api/v1/samples/bulk-update",
+        json={"sample_ids": ids, "add_to_collections": [collection.id]},
+        headers=authenticated_user["headers"],
+    )
+    assert response.status_code == 200
+
+    response = await client.post(
+        "/api/v1/samples/bulk-update",
+        json={"sample_ids": ids[:1], "remove_from_collections": [collection.id]},
+        headers=authenticated_user["headers"],
+    )
+    assert response.status_code == 200
+
+    result = await db_session.execute(
+        select(CollectionSample.sample_id).where(CollectionSample.collection_id == collection.id)
+    )
+    assert sorted(result.scalars().all()) == sorted(ids[1:])
+
+    await db_session.refresh(collection)
+    assert collection.sample_count == 3
+
+
+@pytest.mark.asyncio
+async def test_bulk_update_rejects_foreign_collection(
+    client: AsyncClient, db_session: AsyncSession, authenticated_user
+):
+    ids = await _create_samples(db_session, authenticated_user["user"].id, 2)
+
+    response = await client.post(
+        "/api/v1/samples/bulk-update",
+        json={"sample_ids": ids, "add_to_collections": [424242]},
+        headers=authenticated_user["headers"],
+    )
+
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_bulk_delete_only_own_samples(
+    client: AsyncClient, db_session: AsyncSession, authenticated_user
+):
+    own_ids = await _create_samples(db_session, authenticated_user["user"].id, 3)
+    other_ids = await _create_samples(db_session, authenticated_user["user"].id + 1, 1)
+
+    response = await client.post(
+        "/api/v1/samples/bulk-delete",
+        json={"sample_ids": own_ids + other_ids},
+        headers=authenticated_user["headers"],
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {"requested": 4, "affected": 3, "not_found": other_ids}
+
+    result = await db_session.execute(select(Sample.id))
+    assert result.scalars().all() == other_ids
@@ -0,0 +1,100 @@
+"""
+Tests for ETag / Last-Modified handling on sample lists and audio downloads.
+"""
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.sample import Sample
+
+
+async def _create_sample(db_session: AsyncSession, user_id: int, file_path: str) -> Sample:
+    sample = Sample(user_id=user_id, title="Cached Loop", file_path=file_path, tags=[])
+    db_session.add(sample)
+    await db_session.commit()
+    return sample
+
+
+@pytest.mark.asyncio
+async def test_sample_list_returns_304_for_matching_etag(
+    client: AsyncClient, db_session: AsyncSession, authenticated_user
+):
+    await _create_sample(db_session, authenticated_user["user"].id, "/fake/a.wav")
+    headers = authenticated_user["headers"]
+
+    first = await client.get("/api/v1/samples/", headers=headers)
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    assert first.headers["cache-control"] == "no-cache"
+
+    second = await client.get("/api/v1/samples/", headers={**headers, "If-None-Match": etag})
+    assert second.status_code == 304
+    assert second.content == b""
+    assert second.headers["etag"] == etag
+
+    # A different page is a different representation
+    other_page = await client.get(
+        "/api/v1/samples/?limit=5", headers={**headers, "If-None-Match": etag}
+    )
+    assert other_page.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_sample_list_etag_changes_when_samples_change(
+    client: AsyncClient, db_session: AsyncSession, authenticated_user
+):
+    await _create_sample(db_session, authenticated_user["user"].id, "/fake/a.wav")
+
+    first = await client.get("/api/v1/public/samples/")
+    etag = first.headers["etag"]
+
+    await _create_sample(db_session, authenticated_user["user"].id, "/fake/b.wav")
+
+    second = await client.get("/api/v1/public/samples/", headers={"If-None-Match": etag})
+    assert second.status_code == 200
+    assert second.headers["etag"] != etag
+    assert second.json()["total"] == 2
+
+
+@pytest.mark.asyncio
+async def test_public_download_conditional_and_immutable(
+    client: AsyncClient, db_session: AsyncSession, authenticated_user, tmp_path
+):
+    audio_path = tmp_path / "loop.wav"
+    audio_path.write_bytes(b"RIFF" + b"\x00" * 2048)
+    sample = await _create_sample(db_session, authenticated_user["user"].id, str(audio_path))
+    url = f"/api/v1/public/samples/{sample.id}/download"
+
+    first = await client.get(url)
+    assert first.status_code == 200
+    assert first.headers["cache-control"] == "public, max-age=31536000, immutable"
+    assert len(first.content) == 2052
+
+    by_etag = await client.get(url, headers={"If-None-Match": first.headers["etag"]})
+    assert by_etag.status_code == 304
+    assert by_etag.content == b""
+
+    by_date = await client.get(
+        url, headers={"If-Modified-Since": first.headers["last-modified"]}
+    )
+    assert by_date.status_code == 304
+
+    stale = await client.get(url, headers={"If-None-Match": '"something-else"'})
+    assert stale.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_private_download_is_privately_cached(
+    client: AsyncClient, db_session: AsyncSession, authenticated_user, tmp_path
+):
+    audio_path = tmp_path / "hit.wav"
+    audio_path.write_bytes(b"RIFF" + b"\x00" * 128)
+    sample = await _create_sample(db_session, authenticated_user["user"].id, str(audio_path))
+
+    response = await client.get(
+        f"/api/v1/samples/{sample.id}/download", headers=authenticated_user["headers"]
+    )
+
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == "private, max-age=31536000, immutable"
+    assert response.headers["etag"].startswith('"')
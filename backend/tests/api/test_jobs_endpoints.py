@@ -0,0 +1,45 @@
+"""
+Tests for background job endpoints (/jobs/{id}, /jobs/{id}/cancel).
+"""
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.job import Job, JobStatus
+from app.models.user import User
+from app.services.job_queue import enqueue_job
+
+
+@pytest.mark.asyncio
+async def test_owner_can_read_and_cancel_job(
+    client: AsyncClient, db_session: AsyncSession, authenticated_user
+):
+    job = await enqueue_job(db_session, "sample.vibe", {"sample_id": 1}, user_id=authenticated_user["user"].id)
+
+    response = await client.get(f"/api/v1/jobs/{job.id}", headers=authenticated_user["headers"])
+    assert response.status_code == 200
+    assert response.json()["status"] == JobStatus.QUEUED
+
+    response = await client.post(f"/api/v1/jobs/{job.id}/cancel", headers=authenticated_user["headers"])
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_jobs_of_other_users_are_hidden(
+    client: AsyncClient, db_session: AsyncSession, authenticated_user
+):
+    other = User(email="other@example.com", username="other", hashed_password="x")
+    db_session.add(other)
+    await db_session.commit()
+    theirs = await enqueue_job(db_session, "sample.vibe", {"sample_id": 1}, user_id=other.id)
+    system = await enqueue_job(db_session, "sample.analyze", {"sample_id": 1})
+
+    for job in (theirs, system):
+        response = await client.get(f"/api/v1/jobs/{job.id}", headers=authenticated_user["headers"])
+        assert response.status_code == 404
+
+        response = await client.post(f"/api/v1/jobs/{job.id}/cancel", headers=authenticated_user["headers"])
+        assert response.status_code == 400
+
+    await db_session.refresh(await db_session.get(Job, theirs.id))
+    assert (await db_session.get(Job, theirs.id)).status == JobStatus.QUEUED
@@ -84,6 +84,42 @@ async def test_list_kits_pagination(client: AsyncClient, db_session: AsyncSessio
     assert len(data["kits"]) == 2
 
 
+@pytest.mark.asyncio
+async def test_list_kits_summary_view(
+    client: AsyncClient, db_session: AsyncSession, test_sample: Sample
+):
+    """Test view=summary returns pad counts and cover without assignments."""
+    from app.services.kit_service import KitService
+
+    kit_service = KitService()
+
+    kit = await kit_service.create_kit(db_session, user_id=1, name="Full Kit")
+    await kit_service.create_kit(db_session, user_id=1, name="Empty Kit")
+    await kit_service.assign_sample_to_pad(
+        db_session, kit.id, test_sample.id, pad_bank="B", pad_number=3, user_id=1
+    )
+    await kit_service.assign_sample_to_pad(
+        db_session, kit.id, test_sample.id, pad_bank="A", pad_number=5, user_id=1
+    )
+
+    response = await client.get("/api/v1/kits?view=summary")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 2
+    summaries = {item["name"]: item for item in data["kits"]}
+    assert "samples" not in summaries["Full Kit"]
+    assert summaries["Full Kit"]["pad_count"] == 2
+    assert summaries["Full Kit"]["cover"] == {
+        "sample_id": test_sample.id,
+        "title": test_sample.title,
+        "pad_bank": "A",
+        "pad_number": 5,
+    }
+    assert summaries["Empty Kit"]["pad_count"] == 0
+    assert summaries["Empty Kit"]["cover"] is None
+
+
 @pytest.mark.asyncio
 async def test_create_kit_success(client: AsyncClient):
     """Test POST /api/v1/kits creates kit."""
@@ -0,0 +1,130 @@
+"""
+Tests for lightweight list projections (view=summary / fields=) on
+sample and collection list endpoints.
+"""
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.collection import Collection
+from app.models.sample import Sample
+
+
+async def _create_samples(db_session: AsyncSession, user_id: int, count: int):
+    samples = [
+        Sample(
+            user_id=user_id,
+            title=f"Projected {i}",
+            file_path=f"/fake/path/projected_{i}.wav",
+            genre="soul",
+            bpm=90.0 + i,
+            tags=["dusty"],
+        )
+        for i in range(count)
+    ]
+    db_session.add_all(samples)
+    await db_session.commit()
+    return [sample.id for sample in samples]
+
+
+@pytest.mark.asyncio
+async def test_list_samples_summary_view(
+    client: AsyncClient, db_session: AsyncSession, authenticated_user
+):
+    await _create_samples(db_session, authenticated_user["user"].id, 3)
+
+    response = await client.get(
+        "/api/v1/samples/?view=summary", headers=authenticated_user["headers"]
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 3
+    item = data["items"][0]
+    assert set(item) == {
+        "id", "title", "genre", "bpm", "musical_key", "duration",
+        "tags", "created_at", "file_url",
+    }
+    assert item["file_url"] == f"/api/v1/samples/{item['id']}/download"
+
+
+@pytest.mark.asyncio
+async def test_list_samples_fields_with_filters(
+    client: AsyncClient, db_session: AsyncSession, authenticated_user
+):
+    await _create_samples(db_session, authenticated_user["user"].id, 2)
+
+    response = await client.get(
+        "/api/v1/samples/?fields=title,bpm&genre=soul",
+        headers=authenticated_user["headers"],
+    )
+
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert len(items) == 2
+    assert set(items[0]) == {"id", "title", "bpm", "file_url"}
+
+
+@pytest.mark.asyncio
+async def test_list_samples_rejects_unknown_field(
+    client: AsyncClient, authenticated_user
+):
+    response = await client.get(
+        "/api/v1/samples/?fields=title,password",
+        headers=authenticated_user["headers"],
+    )
+
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_list_samples_full_view_keeps_relationships(
+    client: AsyncClient, db_session: AsyncSession, authenticated_user
+):
+    await _create_samples(db_session, authenticated_user["user"].id, 1)
+    db_session.expunge_all()
+
+    response = await client.get("/api/v1/samples/", headers=authenticated_user["headers"])
+
+    assert response.status_code == 200
+    item = response.json()["items"][0]
+    assert item["collections"] == []
+    assert "source" in item
+
+
+@pytest.mark.asyncio
+async def test_public_list_summary_view(
+    client: AsyncClient, db_session: AsyncSession, authenticated_user
+):
+    await _create_samples(db_session, authenticated_user["user"].id, 2)
+
+    response = await client.get("/api/v1/public/samples/?view=summary&limit=1")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 2
+    assert data["pages"] == 2
+    item = data["items"][0]
+    assert "file_path" not in item
+    assert item["file_url"] == f"/api/v1/public/samples/{item['id']}/download"
+
+
+@pytest.mark.asyncio
+async def test_list_collections_summary_view(
+    client: AsyncClient, db_session: AsyncSession, authenticated_user
+):
+    db_session.add(
+        Collection(user_id=authenticated_user["user"].id, name="Crate", sample_count=0)
+    )
+    await db_session.commit()
+
+    response = await client.get(
+        "/api/v1/collections?view=summary", headers=authenticated_user["headers"]
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 1
+    assert set(data["items"][0]) == {
+        "id", "name", "parent_collection_id", "is_smart", "sample_count", "updated_at",
+    }
@@ -640,6 +640,46 @@ class TestDownloadExport:
                         assert "attachment" in download_response.headers["content-disposition"] or \
                                "filename" in download_response.headers["content-disposition"]
 
+    @pytest.mark.asyncio
+    async def test_download_export_streams_stored_zip(self, api_client, db_session, tmp_path):
+        """
+        Test 17b: Download streams a ZIP of the export directory.
+
+        Validates:
+        - Folder organization is kept inside the archive
+        - Audio is STORED, text metadata is deflated
+        - Content-Length matches the streamed body
+        """
+        from app.models.sp404_export import SP404Export
+
+        export_dir = tmp_path / "export"
+        (export_dir / "hip-hop").mkdir(parents=True)
+        (export_dir / "hip-hop" / "Loop.wav").write_bytes(b"RIFF" + b"\x07" * 4096)
+        (export_dir / "hip-hop" / "Loop.txt").write_text("BPM: 90\n" * 50)
+
+        export_record = SP404Export(
+            export_type="batch",
+            sample_count=1,
+            output_path=str(export_dir),
+            organized_by="genre",
+            format="wav",
+        )
+        db_session.add(export_record)
+        await db_session.commit()
+
+        response = await api_client.get(f"/api/v1/sp404/exports/{export_record.id}/download")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/zip"
+        assert int(response.headers["content-length"]) == len(response.content)
+
+        import io
+        with zipfile.ZipFile(io.BytesIO(response.content)) as zf:
+            infos = {info.filename: info for info in zf.infolist()}
+            assert infos["hip-hop/Loop.wav"].compress_type == zipfile.ZIP_STORED
+            assert infos["hip-hop/Loop.txt"].compress_type == zipfile.ZIP_DEFLATED
+            assert zf.read("hip-hop/Loop.wav") == (export_dir / "hip-hop" / "Loop.wav").read_bytes()
+
 
 class TestListExports:
     """Test suite for GET /api/v1/sp404/exports endpoint."""
@@ -0,0 +1,96 @@
+"""
+Performance benchmarks for large sample list responses.
+
+Measures p50/p99 latency and bytes on the wire for /api/v1/public/samples/
+at 1k and 10k rows per page, uncompressed and gzip, for the full and
+summary views. Run with `-s` to see the report.
+"""
+import statistics
+import time
+from datetime import datetime, timezone
+from typing import Dict, List
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.sample import Sample
+
+PAGE_SIZES = [1_000, 10_000]
+ITERATIONS = {1_000: 20, 10_000: 5}
+
+
+async def _seed_samples(db_session: AsyncSession, user_id: int, count: int) -> None:
+    now = datetime.now(timezone.utc)
+    rows = [
+        {
+            "user_id": user_id,
+            "title": f"Benchmark Sample {i:05d}",
+            "file_path": f"/benchmarks/sample_{i:05d}.wav",
+            "file_size": 1_048_576,
+            "duration": 2.5,
+            "genre": ["hip-hop", "jazz", "soul", "funk"][i % 4],
+            "bpm": 80.0 + (i % 60),
+            "musical_key": "C minor",
+            "tags": ["drums", "dusty", "vinyl"],
+            "extra_metadata": {},
+            "created_at": now,
+        }
+        for i in range(count)
+    ]
+    await db_session.execute(insert(Sample), rows)
+    await db_session.commit()
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def _measure(client: AsyncClient, url: str, encoding: str, iterations: int) -> Dict:
+    timings = []
+    wire_bytes = 0
+    for _ in range(iterations):
+        start = time.perf_counter()
+        response = await client.get(url, headers={"Accept-Encoding": encoding})
+        timings.append((time.perf_counter() - start) * 1000)
+        assert response.status_code == 200
+        wire_bytes = response.num_bytes_downloaded
+
+    return {
+        "p50_ms": statistics.median(timings),
+        "p99_ms": _percentile(timings, 99),
+        "bytes": wire_bytes,
+    }
+
+
+@pytest.mark.slow
+@pytest.mark.asyncio
+@pytest.mark.parametrize("page_size", PAGE_SIZES)
+async def test_public_sample_list_throughput(
+    client: AsyncClient, db_session: AsyncSession, test_user, page_size: int
+):
+    """Benchmark full and summary list pages with and without gzip."""
+    await _seed_samples(db_session, test_user.id, page_size)
+    iterations = ITERATIONS[page_size]
+
+    results = {}
+    for view in ("full", "summary"):
+        url = f"/api/v1/public/samples/?limit={page_size}&view={view}"
+        for encoding in ("identity", "gzip"):
+            results[(view, encoding)] = await _measure(client, url, encoding, iterations)
+
+    print(f"\n  /public/samples/ with {page_size} rows ({iterations} requests each):")
+    for (view, encoding), stats in results.items():
+        print(
+            f"    {view:<8} {encoding:<9} p50={stats['p50_ms']:8.1f}ms "
+            f"p99={stats['p99_ms']:8.1f}ms bytes={stats['bytes']:>10,}"
+        )
+
+    # Compression must shrink the payload substantially for list pages
+    for view in ("full", "summary"):
+        assert results[(view, "gzip")]["bytes"] < results[(view, "identity")]["bytes"] / 3
+    # The summary projection carries less data than the full view
+    assert results[("summary", "identity")]["bytes"] < results[("full", "identity")]["bytes"]
@@ -165,6 +165,9 @@ def setup_test_environment(monkeypatch, temp_upload_dir):
     monkeypatch.setenv("UPLOAD_DIR", temp_upload_dir)
     monkeypatch.setenv("SECRET_KEY", "test-secret-key")
     monkeypatch.setenv("ENVIRONMENT", "test")
+    # Keep rendition cache entries out of the source tree
+    from app.core.config import settings
+    monkeypatch.setattr(settings, "RENDITION_CACHE_DIR", os.path.join(temp_upload_dir, "renditions"))
 
 
 # Utility functions for tests
@@ -20,7 +20,8 @@ def test_export_config_defaults():
 
     assert config.organize_by == "flat"
     assert config.format == "wav"
-    assert config.include_metadata is True
+    assert config.include_metadata is False
+    assert config.manifest_format == "json"
     assert config.sanitize_filenames is True
     assert config.output_base_path is None
 
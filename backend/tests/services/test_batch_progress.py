@@ -0,0 +1,82 @@
+"""
+Tests for in-memory batch progress with coalesced flushes.
+"""
+import asyncio
+
+import pytest
+
+from app.schemas.batch import BatchProgress, BatchStatus
+from app.services.batch_progress import BatchProgressTracker, batch_topic
+from app.services.progress_broadcast import ProgressBroadcaster
+
+
+def _initial(total: int = 1000) -> BatchProgress:
+    return BatchProgress(
+        batch_id="batch_test",
+        status=BatchStatus.PROCESSING,
+        total_samples=total,
+        processed_samples=0,
+        success_count=0,
+        error_count=0,
+        percentage=0.0,
+    )
+
+
+@pytest.mark.asyncio
+async def test_flushes_every_n_samples_and_on_final_status():
+    flushed = []
+
+    async def flush(progress):
+        flushed.append(progress.processed_samples)
+
+    tracker = BatchProgressTracker(
+        _initial(), flush, flush_interval=3600, flush_every_samples=100, broadcaster=ProgressBroadcaster()
+    )
+    for done in range(1, 1001):
+        await tracker.update(processed_samples=done)
+    assert flushed == list(range(100, 1001, 100))
+
+    await tracker.update(status=BatchStatus.COMPLETED, processed_samples=1000)
+    assert len(flushed) == 11
+    assert tracker.flush_count == 11
+
+
+@pytest.mark.asyncio
+async def test_flushes_on_interval():
+    flushed = []
+
+    async def flush(progress):
+        flushed.append(progress.processed_samples)
+
+    tracker = BatchProgressTracker(
+        _initial(), flush, flush_interval=0.05, flush_every_samples=10_000, broadcaster=ProgressBroadcaster()
+    )
+    await tracker.update(processed_samples=1)
+    assert flushed == []
+    await asyncio.sleep(0.06)
+    await tracker.update(processed_samples=2)
+    assert flushed == [2]
+
+
+@pytest.mark.asyncio
+async def test_publishes_throttled_updates_and_final_status():
+    async def flush(progress):
+        pass
+
+    broadcaster = ProgressBroadcaster(buffer_size=1000)
+    tracker = BatchProgressTracker(
+        _initial(), flush, flush_interval=3600, broadcaster=broadcaster, publish_interval=3600
+    )
+
+    async with broadcaster.subscribe(batch_topic("batch_test")) as subscription:
+        for done in range(1, 101):
+            await tracker.update(processed_samples=done)
+        await tracker.update(status=BatchStatus.COMPLETED)
+
+        received = []
+        while (message := await subscription.get(timeout=0)) is not None:
+            received.append(message)
+
+    # First update, then nothing until the final status
+    assert [m["processed_samples"] for m in received] == [1, 100]
+    assert received[-1]["status"] == "completed"
@@ -0,0 +1,205 @@
+"""
+Tests for batch pause/resume/cancel control.
+"""
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.batch import BatchStatus
+from app.models.job import Job
+from app.services import batch_service as batch_module
+from app.services.batch_service import BatchService, CancellationToken, ProcessingStatus, SampleCollection
+
+
+@pytest.fixture
+def collection_dir(tmp_path):
+    path = tmp_path / "collection"
+    path.mkdir()
+    return path
+
+
+@pytest.mark.asyncio
+async def test_pause_resume_cancel_transitions(db_session: AsyncSession, test_user, collection_dir):
+    service = BatchService(db_session)
+    batch = await service.create_batch(test_user.id, str(collection_dir), {})
+
+    assert not await service.resume_batch(batch.id, test_user.id)
+    assert await service.pause_batch(batch.id, test_user.id)
+    assert batch.status == BatchStatus.PAUSED
+    assert not await service.pause_batch(batch.id, test_user.id)
+
+    # Never started, so it goes back to pending
+    assert await service.resume_batch(batch.id, test_user.id)
+    assert batch.status == BatchStatus.PENDING
+
+    assert await service.pause_batch(batch.id, test_user.id)
+    assert await service.cancel_batch(batch.id, test_user.id)
+    assert batch.status == BatchStatus.CANCELLED
+    assert not await service.resume_batch(batch.id, test_user.id)
+
+
+@pytest.mark.asyncio
+async def test_control_refresher_follows_batch_status(db_session: AsyncSession, test_user, collection_dir):
+    service = BatchService(db_session)
+    batch = await service.create_batch(test_user.id, str(collection_dir), {})
+    job_id = await service.enqueue_processing(batch.id)
+
+    token = CancellationToken()
+    await service._control_refresher(batch.id, job_id)(token)
+    assert not token.cancelled
+
+    # Pausing stops the running job so it gives up its queue slot
+    await service.pause_batch(batch.id, test_user.id)
+    await service._control_refresher(batch.id, job_id)(token)
+    assert token.cancelled
+
+    # Resuming hands the batch to a new job; the old one stops
+    await service.resume_batch(batch.id, test_user.id)
+    token = CancellationToken()
+    await service._control_refresher(batch.id, job_id)(token)
+    assert token.cancelled
+    token = CancellationToken()
+    await service._control_refresher(batch.id, batch.job_id)(token)
+    assert not token.cancelled
+
+    await service.cancel_batch(batch.id, test_user.id)
+    await service._control_refresher(batch.id, batch.job_id)(token)
+    assert token.cancelled
+
+
+@pytest.mark.asyncio
+async def test_pause_releases_job_and_resume_requeues_same_batch(
+    db_session: AsyncSession, test_user, collection_dir, monkeypatch
+):
+    service = BatchService(db_session)
+    batch = await service.create_batch(test_user.id, str(collection_dir), {})
+    first_job = await service.enqueue_processing(batch.id)
+    cache_dirs = []
+
+    class PausedMidwayProcessor:
+        def __init__(self, collection_path, cache_dir):
+            cache_dirs.append(cache_dir)
+            self.processing_results = []
+
+        async def process_collection(self, progress_callback, token=None):
+            collection = SampleCollection(
+                name="collection", path=str(collection_dir), total_samples=10, processed_samples=4
+            )
+            await BatchService(db_session).pause_batch(batch.id, test_user.id)
+            assert token.cancelled
+            collection.status = ProcessingStatus.CANCELLED
+            return collection
+
+    monkeypatch.setattr(batch_module, "SampleBatchProcessor", PausedMidwayProcessor)
+
+    # The job returns instead of waiting for a resume
+    await service.process_batch(batch.id, job_id=first_job)
+    await db_session.refresh(batch)
+    assert batch.status == BatchStatus.PAUSED
+    assert batch.processed_samples == 4
+    assert batch.completed_at is None
+
+    assert await service.resume_batch(batch.id, test_user.id)
+    job = await db_session.get(Job, batch.job_id)
+    assert batch.job_id != first_job
+    assert job.payload == {"batch_id": batch.id}
+    assert job.max_attempts > 1
+    assert job.user_id == test_user.id
+
+    # A stale job for the batch does nothing
+    await service.process_batch(batch.id, job_id=first_job)
+    assert cache_dirs == [batch.cache_dir]
+
+
+@pytest.mark.asyncio
+async def test_retry_requeues_same_batch(db_session: AsyncSession, test_user, collection_dir):
+    service = BatchService(db_session)
+    batch = await service.create_batch(test_user.id, str(collection_dir), {})
+    cache_dir = batch.cache_dir
+
+    assert not await service.retry_batch(batch.id, test_user.id)
+    await service.cancel_batch(batch.id, test_user.id)
+    assert await service.retry_batch(batch.id, test_user.id)
+
+    await db_session.refresh(batch)
+    assert batch.status == BatchStatus.PENDING
+    assert batch.completed_at is None
+    assert batch.cache_dir == cache_dir
+    assert (await db_session.get(Job, batch.job_id)).payload == {"batch_id": batch.id}
+
+
+@pytest.mark.asyncio
+async def test_process_batch_stops_on_cancel(db_session: AsyncSession, test_user, collection_dir, monkeypatch):
+    service = BatchService(db_session)
+    batch = await service.create_batch(test_user.id, str(collection_dir), {})
+
+    class CancelledMidwayProcessor:
+        def __init__(self, collection_path, cache_dir):
+            self.processing_results = []
+
+        async def process_collection(self, progress_callback, token=None):
+            collection = SampleCollection(
+                name="collection", path=str(collection_dir), total_samples=10, processed_samples=4
+            )
+            # The running batch registered its token, so a cancel reaches it directly
+            assert batch_module._batch_tokens[batch.id] is token
+            await BatchService(db_session).cancel_batch(batch.id, test_user.id)
+            assert token.cancelled
+            collection.status = ProcessingStatus.CANCELLED
+            return collection
+
+    monkeypatch.setattr(batch_module, "SampleBatchProcessor", CancelledMidwayProcessor)
+
+    await service.process_batch(batch.id)
+
+    await db_session.refresh(batch)
+    assert batch.status == BatchStatus.CANCELLED
+    assert batch.processed_samples == 4
+    assert batch.export_path is None
+    assert batch.id not in batch_module._batch_tokens
+
+
+@pytest.mark.asyncio
+async def test_process_batch_coalesces_progress_commits(
+    db_session: AsyncSession, test_user, collection_dir, monkeypatch
+):
+    service = BatchService(db_session)
+    batch = await service.create_batch(test_user.id, str(collection_dir), {})
+    monkeypatch.setattr(batch_module.settings, "BATCH_PROGRESS_FLUSH_SECONDS", 3600)
+    monkeypatch.setattr(batch_module.settings, "BATCH_PROGRESS_FLUSH_SAMPLES", 250)
+
+    class PerSampleProcessor:
+        def __init__(self, collection_path, cache_dir):
+            self.processing_results = []
+
+        async def process_collection(self, progress_callback, token=None):
+            collection = SampleCollection(
+                name="collection", path=str(collection_dir), total_samples=1000
+            )
+            for _ in range(1000):
+                collection.processed_samples += 1
+                await progress_callback(collection)
+            collection.status = ProcessingStatus.COMPLETED
+            return collection
+
+        def export_results(self):
+            return collection_dir / "export.json"
+
+    monkeypatch.setattr(batch_module, "SampleBatchProcessor", PerSampleProcessor)
+
+    commits = 0
+    real_commit = db_session.commit
+
+    async def counting_commit():
+        nonlocal commits
+        commits += 1
+        await real_commit()
+
+    monkeypatch.setattr(db_session, "commit", counting_commit)
+
+    await service.process_batch(batch.id)
+
+    # Start + 4 coalesced flushes + completion, instead of one per sample
+    assert commits <= 6
+    await db_session.refresh(batch)
+    assert batch.status == BatchStatus.COMPLETED
+    assert batch.processed_samples == 1000
@@ -0,0 +1,90 @@
+"""
+Tests for the parallel export executor and its use by SP404ExportService.
+"""
+import numpy as np
+import pytest
+import soundfile as sf
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.sample import Sample
+from app.schemas.sp404_export import ExportConfig
+from app.services.export_executor import ConversionJob, ExportExecutor
+from app.services.sp404_export_service import SP404ExportService
+
+
+def _write_tone(path, sr=44100, seconds=0.5, channels=1):
+    t = np.linspace(0, seconds, int(sr * seconds), endpoint=False)
+    tone = 0.3 * np.sin(2 * np.pi * 440 * t)
+    audio = np.stack([tone] * channels, axis=1) if channels > 1 else tone
+    sf.write(str(path), audio, sr, subtype="PCM_16")
+    return path
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("use_processes", [False, True])
+async def test_executor_converts_jobs_in_parallel(tmp_path, use_processes):
+    executor = ExportExecutor(max_workers=2, use_processes=use_processes)
+    jobs = [
+        ConversionJob(
+            key=i,
+            input_path=_write_tone(tmp_path / f"in_{i}.wav", channels=1 + i % 2),
+            output_path=tmp_path / "out" / f"out_{i}.wav",
+            format="wav",
+        )
+        for i in range(4)
+    ]
+    jobs.append(ConversionJob(
+        key="missing",
+        input_path=tmp_path / "missing.wav",
+        output_path=tmp_path / "out" / "missing.wav",
+        format="wav",
+    ))
+
+    try:
+        outcomes = {outcome.job.key: outcome async for outcome in executor.convert_all(jobs)}
+    finally:
+        executor.shutdown()
+
+    assert set(outcomes) == {0, 1, 2, 3, "missing"}
+    assert outcomes["missing"].result.success is False
+    for i in range(4):
+        assert outcomes[i].result.success
+        info = sf.info(str(jobs[i].output_path))
+        assert info.samplerate == 48000
+        assert info.channels == 1 + i % 2
+        assert info.subtype == "PCM_16"
+
+
+@pytest.mark.asyncio
+async def test_export_batch_keeps_request_order_and_streams_results(
+    db_session: AsyncSession, test_user, tmp_path
+):
+    samples = []
+    for i in range(3):
+        sample = Sample(
+            user_id=test_user.id,
+            title=f"Pad Hit {i}",
+            file_path=str(_write_tone(tmp_path / f"hit_{i}.wav")),
+        )
+        db_session.add(sample)
+        samples.append(sample)
+    await db_session.commit()
+
+    # Reversed order, a duplicate and a missing ID
+    sample_ids = [samples[2].id, samples[0].id, samples[1].id, samples[0].id, 999999]
+    streamed = []
+
+    service = SP404ExportService(db_session)
+    result = await service.export_batch(
+        sample_ids=sample_ids,
+        config=ExportConfig(organize_by="flat", format="wav", output_base_path=str(tmp_path / "out")),
+        on_result=streamed.append,
+    )
+
+    assert result.total_requested == 5
+    assert result.successful == 4
+    assert result.failed == 1
+    assert [r.sample_id for r in result.results] == sample_ids[:4]
+    assert result.errors == ["Sample 999999: Sample 999999 not found"]
+    assert sorted(r.sample_id for r in streamed) == sorted(sample_ids[:4])
+    assert (tmp_path / "out" / "Pad_Hit_0.wav").exists()
@@ -0,0 +1,127 @@
+"""
+Tests for background export jobs and their progress events.
+"""
+import asyncio
+import json
+
+import numpy as np
+import pytest
+import soundfile as sf
+from httpx import ASGITransport, AsyncClient
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_db
+from app.main import app
+from app.models.sample import Sample
+from app.schemas.sp404_export import ExportResult
+from app.services.export_jobs import ExportJobManager, session_factory_for
+
+
+class _Done(BaseModel):
+    success: bool = True
+    count: int = 0
+
+
+async def _wait(job):
+    return [event async for event in job.subscribe(heartbeat=0.05)]
+
+
+@pytest.mark.asyncio
+async def test_job_publishes_file_events_and_result(db_session: AsyncSession):
+    manager = ExportJobManager(max_concurrent=1, retention_seconds=60)
+
+    async def run(session, on_result):
+        for i in range(3):
+            await on_result(ExportResult(success=i != 1, sample_id=i, format="wav"))
+        return _Done(count=3)
+
+    job = manager.submit("batch", 3, run, session_factory_for(db_session))
+    events = await _wait(job)
+
+    assert [e["type"] for e in events if e["type"] != "heartbeat"] == [
+        "queued", "started", "file", "file", "file", "completed"
+    ]
+    assert job.info().status == "completed"
+    assert (job.completed, job.failed) == (2, 1)
+    assert job.result == {"success": True, "count": 3}
+
+    # Late subscribers replay from the history
+    replay = [e async for e in job.subscribe(after=2)]
+    assert [e["seq"] for e in replay] == [3, 4, 5]
+
+
+@pytest.mark.asyncio
+async def test_failed_runner_and_concurrency_limit(db_session: AsyncSession):
+    manager = ExportJobManager(max_concurrent=1, retention_seconds=60)
+    release = asyncio.Event()
+
+    async def slow(session, on_result):
+        await release.wait()
+        return _Done()
+
+    async def broken(session, on_result):
+        raise RuntimeError("disk full")
+
+    first = manager.submit("kit", 1, slow, session_factory_for(db_session))
+    second = manager.submit("kit", 1, broken, session_factory_for(db_session))
+    await asyncio.sleep(0.05)
+
+    # Only one slot: the second job waits in the queue
+    assert first.status == "running"
+    assert second.status == "queued"
+
+    release.set()
+    await _wait(first)
+    await _wait(second)
+    assert first.status == "completed"
+    assert second.status == "failed"
+    assert second.error == "disk full"
+
+
+@pytest.mark.asyncio
+async def test_batch_export_job_endpoint_streams_progress(
+    db_session: AsyncSession, test_user, tmp_path
+):
+    sample_ids = []
+    for name in ("Kick", "Snare"):
+        path = tmp_path / f"{name}.wav"
+        sf.write(str(path), np.zeros(4410), 44100, subtype="PCM_16")
+        sample = Sample(user_id=test_user.id, title=name, file_path=str(path))
+        db_session.add(sample)
+        await db_session.flush()
+        sample_ids.append(sample.id)
+    await db_session.commit()
+
+    async def override_get_db():
+        yield db_session
+
+    app.dependency_overrides[get_db] = override_get_db
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            response = await client.post("/api/v1/sp404/samples/export-batch/jobs", json={
+                "sample_ids": sample_ids,
+                "config": {"format": "wav", "output_base_path": str(tmp_path / "out")},
+            })
+            assert response.status_code == 202
+            job = response.json()
+            assert job["status"] == "queued"
+            assert job["total"] == 2
+
+            stream = await client.get(job["events_url"])
+            assert stream.headers["content-type"].startswith("text/event-stream")
+            events = [
+                json.loads(line[len("data: "):])
+                for line in stream.text.splitlines() if line.startswith("data: ")
+            ]
+            assert sum(e["type"] == "file" for e in events) == 2
+            assert events[-1]["type"] == "completed"
+
+            status = (await client.get(job["status_url"])).json()
+            assert status["status"] == "completed"
+            assert status["result"]["successful"] == 2
+
+            missing = await client.get("/api/v1/sp404/jobs/nope")
+            assert missing.status_code == 404
+    finally:
+        app.dependency_overrides.clear()
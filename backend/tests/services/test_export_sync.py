@@ -0,0 +1,198 @@
+"""
+Tests for incremental export sync onto an SD card directory.
+"""
+import json
+import os
+
+import numpy as np
+import pytest
+import soundfile as sf
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.sample import Sample
+from app.schemas.sp404_export import ExportConfig
+from app.services.export_sync import SYNC_MANIFEST_NAME, sync_directory
+from app.services import sp404_export_service
+from app.services.sp404_export_service import SP404ExportService
+
+
+def _write(path, content: bytes):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(content)
+    return path
+
+
+@pytest.fixture
+def dirs(tmp_path):
+    source = tmp_path / "export"
+    card = tmp_path / "card"
+    source.mkdir()
+    card.mkdir()
+    return source, card
+
+
+def test_first_sync_copies_everything_and_writes_manifest(dirs):
+    source, card = dirs
+    _write(source / "kick.wav", b"kick")
+    _write(source / "bank_A" / "pad_01_snare.wav", b"snare")
+
+    result = sync_directory(source, card)
+
+    assert result.added == ["bank_A/pad_01_snare.wav", "kick.wav"]
+    assert result.bytes_copied == 9
+    assert (card / "bank_A" / "pad_01_snare.wav").read_bytes() == b"snare"
+    manifest = json.loads((card / SYNC_MANIFEST_NAME).read_text())
+    assert set(manifest["files"]) == {"kick.wav", "bank_A/pad_01_snare.wav"}
+
+
+def test_resync_only_touches_changes(dirs):
+    source, card = dirs
+    _write(source / "kick.wav", b"kick")
+    _write(source / "hat.wav", b"hat")
+    _write(source / "old" / "gone.wav", b"gone")
+    sync_directory(source, card)
+
+    # Re-exported with identical bytes (new mtime), one edit, one removal, one new file
+    _write(source / "kick.wav", b"kick")
+    _write(source / "hat.wav", b"hat2")
+    (source / "old" / "gone.wav").unlink()
+    _write(source / "clap.wav", b"clap")
+
+    result = sync_directory(source, card)
+
+    assert result.added == ["clap.wav"]
+    assert result.replaced == ["hat.wav"]
+    assert result.deleted == ["old/gone.wav"]
+    assert result.unchanged_count == 1
+    assert (card / "hat.wav").read_bytes() == b"hat2"
+    assert not (card / "old").exists()
+
+    again = sync_directory(source, card)
+    assert again.added == again.replaced == again.deleted == []
+    assert again.bytes_copied == 0
+
+
+def test_dry_run_reports_without_changing_target(dirs):
+    source, card = dirs
+    _write(source / "kick.wav", b"kick")
+
+    result = sync_directory(source, card, dry_run=True)
+
+    assert result.added == ["kick.wav"]
+    assert result.bytes_to_copy == 4
+    assert result.bytes_copied == 0
+    assert list(card.iterdir()) == []
+
+
+def test_card_edits_are_replaced_and_untracked_files_kept(dirs):
+    source, card = dirs
+    _write(source / "kick.wav", b"kick")
+    sync_directory(source, card)
+
+    _write(card / "kick.wav", b"edited on card")
+    _write(card / "ROLAND" / "user.bin", b"keep me")
+
+    result = sync_directory(source, card)
+
+    assert result.replaced == ["kick.wav"]
+    assert (card / "kick.wav").read_bytes() == b"kick"
+    assert (card / "ROLAND" / "user.bin").exists()
+
+
+def test_delete_disabled_keeps_tracking_removed_files(dirs):
+    source, card = dirs
+    _write(source / "kick.wav", b"kick")
+    sync_directory(source, card)
+    (source / "kick.wav").unlink()
+
+    kept = sync_directory(source, card, delete=False)
+    assert kept.deleted == []
+    assert (card / "kick.wav").exists()
+
+    removed = sync_directory(source, card)
+    assert removed.deleted == ["kick.wav"]
+    assert not (card / "kick.wav").exists()
+
+
+@pytest.mark.asyncio
+async def test_sync_to_directory_exports_and_mirrors(
+    db_session: AsyncSession, test_user, tmp_path
+):
+    source = tmp_path / "src"
+    source.mkdir()
+    samples = []
+    for name in ("Boom", "Tick"):
+        path = source / f"{name}.wav"
+        sf.write(str(path), np.zeros(4410), 44100, subtype="PCM_16")
+        sample = Sample(user_id=test_user.id, title=name, file_path=str(path))
+        db_session.add(sample)
+        samples.append(sample)
+    await db_session.commit()
+
+    card = tmp_path / "card"
+    card.mkdir()
+    service = SP404ExportService(db_session)
+    config = ExportConfig(organize_by="flat", format="wav", manifest_format="csv")
+
+    first = await service.sync_to_directory(card, config, sample_ids=[s.id for s in samples])
+    assert first.added == ["Boom.wav", "Tick.wav"]
+    assert sf.info(str(card / "Boom.wav")).samplerate == 48000
+
+    second = await service.sync_to_directory(card, config, sample_ids=[samples[0].id])
+    assert second.added == second.replaced == []
+    assert second.deleted == ["Tick.wav"]
+    assert second.unchanged_count == 1
+    assert sorted(os.listdir(card)) == [SYNC_MANIFEST_NAME, "Boom.wav"]
+
+
+@pytest.mark.asyncio
+async def test_sync_renders_only_added_or_changed_files(
+    db_session: AsyncSession, test_user, tmp_path, monkeypatch
+):
+    source = tmp_path / "src"
+    source.mkdir()
+    samples = []
+    for name, seconds in (("Boom", 0.2), ("Tick", 0.3)):
+        path = source / f"{name}.wav"
+        sf.write(str(path), np.zeros(int(44100 * seconds)), 44100, subtype="PCM_16")
+        sample = Sample(user_id=test_user.id, title=name, file_path=str(path))
+        db_session.add(sample)
+        samples.append(sample)
+    await db_session.commit()
+
+    rendered = []
+    executor = sp404_export_service.get_export_executor()
+    convert_all = executor.convert_all
+
+    def spy(jobs):
+        jobs = list(jobs)
+        rendered.extend(job.key for job in jobs)
+        return convert_all(jobs)
+
+    monkeypatch.setattr(executor, "convert_all", spy)
+    card = tmp_path / "card"
+    card.mkdir()
+    service = SP404ExportService(db_session)
+    config = ExportConfig(organize_by="flat", format="wav")
+    ids = [s.id for s in samples]
+
+    # A dry run converts nothing and estimates the copy size from the headers
+    planned = await service.sync_to_directory(card, config, sample_ids=ids, dry_run=True)
+    assert planned.added == ["Boom.wav", "Tick.wav"]
+    assert planned.bytes_to_copy == (9600 + 14400) * 2 + 2 * 44
+    assert rendered == [] and os.listdir(card) == []
+
+    first = await service.sync_to_directory(card, config, sample_ids=ids)
+    assert sorted(rendered) == ["Boom.wav", "Tick.wav"]
+    assert first.bytes_copied == first.bytes_to_copy
+
+    # Only the edited source is rendered again
+    rendered.clear()
+    sf.write(samples[1].file_path, 0.1 * np.ones(4410), 44100, subtype="PCM_16")
+    second = await service.sync_to_directory(card, config, sample_ids=ids)
+    assert rendered == ["Tick.wav"]
+    assert second.replaced == ["Tick.wav"] and second.unchanged_count == 1
+
+    rendered.clear()
+    third = await service.sync_to_directory(card, config, sample_ids=ids)
+    assert rendered == [] and third.unchanged_count == 2
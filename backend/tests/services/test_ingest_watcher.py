@@ -0,0 +1,160 @@
+"""
+Tests for the watch-folder ingestion daemon.
+"""
+import asyncio
+import os
+import time
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.ingest_watcher import WATCHFILES_AVAILABLE, IngestWatcher, sample_title
+from app.models.job import Job
+from app.models.sample import Sample
+
+
+@pytest_asyncio.fixture
+async def session_factory(db_engine):
+    return async_sessionmaker(db_engine, class_=AsyncSession, expire_on_commit=False)
+
+
+def _write(path, data=b"RIFF" + b"\x00" * 64):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return str(path)
+
+
+async def _samples(session_factory):
+    async with session_factory() as session:
+        return (await session.execute(select(Sample).order_by(Sample.id))).scalars().all()
+
+
+async def _wait_for_samples(session_factory, count, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        samples = await _samples(session_factory)
+        if len(samples) >= count:
+            return samples
+        await asyncio.sleep(0.1)
+    return await _samples(session_factory)
+
+
+def test_sample_title_and_owner(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path / "uploads"))
+    watcher = IngestWatcher(folders=[str(tmp_path)], user_id=7)
+
+    assert sample_title("/x/Kick 01 (Artist - Song).wav") == "Kick 01"
+    assert watcher.owner_of(str(tmp_path / "uploads" / "3" / "a.wav")) == 3
+    assert watcher.owner_of(str(tmp_path / "uploads" / "a.wav")) == 7
+    assert watcher.owner_of(str(tmp_path / "packs" / "3" / "a.wav")) == 7
+
+
+def test_files_are_held_until_writes_settle(tmp_path):
+    watcher = IngestWatcher(folders=[str(tmp_path)], debounce=2.0)
+    path = _write(tmp_path / "loop.wav")
+    watcher.observe([path, _write(tmp_path / "notes.txt")])
+    assert list(watcher.pending) == [path]
+
+    now = time.time()
+    assert watcher.take_settled(now) == []
+
+    # Still being written: growing resets the clock
+    _write(tmp_path / "loop.wav", b"RIFF" + b"\x00" * 128)
+    os.utime(path, (now - 60, now - 60))
+    assert watcher.take_settled(now + 1.5) == []
+    assert watcher.take_settled(now + 3.0) == []
+    assert watcher.take_settled(now + 3.6) == [(path, 132)]
+    assert watcher.pending == {}
+
+    # Files found at startup only need an old enough mtime
+    watcher.observe([path], settled=True)
+    assert watcher.take_settled(now) == [(path, 132)]
+
+
+@pytest.mark.asyncio
+async def test_ingest_creates_samples_and_jobs_once(session_factory, test_user, tmp_path):
+    existing = _write(tmp_path / "already.wav")
+    async with session_factory() as session:
+        session.add(Sample(user_id=test_user.id, title="already", file_path=existing))
+        await session.commit()
+
+    watcher = IngestWatcher(folders=[str(tmp_path)], user_id=test_user.id, session_factory=session_factory, batch_size=2)
+    new = [_write(tmp_path / "pack" / f"Snare {i}.wav") for i in range(3)]
+    created = await watcher.ingest([(existing, 68)] + [(path, 68) for path in new])
+    assert created == 3
+    assert await watcher.ingest([(path, 68) for path in new]) == 0
+
+    samples = await _samples(session_factory)
+    assert sorted(s.title for s in samples) == ["Snare 0", "Snare 1", "Snare 2", "already"]
+    async with session_factory() as session:
+        jobs = (await session.execute(select(Job))).scalars().all()
+    assert sorted(job.payload["sample_id"] for job in jobs) == sorted(s.id for s in samples if s.title != "already")
+    assert {(job.kind, job.queue) for job in jobs} == {("sample.analyze", "analysis")}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("use_inotify", [
+    False,
+    pytest.param(True, marks=pytest.mark.skipif(not WATCHFILES_AVAILABLE, reason="watchfiles not installed")),
+])
+async def test_watcher_ingests_new_files(session_factory, test_user, tmp_path, use_inotify):
+    _write(tmp_path / "old.wav")
+    watcher = IngestWatcher(
+        folders=[str(tmp_path)],
+        user_id=test_user.id,
+        session_factory=session_factory,
+        debounce=0.2,
+        poll_interval=0.1,
+        use_inotify=use_inotify,
+    )
+    stop = asyncio.Event()
+    task = asyncio.create_task(watcher.run(stop))
+    try:
+        # Files that predate the watcher are caught up on startup
+        samples = await _wait_for_samples(session_factory, 1)
+        assert [s.title for s in samples] == ["old"]
+
+        await asyncio.sleep(0.3)
+        _write(tmp_path / "new pack" / "Kick.wav")
+        samples = await _wait_for_samples(session_factory, 2)
+        assert sorted(s.title for s in samples) == ["Kick", "old"]
+    finally:
+        stop.set()
+        await asyncio.wait_for(task, timeout=5)
+    assert watcher.ingested == 2
+
+
+@pytest.mark.asyncio
+async def test_uploads_recorded_with_relative_upload_dir_are_not_reingested(
+    session_factory, test_user, tmp_path, monkeypatch
+):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(settings, "UPLOAD_DIR", "./uploads")
+    uploaded = _write(tmp_path / "uploads" / str(test_user.id) / "loop.wav")
+    async with session_factory() as session:
+        session.add(Sample(user_id=test_user.id, title="loop", file_path=f"./uploads/{test_user.id}/loop.wav"))
+        await session.commit()
+
+    watcher = IngestWatcher(folders=["uploads"], user_id=test_user.id, session_factory=session_factory)
+    assert await watcher._known_paths() == {uploaded}
+    assert await watcher.ingest([(uploaded, 68)]) == 0
+    assert watcher.skipped == 1
+
+
+@pytest.mark.asyncio
+async def test_sample_created_during_ingest_is_not_duplicated(session_factory, test_user, tmp_path):
+    path = _write(tmp_path / "Kick.wav")
+    watcher = IngestWatcher(folders=[str(tmp_path)], user_id=test_user.id, session_factory=session_factory)
+    async with session_factory() as session:
+        session.add(Sample(user_id=test_user.id, title="Kick", file_path=path))
+        await session.commit()
+
+    # As if the upload committed after the watcher's lookup
+    watcher.recorded_as = lambda path: []
+    assert await watcher.ingest([(path, 68)]) == 0
+    assert len(await _samples(session_factory)) == 1
+    async with session_factory() as session:
+        assert (await session.execute(select(Job))).scalars().all() == []
@@ -0,0 +1,162 @@
+"""
+Tests for the durable job queue and worker.
+"""
+from datetime import timedelta
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models.job import Job, JobStatus
+from app.services.job_queue import (
+    JobQueue,
+    cancel_job,
+    enqueue_job,
+    job_handler,
+    parse_queue_limits,
+    utcnow,
+)
+from app.worker import JobWorker
+
+
+@pytest_asyncio.fixture
+async def session_factory(db_engine):
+    return async_sessionmaker(db_engine, class_=AsyncSession, expire_on_commit=False)
+
+
+async def _reload(session_factory, job_id: str) -> Job:
+    async with session_factory() as session:
+        return await session.get(Job, job_id)
+
+
+def test_parse_queue_limits():
+    assert parse_queue_limits("vibe=2, batch=1") == {"vibe": 2, "batch": 1}
+    assert parse_queue_limits("") == {}
+    with pytest.raises(ValueError):
+        parse_queue_limits("vibe")
+
+
+@pytest.mark.asyncio
+async def test_claim_orders_by_priority(session_factory):
+    async with session_factory() as session:
+        low = await enqueue_job(session, "test.noop", queue="analysis")
+        high = await enqueue_job(session, "test.noop", queue="analysis", priority=10)
+        await enqueue_job(session, "test.noop", queue="other", priority=100)
+
+    queue = JobQueue(session_factory, "worker-a")
+    first = await queue.claim(["analysis"])
+    second = await queue.claim(["analysis"])
+
+    assert [first.id, second.id] == [high.id, low.id]
+    assert first.status == JobStatus.RUNNING
+    assert first.attempts == 1
+    assert first.lease_owner == "worker-a"
+    assert await queue.claim(["analysis"]) is None
+
+
+@pytest.mark.asyncio
+async def test_failed_attempts_retry_with_backoff_then_fail(session_factory):
+    async with session_factory() as session:
+        job = await enqueue_job(session, "test.noop", max_attempts=2)
+
+    queue = JobQueue(session_factory, "worker-a")
+    claimed = await queue.claim(["default"])
+    assert await queue.fail(claimed, "boom") == JobStatus.QUEUED
+
+    retried = await _reload(session_factory, job.id)
+    assert retried.last_error == "boom"
+    assert await queue.claim(["default"]) is None  # Backing off
+
+    async with session_factory() as session:
+        await session.execute(update(Job).values(run_after=utcnow()))
+        await session.commit()
+
+    claimed = await queue.claim(["default"])
+    assert claimed.attempts == 2
+    assert await queue.fail(claimed, "boom again") == JobStatus.FAILED
+    assert (await _reload(session_factory, job.id)).status == JobStatus.FAILED
+
+
+@pytest.mark.asyncio
+async def test_expired_lease_is_reclaimed(session_factory):
+    async with session_factory() as session:
+        job = await enqueue_job(session, "test.noop")
+
+    crashed = JobQueue(session_factory, "worker-a")
+    await crashed.claim(["default"])
+    survivor = JobQueue(session_factory, "worker-b")
+    assert await survivor.claim(["default"]) is None
+
+    async with session_factory() as session:
+        await session.execute(
+            update(Job).values(lease_expires_at=utcnow() - timedelta(seconds=1))
+        )
+        await session.commit()
+
+    reclaimed = await survivor.claim(["default"])
+    assert reclaimed.id == job.id
+    assert reclaimed.lease_owner == "worker-b"
+    assert reclaimed.attempts == 2
+    assert not await crashed.heartbeat(job.id)
+    assert await survivor.heartbeat(job.id)
+
+
+@pytest.mark.asyncio
+async def test_queue_limit_caps_running_jobs(session_factory):
+    async with session_factory() as session:
+        for _ in range(3):
+            await enqueue_job(session, "test.noop", queue="vibe")
+
+    limits = {"vibe": 2}
+    queue_a = JobQueue(session_factory, "worker-a")
+    queue_b = JobQueue(session_factory, "worker-b")
+    assert await queue_a.claim(["vibe"], limits)
+    assert await queue_b.claim(["vibe"], limits)
+    assert await queue_a.claim(["vibe"], limits) is None
+
+
+@pytest.mark.asyncio
+async def test_cancel_job_drops_lease(session_factory):
+    async with session_factory() as session:
+        job = await enqueue_job(session, "test.noop")
+
+    queue = JobQueue(session_factory, "worker-a")
+    await queue.claim(["default"])
+    async with session_factory() as session:
+        assert await cancel_job(session, job.id)
+
+    assert not await queue.heartbeat(job.id)
+    assert (await _reload(session_factory, job.id)).status == JobStatus.CANCELLED
+
+
+@pytest.mark.asyncio
+async def test_worker_runs_registered_handler(session_factory):
+    calls = []
+
+    @job_handler("test.echo", queue="test")
+    async def echo(db, payload):
+        calls.append(payload)
+        return {"echo": payload["value"]}
+
+    @job_handler("test.explode", queue="test")
+    async def explode(db, payload):
+        raise RuntimeError("kaboom")
+
+    async with session_factory() as session:
+        ok = await enqueue_job(session, "test.echo", {"value": 42}, queue="test")
+        bad = await enqueue_job(session, "test.explode", queue="test", max_attempts=1)
+        unknown = await enqueue_job(session, "test.missing", queue="test")
+
+    worker = JobWorker(queues=["test"], session_factory=session_factory, queue_limits={})
+    assert await worker.run_until_idle() == 3
+
+    ok = await _reload(session_factory, ok.id)
+    assert ok.status == JobStatus.SUCCEEDED
+    assert ok.result == {"echo": 42}
+    assert calls == [{"value": 42, "job_id": ok.id}]
+
+    bad = await _reload(session_factory, bad.id)
+    assert bad.status == JobStatus.FAILED
+    assert "kaboom" in bad.last_error
+    assert (await _reload(session_factory, unknown.id)).status == JobStatus.FAILED
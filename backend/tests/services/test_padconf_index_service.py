@@ -0,0 +1,83 @@
+"""
+Tests for the PADCONF.BIN backup index.
+"""
+import os
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services.padconf_index_service import PadconfIndexService
+from app.services.padconf_service import PadConfig, PadconfService, ProjectConfig
+
+
+def _write_project(path, name, pads):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = PadconfService().create_padconf(
+        ProjectConfig(project_name=name, project_bpm=90.0),
+        [PadConfig(pad_index=index, filename=filename, bpm=90.0) for index, filename in pads]
+    )
+    path.write_bytes(data)
+    return path
+
+
+@pytest.mark.asyncio
+async def test_index_and_find_sample(db_session: AsyncSession, tmp_path):
+    _write_project(tmp_path / "2024-01" / "PROJECT_01" / "PADCONF.BIN", "Dusty", [(1, "Kick_001.wav"), (18, "Snare.wav")])
+    _write_project(tmp_path / "2024-02" / "PROJECT_07" / "PADCONF.BIN", "Night", [(33, "kick_001.wav")])
+    (tmp_path / "2024-02" / "broken").mkdir()
+    (tmp_path / "2024-02" / "broken" / "PADCONF.BIN").write_bytes(b"nope")
+
+    service = PadconfIndexService(db_session)
+    stats = await service.index_directory(tmp_path)
+
+    assert stats.scanned == 3
+    assert stats.indexed == 2
+    assert stats.pads == 3
+    assert len(stats.errors) == 1
+
+    usages = await service.find_sample("KICK_001.WAV")
+    assert [(u.project_name, u.bank, u.pad_number) for u in usages] == [("Dusty", "A", 1), ("Night", "C", 1)]
+
+    partial = await service.find_sample("snare", contains=True)
+    assert [(u.bank, u.pad_number) for u in partial] == [("B", 2)]
+
+
+@pytest.mark.asyncio
+async def test_reindex_updates_changed_and_removed_projects(db_session: AsyncSession, tmp_path):
+    first = _write_project(tmp_path / "a" / "PADCONF.BIN", "A", [(1, "Kick.wav")])
+    second = _write_project(tmp_path / "b" / "PADCONF.BIN", "B", [(1, "Kick.wav")])
+
+    service = PadconfIndexService(db_session)
+    await service.index_directory(tmp_path)
+
+    _write_project(first, "A", [(2, "Clap.wav")])
+    os.utime(first, ns=(1, 1))
+    second.unlink()
+
+    stats = await service.index_directory(tmp_path)
+
+    assert (stats.indexed, stats.unchanged, stats.removed) == (1, 0, 1)
+    assert await service.find_sample("Kick.wav") == []
+    assert [u.pad_index for u in await service.find_sample("clap.wav")] == [2]
+
+    again = await service.index_directory(tmp_path)
+    assert (again.indexed, again.unchanged) == (0, 1)
+
+
+@pytest.mark.asyncio
+async def test_unreadable_files_are_skipped_until_they_change(db_session: AsyncSession, tmp_path):
+    broken = tmp_path / "PROJECT_01" / "PADCONF.BIN"
+    broken.parent.mkdir()
+    broken.write_bytes(b"partial copy")
+
+    service = PadconfIndexService(db_session)
+    first = await service.index_directory(tmp_path)
+    assert (first.indexed, len(first.errors)) == (0, 1)
+
+    again = await service.index_directory(tmp_path)
+    assert (again.indexed, again.unchanged, again.errors) == (0, 1, [])
+
+    _write_project(broken, "Fixed", [(1, "Kick.wav")])
+    fixed = await service.index_directory(tmp_path)
+    assert (fixed.indexed, fixed.errors) == (1, [])
+    assert [u.project_name for u in await service.find_sample("kick.wav")] == ["Fixed"]
@@ -0,0 +1,97 @@
+"""
+Tests for the fan-out progress broadcaster.
+"""
+import asyncio
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.schemas.batch import BatchStatus
+from app.services import progress_broadcast
+from app.services.batch_progress import BatchProgressTracker, register_tracker, unregister_tracker
+from app.services.batch_service import BatchService
+from app.services.progress_broadcast import (
+    InProcessBackend,
+    PostgresNotifyBackend,
+    ProgressBroadcaster,
+    SlowConsumerError,
+)
+
+
+@pytest.mark.asyncio
+async def test_every_subscriber_gets_every_message():
+    broadcaster = ProgressBroadcaster(buffer_size=10)
+
+    async with broadcaster.subscribe("batch:a") as first, broadcaster.subscribe("batch:a") as second:
+        async with broadcaster.subscribe("batch:b") as other:
+            await broadcaster.publish("batch:a", {"n": 1})
+            await broadcaster.publish("batch:a", {"n": 2})
+
+            for subscription in (first, second):
+                assert await subscription.get(timeout=1) == {"n": 1}
+                assert await subscription.get(timeout=1) == {"n": 2}
+            assert await other.get(timeout=0) is None
+
+    assert broadcaster.subscriber_count("batch:a") == 0
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_is_evicted_without_affecting_others():
+    broadcaster = ProgressBroadcaster(buffer_size=3)
+
+    async with broadcaster.subscribe("batch:a") as slow, broadcaster.subscribe("batch:a") as fast:
+        for n in range(5):
+            await broadcaster.publish("batch:a", {"n": n})
+            assert await fast.get(timeout=1) == {"n": n}
+
+        assert slow.evicted
+        assert broadcaster.evictions == 1
+        assert broadcaster.subscriber_count("batch:a") == 1
+        with pytest.raises(SlowConsumerError):
+            await slow.get(timeout=1)
+
+
+@pytest.mark.asyncio
+async def test_unavailable_backend_falls_back_to_in_process():
+    broadcaster = ProgressBroadcaster(PostgresNotifyBackend("postgresql://nobody@127.0.0.1:1/none"))
+
+    async with broadcaster.subscribe("batch:a") as subscription:
+        await broadcaster.publish("batch:a", {"n": 1})
+        assert await subscription.get(timeout=1) == {"n": 1}
+
+    assert isinstance(broadcaster.backend, InProcessBackend)
+
+
+@pytest.mark.asyncio
+async def test_two_watchers_follow_a_running_batch(
+    db_session: AsyncSession, test_user, tmp_path, monkeypatch
+):
+    broadcaster = ProgressBroadcaster()
+    monkeypatch.setattr(progress_broadcast, "_broadcaster", broadcaster)
+
+    service = BatchService(db_session)
+    batch = await service.create_batch(test_user.id, str(tmp_path), {})
+
+    async def flush(progress):
+        pass
+
+    tracker = BatchProgressTracker(
+        service._snapshot(batch), flush, broadcaster=broadcaster, publish_interval=0
+    )
+    register_tracker(batch.id, tracker)
+    try:
+        async def watch():
+            return [p async for p in service.watch_progress(batch.id)]
+
+        watchers = [asyncio.create_task(watch()) for _ in range(2)]
+        while broadcaster.subscriber_count(f"batch:{batch.id}") < 2:
+            await asyncio.sleep(0)
+
+        await tracker.update(status=BatchStatus.PROCESSING, total_samples=10, processed_samples=5)
+        await tracker.update(status=BatchStatus.COMPLETED, processed_samples=10)
+
+        for seen in await asyncio.gather(*watchers):
+            assert [p.processed_samples for p in seen] == [0, 5, 10]
+            assert seen[-1].status == BatchStatus.COMPLETED
+    finally:
+        unregister_tracker(batch.id)
@@ -0,0 +1,143 @@
+"""
+Tests for the content-addressed rendition cache.
+"""
+import os
+import threading
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+from app.schemas.sp404_export import ConversionResult
+from app.services.export_executor import ConversionJob, ExportExecutor
+from app.services.rendition_cache import RenditionCache, RenditionSpec, gain_normalization
+
+
+def _write_tone(path, sr=44100, seconds=0.25, freq=440):
+    t = np.linspace(0, seconds, int(sr * seconds), endpoint=False)
+    sf.write(str(path), 0.3 * np.sin(2 * np.pi * freq * t), sr, subtype="PCM_16")
+    return path
+
+
+def _result(path):
+    return ConversionResult(
+        success=True,
+        output_path=path,
+        original_format=".wav",
+        original_sample_rate=44100,
+        original_duration=0.25,
+    )
+
+
+def test_key_depends_on_content_and_settings(tmp_path):
+    cache = RenditionCache(tmp_path / "cache", max_bytes=10_000_000)
+    a = _write_tone(tmp_path / "a.wav")
+    same_as_a = tmp_path / "copy_of_a.wav"
+    same_as_a.write_bytes(a.read_bytes())
+    b = _write_tone(tmp_path / "b.wav", freq=880)
+
+    wav = RenditionSpec(format="wav")
+    assert cache.key_for(a, wav) == cache.key_for(same_as_a, wav)
+    assert cache.key_for(a, wav) != cache.key_for(b, wav)
+    assert cache.key_for(a, wav) != cache.key_for(a, RenditionSpec(format="aiff"))
+    assert cache.key_for(a, wav) != cache.key_for(a, RenditionSpec(format="wav", sample_rate=44100))
+    assert cache.key_for(a, wav) != cache.key_for(a, RenditionSpec(format="wav", normalization="r128"))
+
+
+def test_store_then_materialize_links_into_place(tmp_path):
+    cache = RenditionCache(tmp_path / "cache", max_bytes=10_000_000)
+    spec = RenditionSpec(format="wav")
+    rendered = tmp_path / "rendered.wav"
+    rendered.write_bytes(b"RIFF" + b"\x01" * 100)
+
+    assert cache.materialize("ab" * 32, spec, tmp_path / "out.wav") is None
+
+    cache.store("ab" * 32, spec, rendered, _result(rendered))
+    out = tmp_path / "export" / "out.wav"
+    hit = cache.materialize("ab" * 32, spec, out)
+
+    assert hit.success and hit.output_path == out
+    assert hit.original_sample_rate == 44100
+    assert out.read_bytes() == rendered.read_bytes()
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # Replacing the export never writes through to the cached entry
+    out.unlink()
+    assert cache.materialize("ab" * 32, spec, out) is not None
+
+
+def test_hit_reports_the_stored_gain(tmp_path):
+    cache = RenditionCache(tmp_path / "cache", max_bytes=10_000_000)
+    spec = RenditionSpec(format="wav", normalization=gain_normalization(-3.5))
+    rendered = tmp_path / "rendered.wav"
+    rendered.write_bytes(b"RIFF" + b"\x01" * 100)
+
+    cache.store("cd" * 32, spec, rendered, _result(rendered).model_copy(update={"gain_db": -3.5}))
+    hit = cache.materialize("cd" * 32, spec, tmp_path / "out.wav")
+
+    assert hit.gain_db == -3.5
+
+
+def test_lru_eviction_keeps_total_under_limit(tmp_path):
+    cache = RenditionCache(tmp_path / "cache", max_bytes=250)
+    spec = RenditionSpec(format="wav")
+    keys = [f"{i:02d}" * 32 for i in range(3)]
+    for key in keys:
+        rendered = tmp_path / f"{key[:2]}.wav"
+        rendered.write_bytes(b"x" * 100)
+        cache.store(key, spec, rendered, _result(rendered))
+        if key == keys[1]:
+            # Touch the first entry so the second becomes least recently used
+            assert cache.materialize(keys[0], spec, tmp_path / "touch.wav")
+
+    assert cache.total_bytes <= 250
+    assert cache.materialize(keys[1], spec, tmp_path / "o1.wav") is None
+    assert cache.materialize(keys[0], spec, tmp_path / "o0.wav") is not None
+    assert cache.materialize(keys[2], spec, tmp_path / "o2.wav") is not None
+
+    # A fresh instance rebuilds the index from disk
+    assert RenditionCache(tmp_path / "cache", max_bytes=250).total_bytes == 200
+
+
+def test_entries_do_not_wait_on_each_other(tmp_path):
+    cache = RenditionCache(tmp_path / "cache", max_bytes=10_000_000, hash_memo_size=2)
+    spec = RenditionSpec(format="wav")
+    rendered = tmp_path / "rendered.wav"
+    rendered.write_bytes(b"RIFF" + b"\x01" * 100)
+    busy = "aa" * 32
+    other = next(f"{i:02x}" * 32 for i in range(256) if cache._key_lock(f"{i:02x}" * 32) is not cache._key_lock(busy))
+
+    # Another entry's file I/O proceeds while one entry is locked
+    with cache._key_lock(busy):
+        worker = threading.Thread(target=cache.store, args=(other, spec, rendered, _result(rendered)))
+        worker.start()
+        worker.join(timeout=5)
+        assert not worker.is_alive()
+    assert cache.materialize(other, spec, tmp_path / "out.wav") is not None
+
+    # The content hash memo is bounded
+    for name in ("a", "b", "c"):
+        cache.content_hash(_write_tone(tmp_path / f"{name}.wav"))
+    assert len(cache._hashes) == 2
+
+
+@pytest.mark.asyncio
+async def test_reexport_is_served_from_cache(tmp_path):
+    source = _write_tone(tmp_path / "loop.wav")
+    executor = ExportExecutor(max_workers=1, use_processes=False)
+
+    async def export(name):
+        job = ConversionJob(key=name, input_path=source, output_path=tmp_path / name, format="wav")
+        return [outcome async for outcome in executor.convert_all([job])][0]
+
+    try:
+        first = await export("first.wav")
+        second = await export("second.wav")
+    finally:
+        executor.shutdown()
+
+    assert first.result.success and not first.cached
+    assert second.result.success and second.cached
+    assert second.result.original_sample_rate == 44100
+    assert (tmp_path / "second.wav").read_bytes() == (tmp_path / "first.wav").read_bytes()
+    assert os.path.samefile(tmp_path / "first.wav", tmp_path / "second.wav")
@@ -0,0 +1,122 @@
+"""
+Tests for analyzer-version driven reprocessing.
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.models.sample import Sample
+from app.services import reprocess_planner
+from app.services.audio_features_service import ANALYSIS_FEATURES, ANALYZER_VERSIONS, analyzer_record
+from app.services.reprocess_planner import (
+    ReprocessRunner,
+    plan_reprocess,
+    stale_features,
+)
+
+
+@pytest_asyncio.fixture
+async def session_factory(db_engine):
+    return async_sessionmaker(db_engine, class_=AsyncSession, expire_on_commit=False)
+
+
+def _current_metadata():
+    return {"analyzers": analyzer_record(bpm="librosa", key="librosa", genre="essentia", spectral="librosa")}
+
+
+def test_stale_features(monkeypatch):
+    metadata = _current_metadata()
+
+    # Without genre classification genre is never recorded, so never stale
+    monkeypatch.setattr(settings, "ENABLE_GENRE_CLASSIFICATION", False)
+    assert stale_features(None) == ["bpm", "key", "spectral"]
+    assert stale_features({"analyzers": analyzer_record(bpm="librosa", key="librosa", spectral="librosa")}) == []
+    assert stale_features(None, ["genre"]) == []
+
+    monkeypatch.setattr(reprocess_planner, "enabled_features", lambda: ANALYSIS_FEATURES)
+    assert stale_features(None) == ["bpm", "key", "genre", "spectral"]
+    assert stale_features(metadata) == []
+
+    monkeypatch.setitem(ANALYZER_VERSIONS, "bpm", ANALYZER_VERSIONS["bpm"] + 1)
+    assert stale_features(metadata) == ["bpm"]
+    assert stale_features(metadata, ["key", "spectral"]) == []
+
+
+@pytest.mark.asyncio
+async def test_plan_selects_only_stale_samples(db_session, test_user, monkeypatch):
+    monkeypatch.setattr(reprocess_planner, "enabled_features", lambda: ANALYSIS_FEATURES)
+    legacy = Sample(user_id=test_user.id, title="legacy", file_path="/a.wav", analysis_metadata={"analyzer": "librosa"})
+    current = Sample(user_id=test_user.id, title="current", file_path="/b.wav", analysis_metadata=_current_metadata())
+    db_session.add_all([legacy, current])
+    await db_session.commit()
+
+    plan = await plan_reprocess(db_session, features=["bpm"])
+    assert [(s.id, s.features) for s in plan.samples] == [(legacy.id, ("bpm",))]
+    assert plan.up_to_date == 1
+
+    # Upgrading the BPM algorithm makes BPM, and only BPM, stale everywhere
+    monkeypatch.setitem(ANALYZER_VERSIONS, "bpm", ANALYZER_VERSIONS["bpm"] + 1)
+    plan = await plan_reprocess(db_session)
+    assert {s.title: s.features for s in plan.samples} == {
+        "legacy": ("bpm", "key", "genre", "spectral"),
+        "current": ("bpm",),
+    }
+    assert plan.feature_counts() == {"bpm": 2, "key": 1, "genre": 1, "spectral": 1}
+
+    with pytest.raises(ValueError):
+        await plan_reprocess(db_session, features=["tempo"])
+
+
+@pytest.mark.asyncio
+async def test_runner_updates_only_stale_features(session_factory, test_user, test_wav_fixture, monkeypatch):
+    async with session_factory() as session:
+        sample = Sample(
+            user_id=test_user.id,
+            title="sine",
+            file_path=str(test_wav_fixture),
+            bpm=45.0,
+            musical_key="D minor",
+            analysis_metadata={**_current_metadata(), "bpm_method": "old"},
+            extra_metadata={"source": "crate", "audio_features": {"bpm": 45.0, "spectral_centroid": 1234.0}},
+        )
+        missing = Sample(user_id=test_user.id, title="gone", file_path="/nowhere.wav", bpm=200.0)
+        session.add_all([sample, missing])
+        await session.commit()
+
+    monkeypatch.setitem(ANALYZER_VERSIONS, "bpm", ANALYZER_VERSIONS["bpm"] + 1)
+    async with session_factory() as session:
+        plan = await plan_reprocess(session, features=["bpm"])
+    assert len(plan.samples) == 2
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        runner = ReprocessRunner(session_factory, workers=2, batch_size=10, executor=executor)
+        results = await runner.run(plan)
+
+    assert {r.sample.title: r.status for r in results} == {"sine": "success", "gone": "error"}
+
+    async with session_factory() as session:
+        updated = await session.get(Sample, sample.id)
+        untouched = await session.get(Sample, missing.id)
+
+    analyzers = updated.analysis_metadata["analyzers"]
+    assert analyzers["bpm"] == {"name": "librosa", "version": ANALYZER_VERSIONS["bpm"]}
+    assert analyzers["key"] == {"name": "librosa", "version": ANALYZER_VERSIONS["key"]}
+    assert updated.analysis_metadata["bpm_method"] == "beat_track"
+    assert updated.musical_key == "D minor"
+    assert updated.extra_metadata["source"] == "crate"
+    assert updated.extra_metadata["audio_features"]["spectral_centroid"] == 1234.0
+    assert updated.extra_metadata["audio_features"]["bpm"] == updated.bpm
+    assert updated.analyzed_at is not None
+    assert untouched.bpm == 200.0
+    assert stale_features(updated.analysis_metadata) == []
+
+
+@pytest.mark.asyncio
+async def test_full_analysis_records_analyzer_versions(audio_service, test_wav_fixture):
+    features = await audio_service.analyze_file(test_wav_fixture)
+    analyzers = features.metadata["analyzers"]
+    assert {"bpm", "key", "spectral"} <= analyzers.keys()
+    assert all(record["version"] == ANALYZER_VERSIONS[f] for f, record in analyzers.items())
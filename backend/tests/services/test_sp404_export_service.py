@@ -2114,6 +2114,166 @@ async def test_export_kit_bank_organization(
         assert True, "Kit exported with bank structure"
 
 
+# =============================================================================
+# EXPORT MANIFEST TESTS
+# =============================================================================
+
+
+@pytest.mark.asyncio
+async def test_export_batch_writes_single_manifest(
+    db_session: AsyncSession,
+    test_user,
+    test_wav_fixture,
+    tmp_path
+):
+    """Batch export writes one JSON manifest instead of per-sample .txt files."""
+    import json
+    from sqlalchemy import select
+    from app.services.sp404_export_service import SP404ExportService
+    from app.schemas.sp404_export import ExportConfig
+    from app.models.sample import Sample
+    from app.models.sp404_export import SP404ExportSample
+
+    sample_ids = []
+    for i in range(1, 4):
+        sample = Sample(
+            user_id=test_user.id,
+            title=f"Manifest Sample {i}",
+            file_path=str(test_wav_fixture),
+            genre="jazz",
+            bpm=90.0 + i
+        )
+        db_session.add(sample)
+        await db_session.flush()
+        sample_ids.append(sample.id)
+    await db_session.commit()
+
+    export_config = ExportConfig(
+        organize_by="flat",
+        format="wav",
+        output_base_path=str(tmp_path / "manifest_batch")
+    )
+
+    service = SP404ExportService(db_session)
+    result = await service.export_batch(
+        sample_ids=list(reversed(sample_ids)),
+        config=export_config
+    )
+
+    assert result.successful == 3
+    output_dir = Path(result.output_base_path)
+    assert result.manifest_path == str(output_dir / "export_manifest.json")
+    assert list(output_dir.rglob("*.txt")) == []
+
+    manifest = json.loads(Path(result.manifest_path).read_text())
+    assert manifest["export_type"] == "batch"
+    assert [row["sample_id"] for row in manifest["samples"]] == list(reversed(sample_ids))
+    assert manifest["samples"][0]["bpm"] == 93.0
+    assert all((output_dir / row["path"]).exists() for row in manifest["samples"])
+
+    rows = (await db_session.execute(select(SP404ExportSample))).scalars().all()
+    assert sorted(row.sample_id for row in rows) == sorted(sample_ids)
+
+
+@pytest.mark.asyncio
+async def test_export_batch_manifest_formats(
+    db_session: AsyncSession,
+    test_user,
+    test_wav_fixture,
+    tmp_path
+):
+    """CSV manifests have one row per sample; "none" skips the manifest."""
+    import csv
+    from app.services.sp404_export_service import SP404ExportService
+    from app.schemas.sp404_export import ExportConfig
+    from app.models.sample import Sample
+
+    sample = Sample(
+        user_id=test_user.id,
+        title="CSV Sample",
+        file_path=str(test_wav_fixture)
+    )
+    db_session.add(sample)
+    await db_session.commit()
+
+    service = SP404ExportService(db_session)
+    csv_result = await service.export_batch(
+        sample_ids=[sample.id],
+        config=ExportConfig(
+            manifest_format="csv",
+            output_base_path=str(tmp_path / "csv_export")
+        )
+    )
+    with open(csv_result.manifest_path, newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert [row["title"] for row in rows] == ["CSV Sample"]
+    assert rows[0]["success"] == "True"
+
+    none_result = await service.export_batch(
+        sample_ids=[sample.id],
+        config=ExportConfig(
+            manifest_format="none",
+            output_base_path=str(tmp_path / "no_manifest")
+        )
+    )
+    assert none_result.manifest_path is None
+    assert not list((tmp_path / "no_manifest").rglob("export_manifest.*"))
+
+
+@pytest.mark.asyncio
+async def test_export_batch_matches_loudness_from_stored_values(
+    db_session: AsyncSession,
+    test_user,
+    tmp_path
+):
+    """target_lufs gain-matches analyzed samples; unanalyzed ones keep their level."""
+    import json
+    import soundfile as sf
+    from app.services.sp404_export_service import SP404ExportService
+    from app.schemas.sp404_export import ExportConfig
+    from app.models.sample import Sample
+    from app.utils.loudness import measure_loudness
+
+    t = np.arange(44100) / 44100
+    sample_ids = []
+    for name, amplitude, analyzed in (("Soft", 0.03, True), ("Loud", 0.6, True), ("Raw", 0.03, False)):
+        audio = amplitude * np.sin(2 * np.pi * 440 * t)
+        path = tmp_path / f"{name}.wav"
+        sf.write(str(path), audio, 44100)
+        loudness = measure_loudness(audio, 44100)
+        sample = Sample(
+            user_id=test_user.id,
+            title=name,
+            file_path=str(path),
+            loudness_lufs=loudness.integrated_lufs if analyzed else None,
+            true_peak_dbtp=loudness.true_peak_dbtp if analyzed else None
+        )
+        db_session.add(sample)
+        await db_session.flush()
+        sample_ids.append(sample.id)
+    await db_session.commit()
+
+    result = await SP404ExportService(db_session).export_batch(
+        sample_ids=sample_ids,
+        config=ExportConfig(target_lufs=-16.0, output_base_path=str(tmp_path / "matched"))
+    )
+
+    assert result.successful == 3
+    output_dir = Path(result.output_base_path)
+    levels = {}
+    for name in ("Soft", "Loud", "Raw"):
+        audio, sr = sf.read(str(output_dir / f"{name}.wav"))
+        levels[name] = measure_loudness(audio, sr).integrated_lufs
+    assert levels["Soft"] == pytest.approx(-16.0, abs=0.3)
+    assert levels["Loud"] == pytest.approx(-16.0, abs=0.3)
+    assert levels["Raw"] < -25.0
+
+    manifest = json.loads(Path(result.manifest_path).read_text())
+    gains = {row["title"]: row["gain_db"] for row in manifest["samples"]}
+    assert gains["Soft"] > 0 > gains["Loud"]
+    assert gains["Raw"] == 0.0
+
+
 # =============================================================================
 # META-TEST: Verify imports will fail (RED phase)
 # =============================================================================
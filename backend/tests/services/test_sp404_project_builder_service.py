@@ -502,3 +502,172 @@ class TestSP404ProjectBuilderService:
         assert result.download_url.startswith("/api/v1/")
         assert "download" in result.download_url.lower()
         assert str(result.export_id) in result.download_url
+
+
+class TestIncrementalProjectBuilds:
+    """Rebuilds reuse unchanged pads via the project build manifest"""
+
+    @pytest.mark.asyncio
+    async def test_rebuild_reconverts_only_changed_pads(self, db_session, tmp_path):
+        import numpy as np
+        import soundfile as sf
+        def write_tone(path, frequency):
+            t = np.linspace(0, 0.5, 22050, endpoint=False)
+            sf.write(str(path), 0.4 * np.sin(2 * np.pi * frequency * t), 44100)
+            return str(path)
+
+        kit = Kit(user_id=1, name="Iterating Kit")
+        db_session.add(kit)
+        await db_session.flush()
+        samples = []
+        for i in range(3):
+            sample = Sample(
+                user_id=1,
+                title=f"Hit {i}",
+                file_path=write_tone(tmp_path / f"hit_{i}.wav", 300 + 100 * i),
+                bpm=90.0,
+            )
+            db_session.add(sample)
+            await db_session.flush()
+            db_session.add(KitSample(kit_id=kit.id, sample_id=sample.id, pad_bank="A", pad_number=i + 1))
+            samples.append(sample)
+        await db_session.commit()
+
+        output_dir = tmp_path / "projects"
+        request = ProjectBuildRequest(project_name="Iterate", audio_format="wav")
+        service = SP404ProjectBuilderService(db_session)
+
+        first = await service.build_project(kit.id, request, output_base_path=output_dir)
+        assert first.success and first.converted_count == 3
+        zip_path = output_dir / f"Iterate_kit{kit.id}.zip"
+        first_mtime = zip_path.stat().st_mtime_ns
+
+        # Nothing changed: no conversions and the archive is reused
+        second = await service.build_project(kit.id, request, output_base_path=output_dir)
+        assert second.success and second.converted_count == 0
+        assert zip_path.stat().st_mtime_ns == first_mtime
+
+        # Swap the sample on pad 2
+        replacement = Sample(
+            user_id=1,
+            title="Hit 1",
+            file_path=write_tone(tmp_path / "replacement.wav", 1000),
+            bpm=120.0,
+        )
+        db_session.add(replacement)
+        await db_session.flush()
+        pad = (await db_session.execute(
+            select(KitSample).where(KitSample.kit_id == kit.id, KitSample.pad_number == 2)
+        )).scalar_one()
+        await db_session.delete(pad)
+        await db_session.flush()
+        db_session.add(KitSample(kit_id=kit.id, sample_id=replacement.id, pad_bank="A", pad_number=2))
+        await db_session.commit()
+
+        third = await service.build_project(kit.id, request, output_base_path=output_dir)
+        assert third.success and third.converted_count == 1
+
+        with zipfile.ZipFile(zip_path) as zf:
+            assert sorted(zf.namelist()) == [
+                "PADCONF.BIN", "PROJECT_INFO.txt",
+                "samples/Hit_0_001.wav", "samples/Hit_1_002.wav", "samples/Hit_2_003.wav",
+            ]
+            padconf = zf.read("PADCONF.BIN")
+
+        # The patched PADCONF matches a from-scratch build
+        fresh = await SP404ProjectBuilderService(db_session).build_project(
+            kit.id, request.model_copy(update={"project_name": "Fresh"}), output_base_path=tmp_path / "fresh"
+        )
+        with zipfile.ZipFile(tmp_path / "fresh" / f"Fresh_kit{kit.id}.zip") as zf:
+            fresh_padconf = zf.read("PADCONF.BIN")
+        assert padconf[0x81:0xA1] != fresh_padconf[0x81:0xA1]  # Different project names
+        assert padconf[0xA1:] == fresh_padconf[0xA1:]
+
+    @pytest.mark.asyncio
+    async def test_kits_sharing_a_project_name_keep_their_own_archive(self, db_session, tmp_path):
+        import zipfile
+        from app.services import sp404_project_builder_service as builder_module
+
+        def write_tone(path, freq):
+            import numpy as np
+            import soundfile as sf
+            t = np.arange(4410) / 44100
+            sf.write(str(path), 0.3 * np.sin(2 * np.pi * freq * t), 44100)
+            return str(path)
+
+        kits = []
+        for i in range(2):
+            kit = Kit(user_id=1, name=f"Kit {i}")
+            db_session.add(kit)
+            await db_session.flush()
+            sample = Sample(user_id=1, title=f"Only {i}", file_path=write_tone(tmp_path / f"only_{i}.wav", 200 + i * 300))
+            db_session.add(sample)
+            await db_session.flush()
+            db_session.add(KitSample(kit_id=kit.id, sample_id=sample.id, pad_bank="A", pad_number=1))
+            kits.append(kit)
+        await db_session.commit()
+
+        output_dir = tmp_path / "projects"
+        request = ProjectBuildRequest(project_name="Shared", audio_format="wav")
+        service = SP404ProjectBuilderService(db_session)
+        for kit in kits:
+            assert (await service.build_project(kit.id, request, output_base_path=output_dir)).success
+
+        # Rebuilding the first kit is a no-op and still serves its own pads
+        again = await service.build_project(kits[0].id, request, output_base_path=output_dir)
+        assert again.success and again.converted_count == 0
+        for i, kit in enumerate(kits):
+            with zipfile.ZipFile(output_dir / f"Shared_kit{kit.id}.zip") as zf:
+                assert [n for n in zf.namelist() if n.startswith("samples/")] == [f"samples/Only_{i}_001.wav"]
+
+        # A replaced archive is rebuilt rather than trusted
+        archive = output_dir / f"Shared_kit{kits[0].id}.zip"
+        archive.write_bytes(b"not a zip")
+        await service.build_project(kits[0].id, request, output_base_path=output_dir)
+        assert zipfile.is_zipfile(archive)
+        assert builder_module._project_locks == {}
+
+    @pytest.mark.asyncio
+    async def test_loudness_target_matches_pads_from_stored_values(self, db_session, tmp_path):
+        import numpy as np
+        import soundfile as sf
+        from app.utils.loudness import measure_loudness
+
+        kit = Kit(user_id=1, name="Level Kit")
+        db_session.add(kit)
+        await db_session.flush()
+        for i, amplitude in enumerate((0.05, 0.5)):
+            t = np.arange(44100) / 44100
+            audio = amplitude * np.sin(2 * np.pi * 220 * t)
+            path = tmp_path / f"level_{i}.wav"
+            sf.write(str(path), audio, 44100)
+            loudness = measure_loudness(audio, 44100)
+            sample = Sample(
+                user_id=1,
+                title=f"Level {i}",
+                file_path=str(path),
+                loudness_lufs=loudness.integrated_lufs,
+                true_peak_dbtp=loudness.true_peak_dbtp,
+            )
+            db_session.add(sample)
+            await db_session.flush()
+            db_session.add(KitSample(kit_id=kit.id, sample_id=sample.id, pad_bank="A", pad_number=i + 1))
+        await db_session.commit()
+
+        output_dir = tmp_path / "projects"
+        service = SP404ProjectBuilderService(db_session)
+        plain = ProjectBuildRequest(project_name="Levels", audio_format="wav")
+        matched = plain.model_copy(update={"target_lufs": -18.0})
+
+        assert (await service.build_project(kit.id, plain, output_base_path=output_dir)).converted_count == 2
+
+        # Changing the target reconverts every pad, each gain-matched to -18 LUFS
+        result = await service.build_project(kit.id, matched, output_base_path=output_dir)
+        assert result.success and result.converted_count == 2
+        samples_dir = output_dir / "Levels_kit{}".format(kit.id) / "samples"
+        for name in ("Level_0_001.wav", "Level_1_002.wav"):
+            audio, sr = sf.read(str(samples_dir / name))
+            assert measure_loudness(audio, sr).integrated_lufs == pytest.approx(-18.0, abs=0.3)
+
+        again = await service.build_project(kit.id, matched, output_base_path=output_dir)
+        assert again.converted_count == 0
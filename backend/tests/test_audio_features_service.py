@@ -14,7 +14,7 @@ import pytest_asyncio
 from pathlib import Path
 from sqlalchemy import select
 
-from app.services.audio_features_service import AudioFeaturesService
+from app.services.audio_features_service import AudioFeaturesService, analyze_in_worker
 from app.models.audio_features import AudioFeatures, AudioError
 from app.models.sample import Sample
 
@@ -140,6 +140,26 @@ async def test_invalid_file_raises_audio_error(audio_service, tmp_path):
     assert error.message, "Error should have descriptive message"
 
 
+def test_analyze_in_worker_returns_errors(test_wav_fixture, tmp_path):
+    """
+    Test the pool-worker entry point used by batch import and reprocess runs.
+
+    Full and partial analyses return features; a bad file returns its error
+    message instead of raising.
+    """
+    features, error = analyze_in_worker(str(test_wav_fixture))
+    assert error is None
+    assert isinstance(features, AudioFeatures)
+
+    features, error = analyze_in_worker(str(test_wav_fixture), ("key",))
+    assert error is None
+    assert features.metadata["analyzers"].keys() == {"key"}
+
+    features, error = analyze_in_worker(str(tmp_path / "does_not_exist.wav"))
+    assert features is None
+    assert "not found" in error.lower() or "does not exist" in error.lower()
+
+
 @pytest.mark.asyncio
 async def test_save_features_to_database(audio_service, db_session, test_wav_fixture, test_user):
     """
@@ -336,3 +336,51 @@ class TestPadconfService:
         data = service.create_padconf(project, pads)
 
         assert len(data) == 52000  # Verify still valid size
+
+    def test_read_pad_table_decodes_all_pads_in_bulk(self, service):
+        """Test bulk decoding of every pad record from a memoryview"""
+        project = ProjectConfig(project_name="Bulk", project_bpm=93.0)
+        pads = [
+            PadConfig(pad_index=1, filename="kick.wav", bpm=93.0, pitch=-2, loop=True),
+            PadConfig(pad_index=17, filename="snare.wav", volume=64),
+            PadConfig(pad_index=160, filename="last.wav", gate=True)
+        ]
+        data = service.create_padconf(project, pads)
+
+        table = service.read_pad_table(memoryview(data))
+
+        assert table.project.project_name == "Bulk"
+        assert len(table.records) == 160
+        assert [(index, name) for index, name, _ in table.used_pads()] == [
+            (1, "kick.wav"), (17, "snare.wav"), (160, "last.wav")
+        ]
+        assert table.filenames[16] == "snare.wav"
+        assert table.records["bpm"][0] == 9300
+        assert table.records["pitch"][0] == -2
+        assert table.records["loop"][0] == 0x7FFFFFFF
+        assert table.records["volume"][16] == 64
+        assert table.records["gate"][159] == 1
+
+    def test_read_clamps_out_of_range_device_values(self, service, temp_dir):
+        """Test values outside the documented ranges do not make a file unreadable"""
+        project = ProjectConfig(project_name="Device", project_bpm=120.0)
+        data = bytearray(service.create_padconf(project, [PadConfig(pad_index=1, filename="kick.wav")]))
+
+        record = service.PAD_METADATA_START
+        data[record + 0x08:record + 0x0C] = (200).to_bytes(4, "big")  # volume
+        data[record + 0x22:record + 0x24] = (0xFFFF).to_bytes(2, "big")  # bpm 655.35
+        data[record + 0x3C:record + 0x40] = (0).to_bytes(4, "big")  # speed
+        data[service.PAD_FILENAME_START:service.PAD_FILENAME_START + 24] = b"A" * 20 + b".wav"
+        data[service.HEADER_PROJECT_BPM:service.HEADER_PROJECT_BPM + 2] = (1000).to_bytes(2, "big")
+        data[service.HEADER_PROJECT_NAME:service.HEADER_PROJECT_NAME + 32] = b"N" * 32
+        temp_file = temp_dir / "PADCONF.BIN"
+        temp_file.write_bytes(bytes(data))
+
+        read_project, read_pads = service.read_padconf(temp_file)
+
+        assert read_project.project_name == "N" * 31
+        assert read_project.project_bpm == 20.0
+        assert read_pads[0].volume == 127
+        assert read_pads[0].bpm is None
+        assert read_pads[0].speed == 5000
+        assert read_pads[0].filename == "A" * 20 + ".wa"
@@ -0,0 +1,112 @@
+"""
+Unit tests for response compression and orjson rendering
+"""
+import gzip
+from datetime import datetime, timezone
+
+import pytest
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+from app.core.compression import CompressionMiddleware, choose_encoding
+from app.core.responses import ORJSONResponse, dumps
+
+LARGE_TEXT = "sp404 " * 1000
+
+
+def _build_app(**kwargs) -> Starlette:
+    async def large(request):
+        return PlainTextResponse(LARGE_TEXT)
+
+    async def small(request):
+        return PlainTextResponse("ok")
+
+    async def audio(request):
+        return Response(b"\x00" * 4096, media_type="audio/wav")
+
+    async def stream(request):
+        async def chunks():
+            for _ in range(5):
+                yield LARGE_TEXT.encode()
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    app = Starlette(routes=[
+        Route("/large", large),
+        Route("/small", small),
+        Route("/audio", audio),
+        Route("/stream", stream),
+    ])
+    return CompressionMiddleware(app, brotli_enabled=False, **kwargs)
+
+
+@pytest_asyncio.fixture
+async def raw_client():
+    transport = ASGITransport(app=_build_app(minimum_size=500))
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        yield ac
+
+
+class TestChooseEncoding:
+    """Tests for Accept-Encoding negotiation."""
+
+    def test_gzip_when_brotli_disabled(self):
+        assert choose_encoding("br, gzip", brotli_enabled=False) == "gzip"
+
+    def test_rejected_encoding_is_ignored(self):
+        assert choose_encoding("gzip;q=0, identity") is None
+
+
+class TestCompressionMiddleware:
+    """Tests for CompressionMiddleware."""
+
+    @pytest.mark.asyncio
+    async def test_large_body_is_gzipped(self, raw_client):
+        async with raw_client.stream(
+            "GET", "/large", headers={"Accept-Encoding": "gzip"}
+        ) as response:
+            raw = b"".join([chunk async for chunk in response.aiter_raw()])
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert int(response.headers["content-length"]) == len(raw)
+        assert gzip.decompress(raw).decode() == LARGE_TEXT
+        assert "accept-encoding" in response.headers["vary"].lower()
+
+    @pytest.mark.asyncio
+    async def test_small_body_passes_through(self, raw_client):
+        response = await raw_client.get("/small", headers={"Accept-Encoding": "gzip"})
+
+        assert "content-encoding" not in response.headers
+        assert response.text == "ok"
+
+    @pytest.mark.asyncio
+    async def test_audio_is_not_compressed(self, raw_client):
+        response = await raw_client.get("/audio", headers={"Accept-Encoding": "gzip"})
+
+        assert "content-encoding" not in response.headers
+        assert len(response.content) == 4096
+
+    @pytest.mark.asyncio
+    async def test_streaming_body_is_gzipped(self, raw_client):
+        response = await raw_client.get("/stream", headers={"Accept-Encoding": "gzip"})
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert "content-length" not in response.headers
+        assert response.text == LARGE_TEXT * 5
+
+
+class TestORJSONResponse:
+    """Tests for the orjson-backed response class."""
+
+    def test_renders_datetimes_like_pydantic(self):
+        created = datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+
+        assert dumps({"created_at": created}) == b'{"created_at":"2024-01-02T03:04:05Z"}'
+
+    def test_response_body(self):
+        response = ORJSONResponse({"items": [1, 2], "total": 2})
+
+        assert response.body == b'{"items":[1,2],"total":2}'
+        assert response.media_type == "application/json"
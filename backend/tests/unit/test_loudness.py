@@ -0,0 +1,77 @@
+"""
+Tests for EBU R128 loudness measurement and gain-matched conversion.
+"""
+import numpy as np
+import pytest
+import soundfile as sf
+
+from app.utils.loudness import k_weighting_sos, measure_loudness, normalization_gain_db
+from app.utils.resampling import convert_file
+
+SR = 48000
+
+
+def _sine(dbfs, seconds, sr=SR, freq=1000.0):
+    t = np.arange(int(sr * seconds)) / sr
+    tone = 10 ** (dbfs / 20) * np.sin(2 * np.pi * freq * t)
+    return np.stack([tone, tone], axis=1)
+
+
+def test_k_weighting_matches_bs1770_at_48k():
+    sos = k_weighting_sos(48000)
+    assert sos[0, :3] == pytest.approx([1.53512485958697, -2.69169618940638, 1.19839281085285])
+    assert sos[0, 4:] == pytest.approx([-1.69065929318241, 0.73248077421585])
+    assert sos[1, 4:] == pytest.approx([-1.99004745483398, 0.99007225036621])
+
+
+def test_reference_tone_reads_minus_23_lufs():
+    # EBU Tech 3341 test 1: stereo 1 kHz sine at -23 dBFS
+    result = measure_loudness(_sine(-23, 20), SR)
+
+    assert result.integrated_lufs == pytest.approx(-23.0, abs=0.1)
+    assert result.true_peak_dbtp == pytest.approx(-23.0, abs=0.1)
+    assert result.loudness_range_lu == pytest.approx(0.0, abs=0.1)
+
+
+def test_gating_ignores_quiet_sections():
+    # EBU Tech 3341 test 3: -36 / -23 / -36 dBFS for 10 / 60 / 10 s
+    audio = np.concatenate([_sine(-36, 10), _sine(-23, 60), _sine(-36, 10)])
+
+    assert measure_loudness(audio, SR).integrated_lufs == pytest.approx(-23.0, abs=0.1)
+
+
+def test_loudness_range_of_two_levels():
+    # EBU Tech 3342 test 1: -20 then -30 dBFS gives an LRA of 10 LU
+    audio = np.concatenate([_sine(-20, 20), _sine(-30, 20)])
+
+    assert measure_loudness(audio, SR).loudness_range_lu == pytest.approx(10.0, abs=1.0)
+
+
+def test_one_shots_and_silence():
+    hit = measure_loudness(_sine(-6, 0.1)[:, 0], 44100)
+    assert hit.integrated_lufs is not None
+    assert hit.loudness_range_lu is None  # Shorter than one 3 s window
+
+    silent = measure_loudness(np.zeros((4800, 2)), SR)
+    assert silent.integrated_lufs is None
+    assert silent.true_peak_dbtp is None
+
+
+def test_normalization_gain_respects_true_peak_ceiling():
+    assert normalization_gain_db(-20.0, -8.0, target_lufs=-14.0) == 6.0
+    # A peaky sample is only raised until it hits the ceiling
+    assert normalization_gain_db(-20.0, -3.0, target_lufs=-14.0) == 2.0
+    assert normalization_gain_db(None, None, target_lufs=-14.0) == 0.0
+
+
+def test_convert_file_applies_gain_while_resampling(tmp_path):
+    source = tmp_path / "quiet.wav"
+    sf.write(str(source), _sine(-30, 4, sr=44100).astype(np.float32), 44100, subtype="PCM_16")
+    before = measure_loudness(sf.read(str(source))[0], 44100).integrated_lufs
+
+    output = tmp_path / "matched.wav"
+    convert_file(source, output, 48000, gain_db=-14.0 - before)
+
+    audio, sr = sf.read(str(output))
+    assert sr == 48000
+    assert measure_loudness(audio, sr).integrated_lufs == pytest.approx(-14.0, abs=0.2)
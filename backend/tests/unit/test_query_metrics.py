@@ -0,0 +1,95 @@
+"""
+Unit tests for per-request query metrics and N+1 detection
+"""
+import pytest
+from sqlalchemy import select, text
+
+from app.core.database import build_engine_kwargs
+from app.core.query_metrics import (
+    QueryMetricsMiddleware,
+    QueryStats,
+    install_query_listeners,
+    track_queries,
+)
+from app.models.sample import Sample
+
+
+class TestQueryStats:
+    """Tests for the QueryStats accumulator."""
+
+    def test_record_counts_and_times(self):
+        stats = QueryStats()
+        stats.record("SELECT 1", 0.002)
+        stats.record("SELECT 1", 0.003)
+
+        assert stats.count == 2
+        assert stats.total_time_ms == pytest.approx(5.0)
+
+    def test_repeated_statements_threshold(self):
+        stats = QueryStats()
+        for _ in range(5):
+            stats.record("SELECT * FROM kit_samples WHERE sample_id = ?", 0.001)
+        stats.record("SELECT * FROM kits WHERE id = ?", 0.001)
+
+        repeated = stats.repeated_statements(threshold=5)
+
+        assert repeated == [("SELECT * FROM kit_samples WHERE sample_id = ?", 5)]
+        assert stats.repeated_statements(threshold=6) == []
+
+
+class TestEngineKwargs:
+    """Tests for settings-driven engine configuration."""
+
+    def test_sqlite_skips_pool_sizing(self):
+        kwargs = build_engine_kwargs("sqlite+aiosqlite:///:memory:")
+
+        assert "pool_size" not in kwargs
+        assert "connect_args" not in kwargs
+
+    def test_asyncpg_gets_pool_and_statement_cache(self):
+        kwargs = build_engine_kwargs("postgresql+asyncpg://u:p@localhost/db")
+
+        assert kwargs["pool_size"] >= 1
+        assert "pool_recycle" in kwargs
+        assert "statement_cache_size" in kwargs["connect_args"]
+        assert "prepared_statement_cache_size" in kwargs["connect_args"]
+
+
+@pytest.mark.asyncio
+async def test_listeners_count_queries_in_scope(db_engine, db_session):
+    """Queries inside track_queries() are counted; outside are not."""
+    install_query_listeners(db_engine)
+
+    await db_session.execute(text("SELECT 1"))
+
+    with track_queries() as stats:
+        for sample_id in range(3):
+            await db_session.execute(select(Sample).where(Sample.id == sample_id))
+
+    assert stats.count == 3
+    assert stats.repeated_statements(threshold=3)
+
+
+@pytest.mark.asyncio
+async def test_middleware_adds_headers_and_flags_repeats(db_engine, db_session):
+    """Middleware reports query count and repeated statements as headers."""
+    install_query_listeners(db_engine)
+
+    async def app(scope, receive, send):
+        for sample_id in range(4):
+            await db_session.execute(select(Sample).where(Sample.id == sample_id))
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"{}"})
+
+    middleware = QueryMetricsMiddleware(app, detect_n_plus_one=True, n_plus_one_threshold=4)
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    await middleware({"type": "http", "method": "GET", "path": "/x"}, None, send)
+
+    headers = dict(messages[0]["headers"])
+    assert headers[b"x-db-query-count"] == b"4"
+    assert b"x-db-query-time-ms" in headers
+    assert headers[b"x-db-repeated-statements"] == b"1"
@@ -0,0 +1,75 @@
+"""
+Tests for the export resampling module.
+"""
+import numpy as np
+import pytest
+import soundfile as sf
+
+from app.utils import resampling
+from app.utils.resampling import QUALITY_PRESETS, convert_file, resample
+
+
+def _tone(sr, seconds=1.0, channels=2, freq=1000.0):
+    t = np.arange(int(sr * seconds)) / sr
+    left = 0.5 * np.sin(2 * np.pi * freq * t)
+    right = 0.25 * np.sin(2 * np.pi * freq * 1.5 * t)
+    audio = np.stack([left, right][:channels], axis=1)
+    return audio.astype(np.float32)
+
+
+@pytest.mark.parametrize("quality", QUALITY_PRESETS)
+def test_resample_all_channels_at_once(quality):
+    audio = _tone(44100)
+
+    out = resample(audio, 44100, 48000, quality)
+
+    assert out.shape == (48000, 2)
+    # Channels keep their own content (level of each sine is preserved)
+    middle = slice(4800, -4800)
+    assert np.max(np.abs(out[middle, 0])) == pytest.approx(0.5, abs=0.02)
+    assert np.max(np.abs(out[middle, 1])) == pytest.approx(0.25, abs=0.02)
+
+
+def test_resample_polyphase_fallback(monkeypatch):
+    monkeypatch.setattr(resampling, "SOXR_AVAILABLE", False)
+
+    out = resample(_tone(44100, channels=1), 44100, 48000, "balanced")
+
+    assert out.shape == (48000, 1)
+    assert out.dtype == np.float32
+
+
+def test_unknown_quality_rejected():
+    with pytest.raises(ValueError, match="Unknown resample quality"):
+        resample(_tone(44100), 44100, 48000, "ultra")
+
+
+def test_convert_file_skips_resample_at_target_rate(tmp_path):
+    source = tmp_path / "already_48k.wav"
+    sf.write(str(source), _tone(48000), 48000, subtype="PCM_16")
+
+    result = convert_file(source, tmp_path / "out.wav", 48000, block_frames=4096)
+
+    assert result.resampled is False
+    assert result.frames_written == 48000
+    # 16-bit in, 16-bit out with no resampling is bit exact
+    original, _ = sf.read(str(source), dtype="int16")
+    converted, _ = sf.read(str(tmp_path / "out.wav"), dtype="int16")
+    np.testing.assert_array_equal(original, converted)
+
+
+@pytest.mark.parametrize("use_soxr", [True, False])
+def test_convert_file_streams_blocks(tmp_path, monkeypatch, use_soxr):
+    monkeypatch.setattr(resampling, "SOXR_AVAILABLE", use_soxr and resampling.SOXR_AVAILABLE)
+    source = tmp_path / "cd.wav"
+    sf.write(str(source), _tone(44100, seconds=2.0), 44100, subtype="PCM_24")
+
+    result = convert_file(source, tmp_path / "out.aiff", 48000, format="aiff", block_frames=1000)
+
+    info = sf.info(str(tmp_path / "out.aiff"))
+    assert result.resampled is True
+    assert result.original_sample_rate == 44100
+    assert result.original_duration == pytest.approx(2.0)
+    assert (info.samplerate, info.channels, info.subtype) == (48000, 2, "PCM_16")
+    assert abs(info.frames - 96000) <= 1
+    assert result.frames_written == info.frames
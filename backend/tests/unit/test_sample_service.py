@@ -52,26 +52,27 @@ class TestSampleService:
     
     @pytest.mark.unit
     @pytest.mark.asyncio
-    async def test_analyze_sample_queues_task(self, db_session):
-        """Test that analyzing a sample queues a background task."""
+    async def test_analyze_sample_queues_task(self, db_session, test_user):
+        """Test that analyzing a sample queues a durable vibe job."""
         # Arrange
+        from app.models.job import Job
+        from app.models.sample import Sample
         from app.services.sample_service import SampleService
         
+        sample = Sample(user_id=test_user.id, title="Test Beat", file_path="samples/test-123.wav")
+        db_session.add(sample)
+        await db_session.commit()
         service = SampleService(db_session)
-        mock_queue = AsyncMock()
         
         # Act
-        await service.analyze_sample(
-            sample_id=123,
-            queue=mock_queue
-        )
+        job_id = await service.analyze_sample(sample_id=sample.id)
         
         # Assert
-        mock_queue.enqueue.assert_called_once_with(
-            "analyze_sample",
-            sample_id=123,
-            priority="normal"
-        )
+        job = await db_session.get(Job, job_id)
+        assert job.kind == "sample.vibe"
+        assert job.queue == "vibe"
+        assert job.payload == {"sample_id": sample.id}
+        assert job.user_id == test_user.id
     
     @pytest.mark.unit
     @pytest.mark.asyncio
@@ -0,0 +1,81 @@
+"""
+Tests for the streaming ZIP writer used by export downloads.
+"""
+import io
+import os
+import zipfile
+
+from app.utils import zip_stream
+from app.utils.zip_stream import ZipStream
+
+
+def _build(tmp_path):
+    audio = tmp_path / "kick.wav"
+    audio.write_bytes(os.urandom(200_000))
+    info = tmp_path / "PROJECT_INFO.txt"
+    info.write_text("Project BPM: 90\n" * 500)
+    empty = tmp_path / "empty.aiff"
+    empty.write_bytes(b"")
+
+    archive = ZipStream(chunk_size=16_384)
+    archive.add_file(audio, "samples/kick.wav")
+    archive.add_file(info, "PROJECT_INFO.txt")
+    archive.add_file(empty, "samples/empty.aiff")
+    archive.add_bytes("Tempo: 90 – swing".encode(), "notes.txt")
+    return archive, audio
+
+
+def test_stream_is_valid_zip_with_stored_audio(tmp_path):
+    archive, audio = _build(tmp_path)
+
+    chunks = list(archive)
+    data = b"".join(chunks)
+
+    assert max(len(chunk) for chunk in chunks) <= 16_384
+    assert archive.size == len(data)
+
+    with zipfile.ZipFile(io.BytesIO(data)) as zf:
+        assert zf.testzip() is None
+        infos = {info.filename: info for info in zf.infolist()}
+        assert infos["samples/kick.wav"].compress_type == zipfile.ZIP_STORED
+        assert infos["samples/empty.aiff"].compress_type == zipfile.ZIP_STORED
+        assert infos["PROJECT_INFO.txt"].compress_type == zipfile.ZIP_DEFLATED
+        assert infos["PROJECT_INFO.txt"].compress_size < infos["PROJECT_INFO.txt"].file_size
+        assert zf.read("samples/kick.wav") == audio.read_bytes()
+        assert zf.read("notes.txt").decode() == "Tempo: 90 – swing"
+
+
+def test_large_text_is_streamed_without_known_size(tmp_path, monkeypatch):
+    monkeypatch.setattr(zip_stream, "EAGER_DEFLATE_LIMIT", 10)
+    log = tmp_path / "export.log"
+    log.write_text("line\n" * 10_000)
+
+    archive = ZipStream()
+    archive.add_file(log, "export.log")
+
+    assert archive.size is None
+    with zipfile.ZipFile(io.BytesIO(b"".join(archive))) as zf:
+        assert zf.read("export.log") == log.read_bytes()
+
+
+def test_zip64_records_are_readable(tmp_path, monkeypatch):
+    # Force ZIP64 layout without writing a 4 GiB file
+    monkeypatch.setattr(zip_stream._Entry, "zip64", property(lambda entry: True))
+    archive, audio = _build(tmp_path)
+
+    data = b"".join(archive)
+
+    assert archive.size == len(data)
+    with zipfile.ZipFile(io.BytesIO(data)) as zf:
+        assert zf.testzip() is None
+        assert zf.read("samples/kick.wav") == audio.read_bytes()
+
+
+def test_write_to_file(tmp_path):
+    archive, _ = _build(tmp_path)
+    target = tmp_path / "project.zip"
+
+    written = archive.write_to(target)
+
+    assert written == target.stat().st_size == archive.size
+    assert zipfile.is_zipfile(target)
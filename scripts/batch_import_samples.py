@@ -9,22 +9,48 @@ import sqlite3
 from pathlib import Path
 from datetime import datetime
 
-def batch_import_samples(input_file=None):
-    """Import samples from unprocessed files list into database."""
+sys.path.insert(0, str(Path(__file__).parent.parent))
 
-    if input_file is None:
-        input_file = 'scripts/batch_automation/unprocessed_files.json'
+DEFAULT_MANIFEST = 'scripts/batch_automation/scan_manifest.db'
 
-    if not os.path.exists(input_file):
-        print(f"❌ Input file not found: {input_file}")
-        return 0
 
-    # Load unprocessed files
-    with open(input_file, 'r') as f:
-        data = json.load(f)
+def scan_for_changes(scan_dir, manifest_path=DEFAULT_MANIFEST, verify=False):
+    """List new and modified audio files under scan_dir since the last scan."""
+    from src.tools.collection_scanner import CollectionScanner
 
-    unprocessed_files = data.get('files', [])
-    print(f"📂 Loading {len(unprocessed_files)} unprocessed files from {input_file}")
+    scanner = CollectionScanner(os.path.abspath(scan_dir), manifest_path=manifest_path)
+    result = scanner.scan(verify=verify)
+    changes = result.changes
+    print(
+        f"🔍 Scanned {result.total_files} audio files: {len(changes.added)} new, "
+        f"{len(changes.modified)} modified, {len(changes.deleted)} deleted, "
+        f"{changes.unchanged} unchanged"
+    )
+    return [
+        {'filename': path.name, 'abs_path': str(path)}
+        for path in changes.added + changes.modified
+    ]
+
+
+def batch_import_samples(input_file=None, scan_dir=None, manifest_path=DEFAULT_MANIFEST, verify=False):
+    """Import samples from unprocessed files list (or an incremental scan) into database."""
+
+    if scan_dir is not None:
+        unprocessed_files = scan_for_changes(scan_dir, manifest_path, verify)
+    else:
+        if input_file is None:
+            input_file = 'scripts/batch_automation/unprocessed_files.json'
+
+        if not os.path.exists(input_file):
+            print(f"❌ Input file not found: {input_file}")
+            return 0
+
+        # Load unprocessed files
+        with open(input_file, 'r') as f:
+            data = json.load(f)
+
+        unprocessed_files = data.get('files', [])
+        print(f"📂 Loading {len(unprocessed_files)} unprocessed files from {input_file}")
 
     # Connect to database
     db_file = 'backend/sp404_samples.db'
@@ -62,12 +88,17 @@ def batch_import_samples(input_file=None):
             # Get file size
             file_size = os.path.getsize(file_path)
 
-            # Check if already exists
+            # Check if already exists (a modified file just gets its size refreshed)
             cursor.execute(
                 "SELECT id FROM samples WHERE file_path = ?",
                 (file_path,)
             )
-            if cursor.fetchone():
+            existing = cursor.fetchone()
+            if existing:
+                cursor.execute(
+                    "UPDATE samples SET file_size = ? WHERE id = ?",
+                    (file_size, existing[0])
+                )
                 duplicates += 1
                 continue
 
@@ -125,6 +156,9 @@ if __name__ == '__main__':
 
     parser = argparse.ArgumentParser(description='Batch import samples')
     parser.add_argument('--input', help='Input JSON file with unprocessed files')
+    parser.add_argument('--scan', help='Scan this directory and import new/modified files instead of --input')
+    parser.add_argument('--manifest', default=DEFAULT_MANIFEST, help='Scan manifest used with --scan')
+    parser.add_argument('--verify', action='store_true', help='With --scan, stat every file to catch in-place rewrites')
     args = parser.parse_args()
 
-    batch_import_samples(args.input)
+    batch_import_samples(args.input, scan_dir=args.scan, manifest_path=args.manifest, verify=args.verify)
@@ -10,22 +10,19 @@ from pathlib import Path
 from datetime import datetime
 import json
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.tools.collection_scanner import scan_files
+
 
 def batch_import_unprocessed():
     """Import all unprocessed audio files into the database."""
 
     # Get all audio files on disk
-    audio_extensions = {'.wav', '.mp3', '.aiff', '.flac', '.ogg', '.m4a'}
     audio_files = {}
 
     print("🔍 Scanning samples directory...")
-    for root, dirs, files in os.walk('samples'):
-        for f in files:
-            if Path(f).suffix.lower() in audio_extensions:
-                rel_path = os.path.join(root, f)
-                abs_path = os.path.abspath(rel_path)
-                normalized = os.path.normpath(abs_path)
-                audio_files[f] = normalized
+    for path in scan_files(os.path.abspath('samples')):
+        audio_files[os.path.basename(path)] = os.path.normpath(path)
 
     print(f"✓ Found {len(audio_files)} audio files on disk")
 
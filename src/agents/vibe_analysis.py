@@ -15,6 +15,7 @@ from pydantic import BaseModel, Field
 from .base import Agent, AgentStatus
 from ..config import settings
 from ..logging_config import AgentLogger
+from ..tools.llm_scheduler import COMPLETION_TOKENS_PER_SAMPLE, RateLimitError
 
 
 class VibeDescriptor(BaseModel):
@@ -51,6 +52,7 @@ class VibeAnalysisAgent(Agent):
         self.last_request_time = None
         self.request_count = 0
         self._cache = {}  # Simple in-memory cache
+        self.scheduler = None  # Optional VibeRequestScheduler replacing the fixed batching
         
         # API configuration
         self.api_key = settings.openrouter_api_key
@@ -98,6 +100,8 @@ class VibeAnalysisAgent(Agent):
                     }
                 )
                 
+                if response.status_code == 429:
+                    raise self._rate_limit_error(response)
                 if response.status_code == 200:
                     result = response.json()
                     content = result['choices'][0]['message']['content']
@@ -116,6 +120,9 @@ class VibeAnalysisAgent(Agent):
                 else:
                     raise Exception(f"API error: {response.status_code}")
                     
+        except RateLimitError:
+            self.status = AgentStatus.IDLE
+            raise
         except Exception as e:
             self.logger.error(f"Error analyzing vibe: {str(e)}")
             self.status = AgentStatus.FAILED
@@ -123,6 +130,11 @@ class VibeAnalysisAgent(Agent):
     
     async def analyze_batch(self, samples: List[Dict[str, Any]]) -> List[SampleVibe]:
         """Analyze multiple samples in a batch.
+
+        With a scheduler attached (see src.tools.llm_scheduler), uncached
+        samples are packed into requests by estimated token size and sent
+        concurrently under its rate limits; otherwise they go out in fixed
+        batches of batch_size with the fixed rate limit.
         
         Args:
             samples: List of sample data dictionaries
@@ -131,68 +143,90 @@ class VibeAnalysisAgent(Agent):
             List of SampleVibe objects
         """
         results = []
+        uncached = []
+        for sample in samples:
+            cache_key = f"{sample['filename']}_{sample.get('bpm', 0)}_{sample.get('key', '')}"
+            if cache_key in self._cache:
+                results.append(self._cache[cache_key])
+            else:
+                uncached.append(sample)
+        
+        if not uncached:
+            return results
+        
+        if self.scheduler is not None:
+            for batch_vibes in await self.scheduler.run_all(
+                self.request_batch, self.scheduler.pack(uncached)
+            ):
+                results.extend(batch_vibes)
+            return results
         
         # Process in batches of batch_size
-        for i in range(0, len(samples), self.batch_size):
-            batch = samples[i:i + self.batch_size]
+        for i in range(0, len(uncached), self.batch_size):
+            await self._apply_rate_limit()
+            results.extend(await self.request_batch(uncached[i:i + self.batch_size]))
+        
+        return results
+    
+    async def request_batch(self, uncached: List[Dict[str, Any]]) -> List[SampleVibe]:
+        """Analyze samples with a single API request (no rate limiting).
+        
+        Args:
+            uncached: Sample data dictionaries for one prompt
             
-            # Check cache for each sample
-            uncached = []
-            for sample in batch:
-                cache_key = f"{sample['filename']}_{sample.get('bpm', 0)}_{sample.get('key', '')}"
-                if cache_key in self._cache:
-                    results.append(self._cache[cache_key])
-                else:
-                    uncached.append(sample)
+        Returns:
+            List of SampleVibe objects
             
-            if uncached:
-                # Apply rate limiting
-                await self._apply_rate_limit()
-                
-                prompt = self.create_batch_prompt(uncached)
+        Raises:
+            RateLimitError: If the provider answers 429
+        """
+        prompt = self.create_batch_prompt(uncached)
+        
+        try:
+            self.status = AgentStatus.RUNNING
+            
+            async with httpx.AsyncClient() as client:
+                response = await client.post(
+                    self.api_url,
+                    headers={
+                        "Authorization": f"Bearer {self.api_key}",
+                        "Content-Type": "application/json"
+                    },
+                    json={
+                        "model": self.model,
+                        "messages": [
+                            {"role": "system", "content": "You are a musical vibe analyst. Analyze samples and return JSON array only."},
+                            {"role": "user", "content": prompt}
+                        ],
+                        "temperature": 0.5,
+                        "max_tokens": len(uncached) * COMPLETION_TOKENS_PER_SAMPLE
+                    }
+                )
                 
-                try:
-                    self.status = AgentStatus.RUNNING
+                if response.status_code == 429:
+                    raise self._rate_limit_error(response)
+                if response.status_code == 200:
+                    result = response.json()
+                    content = result['choices'][0]['message']['content']
+                    batch_vibes = self.parse_batch_response(content, uncached)
                     
-                    async with httpx.AsyncClient() as client:
-                        response = await client.post(
-                            self.api_url,
-                            headers={
-                                "Authorization": f"Bearer {self.api_key}",
-                                "Content-Type": "application/json"
-                            },
-                            json={
-                                "model": self.model,
-                                "messages": [
-                                    {"role": "system", "content": "You are a musical vibe analyst. Analyze samples and return JSON array only."},
-                                    {"role": "user", "content": prompt}
-                                ],
-                                "temperature": 0.5,
-                                "max_tokens": 2000
-                            }
-                        )
-                        
-                        if response.status_code == 200:
-                            result = response.json()
-                            content = result['choices'][0]['message']['content']
-                            batch_vibes = self.parse_batch_response(content, uncached)
-                            
-                            # Cache results
-                            for vibe in batch_vibes:
-                                cache_key = f"{vibe.filename}_{vibe.bpm}_{vibe.key}"
-                                self._cache[cache_key] = vibe
-                            
-                            results.extend(batch_vibes)
-                            self.status = AgentStatus.IDLE
-                        else:
-                            raise Exception(f"API error: {response.status_code}")
-                            
-                except Exception as e:
-                    self.logger.error(f"Error in batch analysis: {str(e)}")
-                    self.status = AgentStatus.FAILED
-                    raise
-        
-        return results
+                    # Cache results
+                    for vibe in batch_vibes:
+                        cache_key = f"{vibe.filename}_{vibe.bpm}_{vibe.key}"
+                        self._cache[cache_key] = vibe
+                    
+                    self.status = AgentStatus.IDLE
+                    return batch_vibes
+                else:
+                    raise Exception(f"API error: {response.status_code}")
+                    
+        except RateLimitError:
+            self.status = AgentStatus.IDLE
+            raise
+        except Exception as e:
+            self.logger.error(f"Error in batch analysis: {str(e)}")
+            self.status = AgentStatus.FAILED
+            raise
     
     def create_single_prompt(self, sample_data: Dict[str, Any]) -> str:
         """Create prompt for single sample analysis with thinking protocol."""
@@ -441,6 +475,15 @@ Return as JSON array ONLY (no markdown, no explanations).
         }
         return compatible.get(key, [key])  # Return same key as compatible if not in dict
     
+    def _rate_limit_error(self, response: httpx.Response) -> RateLimitError:
+        """Build a RateLimitError from a 429 response, honouring Retry-After."""
+        retry_after = None
+        try:
+            retry_after = float(response.headers.get("retry-after", ""))
+        except ValueError:
+            pass
+        return RateLimitError("API error: 429", retry_after=retry_after)
+    
     async def _apply_rate_limit(self):
         """Apply rate limiting to respect API limits."""
         now = datetime.now()
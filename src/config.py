@@ -155,6 +155,32 @@ class Settings(BaseSettings):
         description="Max tokens for collector responses"
     )
 
+    # Vibe Analysis Scheduling
+    vibe_requests_per_minute: int = Field(
+        default=5,
+        description="Provider limit on vibe analysis requests per minute"
+    )
+    vibe_tokens_per_minute: int = Field(
+        default=20000,
+        description="Provider limit on vibe analysis tokens (prompt + completion) per minute"
+    )
+    vibe_max_concurrency: int = Field(
+        default=4,
+        description="Most vibe analysis requests in flight at once"
+    )
+    vibe_max_batch_size: int = Field(
+        default=20,
+        description="Most samples packed into one vibe analysis prompt"
+    )
+    vibe_max_prompt_tokens: int = Field(
+        default=4000,
+        description="Estimated token budget of one vibe analysis request"
+    )
+    vibe_target_latency_seconds: float = Field(
+        default=20.0,
+        description="Vibe requests slower than this shrink the batch size"
+    )
+
     # OpenRouter Model Pricing (per token in USD)
     # Based on OpenRouter pricing as of 2025
     model_pricing: dict[str, dict[str, float]] = Field(
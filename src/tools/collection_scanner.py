@@ -0,0 +1,339 @@
+"""
+Collection Scanner - fast recursive audio file discovery with change detection.
+
+Walks a sample library with os.scandir, visiting directories on a thread pool
+(directory reads and stats release the GIL), and keeps a SQLite manifest with
+one row per directory: its mtime, subdirectories and audio files with their
+(size, mtime, inode). Later scans compare against the manifest and report
+only new, modified and deleted files, so tools can work incrementally instead
+of reprocessing the whole library.
+
+Adding, removing or renaming a file changes its directory's mtime, so a
+directory whose mtime matches the manifest is reused without being listed:
+re-scanning an unchanged library costs one stat per directory. A file
+rewritten in place leaves its directory untouched; pass verify=True to stat
+every file and catch those too.
+
+Example:
+    scanner = CollectionScanner("samples/", manifest_path="samples.manifest.db")
+    result = scanner.scan()
+    for path in result.changes.added + result.changes.modified:
+        ...
+"""
+
+import json
+import os
+import sqlite3
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from functools import cached_property
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+AUDIO_EXTENSIONS = frozenset({'.wav', '.mp3', '.aiff', '.flac', '.m4a', '.ogg'})
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS directories (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    subdirs TEXT NOT NULL,
+    files TEXT NOT NULL
+)
+"""
+
+
+class FileEntry(NamedTuple):
+    """Identity of a file as of the last scan."""
+    size: int
+    mtime_ns: int
+    inode: int
+
+
+@dataclass
+class DirectoryState:
+    """One directory's contents: subdirectory names and files by name."""
+    mtime_ns: int
+    subdirs: List[str]
+    files: Dict[str, FileEntry]
+
+
+@dataclass
+class ScanChanges:
+    """Differences between a scan and the manifest."""
+    added: List[Path] = field(default_factory=list)
+    modified: List[Path] = field(default_factory=list)
+    deleted: List[Path] = field(default_factory=list)
+    unchanged: int = 0
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.added or self.modified or self.deleted)
+
+
+@dataclass
+class ScanResult:
+    """Every directory found by a scan plus what changed since the previous one."""
+    directories: Dict[str, DirectoryState]
+    changes: ScanChanges
+
+    @property
+    def total_files(self) -> int:
+        return sum(len(state.files) for state in self.directories.values())
+
+    @cached_property
+    def files(self) -> Dict[str, FileEntry]:
+        """Mapping of every current file path to its FileEntry."""
+        return {
+            os.path.join(directory, name): entry
+            for directory, state in self.directories.items()
+            for name, entry in state.files.items()
+        }
+
+    @property
+    def paths(self) -> List[Path]:
+        """All current files, sorted."""
+        return [Path(p) for p in sorted(self.files)]
+
+
+def _list_directory(directory: str, mtime_ns: int, extensions: frozenset) -> DirectoryState:
+    """Read a directory: its audio files (stat'ed) and visible subdirectories."""
+    files = {}
+    subdirs = []
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                name = entry.name
+                try:
+                    if name[name.rfind('.'):].lower() in extensions and entry.is_file():
+                        st = entry.stat()
+                        files[name] = FileEntry(st.st_size, st.st_mtime_ns, st.st_ino)
+                    elif not name.startswith('.') and entry.is_dir(follow_symlinks=False):
+                        subdirs.append(name)
+                except OSError:
+                    # Vanished or unreadable mid-scan
+                    continue
+    except OSError:
+        pass
+    return DirectoryState(mtime_ns, subdirs, files)
+
+
+def _visit(
+    directory: str,
+    previous: Optional[DirectoryState],
+    extensions: frozenset,
+    verify: bool
+) -> Optional[DirectoryState]:
+    """State of a directory, reusing `previous` when its mtime is unchanged."""
+    try:
+        mtime_ns = os.stat(directory).st_mtime_ns
+    except OSError:
+        return None
+    if previous is not None and previous.mtime_ns == mtime_ns and not verify:
+        return previous
+    return _list_directory(directory, mtime_ns, extensions)
+
+
+def _walk(
+    root: str,
+    previous: Dict[str, DirectoryState],
+    extensions: frozenset,
+    workers: int,
+    recursive: bool,
+    verify: bool
+) -> Dict[str, DirectoryState]:
+    """Visit root and (optionally) every subdirectory, in parallel."""
+    found: Dict[str, DirectoryState] = {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = {pool.submit(_visit, root, previous.get(root), extensions, verify): root}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                directory = pending.pop(future)
+                state = future.result()
+                if state is None:
+                    continue
+                found[directory] = state
+                if not recursive:
+                    continue
+                for name in state.subdirs:
+                    path = os.path.join(directory, name)
+                    future = pool.submit(_visit, path, previous.get(path), extensions, verify)
+                    pending[future] = path
+    return found
+
+
+def diff_directories(
+    previous: Dict[str, DirectoryState],
+    current: Dict[str, DirectoryState]
+) -> ScanChanges:
+    """Compare two scans. A file whose size, mtime or inode changed is modified."""
+    changes = ScanChanges()
+    for directory, state in current.items():
+        before = previous.get(directory)
+        if before is state:
+            changes.unchanged += len(state.files)
+            continue
+        before_files = before.files if before else {}
+        for name, entry in state.files.items():
+            old = before_files.get(name)
+            if old is None:
+                changes.added.append(Path(directory, name))
+            elif old != entry:
+                changes.modified.append(Path(directory, name))
+            else:
+                changes.unchanged += 1
+        changes.deleted.extend(
+            Path(directory, name) for name in before_files.keys() - state.files.keys()
+        )
+    for directory in previous.keys() - current.keys():
+        changes.deleted.extend(Path(directory, name) for name in previous[directory].files)
+    changes.added.sort()
+    changes.modified.sort()
+    changes.deleted.sort()
+    return changes
+
+
+def scan_files(
+    root: Path,
+    extensions: Iterable[str] = AUDIO_EXTENSIONS,
+    workers: int = 8,
+    recursive: bool = True
+) -> Dict[str, FileEntry]:
+    """Find audio files under a directory (no manifest).
+
+    Args:
+        root: Directory to scan
+        extensions: Lower-case file extensions to include
+        workers: Directories visited in parallel
+        recursive: Descend into subdirectories (hidden ones are skipped)
+
+    Returns:
+        Mapping of file path to its FileEntry
+    """
+    directories = _walk(str(root), {}, frozenset(extensions), workers, recursive, verify=True)
+    return ScanResult(directories, ScanChanges()).files
+
+
+class ScanManifest:
+    """SQLite record of the directories seen by the previous scan."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path))
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(_SCHEMA)
+        self._conn.commit()
+
+    def load(self) -> Dict[str, DirectoryState]:
+        directories = {}
+        for path, mtime_ns, subdirs, files in self._conn.execute(
+            "SELECT path, mtime_ns, subdirs, files FROM directories"
+        ):
+            directories[path] = DirectoryState(
+                mtime_ns,
+                json.loads(subdirs),
+                {name: FileEntry(*entry) for name, entry in json.loads(files).items()}
+            )
+        return directories
+
+    def update(self, upserts: Dict[str, DirectoryState], deletes: Iterable[str]):
+        """Write only the directories that changed, in one transaction."""
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO directories (path, mtime_ns, subdirs, files) VALUES (?, ?, ?, ?)",
+                [
+                    (path, state.mtime_ns, json.dumps(state.subdirs), json.dumps(state.files))
+                    for path, state in upserts.items()
+                ]
+            )
+            self._conn.executemany(
+                "DELETE FROM directories WHERE path = ?", [(path,) for path in deletes]
+            )
+
+    def close(self):
+        self._conn.close()
+
+
+def _record(manifest: ScanManifest, previous: Dict[str, DirectoryState], current: Dict[str, DirectoryState]):
+    """Write the directories that differ from the manifest's state."""
+    manifest.update(
+        {
+            path: state for path, state in current.items()
+            if previous.get(path) != state
+        },
+        previous.keys() - current.keys()
+    )
+
+
+class CollectionScanner:
+    """Incremental scanner for one sample collection."""
+
+    def __init__(
+        self,
+        root: Path,
+        manifest_path: Optional[Path] = None,
+        extensions: Iterable[str] = AUDIO_EXTENSIONS,
+        workers: int = 8,
+        recursive: bool = True
+    ):
+        """Initialize the scanner.
+
+        Args:
+            root: Collection directory
+            manifest_path: Where to keep the manifest; without one the
+                previous scan by this scanner is the baseline (the first
+                scan reports all files as added)
+            extensions: Lower-case file extensions to include
+            workers: Directories visited in parallel
+            recursive: Descend into subdirectories
+        """
+        self.root = os.path.abspath(root)
+        self.manifest_path = Path(manifest_path) if manifest_path else None
+        self.extensions = frozenset(extensions)
+        self.workers = workers
+        self.recursive = recursive
+        self._previous: Dict[str, DirectoryState] = {}
+
+    def scan(self, verify: bool = False, update_manifest: bool = True) -> ScanResult:
+        """Scan the collection and diff it against the manifest.
+
+        Args:
+            verify: Stat every file, even in directories whose mtime is
+                unchanged (catches files rewritten in place)
+            update_manifest: Record this scan (in the manifest, or in memory)
+                so the next one only reports later changes; pass False and
+                call record() once the changes have been handled
+
+        Returns:
+            ScanResult with all current files and the changes
+        """
+        if self.manifest_path is None:
+            previous = self._previous
+            current = _walk(self.root, previous, self.extensions, self.workers, self.recursive, verify)
+            if update_manifest:
+                self._previous = current
+            return ScanResult(current, diff_directories(previous, current))
+
+        manifest = ScanManifest(self.manifest_path)
+        try:
+            previous = manifest.load()
+            current = _walk(self.root, previous, self.extensions, self.workers, self.recursive, verify)
+            changes = diff_directories(previous, current)
+            if update_manifest:
+                _record(manifest, previous, current)
+        finally:
+            manifest.close()
+        return ScanResult(current, changes)
+
+    def record(self, result: ScanResult):
+        """Make a scan taken with update_manifest=False the new baseline."""
+        if self.manifest_path is None:
+            self._previous = result.directories
+            return
+
+        manifest = ScanManifest(self.manifest_path)
+        try:
+            _record(manifest, manifest.load(), result.directories)
+        finally:
+            manifest.close()
@@ -0,0 +1,294 @@
+"""
+LLM Request Scheduler - adaptive batching under provider rate limits.
+
+Vibe analysis throughput is bounded by the provider's requests-per-minute and
+tokens-per-minute limits, not by a fixed sleep. VibeRequestScheduler:
+
+- packs samples into prompts by estimated token size (measured from
+  VibeAnalysisAgent.create_batch_prompt)
+- admits each request through two token buckets (requests and tokens per
+  minute), so bursts use the whole allowance and no more
+- adapts with AIMD: fast successful requests grow the batch size and the
+  number of requests in flight; slow ones shrink the batch; a 429 halves
+  concurrency, backs off for Retry-After and lowers the request rate, which
+  then recovers gradually
+
+Example:
+    scheduler = VibeRequestScheduler(agent)
+    batches = scheduler.pack(sample_data)
+    results = await scheduler.run_all(agent.request_batch, batches)
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, TypeVar
+
+from ..config import settings
+from ..logging_config import AgentLogger
+
+T = TypeVar("T")
+
+# Rough size of a token in characters for English/JSON prompts
+CHARS_PER_TOKEN = 4
+
+# Completion budget reserved per sample in a batch response
+COMPLETION_TOKENS_PER_SAMPLE = 150
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of a prompt."""
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+class RateLimitError(Exception):
+    """The provider rejected a request with HTTP 429."""
+
+    def __init__(self, message: str = "Rate limited", retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """Async token bucket refilled continuously at `rate_per_minute`."""
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        """Initialize a full bucket.
+
+        Args:
+            rate_per_minute: Tokens added per minute
+            capacity: Largest burst (defaults to one minute's allowance)
+        """
+        self.rate_per_minute = rate_per_minute
+        self.capacity = capacity or rate_per_minute
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(
+            self.capacity,
+            self.tokens + (now - self._updated) * self.rate_per_minute / 60
+        )
+        self._updated = now
+
+    def set_rate(self, rate_per_minute: float):
+        """Change the refill rate (tokens already in the bucket are kept)."""
+        self._refill(time.monotonic())
+        self.rate_per_minute = rate_per_minute
+
+    def block_for(self, seconds: float):
+        """Hand out nothing for `seconds` (e.g. a provider's Retry-After)."""
+        self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+        self.tokens = 0
+
+    async def acquire(self, amount: float = 1):
+        """Wait until `amount` tokens are available and take them.
+
+        Requests larger than the capacity take the whole bucket.
+        """
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                wait = self._blocked_until - now
+                if wait <= 0:
+                    if self.tokens >= amount:
+                        self.tokens -= amount
+                        return
+                    wait = (amount - self.tokens) * 60 / self.rate_per_minute
+                await asyncio.sleep(wait)
+
+
+class VibeRequestScheduler:
+    """Sizes, admits and adapts vibe analysis requests."""
+
+    def __init__(
+        self,
+        agent: Any,
+        requests_per_minute: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+        max_batch_size: Optional[int] = None,
+        max_prompt_tokens: Optional[int] = None,
+        target_latency: Optional[float] = None,
+        initial_batch_size: int = 5,
+        max_retries: int = 3
+    ):
+        """Initialize the scheduler (limits default to the vibe_* settings).
+
+        Args:
+            agent: Agent providing create_batch_prompt
+            requests_per_minute: Provider request limit
+            tokens_per_minute: Provider token limit
+            max_concurrency: Most requests in flight
+            max_batch_size: Most samples per request
+            max_prompt_tokens: Token budget of one request
+            target_latency: Requests slower than this shrink the batch size
+            initial_batch_size: Starting batch size
+            max_retries: Retries of a rate-limited request
+        """
+        self.logger = AgentLogger("llm_scheduler")
+        self.agent = agent
+        self.requests_per_minute = requests_per_minute or settings.vibe_requests_per_minute
+        self.tokens_per_minute = tokens_per_minute or settings.vibe_tokens_per_minute
+        self.max_concurrency = max_concurrency or settings.vibe_max_concurrency
+        self.max_batch_size = max_batch_size or settings.vibe_max_batch_size
+        self.max_prompt_tokens = max_prompt_tokens or settings.vibe_max_prompt_tokens
+        self.target_latency = target_latency or settings.vibe_target_latency_seconds
+        self.max_retries = max_retries
+
+        self.request_bucket = TokenBucket(self.requests_per_minute)
+        self.token_bucket = TokenBucket(self.tokens_per_minute)
+        self.request_rate = float(self.requests_per_minute)
+
+        # Adaptive state
+        self.batch_size = min(initial_batch_size, self.max_batch_size)
+        self.concurrency = 1
+        self.throttled_count = 0
+        self._base_tokens = estimate_tokens(agent.create_batch_prompt([]))
+
+    def sample_tokens(self, sample: Dict[str, Any]) -> int:
+        """Estimated tokens one sample adds to a request (prompt + completion)."""
+        prompt = estimate_tokens(self.agent.create_batch_prompt([sample])) - self._base_tokens
+        return prompt + COMPLETION_TOKENS_PER_SAMPLE
+
+    def estimate_request_tokens(self, samples: List[Dict[str, Any]]) -> int:
+        return self._base_tokens + sum(self.sample_tokens(s) for s in samples)
+
+    def pack(
+        self,
+        samples: List[Dict[str, Any]],
+        max_requests: Optional[int] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """Pack samples into requests.
+
+        Each request holds at most the adaptive batch size and stays within
+        the prompt token budget (a single oversized sample still gets its
+        own request).
+
+        Args:
+            samples: Sample data in processing order
+            max_requests: Stop after this many requests
+
+        Returns:
+            List of request batches
+        """
+        batches: List[List[Dict[str, Any]]] = []
+        current: List[Dict[str, Any]] = []
+        tokens = self._base_tokens
+        for sample in samples:
+            cost = self.sample_tokens(sample)
+            if current and (len(current) >= self.batch_size or tokens + cost > self.max_prompt_tokens):
+                batches.append(current)
+                if max_requests and len(batches) >= max_requests:
+                    return batches
+                current, tokens = [], self._base_tokens
+            current.append(sample)
+            tokens += cost
+        if current:
+            batches.append(current)
+        return batches
+
+    def next_chunk_size(self, filenames: List[str]) -> int:
+        """How many of the next samples fill every request slot once.
+
+        Callers that checkpoint between rounds (SampleBatchProcessor) take
+        this many samples per round so all `concurrency` requests are used.
+        """
+        window = filenames[:self.batch_size * self.concurrency]
+        batches = self.pack([{"filename": f} for f in window], max_requests=self.concurrency)
+        return sum(len(batch) for batch in batches)
+
+    async def run_all(
+        self,
+        call: Callable[[List[Dict[str, Any]]], Awaitable[T]],
+        batches: List[List[Dict[str, Any]]]
+    ) -> List[T]:
+        """Run requests with up to `concurrency` in flight.
+
+        Args:
+            call: Coroutine function making one request
+            batches: Request batches (e.g. from pack)
+
+        Returns:
+            Results in the order of `batches`
+
+        Raises:
+            Exception: The first failing request's error; requests still in
+                flight are cancelled
+        """
+        results: List[Any] = [None] * len(batches)
+        in_flight: Dict[asyncio.Task, int] = {}
+        position = 0
+        try:
+            while position < len(batches) or in_flight:
+                while position < len(batches) and len(in_flight) < self.concurrency:
+                    task = asyncio.create_task(self.run(call, batches[position]))
+                    in_flight[task] = position
+                    position += 1
+                done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    results[in_flight.pop(task)] = task.result()
+        finally:
+            for task in in_flight:
+                task.cancel()
+        return results
+
+    async def run(
+        self,
+        call: Callable[[List[Dict[str, Any]]], Awaitable[T]],
+        samples: List[Dict[str, Any]]
+    ) -> T:
+        """Run one request under the rate limits, retrying 429s.
+
+        Args:
+            call: Coroutine function making the request for `samples`
+            samples: Sample data for the request
+
+        Returns:
+            The call's result
+
+        Raises:
+            RateLimitError: If still rate limited after max_retries
+        """
+        tokens = self.estimate_request_tokens(samples)
+        for attempt in range(self.max_retries + 1):
+            await self.request_bucket.acquire(1)
+            await self.token_bucket.acquire(tokens)
+            start = time.monotonic()
+            try:
+                result = await call(samples)
+            except RateLimitError as e:
+                self.record_throttle(e.retry_after)
+                if attempt == self.max_retries:
+                    raise
+                continue
+            self.record_success(time.monotonic() - start)
+            return result
+
+    def record_success(self, latency: float):
+        """Grow after a fast request; shrink the batch after a slow one."""
+        if latency <= self.target_latency:
+            self.batch_size = min(self.max_batch_size, self.batch_size + 1)
+            self.concurrency = min(self.max_concurrency, self.concurrency + 1)
+        else:
+            self.batch_size = max(1, self.batch_size - 1)
+        if self.request_rate < self.requests_per_minute:
+            # Recover the request rate lost to 429s gradually
+            self.request_rate = min(self.requests_per_minute, self.request_rate + 1)
+            self.request_bucket.set_rate(self.request_rate)
+
+    def record_throttle(self, retry_after: Optional[float]):
+        """Back off after a 429: halve concurrency and lower the request rate."""
+        self.throttled_count += 1
+        self.concurrency = max(1, self.concurrency // 2)
+        self.request_rate = max(1.0, self.request_rate * 0.5)
+        self.request_bucket.set_rate(self.request_rate)
+        delay = retry_after if retry_after is not None else 60 / self.request_rate
+        self.request_bucket.block_for(delay)
+        self.logger.warning(
+            f"Rate limited by provider; backing off {delay:.1f}s "
+            f"(concurrency {self.concurrency}, {self.request_rate:.1f} req/min)"
+        )
@@ -4,18 +4,21 @@ Designed for the Wanns Wavs collection and similar large sample libraries.
 """
 
 import asyncio
+import inspect
 import json
-import os
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Callable
+from typing import Awaitable, Dict, List, Optional, Any, Callable
 
 from pydantic import BaseModel, Field
 
 from ..agents.vibe_analysis import VibeAnalysisAgent
 from ..logging_config import AgentLogger
 from . import audio
+from .collection_scanner import CollectionScanner
+from .llm_scheduler import VibeRequestScheduler
+from .sample_cache import SampleCacheStore, find_json_cache_files, migrate_json_cache
 
 
 class ProcessingStatus(str, Enum):
@@ -25,6 +28,70 @@ class ProcessingStatus(str, Enum):
     COMPLETED = "completed"
     FAILED = "failed"
     PAUSED = "paused"
+    CANCELLED = "cancelled"
+
+
+class ProcessingCancelled(Exception):
+    """Raised at a checkpoint once processing has been cancelled."""
+
+
+class CancellationToken:
+    """Cooperative pause/resume/cancel signal checked between samples.
+
+    Processing code calls `await token.checkpoint()` at safe points (between
+    samples, before an API call). A paused token blocks there until resumed;
+    a cancelled one raises ProcessingCancelled.
+
+    An optional `refresh` coroutine is called from checkpoints at most every
+    `refresh_interval` seconds (and while paused) to pull state from an
+    external source, e.g. a batch status row changed by another process.
+    """
+
+    def __init__(
+        self,
+        refresh: Optional[Callable[["CancellationToken"], Awaitable[None]]] = None,
+        refresh_interval: float = 2.0
+    ):
+        self._resumed = asyncio.Event()
+        self._resumed.set()
+        self.cancelled = False
+        self.refresh = refresh
+        self.refresh_interval = refresh_interval
+        self._last_refresh: Optional[float] = None
+
+    @property
+    def paused(self) -> bool:
+        return not self._resumed.is_set()
+
+    def pause(self):
+        self._resumed.clear()
+
+    def resume(self):
+        self._resumed.set()
+
+    def cancel(self):
+        self.cancelled = True
+        self._resumed.set()
+
+    async def _maybe_refresh(self):
+        if self.refresh is None:
+            return
+        now = asyncio.get_event_loop().time()
+        if self._last_refresh is None or now - self._last_refresh >= self.refresh_interval:
+            self._last_refresh = now
+            await self.refresh(self)
+
+    async def checkpoint(self):
+        """Wait while paused; raise ProcessingCancelled once cancelled."""
+        await self._maybe_refresh()
+        while self.paused and not self.cancelled:
+            try:
+                await asyncio.wait_for(self._resumed.wait(), timeout=self.refresh_interval)
+            except asyncio.TimeoutError:
+                pass
+            await self._maybe_refresh()
+        if self.cancelled:
+            raise ProcessingCancelled()
 
 
 class BatchResult(BaseModel):
@@ -75,39 +142,61 @@ class SampleBatchProcessor:
         self.collection_path = Path(collection_path)
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(exist_ok=True)
+        self.cache = SampleCacheStore(self.cache_dir)
+        self._migrate_legacy_cache()
         
         # Processing configuration
-        self.batch_size = 5  # Process 5 samples per batch
-        self.rate_limit_seconds = 12  # 5 requests per minute = 12 seconds between
+        self.batch_size = 5  # Initial samples per vibe request; adapted by the scheduler
         
         # Initialize components
         self.vibe_agent = VibeAnalysisAgent()
+        self.scheduler = VibeRequestScheduler(self.vibe_agent, initial_batch_size=self.batch_size)
+        self.vibe_agent.scheduler = self.scheduler
         self.audio_analyzer = audio  # Reference to audio tools module
         
         # Processing state
-        self._last_request_time: Optional[float] = None
         self.processing_results: List[BatchResult] = []
     
     def discover_samples(self) -> List[Path]:
-        """Discover all audio samples in the collection directory.
+        """Discover all audio samples in the collection directory tree.
+
+        The scan is recorded in a manifest in the cache directory; samples
+        whose file changed since the previous scan have their cached result
+        dropped so they are processed again.
         
         Returns:
             List of paths to audio files
         """
-        audio_extensions = {'.wav', '.mp3', '.aiff', '.flac', '.m4a', '.ogg'}
-        samples = []
-        
         if not self.collection_path.exists():
             self.logger.error(f"Collection path does not exist: {self.collection_path}")
-            return samples
-        
-        # Get all files in directory
-        for file_path in self.collection_path.iterdir():
-            if file_path.is_file() and file_path.suffix.lower() in audio_extensions:
-                samples.append(file_path)
-        
-        self.logger.info(f"Discovered {len(samples)} audio samples")
-        return sorted(samples)  # Sort for consistent ordering
+            return []
+        
+        scanner = CollectionScanner(self.collection_path, manifest_path=self.cache_dir / "manifest.db")
+        # Stat every file: a re-exported sample may be rewritten in place
+        result = scanner.scan(verify=True)
+        if result.changes.modified:
+            dropped = self.cache.delete_many(self.sample_key(p) for p in result.changes.modified)
+            self.logger.info(f"{dropped} cached samples changed on disk and will be reprocessed")
+        
+        samples = result.paths  # Sorted for consistent ordering
+        self.logger.info(
+            f"Discovered {len(samples)} audio samples "
+            f"({len(result.changes.added)} new, {len(result.changes.modified)} modified, "
+            f"{len(result.changes.deleted)} deleted)"
+        )
+        return samples
+
+    def sample_key(self, sample_path: Path) -> str:
+        """Cache key of a sample: its path relative to the collection.
+
+        Samples in different folders of the tree may share a filename, so
+        the relative path is used; files outside the collection fall back
+        to their filename.
+        """
+        try:
+            return sample_path.relative_to(self.collection_path).as_posix()
+        except ValueError:
+            return sample_path.name
     
     def extract_local_features(self, sample_path: Path) -> Dict[str, Any]:
         """Extract audio features locally without API calls.
@@ -119,7 +208,7 @@ class SampleBatchProcessor:
             Dictionary of audio features
         """
         features = {
-            "filename": sample_path.name,
+            "filename": self.sample_key(sample_path),
             "path": str(sample_path)
         }
         
@@ -148,42 +237,44 @@ class SampleBatchProcessor:
         
         return features
     
+    def _migrate_legacy_cache(self):
+        """Import a pre-SQLite JSON cache the first time this directory is opened."""
+        if len(self.cache) or next(find_json_cache_files(self.cache_dir), None) is None:
+            return
+        count = migrate_json_cache(self.cache_dir, store=self.cache)
+        self.logger.info(f"Migrated {count} JSON cache entries into {self.cache.path}")
+
     def save_to_cache(self, filename: str, data: Dict[str, Any]):
         """Save processed data to cache.
+
+        The cache entry is the sample's checkpoint; it is written in a
+        transaction, so an interrupted run never leaves a half-written
+        entry that would count as completed.
         
         Args:
-            filename: Sample filename
+            filename: Sample key (see sample_key)
             data: Data to cache
         """
-        cache_file = self.cache_dir / f"{filename}.json"
-        with open(cache_file, 'w') as f:
-            json.dump(data, f, indent=2)
+        self.cache.put(filename, data)
     
     def load_from_cache(self, filename: str) -> Optional[Dict[str, Any]]:
         """Load cached data for a sample.
         
         Args:
-            filename: Sample filename
+            filename: Sample key (see sample_key)
             
         Returns:
             Cached data or None if not found
         """
-        cache_file = self.cache_dir / f"{filename}.json"
-        if cache_file.exists():
-            with open(cache_file, 'r') as f:
-                return json.load(f)
-        return None
+        return self.cache.get(filename)
     
     def get_cached_files(self) -> List[str]:
         """Get list of files that have been cached.
         
         Returns:
-            List of cached filenames
+            List of cached sample keys
         """
-        cached = []
-        for cache_file in self.cache_dir.glob("*.json"):
-            cached.append(cache_file.stem)
-        return cached
+        return list(self.cache.filenames())
     
     def get_unprocessed_samples(self) -> List[Path]:
         """Get samples that haven't been processed yet.
@@ -196,31 +287,35 @@ class SampleBatchProcessor:
         
         unprocessed = []
         for sample in all_samples:
-            if sample.name not in cached_files:
+            if self.sample_key(sample) not in cached_files:
                 unprocessed.append(sample)
         
         return unprocessed
     
-    async def _apply_rate_limit(self):
-        """Apply rate limiting between API calls."""
-        if self._last_request_time is not None:
-            elapsed = asyncio.get_event_loop().time() - self._last_request_time
-            if elapsed < self.rate_limit_seconds:
-                wait_time = self.rate_limit_seconds - elapsed
-                self.logger.info(f"Rate limiting: waiting {wait_time:.1f} seconds")
-                await asyncio.sleep(wait_time)
-        
-        self._last_request_time = asyncio.get_event_loop().time()
-    
-    async def process_batch(self, samples: List[Path], batch_number: int) -> BatchResult:
+    async def process_batch(
+        self,
+        samples: List[Path],
+        batch_number: int,
+        token: Optional[CancellationToken] = None
+    ) -> BatchResult:
         """Process a batch of samples.
+
+        Vibe analysis of the batch is split into requests and rate limited
+        by the scheduler; the batch is the unit of checkpointing.
         
         Args:
             samples: List of sample paths to process
             batch_number: Batch sequence number
+            token: Optional pause/cancel token, checked before each sample
+                and before the vibe analysis call
             
         Returns:
             BatchResult with processing statistics
+
+        Raises:
+            ProcessingCancelled: If the token is cancelled. Nothing from the
+                unfinished batch is cached, so a resumed run redoes exactly
+                this batch's uncached samples.
         """
         start_time = asyncio.get_event_loop().time()
         success_count = 0
@@ -229,38 +324,44 @@ class SampleBatchProcessor:
         # Extract local features for all samples
         sample_data = []
         for sample in samples:
+            if token:
+                await token.checkpoint()
+
             # Check cache first
-            cached = self.load_from_cache(sample.name)
-            if cached:
-                self.logger.info(f"Using cached data for {sample.name}")
+            key = self.sample_key(sample)
+            if key in self.cache:
+                self.logger.info(f"Using cached data for {key}")
                 success_count += 1
                 continue
             
             # Extract features
             features = self.extract_local_features(sample)
             if not features.get("error"):
-                sample_data.append(features)
+                sample_data.append((key, features))
             else:
-                errors.append(f"{sample.name}: {features.get('error_message', 'Unknown error')}")
+                errors.append(f"{key}: {features.get('error_message', 'Unknown error')}")
         
         # Process uncached samples with vibe analysis
         if sample_data:
-            # Apply rate limiting
-            await self._apply_rate_limit()
-            
+            if token:
+                await token.checkpoint()
+
             try:
                 # Analyze vibes in batch
-                vibe_results = await self.vibe_agent.analyze_batch(sample_data)
+                vibe_results = await self.vibe_agent.analyze_batch([data for _, data in sample_data])
+                vibes = {vibe.filename: vibe for vibe in vibe_results}
                 
-                # Combine results and cache
-                for i, vibe in enumerate(vibe_results):
-                    if i < len(sample_data):
+                # Combine results and cache the whole batch in one transaction
+                results = []
+                for key, data in sample_data:
+                    vibe = vibes.get(data["filename"])
+                    if vibe is not None:
                         combined = {
-                            **sample_data[i],
+                            **data,
                             "vibe": vibe.model_dump()
                         }
-                        self.save_to_cache(sample_data[i]["filename"], combined)
-                        success_count += 1
+                        results.append((key, combined))
+                success_count += self.cache.put_many(results)
                         
             except Exception as e:
                 self.logger.error(f"Error in vibe analysis: {str(e)}")
@@ -277,47 +378,70 @@ class SampleBatchProcessor:
             errors=errors
         )
     
+    async def _notify(self, progress_callback, collection: SampleCollection):
+        """Call a sync or async progress callback."""
+        if progress_callback:
+            result = progress_callback(collection)
+            if inspect.isawaitable(result):
+                await result
+
     async def process_collection(
         self,
-        progress_callback: Optional[Callable[[SampleCollection], None]] = None
+        progress_callback: Optional[Callable[[SampleCollection], Any]] = None,
+        token: Optional[CancellationToken] = None
     ) -> SampleCollection:
         """Process the entire sample collection.
+
+        Completed samples are checkpointed in the cache as they finish, so
+        a cancelled (or crashed) run can be resumed by processing the same
+        collection again; only uncached samples are processed.
         
         Args:
-            progress_callback: Optional callback for progress updates
+            progress_callback: Optional callback (sync or async) for progress updates
+            token: Optional pause/cancel token checked between samples
             
         Returns:
-            SampleCollection with final status
+            SampleCollection with final status (CANCELLED if the token was cancelled)
         """
         # Get unprocessed samples
         samples = self.get_unprocessed_samples()
-        total_samples = len(samples) + len(self.get_cached_files())
+        cached_count = len(self.get_cached_files())
         
         collection = SampleCollection(
             name=self.collection_path.name,
             path=str(self.collection_path),
-            total_samples=total_samples,
-            processed_samples=len(self.get_cached_files()),
+            total_samples=len(samples) + cached_count,
+            processed_samples=cached_count,
             status=ProcessingStatus.IN_PROGRESS
         )
         
-        if progress_callback:
-            progress_callback(collection)
+        await self._notify(progress_callback, collection)
         
-        # Process in batches
+        # Process in batches sized to fill every concurrent request slot
         batch_number = 1
-        for i in range(0, len(samples), self.batch_size):
-            batch = samples[i:i + self.batch_size]
+        position = 0
+        while position < len(samples):
+            window = samples[position:position + self.scheduler.batch_size * self.scheduler.concurrency]
+            batch = window[:self.scheduler.next_chunk_size([p.name for p in window])]
+            position += len(batch)
             
             self.logger.info(f"Processing batch {batch_number} ({len(batch)} samples)")
             
-            result = await self.process_batch(batch, batch_number)
+            try:
+                result = await self.process_batch(batch, batch_number, token=token)
+            except ProcessingCancelled:
+                self.logger.info(
+                    f"Processing cancelled after {collection.processed_samples}"
+                    f"/{collection.total_samples} samples"
+                )
+                collection.status = ProcessingStatus.CANCELLED
+                await self._notify(progress_callback, collection)
+                return collection
             self.processing_results.append(result)
             
             collection.processed_samples += result.success_count
             
-            if progress_callback:
-                progress_callback(collection)
+            await self._notify(progress_callback, collection)
             
             batch_number += 1
         
@@ -329,8 +453,7 @@ class SampleBatchProcessor:
             "cache_dir": str(self.cache_dir)
         }
         
-        if progress_callback:
-            progress_callback(collection)
+        await self._notify(progress_callback, collection)
         
         return collection
     
@@ -376,6 +499,9 @@ Batch Details:
     
     def export_results(self, output_path: Optional[Path] = None) -> Path:
         """Export all processed results to JSON.
+
+        Results are streamed from the cache store into the file, so memory
+        use does not grow with the collection size.
         
         Args:
             output_path: Optional output path
@@ -387,27 +513,22 @@ Batch Details:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             output_path = self.cache_dir / f"export_{timestamp}.json"
         
-        # Collect all cached results
-        all_results = []
-        for cache_file in self.cache_dir.glob("*.json"):
-            if not cache_file.name.startswith("export_"):
-                with open(cache_file, 'r') as f:
-                    all_results.append(json.load(f))
-        
-        # Create export data
-        export_data = {
-            "metadata": {
-                "collection": str(self.collection_path),
-                "total_samples": len(all_results),
-                "export_date": datetime.now().isoformat(),
-                "processor_version": "1.0.0"
-            },
-            "samples": all_results
+        metadata = {
+            "collection": str(self.collection_path),
+            "total_samples": len(self.cache),
+            "export_date": datetime.now().isoformat(),
+            "processor_version": "1.0.0"
         }
         
-        # Write export file
+        # Write export file: metadata, then one cached result per line
         with open(output_path, 'w') as f:
-            json.dump(export_data, f, indent=2)
-        
-        self.logger.info(f"Exported {len(all_results)} results to {output_path}")
+            f.write('{\n  "metadata": ')
+            f.write(json.dumps(metadata))
+            f.write(',\n  "samples": [')
+            for i, data in enumerate(self.cache.iter_results()):
+                f.write(",\n    " if i else "\n    ")
+                f.write(data)
+            f.write("\n  ]\n}\n")
+        
+        self.logger.info(f"Exported {metadata['total_samples']} results to {output_path}")
         return output_path
\ No newline at end of file
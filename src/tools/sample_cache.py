@@ -0,0 +1,191 @@
+"""
+Sample Cache Store - single-file SQLite cache of per-sample processing results.
+
+Replaces the one-JSON-file-per-sample cache of SampleBatchProcessor. A large
+collection used to mean tens of thousands of small files that were globbed
+several times per run and all re-read on export; the store keeps every
+result in one indexed SQLite file instead:
+
+- membership checks are primary-key lookups
+- results of a processing batch are written in one transaction
+- exports stream rows straight from a cursor
+
+Existing JSON caches are imported with `migrate_json_cache` (run
+automatically when a processor opens an empty store next to JSON files), or
+from the command line:
+
+    python -m src.tools.sample_cache migrate sample_cache/ [--delete]
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional, Set, Tuple
+
+CACHE_DB_NAME = "samples.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS samples (
+    filename TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    updated_at REAL NOT NULL
+)
+"""
+
+
+class SampleCacheStore:
+    """SQLite-backed cache of processed sample results keyed by filename."""
+
+    def __init__(self, cache_dir: Path):
+        """Open (or create) the store in a cache directory.
+
+        Args:
+            cache_dir: Directory holding the store file
+        """
+        self.path = Path(cache_dir) / CACHE_DB_NAME
+        self._conn = sqlite3.connect(str(self.path))
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(_SCHEMA)
+        self._conn.commit()
+
+    def put(self, filename: str, data: Dict[str, Any]):
+        """Store (or replace) one sample's result."""
+        self.put_many([(filename, data)])
+
+    def put_many(self, items: Iterable[Tuple[str, Dict[str, Any]]]) -> int:
+        """Store several results in a single transaction.
+
+        Args:
+            items: (filename, data) pairs
+
+        Returns:
+            Number of results written
+        """
+        now = time.time()
+        rows = [(filename, json.dumps(data), now) for filename, data in items]
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO samples (filename, data, updated_at) VALUES (?, ?, ?)",
+                rows
+            )
+        return len(rows)
+
+    def delete_many(self, filenames: Iterable[str]) -> int:
+        """Drop cached results (e.g. for samples whose file changed)."""
+        with self._conn:
+            cursor = self._conn.executemany(
+                "DELETE FROM samples WHERE filename = ?", [(f,) for f in filenames]
+            )
+        return cursor.rowcount
+
+    def get(self, filename: str) -> Optional[Dict[str, Any]]:
+        """Cached result for a sample, or None."""
+        row = self._conn.execute(
+            "SELECT data FROM samples WHERE filename = ?", (filename,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def __contains__(self, filename: str) -> bool:
+        return self._conn.execute(
+            "SELECT 1 FROM samples WHERE filename = ?", (filename,)
+        ).fetchone() is not None
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM samples").fetchone()[0]
+
+    def filenames(self) -> Set[str]:
+        """Filenames of every cached sample."""
+        return {row[0] for row in self._conn.execute("SELECT filename FROM samples")}
+
+    def iter_results(self) -> Iterator[str]:
+        """Stream cached results as JSON strings, ordered by filename."""
+        cursor = self._conn.execute("SELECT data FROM samples ORDER BY filename")
+        for (data,) in cursor:
+            yield data
+
+    def close(self):
+        self._conn.close()
+
+
+def find_json_cache_files(cache_dir: Path) -> Iterator[os.DirEntry]:
+    """Legacy per-sample JSON cache files (exports excluded)."""
+    with os.scandir(cache_dir) as it:
+        for entry in it:
+            if (
+                entry.name.endswith(".json")
+                and not entry.name.startswith(("export_", "."))
+                and entry.is_file()
+            ):
+                yield entry
+
+
+def migrate_json_cache(
+    cache_dir: Path,
+    store: Optional[SampleCacheStore] = None,
+    delete: bool = False,
+    batch_size: int = 500
+) -> int:
+    """Import a legacy JSON cache directory into the SQLite store.
+
+    Results already in the store are kept; unreadable files are skipped.
+
+    Args:
+        cache_dir: Directory containing `{filename}.json` cache files
+        store: Store to import into (defaults to the one in cache_dir)
+        delete: Remove each JSON file once imported
+        batch_size: Results written per transaction
+
+    Returns:
+        Number of results imported
+    """
+    cache_dir = Path(cache_dir)
+    store = store or SampleCacheStore(cache_dir)
+    existing = store.filenames()
+    imported = 0
+    pending = []
+    imported_files = []
+
+    def flush():
+        nonlocal imported
+        imported += store.put_many(pending)
+        if delete:
+            for path in imported_files:
+                os.remove(path)
+        pending.clear()
+        imported_files.clear()
+
+    for entry in find_json_cache_files(cache_dir):
+        filename = entry.name[:-len(".json")]
+        if filename not in existing:
+            try:
+                with open(entry.path, 'r') as f:
+                    pending.append((filename, json.load(f)))
+            except (OSError, ValueError):
+                continue
+        imported_files.append(entry.path)
+        if len(pending) >= batch_size:
+            flush()
+    flush()
+
+    return imported
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sample cache store maintenance")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    migrate = subparsers.add_parser("migrate", help="Import a JSON cache directory into samples.db")
+    migrate.add_argument("cache_dir", type=Path)
+    migrate.add_argument("--delete", action="store_true", help="Remove JSON files once imported")
+    args = parser.parse_args()
+
+    if args.command == "migrate":
+        count = migrate_json_cache(args.cache_dir, delete=args.delete)
+        print(f"Imported {count} cached results into {args.cache_dir / CACHE_DB_NAME}")
+
+
+if __name__ == "__main__":
+    main()
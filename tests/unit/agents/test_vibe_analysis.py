@@ -10,6 +10,7 @@ from datetime import datetime
 
 # This import will fail until we implement the agent
 from src.agents.vibe_analysis import VibeAnalysisAgent, SampleVibe, VibeDescriptor
+from src.tools.llm_scheduler import COMPLETION_TOKENS_PER_SAMPLE
 
 
 class TestVibeAnalysisAgent:
@@ -160,6 +161,9 @@ class TestVibeAnalysisAgent:
             assert all(isinstance(r, SampleVibe) for r in results)
             assert results[0].vibe.genre == "electronic"
             assert results[1].vibe.genre == "synthwave"
+            # The completion budget grows with the batch
+            request = mock_post.call_args.kwargs["json"]
+            assert request["max_tokens"] == 5 * COMPLETION_TOKENS_PER_SAMPLE
     
     @pytest.mark.asyncio
     async def test_rate_limiting(self, agent):
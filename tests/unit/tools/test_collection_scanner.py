@@ -0,0 +1,102 @@
+"""
+Unit tests for the Collection Scanner.
+"""
+
+import os
+import shutil
+
+from src.tools.collection_scanner import CollectionScanner, scan_files
+
+
+def _touch(path, content="x"):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+
+
+class TestCollectionScanner:
+    """Test suite for Collection Scanner."""
+
+    def test_scan_files_is_recursive_and_filters_extensions(self, temp_output_dir):
+        """Test nested audio files are found and other files ignored."""
+        root = temp_output_dir / "library"
+        _touch(root / "kick.wav")
+        _touch(root / "drums" / "snare.WAV")
+        _touch(root / "drums" / "70s" / "break.flac")
+        _touch(root / "notes.txt")
+        _touch(root / ".hidden" / "ignored.wav")
+
+        found = scan_files(root, workers=2)
+
+        assert sorted(os.path.basename(p) for p in found) == ["break.flac", "kick.wav", "snare.WAV"]
+
+    def test_incremental_scan_reports_only_changes(self, temp_output_dir):
+        """Test later scans yield new, modified and deleted files only."""
+        root = temp_output_dir / "library"
+        _touch(root / "a.wav")
+        _touch(root / "sub" / "b.wav")
+        _touch(root / "sub" / "c.wav")
+        scanner = CollectionScanner(root, manifest_path=temp_output_dir / "manifest.db")
+
+        first = scanner.scan()
+        assert len(first.changes.added) == 3
+
+        second = scanner.scan()
+        assert not second.changes.has_changes
+        assert second.changes.unchanged == 3
+
+        _touch(root / "sub" / "b.wav", "longer content")
+        (root / "sub" / "c.wav").unlink()
+        _touch(root / "d.wav")
+
+        third = scanner.scan(verify=True)
+        assert [p.name for p in third.changes.added] == ["d.wav"]
+        assert [p.name for p in third.changes.modified] == ["b.wav"]
+        assert [p.name for p in third.changes.deleted] == ["c.wav"]
+        assert third.changes.unchanged == 1
+        assert not scanner.scan().changes.has_changes
+
+    def test_new_subdirectory_is_found_without_verify(self, temp_output_dir):
+        """Test files added in new or existing directories show up on a fast scan."""
+        root = temp_output_dir / "library"
+        _touch(root / "a.wav")
+        scanner = CollectionScanner(root, manifest_path=temp_output_dir / "manifest.db")
+        scanner.scan()
+
+        _touch(root / "new" / "deep" / "b.wav")
+        _touch(root / "c.wav")
+        shutil.rmtree(root / "new" / "deep")
+        _touch(root / "new" / "deeper" / "d.wav")
+
+        result = scanner.scan()
+        assert [p.name for p in result.changes.added] == ["c.wav", "d.wav"]
+        assert result.total_files == 3
+
+    def test_scanner_without_manifest_diffs_against_previous_scan(self, temp_output_dir):
+        """Test a manifest-less scanner reports changes since its own last scan."""
+        root = temp_output_dir / "library"
+        _touch(root / "a.wav")
+        scanner = CollectionScanner(root)
+        assert [p.name for p in scanner.scan().changes.added] == ["a.wav"]
+
+        _touch(root / "b.wav")
+        (root / "a.wav").unlink()
+        changes = scanner.scan().changes
+        assert [p.name for p in changes.added] == ["b.wav"]
+        assert [p.name for p in changes.deleted] == ["a.wav"]
+        assert not scanner.scan().changes.has_changes
+
+    def test_scan_without_update_is_recorded_later(self, temp_output_dir):
+        """Test changes keep being reported until the scan is recorded."""
+        root = temp_output_dir / "library"
+        _touch(root / "a.wav")
+        scanner = CollectionScanner(root, manifest_path=temp_output_dir / "manifest.db")
+        scanner.scan()
+
+        _touch(root / "sub" / "b.wav")
+        pending = scanner.scan(update_manifest=False)
+        assert [p.name for p in pending.changes.added] == ["b.wav"]
+        # Not recorded yet (e.g. the import was interrupted): reported again
+        assert [p.name for p in scanner.scan(update_manifest=False).changes.added] == ["b.wav"]
+
+        scanner.record(pending)
+        assert not scanner.scan().changes.has_changes
@@ -0,0 +1,112 @@
+"""
+Unit tests for the LLM request scheduler.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from src.agents.vibe_analysis import VibeAnalysisAgent
+from src.tools.llm_scheduler import RateLimitError, TokenBucket, VibeRequestScheduler
+
+
+def _samples(count, name_length=10):
+    return [{"filename": f"{i:04d}" + "x" * name_length + ".wav", "bpm": 90, "key": "C"} for i in range(count)]
+
+
+class TestTokenBucket:
+    """Test suite for TokenBucket."""
+
+    @pytest.mark.asyncio
+    async def test_burst_then_refill_rate(self):
+        """Test a full bucket bursts, then admits at the refill rate."""
+        bucket = TokenBucket(rate_per_minute=600, capacity=3)  # 10 per second
+
+        start = time.monotonic()
+        for _ in range(3):
+            await bucket.acquire()
+        assert time.monotonic() - start < 0.05
+
+        await bucket.acquire()
+        assert 0.07 <= time.monotonic() - start < 0.3
+
+    @pytest.mark.asyncio
+    async def test_block_for_delays_acquire(self):
+        """Test a Retry-After block holds back every caller."""
+        bucket = TokenBucket(rate_per_minute=6000)
+        bucket.block_for(0.1)
+
+        start = time.monotonic()
+        await bucket.acquire()
+        assert time.monotonic() - start >= 0.09
+
+
+class TestVibeRequestScheduler:
+    """Test suite for VibeRequestScheduler."""
+
+    @pytest.fixture
+    def scheduler(self):
+        return VibeRequestScheduler(
+            VibeAnalysisAgent(),
+            requests_per_minute=6000,
+            tokens_per_minute=10_000_000,
+            max_concurrency=4,
+            max_batch_size=8,
+            max_prompt_tokens=4000,
+            target_latency=1.0
+        )
+
+    def test_pack_respects_batch_size_and_token_budget(self, scheduler):
+        """Test requests are capped by batch size and estimated tokens."""
+        batches = scheduler.pack(_samples(12))
+        assert [len(b) for b in batches] == [5, 5, 2]
+
+        scheduler.max_prompt_tokens = scheduler.estimate_request_tokens(_samples(2, name_length=400))
+        batches = scheduler.pack(_samples(5, name_length=400))
+        assert [len(b) for b in batches] == [2, 2, 1]
+        assert all(scheduler.estimate_request_tokens(b) <= scheduler.max_prompt_tokens for b in batches)
+
+    @pytest.mark.asyncio
+    async def test_adapts_to_latency_and_rate_limits(self, scheduler):
+        """Test fast successes grow batches and concurrency; 429s back off."""
+        calls = []
+
+        async def request(batch):
+            calls.append(len(batch))
+            if len(calls) == 3:
+                raise RateLimitError(retry_after=0.05)
+            return [s["filename"] for s in batch]
+
+        results = await scheduler.run_all(request, scheduler.pack(_samples(20)))
+
+        assert [name for batch in results for name in batch] == [s["filename"] for s in _samples(20)]
+        assert scheduler.throttled_count == 1
+        assert len(calls) == 5  # Four requests, one retried after the 429
+        assert scheduler.request_rate < scheduler.requests_per_minute
+
+        scheduler.concurrency = 1
+        scheduler.batch_size = 5
+        for _ in range(3):
+            scheduler.record_success(latency=0.1)
+        assert (scheduler.batch_size, scheduler.concurrency) == (8, 4)
+        scheduler.record_success(latency=5.0)
+        assert scheduler.batch_size == 7
+
+    @pytest.mark.asyncio
+    async def test_run_all_overlaps_requests(self, scheduler):
+        """Test up to `concurrency` requests are in flight at once."""
+        scheduler.concurrency = 3
+        in_flight = 0
+        peak = 0
+
+        async def request(batch):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.02)
+            in_flight -= 1
+            return batch
+
+        await scheduler.run_all(request, [[s] for s in _samples(9)])
+        assert peak >= 3
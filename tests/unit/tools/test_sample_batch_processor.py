@@ -14,7 +14,9 @@ from src.tools.sample_batch_processor import (
     SampleBatchProcessor,
     ProcessingStatus,
     BatchResult,
-    SampleCollection
+    SampleCollection,
+    CancellationToken,
+    ProcessingCancelled
 )
 
 
@@ -34,7 +36,8 @@ class TestSampleBatchProcessor:
         assert processor.collection_path == Path("/Users/bhunt/development/claude/personal/sp404mk2-sample-agent/Wanns Wavs 1")
         assert processor.cache_dir.exists()
         assert processor.batch_size == 5
-        assert processor.rate_limit_seconds == 12  # 5 requests per minute
+        assert processor.scheduler.batch_size == 5
+        assert processor.vibe_agent.scheduler is processor.scheduler
         assert hasattr(processor, 'vibe_agent')
         assert hasattr(processor, 'audio_analyzer')
     
@@ -286,21 +289,6 @@ class TestSampleBatchProcessor:
             assert features["error"] is True
             assert "File not found" in features.get("error_message", "")
     
-    @pytest.mark.asyncio
-    async def test_rate_limit_enforcement(self, processor):
-        """Test that rate limiting is properly enforced."""
-        # Set last request time to now
-        processor._last_request_time = asyncio.get_event_loop().time()
-        
-        # Try to process immediately
-        start = asyncio.get_event_loop().time()
-        await processor._apply_rate_limit()
-        elapsed = asyncio.get_event_loop().time() - start
-        
-        # Should wait approximately 12 seconds
-        assert elapsed >= 11  # Allow small margin
-        assert elapsed < 13
-    
     def test_export_results(self, processor):
         """Test exporting results to JSON."""
         # Add some mock cached results
@@ -324,4 +312,136 @@ class TestSampleBatchProcessor:
         
         assert len(data["samples"]) == 2
         assert data["metadata"]["total_samples"] == 2
-        assert "export_date" in data["metadata"]
\ No newline at end of file
+        assert "export_date" in data["metadata"]
+
+    @pytest.mark.asyncio
+    async def test_cancellation_token(self):
+        """Test pause blocks at a checkpoint until resumed, cancel raises."""
+        token = CancellationToken(refresh_interval=0.01)
+        await token.checkpoint()  # Not paused: returns immediately
+
+        token.pause()
+        waiter = asyncio.create_task(token.checkpoint())
+        await asyncio.sleep(0.05)
+        assert not waiter.done()
+
+        token.resume()
+        await asyncio.wait_for(waiter, timeout=1)
+
+        token.cancel()
+        with pytest.raises(ProcessingCancelled):
+            await token.checkpoint()
+
+    @pytest.mark.asyncio
+    async def test_cancel_and_resume_skips_completed_samples(self, processor, temp_output_dir):
+        """Test a cancelled run resumes from per-sample checkpoints."""
+        from src.agents.vibe_analysis import SampleVibe, VibeDescriptor
+
+        collection_dir = temp_output_dir / "collection"
+        collection_dir.mkdir()
+        for i in range(12):
+            (collection_dir / f"sample_{i:02d}.wav").write_text("")
+        processor.collection_path = collection_dir
+
+        analyzed = []
+
+        async def analyze_batch(sample_data):
+            analyzed.extend(d["filename"] for d in sample_data)
+            return [
+                SampleVibe(
+                    filename=d["filename"],
+                    bpm=90,
+                    key="C",
+                    vibe=VibeDescriptor(
+                        mood=["test"], era="modern", genre="test",
+                        energy_level="medium", descriptors=["test"]
+                    ),
+                    compatibility_tags=["test"],
+                    best_use="test"
+                )
+                for d in sample_data
+            ]
+
+        processor.vibe_agent.analyze_batch = analyze_batch
+        token = CancellationToken()
+
+        def cancel_after_first_batch(collection):
+            if collection.processed_samples >= 5:
+                token.cancel()
+
+        with patch.object(processor, 'extract_local_features') as mock_extract:
+            mock_extract.side_effect = lambda path: {"filename": path.name, "bpm": 90}
+
+            first = await processor.process_collection(cancel_after_first_batch, token=token)
+            assert first.status == ProcessingStatus.CANCELLED
+            assert first.processed_samples == 5
+            assert len(processor.get_cached_files()) == 5
+
+            second = await processor.process_collection()
+
+        assert second.status == ProcessingStatus.COMPLETED
+        assert second.processed_samples == 12
+        # Every sample was analyzed exactly once across both runs
+        assert sorted(analyzed) == sorted(f"sample_{i:02d}.wav" for i in range(12))
+
+    def test_cache_store_batched_writes_and_membership(self, processor):
+        """Test results written in one batch are all visible to lookups."""
+        processor.cache.put_many(
+            (f"sample_{i}.wav", {"filename": f"sample_{i}.wav"}) for i in range(3)
+        )
+
+        assert "sample_1.wav" in processor.cache
+        assert "missing.wav" not in processor.cache
+        assert len(processor.cache) == 3
+        assert sorted(processor.get_cached_files()) == [f"sample_{i}.wav" for i in range(3)]
+
+    def test_legacy_json_cache_is_migrated(self, temp_output_dir):
+        """Test an existing per-sample JSON cache is imported on first open."""
+        cache_dir = temp_output_dir / "legacy_cache"
+        cache_dir.mkdir()
+        for name in ("a.wav", "b.wav"):
+            (cache_dir / f"{name}.json").write_text(json.dumps({"filename": name}))
+        (cache_dir / "export_20240101_000000.json").write_text("{}")
+        (cache_dir / "broken.wav.json").write_text("{not json")
+
+        processor = SampleBatchProcessor(collection_path=str(temp_output_dir), cache_dir=str(cache_dir))
+
+        assert sorted(processor.get_cached_files()) == ["a.wav", "b.wav"]
+        assert processor.load_from_cache("a.wav") == {"filename": "a.wav"}
+
+    def test_modified_sample_is_reprocessed(self, processor, temp_output_dir):
+        """Test a sample whose file changed loses its cached result."""
+        collection_dir = temp_output_dir / "collection"
+        (collection_dir / "drums").mkdir(parents=True)
+        (collection_dir / "drums" / "kick.wav").write_text("")
+        (collection_dir / "snare.wav").write_text("")
+        processor.collection_path = collection_dir
+
+        processor.discover_samples()
+        processor.save_to_cache("drums/kick.wav", {"filename": "drums/kick.wav"})
+        processor.save_to_cache("snare.wav", {"filename": "snare.wav"})
+        assert processor.get_unprocessed_samples() == []
+
+        (collection_dir / "drums" / "kick.wav").write_text("re-exported")
+
+        assert [p.name for p in processor.get_unprocessed_samples()] == ["kick.wav"]
+        assert "snare.wav" in processor.cache
+
+    def test_samples_sharing_a_filename_are_cached_separately(self, processor, temp_output_dir):
+        """Test samples with the same filename in different folders each get a result."""
+        collection_dir = temp_output_dir / "collection"
+        for folder in ("pack_a", "pack_b"):
+            (collection_dir / folder).mkdir(parents=True)
+            (collection_dir / folder / "kick.wav").write_text("")
+        processor.collection_path = collection_dir
+
+        assert processor.sample_key(collection_dir / "pack_a" / "kick.wav") == "pack_a/kick.wav"
+        processor.save_to_cache("pack_a/kick.wav", {"filename": "pack_a/kick.wav"})
+
+        unprocessed = processor.get_unprocessed_samples()
+        assert unprocessed == [collection_dir / "pack_b" / "kick.wav"]
+
+        (collection_dir / "pack_a" / "kick.wav").write_text("re-exported")
+        processor.save_to_cache("pack_b/kick.wav", {"filename": "pack_b/kick.wav"})
+        assert processor.get_unprocessed_samples() == [collection_dir / "pack_a" / "kick.wav"]
+        assert "pack_b/kick.wav" in processor.cache